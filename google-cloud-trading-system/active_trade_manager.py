@@ -9,7 +9,8 @@ import sys
 import time
 import requests
 from datetime import datetime
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -18,7 +19,7 @@ sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
 from src.core.oanda_client import OandaClient
 
 class ActiveTradeManager:
-    def __init__(self):
+    def __init__(self, clients: Optional[Dict[str, OandaClient]] = None, max_workers: int = 8):
         load_dotenv(os.path.join(BASE_DIR, 'oanda_config.env'))
         
         self.api_key = os.getenv('OANDA_API_KEY')
@@ -30,10 +31,11 @@ class ActiveTradeManager:
             'ALPHA': os.getenv('STRATEGY_ALPHA_ACCOUNT')
         }
         
-        self.clients = {
+        self.clients = clients or {
             name: OandaClient(self.api_key, account_id, self.environment)
             for name, account_id in self.accounts.items()
         }
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='trade-manager')
         
         self.early_close_loss_pct = -0.0015
         self.early_close_profit_pct = 0.001
@@ -44,6 +46,7 @@ class ActiveTradeManager:
         self.telegram_chat_id = os.getenv('TELEGRAM_CHAT_ID')
         
         self.trade_entry_times = {}
+        self._trade_accounts = {}
         self.actions_taken = 0
         
         print("✅ Active Trade Manager initialized - FIXED VERSION")
@@ -59,7 +62,7 @@ class ActiveTradeManager:
         """Close a specific trade by ID"""
         try:
             url = f"{client.base_url}/v3/accounts/{client.account_id}/trades/{trade_id}/close"
-            response = requests.put(url, headers=client.headers, json={})
+            response = requests.put(url, headers=client.headers, json={}, timeout=10)
             
             if response.status_code == 200:
                 return True
@@ -68,66 +71,134 @@ class ActiveTradeManager:
         except:
             return False
     
-    def manage_all_positions(self):
-        total_actions = 0
+    def _fetch_open_trades(self) -> Dict[str, List[Dict]]:
+        """Open trades for every account, fetched in parallel (failed accounts are left out)"""
+        def fetch(name):
+            return name, self.clients[name].get_open_trades()
         
+        open_trades = {}
+        futures = [self.executor.submit(fetch, name) for name in self.clients]
+        for future in futures:
+            try:
+                name, trades = future.result()
+                open_trades[name] = trades
+            except Exception as e:
+                print(f"Error fetching trades: {e}")
+        return open_trades
+    
+    def _price_snapshot(self, instruments: List[str]) -> Dict:
+        """One pricing call for every open instrument; prices are the same on every account"""
+        if not instruments:
+            return {}
         for account_name, client in self.clients.items():
             try:
-                open_trades = client.get_open_trades()
+                return client.get_current_prices(instruments, force_refresh=True)
+            except Exception as e:
+                print(f"Price snapshot failed via {account_name}: {e}")
+        return {}
+    
+    def evaluate_positions(self, open_trades: Dict[str, List[Dict]], prices: Dict,
+                           now: Optional[datetime] = None) -> List[Dict]:
+        """
+        Apply the close rules to every open trade against one price snapshot
+        
+        Args:
+            open_trades: Account name -> raw OANDA trade dicts
+            prices: Instrument -> OandaPrice from _price_snapshot
+            now: Evaluation time (defaults to now)
+        
+        Returns:
+            One dict per trade to close (account, trade_id, instrument, units, reason)
+        """
+        now = now or datetime.now()
+        to_close = []
+        
+        for account_name, trades in open_trades.items():
+            for trade in trades:
+                trade_id = trade['id']
+                instrument = trade['instrument']
+                current_units = float(trade['currentUnits'])
+                price = float(trade['price'])
+                
+                quote = prices.get(instrument)
+                if quote is not None and price > 0:
+                    current_price = quote.bid if current_units > 0 else quote.ask
+                    if current_units > 0:
+                        pl_pct = (current_price - price) / price
+                    else:
+                        pl_pct = (price - current_price) / price
+                else:
+                    unrealized_pl = float(trade.get('unrealizedPL', 0))
+                    pl_pct = unrealized_pl / (abs(current_units) * price) if price > 0 and current_units else 0
+                
+                if trade_id not in self.trade_entry_times:
+                    self.trade_entry_times[trade_id] = now
+                
+                time_in_trade = (now - self.trade_entry_times[trade_id]).total_seconds() / 60
                 
-                for trade in open_trades:
-                    trade_id = trade['id']
-                    instrument = trade['instrument']
-                    current_units = float(trade['currentUnits'])
-                    price = float(trade['price'])
-                    unrealized_pl = float(trade['unrealizedPL'])
-                    
-                    # Get current price
-                    try:
-                        prices = client.get_current_prices([instrument])
-                        current_price = prices[instrument].bid if current_units > 0 else prices[instrument].ask
-                        
-                        if current_units > 0:
-                            pl_pct = (current_price - price) / price
-                        else:
-                            pl_pct = (price - current_price) / price
-                    except:
-                        pl_pct = unrealized_pl / (abs(current_units) * price) if price > 0 else 0
-                    
-                    if trade_id not in self.trade_entry_times:
-                        self.trade_entry_times[trade_id] = datetime.now()
-                    
-                    time_in_trade = (datetime.now() - self.trade_entry_times[trade_id]).total_seconds() / 60
-                    
-                    should_close = False
-                    reason = ""
-                    
-                    if pl_pct <= self.early_close_loss_pct:
-                        should_close = True
-                        reason = f"EARLY LOSS ({pl_pct*100:.2f}%)"
-                    elif pl_pct < 0 and time_in_trade >= self.max_loss_hold_time:
-                        should_close = True
-                        reason = f"MAX LOSS TIME ({time_in_trade:.0f}min, {pl_pct*100:.2f}%)"
-                    elif pl_pct >= self.early_close_profit_pct:
-                        should_close = True
-                        reason = f"QUICK PROFIT ({pl_pct*100:.2f}%)"
-                    elif time_in_trade >= self.max_hold_time_minutes:
-                        should_close = True
-                        reason = f"MAX TIME ({time_in_trade:.0f}min, {pl_pct*100:.2f}%)"
-                    
-                    if should_close:
-                        if self.close_trade_by_id(client, trade_id):
-                            message = f"🔴 {account_name} - CLOSED {instrument}\n   {reason}\n   Units: {abs(current_units):,.0f}"
-                            print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
-                            self.send_telegram(message)
-                            self.actions_taken += 1
-                            total_actions += 1
-                            
-                            if trade_id in self.trade_entry_times:
-                                del self.trade_entry_times[trade_id]
-                        
+                reason = ""
+                if pl_pct <= self.early_close_loss_pct:
+                    reason = f"EARLY LOSS ({pl_pct*100:.2f}%)"
+                elif pl_pct < 0 and time_in_trade >= self.max_loss_hold_time:
+                    reason = f"MAX LOSS TIME ({time_in_trade:.0f}min, {pl_pct*100:.2f}%)"
+                elif pl_pct >= self.early_close_profit_pct:
+                    reason = f"QUICK PROFIT ({pl_pct*100:.2f}%)"
+                elif time_in_trade >= self.max_hold_time_minutes:
+                    reason = f"MAX TIME ({time_in_trade:.0f}min, {pl_pct*100:.2f}%)"
+                
+                if reason:
+                    to_close.append({
+                        'account': account_name,
+                        'trade_id': trade_id,
+                        'instrument': instrument,
+                        'units': current_units,
+                        'reason': reason,
+                    })
+        
+        return to_close
+    
+    def _close_and_notify(self, decision: Dict) -> bool:
+        if not self.close_trade_by_id(self.clients[decision['account']], decision['trade_id']):
+            return False
+        message = (f"🔴 {decision['account']} - CLOSED {decision['instrument']}\n   {decision['reason']}"
+                   f"\n   Units: {abs(decision['units']):,.0f}")
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+        self.send_telegram(message)
+        return True
+    
+    def manage_all_positions(self):
+        """
+        One supervision cycle: trades from all accounts, a single price
+        snapshot for their instruments, bulk evaluation, concurrent closes
+        
+        Returns:
+            Number of trades closed
+        """
+        open_trades = self._fetch_open_trades()
+        
+        # Forget trades closed elsewhere (stop/TP hit) on the accounts we could read
+        open_ids = {trade['id'] for trades in open_trades.values() for trade in trades}
+        for trade_id in [t for t, name in self._trade_accounts.items() if name in open_trades and t not in open_ids]:
+            self._trade_accounts.pop(trade_id)
+            self.trade_entry_times.pop(trade_id, None)
+        self._trade_accounts.update({trade['id']: name for name, trades in open_trades.items() for trade in trades})
+        
+        instruments = sorted({trade['instrument'] for trades in open_trades.values() for trade in trades})
+        prices = self._price_snapshot(instruments)
+        to_close = self.evaluate_positions(open_trades, prices)
+        
+        total_actions = 0
+        futures = [(decision, self.executor.submit(self._close_and_notify, decision)) for decision in to_close]
+        for decision, future in futures:
+            try:
+                closed = future.result()
             except Exception as e:
-                print(f"Error in {account_name}: {e}")
+                print(f"Error closing {decision['trade_id']} in {decision['account']}: {e}")
+                continue
+            if closed:
+                self.actions_taken += 1
+                total_actions += 1
+                self.trade_entry_times.pop(decision['trade_id'], None)
         
         return total_actions
     
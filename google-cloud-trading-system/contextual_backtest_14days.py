@@ -28,6 +28,7 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import pytz
+import inspect
 import json
 import traceback
 
@@ -65,6 +66,8 @@ try:
     from src.core.telegram_notifier import TelegramNotifier
     from src.core.historical_fetcher import get_historical_fetcher
     from src.core.data_feed import MarketData
+    from src.core.exit_simulator import ExitSimulator
+    from src.core.backtest_context import BacktestContext
     
     logger.info("✅ Core modules imported")
 except Exception as e:
@@ -104,38 +107,14 @@ class BacktestTrade:
         self.max_favorable_excursion = 0.0  # Maximum profit reached
         self.max_adverse_excursion = 0.0  # Maximum drawdown reached
     
-    def update(self, current_price, current_time):
-        """Update trade with current price"""
-        if self.status != "open":
-            return
-        
-        # Calculate profit/loss
-        if self.side == "BUY":
-            profit = current_price - self.entry_price
-        else:
-            profit = self.entry_price - current_price
-        
-        # Update max favorable/adverse excursion
-        if profit > 0 and profit > self.max_favorable_excursion:
-            self.max_favorable_excursion = profit
-        elif profit < 0 and profit < self.max_adverse_excursion:
-            self.max_adverse_excursion = profit
-        
-        # Check if stopped out
-        if (self.side == "BUY" and current_price <= self.stop_loss) or \
-           (self.side == "SELL" and current_price >= self.stop_loss):
-            self.exit_price = self.stop_loss
-            self.exit_time = current_time
-            self.status = "loss"
-            self._calculate_profit()
-        
-        # Check if take profit hit
-        elif (self.side == "BUY" and current_price >= self.take_profit) or \
-             (self.side == "SELL" and current_price <= self.take_profit):
-            self.exit_price = self.take_profit
-            self.exit_time = current_time
-            self.status = "win"
-            self._calculate_profit()
+    def apply_exit(self, event, exit_time=None):
+        """Close the trade from an ExitSimulator event (intrabar high/low fill)"""
+        self.exit_price = event.exit_price
+        self.exit_time = exit_time if exit_time is not None else event.exit_time
+        self.status = "win" if event.price_move > 0 else "loss"
+        self.max_favorable_excursion = event.max_favorable_excursion
+        self.max_adverse_excursion = event.max_adverse_excursion
+        self._calculate_profit()
     
     def _calculate_profit(self):
         """Calculate profit in pips and percent"""
@@ -207,6 +186,15 @@ class ContextualBacktester:
         self.price_data_by_timeframe = {}
         self.news_events = {}
         self.trades = []
+        # Open trades resolved against each candle's high/low; stop wins a same-bar tie
+        self.exit_simulator = ExitSimulator(self.instruments)
+        self._candle_idx = 0
+        # Per-bar session/news/multi-timeframe context, built once in run_backtest
+        self.context = None
+        self._closes = {}
+        self._times = []
+        self._times_ns = None
+        self._ticks = {}  # one MarketData per instrument, repriced every bar
         
         logger.info(f"✅ Contextual Backtester initialized for {days} days")
     
@@ -314,6 +302,8 @@ class ContextualBacktester:
         
         logger.info(f"✅ Processing {min_length} candles for each instrument")
         
+        self._prepare_context(min_length)
+        
         # Clear price history in strategies
         for strategy_info in self.strategies:
             strategy = strategy_info['instance']
@@ -343,84 +333,84 @@ class ContextualBacktester:
         
         return True
     
+    def _prepare_context(self, min_length):
+        """Precompute closes and the per-bar context for the whole run"""
+        available = [inst for inst in self.instruments if inst in self.historical_data]
+        self._closes = {inst: [float(c['close']) for c in self.historical_data[inst][:min_length]]
+                        for inst in available}
+        # bars are stamped with the last instrument's time, as in live scanning
+        self._times = [c['time'] for c in self.historical_data[available[-1]][:min_length]]
+        
+        index = pd.to_datetime(self._times)
+        news = self.historical_news.get_historical_news(
+            from_date=index[0].to_pydatetime().replace(tzinfo=None) - timedelta(days=1),
+            to_date=index[-1].to_pydatetime().replace(tzinfo=None) + timedelta(days=1))
+        self.context = BacktestContext(index, self.session_manager, news,
+                                       psychological_levels=self.price_analyzer.psychological_levels)
+        for instrument in available:
+            if instrument in self.price_data_by_timeframe:
+                self.context.add_instrument(instrument, self.price_data_by_timeframe[instrument])
+        self._times_ns = (index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')).as_unit('ns').asi8
+        self._ticks = {
+            instrument: MarketData(pair=instrument, is_live=False, data_source='OANDA_Historical',
+                                   last_update_age=0, time_ns=0)
+            for instrument in available
+        }
+        for strategy_info in self.strategies:
+            # strategies that take the bar context score the bar's session/news/levels, not the wall clock
+            params = inspect.signature(strategy_info['instance'].analyze_market).parameters
+            strategy_info['takes_context'] = 'context' in params and 'bar' in params
+        logger.info(f"✅ Context precomputed for {len(self.context)} bars of {len(available)} instruments")
+    
+    def _market_data(self, candle_idx):
+        """MarketData for every instrument at this bar (the same objects, repriced in place)"""
+        timestamp = self._times[candle_idx]
+        time_ns = int(self._times_ns[candle_idx])
+        for instrument, closes in self._closes.items():
+            close = closes[candle_idx]
+            self._ticks[instrument].move_to(close, close + 0.0001, time_ns, timestamp)
+        return self._ticks
+    
+    def _analyze(self, strategy_info, market_data_dict, candle_idx):
+        """Call analyze_market with ALL instruments (like live trading), plus the bar context if taken"""
+        strategy = strategy_info['instance']
+        if strategy_info.get('takes_context'):
+            return strategy.analyze_market(market_data_dict, context=self.context, bar=candle_idx)
+        return strategy.analyze_market(market_data_dict)
+    
     def _process_candle_for_indicators(self, candle_idx):
         """Process candle data for indicators only (warm-up)"""
         # Build market_data dict with ALL instruments at this timestamp
-        market_data_dict = {}
-        
-        for instrument in self.instruments:
-            if instrument not in self.historical_data:
-                continue
-            
-            candle = self.historical_data[instrument][candle_idx]
-            close_price = float(candle['close'])
-            
-            market_data_dict[instrument] = MarketData(
-                pair=instrument,
-                bid=close_price,
-                ask=close_price + 0.0001,
-                timestamp=candle['time'],
-                is_live=False,
-                data_source='OANDA_Historical',
-                spread=0.0001,
-                last_update_age=0
-            )
+        market_data_dict = self._market_data(candle_idx)
         
         # Update strategy price history
         for strategy_info in self.strategies:
-            strategy = strategy_info['instance']
-            
-            # Call analyze_market with ALL instruments (like live trading)
-            if hasattr(strategy, 'analyze_market'):
-                strategy.analyze_market(market_data_dict)
+            if hasattr(strategy_info['instance'], 'analyze_market'):
+                self._analyze(strategy_info, market_data_dict, candle_idx)
     
     def _process_candle(self, candle_idx):
         """Process a single candle for all instruments"""
-        # Build market_data dict with ALL instruments at this timestamp
-        market_data_dict = {}
-        timestamp = None
+        self._candle_idx = candle_idx
         
-        for instrument in self.instruments:
-            if instrument not in self.historical_data:
-                continue
-            
-            candle = self.historical_data[instrument][candle_idx]
-            close_price = float(candle['close'])
-            timestamp = candle['time']
-            
-            market_data_dict[instrument] = MarketData(
-                pair=instrument,
-                bid=close_price,
-                ask=close_price + 0.0001,
-                timestamp=timestamp,
-                is_live=False,
-                data_source='OANDA_Historical',
-                spread=0.0001,
-                last_update_age=0
-            )
-        
-        # Convert timestamp to datetime
-        if timestamp:
-            dt_timestamp = pd.to_datetime(timestamp)
-        else:
-            return
-        
-        # Get session quality
-        session_quality, active_sessions = self.session_manager.get_session_quality(dt_timestamp)
+        # Build market_data dict with ALL instruments at this timestamp
+        market_data_dict = self._market_data(candle_idx)
+        dt_timestamp = self.context.index[candle_idx]
         
-        # Get relevant news
-        news_context = self.historical_news.get_news_context(dt_timestamp)
+        # Session quality (precomputed); news context is only assembled for bars with signals
+        session_quality = int(self.context.session_quality[candle_idx])
+        news_context = None
         
         # Process each strategy
         for strategy_info in self.strategies:
             strategy = strategy_info['instance']
             strategy_name = strategy_info['name']
             
-            # Call analyze_market with ALL instruments (like live trading)
             if hasattr(strategy, 'analyze_market'):
-                signals = strategy.analyze_market(market_data_dict)
+                signals = self._analyze(strategy_info, market_data_dict, candle_idx)
                 
                 if signals:
+                    if news_context is None:
+                        news_context = self.context.news_context(candle_idx)
                     for signal in signals:
                         self._process_signal(signal, strategy_name, dt_timestamp, 
                                            market_data_dict, session_quality, news_context)
@@ -435,7 +425,7 @@ class ContextualBacktester:
         current_price = market_data_dict[instrument].bid
         
         # Get price context
-        price_context = self._get_price_context(instrument, current_price, timestamp)
+        price_context = self._get_price_context(instrument, current_price, self._candle_idx)
         
         # Combine context
         combined_context = {
@@ -481,52 +471,40 @@ class ContextualBacktester:
             
             # Add to trades list
             self.trades.append(trade)
+            self.exit_simulator.open_position(
+                instrument, side, current_price, stop_loss=stop_loss, take_profit=take_profit,
+                bar_index=self._candle_idx, entry_time=timestamp, tag=trade)
             
             logger.info(f"🔵 TRADE OPENED: {instrument} {side} @ {current_price:.5f} "
                        f"(Quality: {quality_score.total_score}/100)")
     
-    def _get_price_context(self, instrument, price, timestamp):
-        """Get price context for an instrument"""
-        # Get relevant price data up to this timestamp
-        if instrument not in self.price_data_by_timeframe:
-            return {}
-        
-        # Filter data up to timestamp
-        filtered_data = {}
-        for timeframe, df in self.price_data_by_timeframe[instrument].items():
-            filtered_data[timeframe] = df[df.index <= timestamp]
-        
-        # Analyze price context
+    def _get_price_context(self, instrument, price, candle_idx):
+        """Get price context for an instrument from the precomputed multi-timeframe arrays"""
         try:
-            contexts = self.price_analyzer.analyze_price_context(instrument, filtered_data)
-            trade_context = self.price_analyzer.get_trade_context(instrument, price, contexts)
-            return trade_context
+            return self.context.price_context(instrument, candle_idx, price)
         except Exception as e:
             logger.error(f"❌ Error getting price context: {e}")
             return {}
     
     def _update_open_trades(self, candle_idx):
-        """Update all open trades with latest prices"""
-        for instrument in self.instruments:
-            if instrument not in self.historical_data:
-                continue
-            
-            candle = self.historical_data[instrument][candle_idx]
-            current_price = float(candle['close'])
-            timestamp = pd.to_datetime(candle['time'])
-            
-            # Update trades for this instrument
-            for trade in self.trades:
-                if trade.instrument == instrument and trade.status == "open":
-                    trade.update(current_price, timestamp)
-                    
-                    if trade.status != "open":
-                        if trade.status == "win":
-                            logger.info(f"✅ TRADE WON: {trade.instrument} {trade.side} "
-                                      f"Profit: {trade.profit_pips:.1f} pips ({trade.profit_percent:.2f}%)")
-                        else:
-                            logger.info(f"❌ TRADE LOST: {trade.instrument} {trade.side} "
-                                      f"Loss: {trade.profit_pips:.1f} pips ({trade.profit_percent:.2f}%)")
+        """Resolve stops/targets of all open trades against this candle's high/low"""
+        if not len(self.exit_simulator):
+            return
+        
+        bars = {instrument: self.historical_data[instrument][candle_idx]
+                for instrument in self.instruments if instrument in self.historical_data}
+        bar_open, high, low = self.exit_simulator.bar_arrays(
+            {inst: {k: float(c[k]) for k in ('open', 'high', 'low')} for inst, c in bars.items()})
+        
+        for event in self.exit_simulator.step(high, low, bar_open, bar_index=candle_idx):
+            trade = event.tag
+            trade.apply_exit(event, pd.to_datetime(bars[trade.instrument]['time']))
+            if trade.status == "win":
+                logger.info(f"✅ TRADE WON: {trade.instrument} {trade.side} "
+                          f"Profit: {trade.profit_pips:.1f} pips ({trade.profit_percent:.2f}%)")
+            else:
+                logger.info(f"❌ TRADE LOST: {trade.instrument} {trade.side} "
+                          f"Loss: {trade.profit_pips:.1f} pips ({trade.profit_percent:.2f}%)")
     
     def _generate_report(self):
         """Generate backtest report"""
@@ -24,7 +24,7 @@ import threading
 sys.path.append('/Users/mac/quant_system_clean/google-cloud-trading-system')
 
 from src.core.yaml_manager import get_yaml_manager
-from src.core.oanda_client import OandaClient
+from src.core.oanda_client import get_account_client
 from src.analytics.trade_database import TradeDatabase
 from src.analytics.metrics_calculator import MetricsCalculator
 
@@ -63,7 +63,7 @@ class DashboardSyncManager:
         """Sync data for a specific account"""
         try:
             # Get account info
-            client = OandaClient(account_id=account_id)
+            client = get_account_client(account_id)
             account_info = client.get_account_info()
             open_trades = client.get_open_trades()
             
@@ -117,7 +117,7 @@ class DashboardSyncManager:
             semi_auto_account_id = "101-004-30719775-001"  # Strategy Zeta
             
             # Get semi-auto account data
-            client = OandaClient(account_id=semi_auto_account_id)
+            client = get_account_client(semi_auto_account_id)
             account_info = client.get_account_info()
             open_trades = client.get_open_trades()
             
@@ -164,7 +164,7 @@ class DashboardSyncManager:
             
             for account in self.accounts_config:
                 try:
-                    client = OandaClient(account_id=account['id'])
+                    client = get_account_client(account['id'])
                     account_info = client.get_account_info()
                     open_trades = client.get_open_trades()
                     
@@ -214,7 +214,7 @@ class DashboardSyncManager:
                 account_id = account['id']
                 try:
                     # Get account performance
-                    client = OandaClient(account_id=account_id)
+                    client = get_account_client(account_id)
                     account_info = client.get_account_info()
                     open_trades = client.get_open_trades()
                     
@@ -40,6 +40,17 @@ from src.core.oanda_client import OandaClient
 from src.core.data_feed import MarketData
 from src.core.ftmo_risk_manager import FTMORiskManager
 from src.strategies.momentum_trading import MomentumTradingStrategy
+from src.core.walk_forward import WalkForwardRunner, bars_per_day, make_folds
+from src.core.parameter_search import SearchSpace, get_search
+
+FTMO_PARAM_RANGES = {
+    'min_adx': [10, 15, 20, 25, 30],
+    'min_momentum': [0.002, 0.003, 0.005, 0.008],
+    'min_quality_score': [50, 55, 60, 65, 70],
+    'stop_loss_atr': [2.0, 2.5, 3.0, 3.5],
+    'take_profit_atr': [4.0, 5.0, 6.0, 8.0],
+    'momentum_period': [15, 20, 25, 30]
+}
 
 def fetch_oanda_data(client, instrument, days=14):
     """Fetch historical data from OANDA with proper format handling"""
@@ -155,9 +166,20 @@ def calculate_indicators(prices):
     
     return df
 
-def simple_backtest(data, params):
-    """Simple backtest with given parameters"""
-    df = calculate_indicators(data)
+def simple_backtest(data, params, indicators=None, start=100, end=None, return_trades=False):
+    """
+    Simple backtest with given parameters
+    
+    Args:
+        data: Processed candles (ignored when ``indicators`` is given)
+        params: Strategy parameters
+        indicators: Output of calculate_indicators() to reuse across runs
+        start: First bar that may open a trade (never before bar 100)
+        end: Bar after the last one processed (default: all); a trade still
+            open there is closed at that bar's close
+        return_trades: Include the closed trades under 'trade_log'
+    """
+    df = indicators if indicators is not None else calculate_indicators(data)
     
     if df is None or len(df) < 100:
         return {
@@ -184,7 +206,8 @@ def simple_backtest(data, params):
     momentum_period = params.get('momentum_period', 20)
     
     # Process each row
-    for i in range(100, len(df)):
+    stop = len(df) if end is None else min(end, len(df))
+    for i in range(max(100, start), stop):
         row = df.iloc[i]
         
         # Skip if indicators are NaN
@@ -295,6 +318,19 @@ def simple_backtest(data, params):
                 'entry_time': row['timestamp'] if 'timestamp' in row else i
             }
     
+    # A trade still open at the window end is closed on its last bar, not dropped
+    # (dropping it would favour parameter sets whose trades exit quickly)
+    if open_trade and stop > max(100, start):
+        exit_price = df['close'].iloc[stop - 1]
+        direction = 1 if open_trade['side'] == 'BUY' else -1
+        pnl = direction * (exit_price - open_trade['entry']) * open_trade['units']
+        open_trade['exit'] = exit_price
+        open_trade['pnl'] = pnl
+        open_trade['result'] = 'win' if pnl > 0 else 'loss'
+        trades.append(open_trade)
+        balance += pnl
+        max_dd = max(max_dd, (peak_balance - balance) / peak_balance)
+    
     # Calculate results
     total_trades = len(trades)
     wins = sum(1 for t in trades if t['result'] == 'win')
@@ -302,7 +338,7 @@ def simple_backtest(data, params):
     win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
     profit_pips = sum(t['pnl'] for t in trades)
     
-    return {
+    result = {
         'trades': total_trades,
         'wins': wins,
         'losses': losses,
@@ -311,9 +347,72 @@ def simple_backtest(data, params):
         'max_dd': max_dd * 100,
         'final_balance': balance
     }
+    if return_trades:
+        result['trade_log'] = trades
+    return result
 
-def optimize_for_ftmo():
-    """Run comprehensive optimization for FTMO challenge"""
+def ftmo_fitness(result):
+    """FTMO fitness of a backtest result (win rate, frequency, profit, drawdown)"""
+    fitness = 0
+    
+    # Win rate component (60% weight)
+    if result['win_rate'] >= 65:
+        fitness += 0.6 * (result['win_rate'] / 100)
+    else:
+        fitness += 0.3 * (result['win_rate'] / 100)  # Penalty for < 65%
+    
+    # Trade frequency (20% weight) - target 20-40 trades
+    trade_score = 1 - abs(result['trades'] - 30) / 50
+    fitness += 0.2 * max(0, trade_score)
+    
+    # Profitability (10% weight)
+    if result['profit_pips'] > 0:
+        fitness += 0.1
+    
+    # Max drawdown (10% weight) - lower is better
+    dd_score = 1 - (result['max_dd'] / 10)  # Normalize to 10% max
+    fitness += 0.1 * max(0, dd_score)
+    
+    return fitness
+
+def _search_ftmo(data, indicators, param_ranges, method, seed=None, **search_kwargs):
+    """
+    Adaptive search over the same fitness as the grid
+    
+    Fractional budgets backtest only the most recent share of the bars after
+    warm-up; full-data results are collected in the grid's result format.
+    """
+    n_bars = len(indicators)
+    full_results = {}
+    
+    def objective(params, budget):
+        start = 100 if budget >= 1.0 else max(100, n_bars - int(round((n_bars - 100) * budget)))
+        result = simple_backtest(data, params, indicators=indicators, start=start)
+        fitness = ftmo_fitness(result)
+        if budget >= 1.0:
+            full_results[json.dumps(params, sort_keys=True, default=str)] = {
+                'params': params,
+                'fitness': fitness,
+                **result
+            }
+        return fitness
+    
+    outcome = get_search(method, **search_kwargs).run(SearchSpace(param_ranges), objective, seed=seed)
+    grid_size = int(np.prod([len(v) for v in param_ranges.values() if isinstance(v, list)]))
+    logger.info(f"🔍 {method}: {outcome.evaluations} backtests ({outcome.budget_used:.1f} full-data "
+                f"equivalents) vs {grid_size} for the full grid")
+    return list(full_results.values())
+
+def optimize_for_ftmo(search=None, seed=None, **search_kwargs):
+    """
+    Run comprehensive optimization for FTMO challenge
+    
+    Args:
+        search: None for the full grid, or a parameter_search method
+            ('tpe', 'hyperband', 'successive_halving', 'random')
+        seed: Seed for the adaptive searches
+        **search_kwargs: Passed to the search (e.g. n_trials)
+    """
     
     logger.info("\n" + "="*70)
     logger.info("🎯 FTMO GOLD OPTIMIZER - Monte Carlo Simulation")
@@ -332,64 +431,43 @@ def optimize_for_ftmo():
         return None
     
     # Define parameter ranges for FTMO optimization
-    param_ranges = {
-        'min_adx': [10, 15, 20, 25, 30],
-        'min_momentum': [0.002, 0.003, 0.005, 0.008],
-        'min_quality_score': [50, 55, 60, 65, 70],
-        'stop_loss_atr': [2.0, 2.5, 3.0, 3.5],
-        'take_profit_atr': [4.0, 5.0, 6.0, 8.0],
-        'momentum_period': [15, 20, 25, 30]
-    }
+    param_ranges = FTMO_PARAM_RANGES
     
-    # Generate all combinations
-    keys = list(param_ranges.keys())
-    values = list(param_ranges.values())
-    combinations = list(itertools.product(*values))
-    param_combos = [dict(zip(keys, combo)) for combo in combinations]
+    # Indicators don't depend on the parameters - compute them once
+    indicators = calculate_indicators(data)
     
-    total_combos = len(param_combos)
-    logger.info(f"📊 Testing {total_combos} parameter combinations...")
-    logger.info(f"   Estimated time: {total_combos * 0.5 / 60:.1f} minutes\n")
+    if search is not None:
+        results = _search_ftmo(data, indicators, param_ranges, search, seed, **search_kwargs)
+    else:
+        # Generate all combinations
+        keys = list(param_ranges.keys())
+        values = list(param_ranges.values())
+        combinations = list(itertools.product(*values))
+        param_combos = [dict(zip(keys, combo)) for combo in combinations]
     
-    # Test each combination
-    results = []
+        total_combos = len(param_combos)
+        logger.info(f"📊 Testing {total_combos} parameter combinations...")
+        logger.info(f"   Estimated time: {total_combos * 0.5 / 60:.1f} minutes\n")
     
-    for i, params in enumerate(param_combos, 1):
-        if i % 100 == 0 or i == 1:
-            logger.info(f"  Progress: {i}/{total_combos} ({i*100//total_combos}%)")
+        # Test each combination
+        results = []
+    
+        for i, params in enumerate(param_combos, 1):
+            if i % 100 == 0 or i == 1:
+                logger.info(f"  Progress: {i}/{total_combos} ({i*100//total_combos}%)")
         
-        try:
-            result = simple_backtest(data, params)
-            
-            # Calculate FTMO fitness
-            fitness = 0
-            
-            # Win rate component (60% weight)
-            if result['win_rate'] >= 65:
-                fitness += 0.6 * (result['win_rate'] / 100)
-            else:
-                fitness += 0.3 * (result['win_rate'] / 100)  # Penalty for < 65%
-            
-            # Trade frequency (20% weight) - target 20-40 trades
-            trade_score = 1 - abs(result['trades'] - 30) / 50
-            fitness += 0.2 * max(0, trade_score)
-            
-            # Profitability (10% weight)
-            if result['profit_pips'] > 0:
-                fitness += 0.1
-            
-            # Max drawdown (10% weight) - lower is better
-            dd_score = 1 - (result['max_dd'] / 10)  # Normalize to 10% max
-            fitness += 0.1 * max(0, dd_score)
+            try:
+                result = simple_backtest(data, params, indicators=indicators)
+                fitness = ftmo_fitness(result)
             
-            results.append({
-                'params': params,
-                'fitness': fitness,
-                **result
-            })
+                results.append({
+                    'params': params,
+                    'fitness': fitness,
+                    **result
+                })
             
-        except Exception as e:
-            logger.debug(f"  Error testing combo {i}: {e}")
+            except Exception as e:
+                logger.debug(f"  Error testing combo {i}: {e}")
     
     # Sort by fitness
     results.sort(key=lambda x: x['fitness'], reverse=True)
@@ -446,8 +524,66 @@ def optimize_for_ftmo():
     
     return results
 
+def _ftmo_fold_backtest(params, indicators, start, end):
+    """Walk-forward evaluator: trades opened in bars [start, end) only"""
+    result = simple_backtest(None, params, indicators=indicators, start=start, end=end, return_trades=True)
+    result['score'] = ftmo_fitness(result)
+    result['trades_closed'] = result['trades']
+    result['trades'] = result.pop('trade_log')
+    return result
+
+def walk_forward_ftmo(data=None, param_ranges=None, days=28, train_days=7, test_days=2,
+                      anchored=False, n_workers=None):
+    """
+    Walk-forward FTMO optimization: fit on each training window, score on the next
+    
+    Args:
+        data: Processed candles from fetch_oanda_data (fetched if None)
+        param_ranges: Grid to search per fold (FTMO_PARAM_RANGES by default)
+        days: History to fetch when ``data`` is None
+        train_days: In-sample window per fold
+        test_days: Out-of-sample window per fold
+        anchored: Grow the training window from the start instead of rolling it
+        n_workers: Worker processes (default: CPUs - 1)
+        
+    Returns:
+        WalkForwardResult with stitched out-of-sample equity and parameter stability
+    """
+    if data is None:
+        data = fetch_oanda_data(OandaClient(), 'XAU_USD', days=days)
+    indicators = calculate_indicators(data) if data else None
+    if indicators is None:
+        logger.error("❌ Not enough data for walk-forward")
+        return None
+    
+    # Bars per day from the candle spacing (M5 or H1 depending on the fetch)
+    day = bars_per_day(indicators['timestamp'])
+    folds = make_folds(len(indicators), train_days * day, test_days * day,
+                       anchored=anchored, start=100)
+    if not folds:
+        logger.error("❌ History too short for the requested train/test windows")
+        return None
+    
+    ranges = param_ranges or FTMO_PARAM_RANGES
+    keys = list(ranges)
+    candidates = [dict(zip(keys, combo)) for combo in itertools.product(*ranges.values())]
+    runner = WalkForwardRunner(_ftmo_fold_backtest, candidates, score_key='score',
+                               n_workers=n_workers, initial_balance=100000)
+    result = runner.run(indicators, folds)
+    
+    output_file = 'ftmo_walk_forward_results.json'
+    with open(output_file, 'w') as f:
+        json.dump(result.summary(), f, indent=2, default=str)
+    logger.info(f"💾 Walk-forward results saved to {output_file}")
+    return result
+
 if __name__ == "__main__":
-    optimize_for_ftmo()
+    if '--walk-forward' in sys.argv:
+        walk_forward_ftmo()
+    elif '--search' in sys.argv:
+        optimize_for_ftmo(search=sys.argv[sys.argv.index('--search') + 1], seed=42)
+    else:
+        optimize_for_ftmo()
 
 
 
@@ -22,6 +22,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from strategies.ict_ote_strategy import ICTOTEStrategy, ICTLevel
 from core.data_feed import MarketData
+from core.ledger_monte_carlo import TradeLedger, run_ledger_monte_carlo
+from core.exit_simulator import ExitSimulator
+from core.backtest_cache import BacktestCache, code_version, data_fingerprint, get_backtest_cache, make_key
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -81,11 +84,19 @@ class MonteCarloResult:
     max_consecutive_losses: int
     max_consecutive_wins: int
     simulations: List[float]
+    mean_max_drawdown: float = 0.0
+    drawdown_percentile_50: float = 0.0
+    drawdown_percentile_95: float = 0.0
+    probability_of_ruin: float = 0.0
+    ruin_threshold: float = 0.5
+    method: str = 'bootstrap'
+    n_trades: int = 0
 
 class ICTOTEOptimizer:
     """Comprehensive ICT OTE Strategy Optimizer"""
     
-    def __init__(self, config: OptimizationConfig):
+    def __init__(self, config: OptimizationConfig, cache: Optional[BacktestCache] = None,
+                 use_cache: bool = True):
         self.config = config
         self.api_key = os.environ.get('OANDA_API_KEY', 'REMOVED_SECRET')
         self.base_url = os.environ.get('OANDA_BASE_URL', 'https://api-fxpractice.oanda.com')
@@ -98,6 +109,16 @@ class ICTOTEOptimizer:
         self.backtest_results: List[BacktestResult] = []
         self.monte_carlo_results: Dict[str, MonteCarloResult] = {}
         self.optimization_results: Dict[str, Any] = {}
+        self.historical_data: Dict[str, pd.DataFrame] = {}
+        
+        # Backtests are memoized per (strategy + optimizer source, params, data);
+        # results from older versions of the code are dropped up front
+        self.cache = (cache or get_backtest_cache()) if use_cache else None
+        self.code_version = code_version(ICTOTEStrategy, type(self), ExitSimulator)
+        self.cache_namespace = 'ICTOTEStrategy:ict_ote_optimizer'
+        self._fingerprint = None
+        if self.cache is not None:
+            self.cache.invalidate(self.cache_namespace, keep_version=self.code_version)
         
         logger.info("🚀 ICT OTE Optimizer initialized")
         logger.info(f"📊 Instruments: {config.instruments}")
@@ -173,7 +194,21 @@ class ICTOTEOptimizer:
     
     def run_single_backtest(self, parameters: Dict[str, Any], 
                           historical_data: Dict[str, pd.DataFrame]) -> BacktestResult:
-        """Run single backtest with given parameters"""
+        """Run single backtest with given parameters (memoized in the backtest cache)"""
+        if self.cache is None:
+            return self._run_single_backtest(parameters, historical_data)
+        
+        if self._fingerprint is None or self._fingerprint[0] is not historical_data:
+            self._fingerprint = (historical_data, data_fingerprint(historical_data))
+        key = make_key(self.code_version, parameters, self._fingerprint[1], config=asdict(self.config))
+        return self.cache.get_or_compute(
+            key, lambda: self._run_single_backtest(parameters, historical_data),
+            strategy=self.cache_namespace, version=self.code_version
+        )
+    
+    def _run_single_backtest(self, parameters: Dict[str, Any],
+                             historical_data: Dict[str, pd.DataFrame]) -> BacktestResult:
+        """Uncached backtest behind run_single_backtest()"""
         try:
             strategy = self.create_ict_strategy(parameters)
             
@@ -189,34 +224,67 @@ class ICTOTEOptimizer:
                     continue
                 
                 # Pre-fill strategy with historical data
-                strategy.price_history[instrument] = []
-                for _, row in df.iterrows():
-                    strategy.price_history[instrument].append({
-                        'timestamp': row.name.isoformat(),
-                        'open': row['open'],
-                        'high': row['high'],
-                        'low': row['low'],
-                        'close': row['close'],
-                        'volume': row['volume']
-                    })
+                strategy.price_history[instrument] = [
+                    {'timestamp': ts.isoformat(), 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+                    for ts, o, h, l, c, v in zip(df.index, df['open'], df['high'], df['low'],
+                                                 df['close'], df['volume'])
+                ]
                 
                 # Analyze ICT levels
                 strategy._analyze_ict_levels(instrument)
             
+            # Exits resolve against each bar's high/low; a stop wins a same-bar tie
+            simulator = ExitSimulator(list(historical_data))
+            opened = 0
+            
+            def settle(events):
+                nonlocal balance
+                for event in events:
+                    trade = event.tag
+                    pnl = event.price_move * trade['position_size'] - trade['commission']
+                    balance += pnl
+                    duration = (event.exit_time - event.entry_time).total_seconds() / 3600
+                    trade.update({
+                        'exit_price': event.exit_price,
+                        'exit_time': event.exit_time,
+                        'exit_reason': event.reason,
+                        'pnl': pnl,
+                        'duration_hours': duration,
+                        'max_favorable_excursion': event.max_favorable_excursion,
+                        'max_adverse_excursion': event.max_adverse_excursion
+                    })
+                    trades.append(trade)
+                    equity_curve.append({
+                        'timestamp': event.exit_time,
+                        'balance': balance,
+                        'equity': balance
+                    })
+            
             # Simulate trading
             for instrument, df in historical_data.items():
                 if df.empty:
                     continue
                 
-                for timestamp, row in df.iterrows():
+                slot = simulator.instruments.index(instrument)
+                bar_open = np.full(len(simulator.instruments), np.nan)
+                bar_high, bar_low = bar_open.copy(), bar_open.copy()
+                opens = df['open'].to_numpy(dtype=float)
+                highs = df['high'].to_numpy(dtype=float)
+                lows = df['low'].to_numpy(dtype=float)
+                closes = df['close'].to_numpy(dtype=float)
+                
+                for i, timestamp in enumerate(df.index):
+                    # Resolve open positions on this bar before new signals
+                    bar_open[slot], bar_high[slot], bar_low[slot] = opens[i], highs[i], lows[i]
+                    settle(simulator.step(bar_high, bar_low, bar_open, bar_index=i, bar_time=timestamp))
+                    
                     # Create market data
                     market_data = MarketData(
                         instrument=instrument,
-                        bid=row['close'],
-                        ask=row['close'] + 0.0001,
+                        bid=closes[i],
+                        ask=closes[i] + 0.0001,
                         timestamp=timestamp,
-                        spread=0.0001,
-                        session='LONDON'
+                        spread=0.0001
                     )
                     
                     # Generate signals
@@ -224,12 +292,11 @@ class ICTOTEOptimizer:
                     
                     # Process signals
                     for signal in signals:
-                        if len(trades) >= self.config.max_trades_per_day * 30:  # Monthly limit
+                        if opened >= self.config.max_trades_per_day * 30:  # Monthly limit
                             continue
                         
                         # Calculate position size
                         risk_amount = balance * 0.02  # 2% risk per trade
-                        atr = strategy._calculate_atr(instrument)
                         stop_distance = abs(signal.stop_loss - signal.entry_price)
                         position_size = risk_amount / stop_distance if stop_distance > 0 else 0
                         
@@ -243,47 +310,31 @@ class ICTOTEOptimizer:
                         else:
                             entry_price -= self.config.spread_pips * 0.0001
                         
-                        # Simulate price movement (simplified)
-                        # In real implementation, use actual price data
-                        exit_price = entry_price * (1.001 if signal.side.value == 'BUY' else 0.999)
-                        exit_time = timestamp + timedelta(hours=2)  # 2 hour average trade
-                        
-                        # Calculate P&L
-                        if signal.side.value == 'BUY':
-                            pnl = (exit_price - entry_price) * position_size
-                        else:
-                            pnl = (entry_price - exit_price) * position_size
-                        
-                        # Apply commission
                         commission = abs(position_size) * entry_price * self.config.commission_rate
-                        pnl -= commission
-                        
-                        # Update balance
-                        balance += pnl
                         
-                        # Record trade
+                        # Trade is recorded when the simulator closes it
                         trade = {
                             'timestamp': timestamp,
                             'instrument': instrument,
                             'side': signal.side.value,
                             'entry_price': entry_price,
-                            'exit_price': exit_price,
+                            'stop_loss': signal.stop_loss,
+                            'take_profit': signal.take_profit,
                             'position_size': position_size,
-                            'pnl': pnl,
                             'commission': commission,
-                            'duration_hours': 2.0,
                             'ote_level': signal.metadata.get('ote_level', 0),
                             'ote_strength': signal.metadata.get('ote_strength', 0),
                             'quality_score': signal.confidence * 100
                         }
-                        trades.append(trade)
-                        
-                        # Update equity curve
-                        equity_curve.append({
-                            'timestamp': timestamp,
-                            'balance': balance,
-                            'equity': balance
-                        })
+                        simulator.open_position(instrument, signal.side.value, entry_price,
+                                                stop_loss=signal.stop_loss, take_profit=signal.take_profit,
+                                                bar_index=i, entry_time=timestamp, tag=trade)
+                        opened += 1
+                
+                # Anything still open is closed at the last close
+                bar_close = np.full(len(simulator.instruments), np.nan)
+                bar_close[slot] = closes[-1]
+                settle(simulator.close_all(bar_close, bar_index=len(df), bar_time=df.index[-1]))
             
             # Calculate performance metrics
             metrics = self._calculate_performance_metrics(trades, equity_curve)
@@ -391,20 +442,27 @@ class ICTOTEOptimizer:
         
         return max_dd * 100
     
-    def generate_parameter_combinations(self, n_combinations: int = 100) -> List[Dict[str, Any]]:
-        """Generate random parameter combinations for optimization"""
+    def generate_parameter_combinations(self, n_combinations: int = 100,
+                                        seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Generate random parameter combinations for optimization
+        
+        A fixed ``seed`` regenerates the same sweep, so an interrupted run
+        resumes from the backtest cache instead of starting over.
+        """
+        rng = np.random.default_rng(seed) if seed is not None else np.random
         combinations = []
         
         for _ in range(n_combinations):
             params = {
-                'ote_min_retracement': np.random.uniform(*self.config.ote_min_retracement_range),
-                'ote_max_retracement': np.random.uniform(*self.config.ote_max_retracement_range),
-                'fvg_min_size': np.random.uniform(*self.config.fvg_min_size_range),
-                'ob_lookback': int(np.random.uniform(*self.config.ob_lookback_range)),
-                'stop_loss_atr': np.random.uniform(*self.config.stop_loss_atr_range),
-                'take_profit_atr': np.random.uniform(*self.config.take_profit_atr_range),
-                'min_ote_strength': np.random.uniform(*self.config.min_ote_strength_range),
-                'min_fvg_strength': np.random.uniform(*self.config.min_fvg_strength_range)
+                'ote_min_retracement': rng.uniform(*self.config.ote_min_retracement_range),
+                'ote_max_retracement': rng.uniform(*self.config.ote_max_retracement_range),
+                'fvg_min_size': rng.uniform(*self.config.fvg_min_size_range),
+                'ob_lookback': int(rng.uniform(*self.config.ob_lookback_range)),
+                'stop_loss_atr': rng.uniform(*self.config.stop_loss_atr_range),
+                'take_profit_atr': rng.uniform(*self.config.take_profit_atr_range),
+                'min_ote_strength': rng.uniform(*self.config.min_ote_strength_range),
+                'min_fvg_strength': rng.uniform(*self.config.min_fvg_strength_range)
             }
             
             # Ensure logical constraints
@@ -415,23 +473,19 @@ class ICTOTEOptimizer:
         
         return combinations
     
-    def run_optimization(self, n_combinations: int = 50) -> Dict[str, Any]:
-        """Run parameter optimization"""
+    def run_optimization(self, n_combinations: int = 50, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Run parameter optimization (pass ``seed`` to make the sweep resumable)"""
         logger.info(f"🔧 Starting optimization with {n_combinations} combinations...")
         
-        # Fetch historical data
-        historical_data = {}
-        for instrument in self.config.instruments:
-            df = self.fetch_historical_data(instrument)
-            if not df.empty:
-                historical_data[instrument] = df
+        # Fetch historical data (kept for the Monte Carlo ledger)
+        historical_data = self._load_historical_data()
         
         if not historical_data:
             logger.error("❌ No historical data available for optimization")
             return {}
         
         # Generate parameter combinations
-        combinations = self.generate_parameter_combinations(n_combinations)
+        combinations = self.generate_parameter_combinations(n_combinations, seed=seed)
         
         # Run backtests
         results = []
@@ -470,161 +524,94 @@ class ICTOTEOptimizer:
         
         return {}
     
-    def run_monte_carlo_simulation(self, parameters: Dict[str, Any], 
-                                 n_simulations: int = 1000) -> MonteCarloResult:
-        """Run Monte Carlo simulation for robustness testing"""
-        logger.info(f"🎲 Running Monte Carlo simulation with {n_simulations} iterations...")
-        
-        # Fetch historical data
-        historical_data = {}
-        for instrument in self.config.instruments:
-            df = self.fetch_historical_data(instrument)
-            if not df.empty:
-                historical_data[instrument] = df
-        
+    def _load_historical_data(self) -> Dict[str, pd.DataFrame]:
+        """Historical data for all instruments, fetched once per optimizer"""
+        if not self.historical_data:
+            for instrument in self.config.instruments:
+                df = self.fetch_historical_data(instrument)
+                if not df.empty:
+                    self.historical_data[instrument] = df
+        return self.historical_data
+    
+    def build_trade_ledger(self, parameters: Dict[str, Any],
+                           historical_data: Optional[Dict[str, pd.DataFrame]] = None) -> Optional[TradeLedger]:
+        """
+        Generate signals and per-trade outcomes once for Monte Carlo resampling
+        
+        Args:
+            parameters: Strategy parameters
+            historical_data: Data to backtest on (cached optimizer data if None)
+            
+        Returns:
+            TradeLedger of the backtest's trades, or None if there are none
+        """
+        historical_data = historical_data or self._load_historical_data()
         if not historical_data:
             logger.error("❌ No historical data available for Monte Carlo")
             return None
         
-        # Run multiple simulations with random trade selection
-        simulation_returns = []
-        max_consecutive_losses = 0
-        max_consecutive_wins = 0
+        backtest = self.run_single_backtest(parameters, historical_data)
+        if not backtest or not backtest.trades:
+            logger.error("❌ Backtest produced no trades - nothing to resample")
+            return None
         
-        for sim in range(n_simulations):
-            # Create strategy with parameters
-            strategy = self.create_ict_strategy(parameters)
-            
-            # Simulate with random trade selection (bootstrap)
-            balance = self.config.initial_balance
-            trades = []
-            
-            # Get all possible trades from historical data
-            all_trades = []
-            for instrument, df in historical_data.items():
-                if df.empty:
-                    continue
-                
-                # Pre-fill strategy
-                strategy.price_history[instrument] = []
-                for _, row in df.iterrows():
-                    strategy.price_history[instrument].append({
-                        'timestamp': row.name.isoformat(),
-                        'open': row['open'],
-                        'high': row['high'],
-                        'low': row['low'],
-                        'close': row['close'],
-                        'volume': row['volume']
-                    })
-                
-                strategy._analyze_ict_levels(instrument)
-                
-                # Generate signals for this instrument
-                for timestamp, row in df.iterrows():
-                    market_data = MarketData(
-                        instrument=instrument,
-                        bid=row['close'],
-                        ask=row['close'] + 0.0001,
-                        timestamp=timestamp,
-                        spread=0.0001,
-                        session='LONDON'
-                    )
-                    
-                    signals = strategy.analyze_market({instrument: market_data})
-                    for signal in signals:
-                        all_trades.append({
-                            'timestamp': timestamp,
-                            'instrument': instrument,
-                            'signal': signal,
-                            'price': row['close']
-                        })
-            
-            # Randomly select trades for this simulation
-            n_trades = min(len(all_trades), np.random.randint(10, 100))
-            selected_trades = np.random.choice(all_trades, size=n_trades, replace=False)
-            
-            # Simulate selected trades
-            consecutive_losses = 0
-            consecutive_wins = 0
-            current_consecutive_losses = 0
-            current_consecutive_wins = 0
-            
-            for trade_data in selected_trades:
-                signal = trade_data['signal']
-                
-                # Calculate position size
-                risk_amount = balance * 0.02
-                atr = strategy._calculate_atr(trade_data['instrument'])
-                stop_distance = abs(signal.stop_loss - signal.entry_price)
-                position_size = risk_amount / stop_distance if stop_distance > 0 else 0
-                
-                if position_size <= 0:
-                    continue
-                
-                # Simulate trade outcome (random but realistic)
-                entry_price = signal.entry_price
-                if signal.side.value == 'BUY':
-                    entry_price += self.config.spread_pips * 0.0001
-                else:
-                    entry_price -= self.config.spread_pips * 0.0001
-                
-                # Random outcome based on win rate
-                win_probability = 0.6  # 60% win rate assumption
-                is_winner = np.random.random() < win_probability
-                
-                if is_winner:
-                    # Winning trade
-                    if signal.side.value == 'BUY':
-                        exit_price = entry_price * (1 + np.random.uniform(0.001, 0.005))
-                    else:
-                        exit_price = entry_price * (1 - np.random.uniform(0.001, 0.005))
-                    
-                    pnl = abs(exit_price - entry_price) * position_size
-                    current_consecutive_wins += 1
-                    current_consecutive_losses = 0
-                else:
-                    # Losing trade
-                    if signal.side.value == 'BUY':
-                        exit_price = entry_price * (1 - np.random.uniform(0.001, 0.003))
-                    else:
-                        exit_price = entry_price * (1 + np.random.uniform(0.001, 0.003))
-                    
-                    pnl = -abs(exit_price - entry_price) * position_size
-                    current_consecutive_losses += 1
-                    current_consecutive_wins = 0
-                
-                # Apply commission
-                commission = abs(position_size) * entry_price * self.config.commission_rate
-                pnl -= commission
-                
-                # Update balance
-                balance += pnl
-                
-                # Track consecutive streaks
-                max_consecutive_wins = max(max_consecutive_wins, current_consecutive_wins)
-                max_consecutive_losses = max(max_consecutive_losses, current_consecutive_losses)
-            
-            # Calculate return for this simulation
-            total_return = ((balance - self.config.initial_balance) / self.config.initial_balance) * 100
-            simulation_returns.append(total_return)
+        ledger = TradeLedger.from_trades(backtest.trades, self.config.initial_balance)
+        logger.info(f"📒 Trade ledger built: {len(ledger)} trades")
+        return ledger
+    
+    def run_monte_carlo_simulation(self, parameters: Dict[str, Any], 
+                                 n_simulations: int = 1000,
+                                 method: str = 'bootstrap',
+                                 block_size: Optional[int] = None,
+                                 ruin_threshold: float = 0.5,
+                                 seed: Optional[int] = None,
+                                 historical_data: Optional[Dict[str, pd.DataFrame]] = None) -> MonteCarloResult:
+        """
+        Run Monte Carlo simulation for robustness testing
+        
+        The strategy is backtested once; every simulated path then resamples
+        that trade ledger with numpy, so thousands of paths take seconds.
+        
+        Args:
+            parameters: Strategy parameters
+            n_simulations: Number of equity paths
+            method: 'bootstrap', 'block_bootstrap' or 'shuffle' (trade-order permutation)
+            block_size: Block length for block_bootstrap (default sqrt(n_trades))
+            ruin_threshold: Equity fraction of initial balance that counts as ruin
+            seed: Seed for reproducible paths
+            historical_data: Data to backtest on (cached optimizer data if None)
+        """
+        logger.info(f"🎲 Running Monte Carlo simulation with {n_simulations} iterations ({method})...")
+        
+        ledger = self.build_trade_ledger(parameters, historical_data)
+        if ledger is None:
+            return None
         
-        # Calculate Monte Carlo statistics
-        returns_array = np.array(simulation_returns)
+        paths = run_ledger_monte_carlo(ledger, n_paths=n_simulations, method=method,
+                                       block_size=block_size, ruin_threshold=ruin_threshold, seed=seed)
+        stats = paths.summary()
         
         result = MonteCarloResult(
-            mean_return=np.mean(returns_array),
-            std_return=np.std(returns_array),
-            min_return=np.min(returns_array),
-            max_return=np.max(returns_array),
-            percentile_5=np.percentile(returns_array, 5),
-            percentile_25=np.percentile(returns_array, 25),
-            percentile_75=np.percentile(returns_array, 75),
-            percentile_95=np.percentile(returns_array, 95),
-            probability_of_profit=np.mean(returns_array > 0) * 100,
-            probability_of_loss=np.mean(returns_array <= 0) * 100,
-            max_consecutive_losses=max_consecutive_losses,
-            max_consecutive_wins=max_consecutive_wins,
-            simulations=simulation_returns
+            mean_return=stats['mean_return'],
+            std_return=stats['std_return'],
+            min_return=stats['min_return'],
+            max_return=stats['max_return'],
+            percentile_5=stats['return_percentiles'][5],
+            percentile_25=stats['return_percentiles'][25],
+            percentile_75=stats['return_percentiles'][75],
+            percentile_95=stats['return_percentiles'][95],
+            probability_of_profit=stats['probability_of_profit'],
+            probability_of_loss=stats['probability_of_loss'],
+            max_consecutive_losses=stats['max_consecutive_losses'],
+            max_consecutive_wins=stats['max_consecutive_wins'],
+            simulations=paths.final_returns.tolist(),
+            mean_max_drawdown=stats['mean_max_drawdown'],
+            drawdown_percentile_50=stats['drawdown_percentiles'][50],
+            drawdown_percentile_95=stats['drawdown_percentiles'][95],
+            probability_of_ruin=stats['probability_of_ruin'],
+            ruin_threshold=ruin_threshold,
+            method=method,
+            n_trades=len(ledger)
         )
         
         self.monte_carlo_results['optimized'] = result
@@ -633,6 +620,8 @@ class ICTOTEOptimizer:
         logger.info(f"📊 Mean Return: {result.mean_return:.2f}%")
         logger.info(f"📊 Std Return: {result.std_return:.2f}%")
         logger.info(f"📊 Probability of Profit: {result.probability_of_profit:.1f}%")
+        logger.info(f"📉 95th Percentile Drawdown: {result.drawdown_percentile_95:.2f}%")
+        logger.info(f"💀 Probability of Ruin: {result.probability_of_ruin:.2f}%")
         
         return result
     
@@ -667,6 +656,7 @@ class ICTOTEOptimizer:
         if 'optimized' in self.monte_carlo_results:
             mc = self.monte_carlo_results['optimized']
             report.append("## Monte Carlo Simulation Results")
+            report.append(f"- Method: {mc.method} ({len(mc.simulations)} paths over {mc.n_trades} trades)")
             report.append(f"- Mean Return: {mc.mean_return:.2f}%")
             report.append(f"- Standard Deviation: {mc.std_return:.2f}%")
             report.append(f"- Min Return: {mc.min_return:.2f}%")
@@ -677,6 +667,10 @@ class ICTOTEOptimizer:
             report.append(f"- Probability of Loss: {mc.probability_of_loss:.1f}%")
             report.append(f"- Max Consecutive Wins: {mc.max_consecutive_wins}")
             report.append(f"- Max Consecutive Losses: {mc.max_consecutive_losses}")
+            report.append(f"- Mean Max Drawdown: {mc.mean_max_drawdown:.2f}%")
+            report.append(f"- Median Max Drawdown: {mc.drawdown_percentile_50:.2f}%")
+            report.append(f"- 95th Percentile Drawdown: {mc.drawdown_percentile_95:.2f}%")
+            report.append(f"- Probability of Ruin (equity < {mc.ruin_threshold:.0%}): {mc.probability_of_ruin:.2f}%")
             report.append("")
         
         # Recommendations
@@ -13,15 +13,24 @@ import threading
 import asyncio
 from datetime import datetime, timedelta
 import uuid
-from flask import Flask, jsonify, request, render_template, redirect
-from flask_socketio import SocketIO, emit
-from flask_apscheduler import APScheduler
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
 from functools import lru_cache
 import hashlib
 
+# Startup profile first so every later phase is timed
+from src.core.startup_profile import get_startup_profile, lazy_callable, ServiceRegistry, IMPORT_PROFILING_ENV
+startup_profile = get_startup_profile()
+
+# Set by `python -m src.core.startup_profile` in its child: import only, start nothing
+IMPORT_PROFILING = os.getenv(IMPORT_PROFILING_ENV, 'false').lower() == 'true'
+
+with startup_profile.phase('import:flask'):
+    from flask import Flask, jsonify, request, render_template, redirect
+    from flask_socketio import SocketIO, emit
+    from flask_apscheduler import APScheduler
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -51,18 +60,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Import analytics modules
-try:
-    from src.analytics.trade_database import get_trade_database
-    from src.analytics.trade_logger import get_trade_logger
-    from src.analytics.strategy_version_manager import get_strategy_version_manager
-    from src.analytics.analytics_dashboard import start_analytics_dashboard
-    from src.analytics.data_archiver import get_data_archiver
-    ANALYTICS_ENABLED = True
-    logger.info("✅ Analytics modules imported successfully")
-except ImportError as e:
-    ANALYTICS_ENABLED = False
-    logger.warning(f"⚠️ Analytics not available: {e}")
+# Analytics modules resolve on first use instead of at import time
+get_trade_database = lazy_callable('src.analytics.trade_database', 'get_trade_database')
+get_trade_logger = lazy_callable('src.analytics.trade_logger', 'get_trade_logger')
+get_strategy_version_manager = lazy_callable('src.analytics.strategy_version_manager', 'get_strategy_version_manager')
+start_analytics_dashboard = lazy_callable('src.analytics.analytics_dashboard', 'start_analytics_dashboard')
+get_data_archiver = lazy_callable('src.analytics.data_archiver', 'get_data_archiver')
+ANALYTICS_ENABLED = None  # unknown until analytics_enabled() is first called
+
+def analytics_enabled() -> bool:
+    """Import the analytics modules on first call and report whether they are available"""
+    global ANALYTICS_ENABLED
+    if ANALYTICS_ENABLED is None:
+        try:
+            with startup_profile.phase('import:analytics'):
+                import src.analytics.trade_database
+                import src.analytics.trade_logger
+                import src.analytics.strategy_version_manager
+                import src.analytics.analytics_dashboard
+                import src.analytics.data_archiver
+            ANALYTICS_ENABLED = True
+            logger.info("✅ Analytics modules imported successfully")
+        except ImportError as e:
+            ANALYTICS_ENABLED = False
+            logger.warning(f"⚠️ Analytics not available: {e}")
+    return ANALYTICS_ENABLED
 
 # Create Flask app with correct template directory (MOVED UP for app.config usage)
 template_dir = os.path.join(os.path.dirname(__file__), 'src', 'templates')
@@ -157,88 +179,113 @@ app.config['SCHEDULER_TIMEZONE'] = 'Europe/London'
 # LAZY INITIALIZATION FUNCTIONS (Flask app.config)
 # ==========================================
 
-def get_dashboard_manager():
-    """Get or create dashboard manager in Flask app context"""
-    if 'dashboard_manager' not in app.config:
+# Services are built once on first use (thread-safe) and stored in app.config;
+# readiness events replace fixed startup sleeps
+services = ServiceRegistry(store=app.config, profile=startup_profile)
+
+def _create_dashboard_manager():
+    """Build the dashboard manager service (called once by the registry)"""
+    try:
+        logger.info("🔄 Initializing dashboard manager...")
+        from src.dashboard.advanced_dashboard import AdvancedDashboardManager
+        service = AdvancedDashboardManager()
+        logger.info("✅ Dashboard manager initialized")
+        return service
+    except ImportError as e:
+        logger.error(f"❌ Missing dependencies for dashboard: {e}")
+        logger.info("🔄 Attempting to initialize basic dashboard...")
         try:
-            logger.info("🔄 Initializing dashboard manager...")
+            # Try to initialize without new modules
             from src.dashboard.advanced_dashboard import AdvancedDashboardManager
-            app.config['dashboard_manager'] = AdvancedDashboardManager()
-            logger.info("✅ Dashboard manager initialized")
-        except ImportError as e:
-            logger.error(f"❌ Missing dependencies for dashboard: {e}")
-            logger.info("🔄 Attempting to initialize basic dashboard...")
-            try:
-                # Try to initialize without new modules
-                from src.dashboard.advanced_dashboard import AdvancedDashboardManager
-                app.config['dashboard_manager'] = AdvancedDashboardManager()
-                logger.info("✅ Basic dashboard manager initialized")
-            except Exception as e2:
-                logger.error(f"❌ Failed to initialize basic dashboard: {e2}")
-                app.config['dashboard_manager'] = None
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize dashboard: {e}")
-            logger.exception("Full traceback:")
-            app.config['dashboard_manager'] = None
-    return app.config.get('dashboard_manager')
+            service = AdvancedDashboardManager()
+            logger.info("✅ Basic dashboard manager initialized")
+            return service
+        except Exception as e2:
+            logger.error(f"❌ Failed to initialize basic dashboard: {e2}")
+            return None
+    except Exception as e:
+        logger.error(f"❌ Failed to initialize dashboard: {e}")
+        logger.exception("Full traceback:")
+        return None
+services.register('dashboard_manager', _create_dashboard_manager)
+
+def get_dashboard_manager():
+    """Get or create dashboard manager in Flask app context"""
+    return services.get('dashboard_manager')
+
+def _create_scanner():
+    """Build the scanner service (called once by the registry)"""
+    try:
+        logger.info("🔄 Initializing scanner...")
+        from src.core.simple_timer_scanner import get_simple_scanner
+        service = get_simple_scanner()
+        logger.info("✅ Scanner initialized")
+        return service
+    except Exception as e:
+        logger.error(f"❌ Scanner init failed: {e}")
+        logger.exception("Full traceback:")
+        return None
+services.register('scanner', _create_scanner)
 
 def get_scanner():
     """Get or create scanner in Flask app context"""
-    if 'scanner' not in app.config:
-        try:
-            logger.info("🔄 Initializing scanner...")
-            from src.core.simple_timer_scanner import get_simple_scanner
-            app.config['scanner'] = get_simple_scanner()
-            logger.info("✅ Scanner initialized")
-        except Exception as e:
-            logger.error(f"❌ Scanner init failed: {e}")
-            logger.exception("Full traceback:")
-            app.config['scanner'] = None
-    return app.config.get('scanner')
+    return services.get('scanner')
+
+def _create_news_integration():
+    """Build the news integration service (called once by the registry)"""
+    try:
+        logger.info("🔄 Initializing news integration...")
+        from src.core.news_integration import safe_news_integration
+        service = safe_news_integration
+        logger.info("✅ News integration initialized")
+        return service
+    except Exception as e:
+        logger.error(f"❌ News integration init failed: {e}")
+        logger.exception("Full traceback:")
+        return None
+services.register('news_integration', _create_news_integration)
 
 def get_news_integration():
     """Get or create news integration in Flask app context"""
-    if 'news_integration' not in app.config:
-        try:
-            logger.info("🔄 Initializing news integration...")
-            from src.core.news_integration import safe_news_integration
-            app.config['news_integration'] = safe_news_integration
-            logger.info("✅ News integration initialized")
-        except Exception as e:
-            logger.error(f"❌ News integration init failed: {e}")
-            logger.exception("Full traceback:")
-            app.config['news_integration'] = None
-    return app.config.get('news_integration')
+    return services.get('news_integration')
+
+def _create_ai_assistant():
+    """Build the AI assistant service (called once by the registry)"""
+    try:
+        logger.info("🔄 Initializing AI assistant...")
+        from src.dashboard.ai_assistant_api import AIAssistantAPI
+        service = AIAssistantAPI()
+        logger.info("✅ AI assistant initialized")
+        return service
+    except Exception as e:
+        logger.error(f"❌ AI assistant init failed: {e}")
+        logger.exception("Full traceback:")
+        return None
+services.register('ai_assistant', _create_ai_assistant)
 
 def get_ai_assistant():
     """Get or create AI assistant in Flask app context"""
-    if 'ai_assistant' not in app.config:
-        try:
-            logger.info("🔄 Initializing AI assistant...")
-            from src.dashboard.ai_assistant_api import AIAssistantAPI
-            app.config['ai_assistant'] = AIAssistantAPI()
-            logger.info("✅ AI assistant initialized")
-        except Exception as e:
-            logger.error(f"❌ AI assistant init failed: {e}")
-            logger.exception("Full traceback:")
-            app.config['ai_assistant'] = None
-    return app.config.get('ai_assistant')
+    return services.get('ai_assistant')
+
+def _create_weekend_optimizer():
+    """Build the weekend optimizer service (called once by the registry)"""
+    try:
+        logger.info("🔄 Initializing weekend optimization...")
+        from weekend_optimization import get_weekend_optimizer as get_optimizer
+        optimizer = get_optimizer()
+        optimizer.start_scheduler()
+        service = optimizer
+        logger.info("✅ Weekend optimization initialized")
+        return service
+    except Exception as e:
+        logger.error(f"❌ Weekend optimization init failed: {e}")
+        logger.exception("Full traceback:")
+        return None
+services.register('weekend_optimizer', _create_weekend_optimizer)
 
 def get_weekend_optimizer():
     """Get or create weekend optimizer in Flask app context"""
-    if 'weekend_optimizer' not in app.config:
-        try:
-            logger.info("🔄 Initializing weekend optimization...")
-            from weekend_optimization import get_weekend_optimizer as get_optimizer
-            optimizer = get_optimizer()
-            optimizer.start_scheduler()
-            app.config['weekend_optimizer'] = optimizer
-            logger.info("✅ Weekend optimization initialized")
-        except Exception as e:
-            logger.error(f"❌ Weekend optimization init failed: {e}")
-            logger.exception("Full traceback:")
-            app.config['weekend_optimizer'] = None
-    return app.config.get('weekend_optimizer')
+    return services.get('weekend_optimizer')
 
 # ==========================================
 # BACKGROUND JOBS
@@ -269,7 +316,8 @@ def run_scanner_job():
 def initialize_dashboard_manager():
     """Pre-initialize dashboard manager in background to avoid first-request timeout"""
     try:
-        time.sleep(5)  # Brief delay to let app start
+        # No startup delay: construction runs off the request path and the
+        # registry makes concurrent first requests wait for this same build
         logger.info("🔄 Pre-initializing dashboard manager in background...")
         mgr = get_dashboard_manager()
         if mgr:
@@ -283,15 +331,18 @@ def initialize_dashboard_manager():
         logger.exception("Full traceback:")
 
 # Start dashboard pre-initialization in background
-dashboard_init_thread = threading.Thread(target=initialize_dashboard_manager, daemon=True)
-dashboard_init_thread.start()
-logger.info("✅ Dashboard manager pre-initialization started")
+dashboard_init_thread = threading.Thread(target=initialize_dashboard_manager, name='dashboard-init', daemon=True)
+if not IMPORT_PROFILING:
+    dashboard_init_thread.start()
+    logger.info("✅ Dashboard manager pre-initialization started")
 
 # Initialize daily monitor
 def initialize_monitor():
     """Initialize daily monitoring system"""
     try:
-        time.sleep(15)  # Wait for scanner to start
+        # Start once the dashboard (accounts, data feed) is up rather than after a fixed delay
+        if not services.wait('dashboard_manager', timeout=60):
+            logger.warning("⚠️ Dashboard manager not ready - starting daily monitor anyway")
         logger.info("🔄 Initializing daily monitor...")
         from src.core.daily_monitor import get_daily_monitor
         monitor = get_daily_monitor()
@@ -301,11 +352,13 @@ def initialize_monitor():
         logger.exception("Full traceback:")
 
 # Start monitor in background thread
-monitor_thread = threading.Thread(target=initialize_monitor, daemon=True)
-monitor_thread.start()
-logger.info("✅ Daily monitor initialization scheduled")
+monitor_thread = threading.Thread(target=initialize_monitor, name='daily-monitor', daemon=True)
+if not IMPORT_PROFILING:
+    monitor_thread.start()
+    logger.info("✅ Daily monitor initialization scheduled")
 
 # Initialize APScheduler (app and config already set up above)
+_scheduler_setup_start = time.perf_counter()
 scheduler = APScheduler()
 scheduler.init_app(app)
 
@@ -325,7 +378,7 @@ def capture_performance_snapshots():
     """Capture performance snapshots for all strategies"""
     try:
         from src.core.yaml_manager import get_yaml_manager
-        from src.core.oanda_client import OandaClient
+        from src.core.oanda_client import get_account_client
         from src.core.performance_tracker import get_performance_tracker
         
         logger.info("📸 Capturing performance snapshots...")
@@ -343,8 +396,8 @@ def capture_performance_snapshots():
             account_id = account['id']
             
             try:
-                # Create OandaClient for this specific account
-                oanda_client = OandaClient(account_id=account_id)
+                # Shared long-lived client for this account
+                oanda_client = get_account_client(account_id)
                 account_info = oanda_client.get_account_info()  # No argument needed
                 balance = float(account_info.get('balance', 0))
                 nav = float(account_info.get('NAV', 0))
@@ -394,33 +447,40 @@ logger.info("✅ APScheduler configured - scanner every 5min, snapshots every 15
 
 # START SCHEDULER IMMEDIATELY (not in __main__ - for App Engine)
 try:
-    scheduler.start()
-    logger.info("✅ APScheduler STARTED on app initialization")
+    if IMPORT_PROFILING:
+        logger.info("⏸️ Import profiling - scheduler not started")
+    else:
+        scheduler.start()
+        logger.info("✅ APScheduler STARTED on app initialization")
 except Exception as e:
     logger.error(f"❌ Failed to start scheduler: {e}")
     logger.exception("Full traceback:")
+startup_profile.record('scheduler', time.perf_counter() - _scheduler_setup_start)
 
 # Initialize SocketIO with proper configuration for Google Cloud
-socketio = SocketIO(app, 
-                   cors_allowed_origins="*", 
-                   async_mode='threading',
-                   logger=False,
-                   engineio_logger=False,
-                   ping_timeout=60,
-                   ping_interval=25)
+with startup_profile.phase('socketio'):
+    socketio = SocketIO(app, 
+                       cors_allowed_origins="*", 
+                       async_mode='threading',
+                       logger=False,
+                       engineio_logger=False,
+                       ping_timeout=60,
+                       ping_interval=25)
 
 # Register AI Assistant Blueprint
 try:
-    from src.dashboard.ai_assistant_api import register_ai_assistant
-    register_ai_assistant(app, socketio)
+    with startup_profile.phase('ai_assistant_blueprint'):
+        from src.dashboard.ai_assistant_api import register_ai_assistant
+        register_ai_assistant(app, socketio)
     logger.info("✅ AI Assistant blueprint registered")
 except Exception as e:
     logger.error(f"❌ Failed to register AI assistant blueprint: {e}")
 
 # Initialize Toast Notification System (NEW - doesn't break existing functionality)
 try:
-    from src.utils.toast_notifier import initialize_toast_notifier
-    initialize_toast_notifier(socketio)
+    with startup_profile.phase('toast_notifier'):
+        from src.utils.toast_notifier import initialize_toast_notifier
+        initialize_toast_notifier(socketio)
     logger.info("✅ Toast notification system initialized")
 except Exception as e:
     logger.warning(f"⚠️ Toast notifier init failed (non-critical): {e}")
@@ -2072,7 +2132,7 @@ def force_execute_now():
     """FORCE IMMEDIATE TRADE EXECUTION - Places micro-trades on all strategies"""
     try:
         from src.core.yaml_manager import get_yaml_manager
-        from src.core.oanda_client import OandaClient
+        from src.core.oanda_client import get_account_client
         
         yaml_mgr = get_yaml_manager()
         accounts = yaml_mgr.get_all_accounts()
@@ -2094,8 +2154,8 @@ def force_execute_now():
             instrument = instruments[0]
             
             try:
-                # Create OANDA client
-                client = OandaClient(account_id=account_id)
+                # Shared OANDA client for the account
+                client = get_account_client(account_id)
                 
                 # Get current price
                 prices = client.get_current_prices([instrument], force_refresh=True)
@@ -2191,13 +2251,32 @@ def force_execute_now():
 
 @app.route('/api/health')
 def health():
-    """Health check route"""
+    """Health check route - answers immediately, never waits on service init"""
+    startup_profile.mark('first_health_response')
+    service_status = services.status()
+    dashboard_state = service_status['dashboard_manager']['state']
     return jsonify({
         "status": "ok",
         "timestamp": str(datetime.now()),
-        "dashboard_manager": "initialized" if get_dashboard_manager() else "failed"
+        "dashboard_manager": {
+            ServiceRegistry.READY: "initialized",
+            ServiceRegistry.FAILED: "failed",
+        }.get(dashboard_state, dashboard_state),
+        "services": {name: info['state'] for name, info in service_status.items()},
+        "uptime_seconds": round(startup_profile.elapsed(), 2)
     })
 
+@app.route('/api/startup-profile')
+def startup_profile_report():
+    """Startup timings and service readiness (import-time trees: python -m src.core.startup_profile)"""
+    try:
+        report = startup_profile.report()
+        report['services'] = services.status()
+        return jsonify(report)
+    except Exception as e:
+        logger.error(f"❌ Startup profile error: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/contextual/<instrument>')
 def get_contextual_insights(instrument):
     """Get contextual insights for instrument"""
@@ -3909,8 +3988,8 @@ def trigger_premium_scan():
                     # Get account ID (could be string or dict)
                     first_account = active_accounts[0]
                     first_account_id = first_account.get('account_id') if isinstance(first_account, dict) else first_account
-                    from src.core.oanda_client import OandaClient
-                    oanda_client = OandaClient(account_id=first_account_id)
+                    from src.core.oanda_client import get_account_client
+                    oanda_client = get_account_client(first_account_id)
             
             data_feed = dashboard_mgr.data_feed
             
@@ -4001,7 +4080,7 @@ if __name__ == '__main__':
     logger.info("✅ APScheduler already started on app init")
     
     # Initialize analytics system
-    if ANALYTICS_ENABLED:
+    if analytics_enabled():
         try:
             logger.info("🔄 Initializing analytics system...")
             
@@ -4141,7 +4220,7 @@ def get_live_performance_data_cached():
         return _performance_cache['data']
     
     try:
-        from src.core.oanda_client import OandaClient
+        from src.core.oanda_client import get_account_client
         
         accounts_config = {
             'PRIMARY': (os.getenv('PRIMARY_ACCOUNT'), 'Ultra Strict Forex'),
@@ -4157,7 +4236,7 @@ def get_live_performance_data_cached():
         
         for name, (account_id, strategy) in accounts_config.items():
             try:
-                client = OandaClient(os.getenv('OANDA_API_KEY'), account_id, os.getenv('OANDA_ENVIRONMENT'))
+                client = get_account_client(account_id)
                 account_info = client.get_account_info()
                 open_trades = client.get_open_trades()
                 
@@ -4285,7 +4364,7 @@ def cron_aggressive_scan():
 @app.route('/api/analytics/health')
 def api_analytics_health():
     """Check analytics system health"""
-    if not ANALYTICS_ENABLED:
+    if not analytics_enabled():
         return jsonify({'success': False, 'error': 'Analytics not enabled'}), 503
     
     try:
@@ -4303,7 +4382,7 @@ def api_analytics_health():
 @app.route('/api/analytics/summary')
 def api_analytics_summary():
     """Get analytics summary for main dashboard"""
-    if not ANALYTICS_ENABLED:
+    if not analytics_enabled():
         return jsonify({'success': False, 'error': 'Analytics not enabled'})
     
     try:
@@ -4482,3 +4561,5 @@ def api_gold_analysis():
         logger.error(f"❌ Error getting Gold analysis: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+startup_profile.mark('module_loaded')
+logger.info(f"✅ main module loaded in {startup_profile.elapsed():.2f}s")
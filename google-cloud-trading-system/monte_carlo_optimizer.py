@@ -38,6 +38,10 @@ except Exception as e:
 # Import core modules
 from src.core.historical_fetcher import get_historical_fetcher
 from validate_strategy import StrategyValidator
+from src.core.walk_forward import WalkForwardRunner, make_folds
+
+# Candles StrategyValidator feeds as history before it starts counting signals
+VALIDATOR_WARMUP_BARS = 30
 
 # Import contextual modules
 try:
@@ -60,6 +64,22 @@ class ContextualMonteCarloOptimizer:
     - Multi-objective fitness function
     """
     
+    # Parameter ranges to test - FIXED OCT 17: More realistic ranges
+    PARAM_RANGES = {
+        # Core parameters
+        'min_adx': (5, 18),                # ADX threshold (was 8-30, TOO HIGH!)
+        'min_momentum': (0.0003, 0.008),   # 0.03% to 0.8% (realistic for 3.5h periods)
+        'min_volume': (0.05, 0.40),        # 5% to 40% above average
+        'quality_threshold': (10, 50),     # Quality score minimum (was 80, TOO HIGH!)
+        
+        # Session parameters
+        'min_session_quality': (0, 80),    # Minimum session quality (0-100)
+        'only_trade_london_ny': (0, 1),    # Boolean (0=false, 1=true)
+        
+        # News parameters
+        'avoid_high_impact_news': (0, 1),  # Boolean (0=false, 1=true)
+    }
+    
     def __init__(self, strategy_name: str, strategy_module: str, 
                 strategy_function: str, instruments: List[str],
                 historical_data: Dict, lookback_days: int = 7):
@@ -150,21 +170,7 @@ class ContextualMonteCarloOptimizer:
         logger.info(f"News Filter: {'Enabled' if news_filter else 'Disabled'}")
         logger.info("")
         
-        # Parameter ranges to test - FIXED OCT 17: More realistic ranges
-        param_ranges = {
-            # Core parameters
-            'min_adx': (5, 18),                # ADX threshold (was 8-30, TOO HIGH!)
-            'min_momentum': (0.0003, 0.008),   # 0.03% to 0.8% (realistic for 3.5h periods)
-            'min_volume': (0.05, 0.40),        # 5% to 40% above average
-            'quality_threshold': (10, 50),     # Quality score minimum (was 80, TOO HIGH!)
-            
-            # Session parameters
-            'min_session_quality': (0, 80),    # Minimum session quality (0-100)
-            'only_trade_london_ny': (0, 1),    # Boolean (0=false, 1=true)
-            
-            # News parameters
-            'avoid_high_impact_news': (0, 1),  # Boolean (0=false, 1=true)
-        }
+        param_ranges = self.PARAM_RANGES
         
         logger.info("Parameter Ranges:")
         logger.info(f"  ADX: {param_ranges['min_adx'][0]}-{param_ranges['min_adx'][1]}")
@@ -189,83 +195,11 @@ class ContextualMonteCarloOptimizer:
             if (i + 1) % 100 == 0:
                 logger.info(f"  Progress: {i+1}/{iterations}...")
             
-            # Generate random configuration
-            test_config = {
-                'min_adx': random.uniform(*param_ranges['min_adx']),
-                'min_momentum': random.uniform(*param_ranges['min_momentum']),
-                'min_volume': random.uniform(*param_ranges['min_volume']),
-                'quality_threshold': random.uniform(*param_ranges['quality_threshold'])
-            }
-            
-            # Add session parameters if enabled
-            if session_filter:
-                test_config['min_session_quality'] = random.uniform(*param_ranges['min_session_quality'])
-                test_config['only_trade_london_ny'] = random.uniform(*param_ranges['only_trade_london_ny']) > 0.5
-            
-            # Add news parameters if enabled
-            if news_filter:
-                test_config['avoid_high_impact_news'] = random.uniform(*param_ranges['avoid_high_impact_news']) > 0.5
+            test_config = self._sample_config(param_ranges, session_filter, news_filter)
             
             try:
-                # Load strategy with test configuration
-                module = __import__(self.strategy_module, fromlist=[self.strategy_function])
-                get_strategy = getattr(module, self.strategy_function)
-                strategy = get_strategy()
-                
-                # Apply test configuration
-                if hasattr(strategy, 'min_adx'):
-                    strategy.min_adx = test_config['min_adx']
-                if hasattr(strategy, 'min_momentum'):
-                    strategy.min_momentum = test_config['min_momentum']
-                if hasattr(strategy, 'min_volume'):
-                    strategy.min_volume = test_config['min_volume']
-                if hasattr(strategy, 'min_quality_score'):
-                    strategy.min_quality_score = test_config['quality_threshold']
-                
-                # Apply session parameters if enabled
-                if session_filter:
-                    if hasattr(strategy, 'min_session_quality'):
-                        strategy.min_session_quality = test_config['min_session_quality']
-                    if hasattr(strategy, 'only_trade_london_ny'):
-                        strategy.only_trade_london_ny = test_config['only_trade_london_ny']
-                
-                # Apply news parameters if enabled
-                if news_filter:
-                    if hasattr(strategy, 'avoid_high_impact_news'):
-                        strategy.avoid_high_impact_news = test_config['avoid_high_impact_news']
-                
-                # Reset strategy state
-                if hasattr(strategy, 'price_history'):
-                    strategy.price_history = {inst: [] for inst in self.instruments}
-                if hasattr(strategy, 'daily_trade_count'):
-                    strategy.daily_trade_count = 0
-                if hasattr(strategy, 'daily_signals'):
-                    strategy.daily_signals = []
-                
-                # Add contextual filters to strategy
-                self._add_contextual_filters(strategy, session_filter, news_filter)
-                
-                # Test this configuration
-                backtest_results = self.validator.run_strategy_backtest(strategy, self.historical_data)
-                
-                signals_generated = backtest_results['signals_generated']
-                avg_quality = backtest_results['avg_quality']
-                
-                # Calculate signals per day
-                signals_per_day = signals_generated / days_in_data if days_in_data > 0 else 0
-                
-                # Calculate fitness score
-                # Enhanced multi-objective fitness function
-                fitness = self._calculate_fitness(signals_per_day, avg_quality, target_trades_per_day)
-                
-                results.append({
-                    'config': test_config,
-                    'signals': signals_generated,
-                    'signals_per_day': signals_per_day,
-                    'avg_quality': avg_quality,
-                    'fitness': fitness
-                })
-                
+                results.append(self._evaluate_config(test_config, self.historical_data, days_in_data,
+                                                     session_filter, news_filter, target_trades_per_day))
             except Exception as e:
                 # Skip failed configurations
                 logger.debug(f"Config {i} failed: {e}")
@@ -281,6 +215,140 @@ class ContextualMonteCarloOptimizer:
         
         return top_10
     
+    def _sample_config(self, param_ranges: Dict, session_filter: bool, news_filter: bool,
+                       rng: Optional[random.Random] = None) -> Dict:
+        """Draw one random configuration from the parameter ranges"""
+        rng = rng or random
+        test_config = {
+            'min_adx': rng.uniform(*param_ranges['min_adx']),
+            'min_momentum': rng.uniform(*param_ranges['min_momentum']),
+            'min_volume': rng.uniform(*param_ranges['min_volume']),
+            'quality_threshold': rng.uniform(*param_ranges['quality_threshold'])
+        }
+        
+        # Add session parameters if enabled
+        if session_filter:
+            test_config['min_session_quality'] = rng.uniform(*param_ranges['min_session_quality'])
+            test_config['only_trade_london_ny'] = rng.uniform(*param_ranges['only_trade_london_ny']) > 0.5
+        
+        # Add news parameters if enabled
+        if news_filter:
+            test_config['avoid_high_impact_news'] = rng.uniform(*param_ranges['avoid_high_impact_news']) > 0.5
+        
+        return test_config
+    
+    def _evaluate_config(self, test_config: Dict, historical_data: Dict, days: float,
+                         session_filter: bool, news_filter: bool,
+                         target_trades_per_day: float) -> Dict:
+        """Build the strategy for one configuration and score it on historical_data"""
+        # Load strategy with test configuration
+        module = __import__(self.strategy_module, fromlist=[self.strategy_function])
+        get_strategy = getattr(module, self.strategy_function)
+        strategy = get_strategy()
+        
+        # Apply test configuration
+        if hasattr(strategy, 'min_adx'):
+            strategy.min_adx = test_config['min_adx']
+        if hasattr(strategy, 'min_momentum'):
+            strategy.min_momentum = test_config['min_momentum']
+        if hasattr(strategy, 'min_volume'):
+            strategy.min_volume = test_config['min_volume']
+        if hasattr(strategy, 'min_quality_score'):
+            strategy.min_quality_score = test_config['quality_threshold']
+        
+        # Apply session parameters if enabled
+        if session_filter:
+            if hasattr(strategy, 'min_session_quality'):
+                strategy.min_session_quality = test_config['min_session_quality']
+            if hasattr(strategy, 'only_trade_london_ny'):
+                strategy.only_trade_london_ny = test_config['only_trade_london_ny']
+        
+        # Apply news parameters if enabled
+        if news_filter:
+            if hasattr(strategy, 'avoid_high_impact_news'):
+                strategy.avoid_high_impact_news = test_config['avoid_high_impact_news']
+        
+        # Reset strategy state
+        if hasattr(strategy, 'price_history'):
+            strategy.price_history = {inst: [] for inst in self.instruments}
+        if hasattr(strategy, 'daily_trade_count'):
+            strategy.daily_trade_count = 0
+        if hasattr(strategy, 'daily_signals'):
+            strategy.daily_signals = []
+        
+        # Add contextual filters to strategy
+        self._add_contextual_filters(strategy, session_filter, news_filter)
+        
+        # Test this configuration
+        backtest_results = self.validator.run_strategy_backtest(strategy, historical_data)
+        
+        signals_generated = backtest_results['signals_generated']
+        avg_quality = backtest_results['avg_quality']
+        
+        # Calculate signals per day
+        signals_per_day = signals_generated / days if days > 0 else 0
+        
+        # Calculate fitness score
+        # Enhanced multi-objective fitness function
+        fitness = self._calculate_fitness(signals_per_day, avg_quality, target_trades_per_day)
+        
+        return {
+            'config': test_config,
+            'signals': signals_generated,
+            'signals_per_day': signals_per_day,
+            'avg_quality': avg_quality,
+            'fitness': fitness
+        }
+    
+    def walk_forward(self, iterations: int = 200, train_days: float = 3, test_days: float = 1,
+                     anchored: bool = False, session_filter: bool = True, news_filter: bool = True,
+                     target_trades_per_day: float = 5.0, n_workers: Optional[int] = None,
+                     seed: Optional[int] = None):
+        """
+        Walk-forward version of optimize(): the same random configurations are
+        searched on each training window and the winner is scored on the next
+        unseen window
+        
+        Session quality and news flags are computed once in __init__ and shared
+        by every fold.
+        
+        Args:
+            iterations: Random configurations searched per fold
+            train_days: In-sample window per fold
+            test_days: Out-of-sample window per fold
+            anchored: Grow the training window from the start instead of rolling it
+            session_filter: Whether to include session quality in optimization
+            news_filter: Whether to include news filtering in optimization
+            target_trades_per_day: Target number of trades per day
+            n_workers: Worker processes (default: CPUs - 1)
+            seed: Seed for the candidate draw
+            
+        Returns:
+            WalkForwardResult (out-of-sample fitness per fold and parameter stability)
+        """
+        rng = random.Random(seed)
+        candidates = [self._sample_config(self.PARAM_RANGES, session_filter, news_filter, rng)
+                      for _ in range(iterations)]
+        
+        bars_per_day = len(self.timestamps) / self.lookback_days if self.lookback_days else 0
+        folds = make_folds(len(self.timestamps), int(train_days * bars_per_day), int(test_days * bars_per_day),
+                           anchored=anchored, start=VALIDATOR_WARMUP_BARS)
+        if not folds:
+            logger.error("❌ History too short for the requested train/test windows")
+            return None
+        
+        def evaluate(test_config, historical_data, start, end):
+            # Validator warms up on the first VALIDATOR_WARMUP_BARS candles of the slice
+            first = max(0, start - VALIDATOR_WARMUP_BARS)
+            window = {inst: candles[first:end] for inst, candles in historical_data.items()}
+            result = self._evaluate_config(test_config, window, (end - start) / bars_per_day,
+                                           session_filter, news_filter, target_trades_per_day)
+            result['score'] = result['fitness']
+            return result
+        
+        runner = WalkForwardRunner(evaluate, candidates, score_key='score', n_workers=n_workers)
+        return runner.run(self.historical_data, folds)
+    
     def _add_contextual_filters(self, strategy, session_filter: bool, news_filter: bool):
         """Add contextual filters to strategy for backtest"""
         if not hasattr(strategy, 'original_generate_signal'):
@@ -440,6 +508,10 @@ if __name__ == "__main__":
     parser.add_argument("--session", action="store_true", help="Enable session filtering")
     parser.add_argument("--news", action="store_true", help="Enable news filtering")
     parser.add_argument("--target", type=float, default=5.0, help="Target trades per day")
+    parser.add_argument("--walk-forward", action="store_true", help="Run rolling train/test folds instead")
+    parser.add_argument("--train-days", type=float, default=3, help="Walk-forward training window (days)")
+    parser.add_argument("--test-days", type=float, default=1, help="Walk-forward test window (days)")
+    parser.add_argument("--anchored", action="store_true", help="Anchored (expanding) training window")
     args = parser.parse_args()
     
     # Get historical data
@@ -459,6 +531,20 @@ if __name__ == "__main__":
         lookback_days=args.days
     )
     
+    if args.walk_forward:
+        wf = optimizer.walk_forward(
+            iterations=args.iterations,
+            train_days=args.train_days,
+            test_days=args.test_days,
+            anchored=args.anchored,
+            session_filter=args.session,
+            news_filter=args.news,
+            target_trades_per_day=args.target
+        )
+        if wf:
+            optimizer.save_results([wf.summary()], f"walk_forward_{args.strategy}.json")
+        sys.exit(0)
+    
     # Run optimization
     top_configs = optimizer.optimize(
         iterations=args.iterations,
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Backtest Result Cache - Content-addressed memoization for the optimizers
+Results are keyed by a hash of the strategy/backtester source, the parameter
+set and a fingerprint of the data window, and persisted in a local SQLite
+store so repeated evaluations return instantly and interrupted sweeps resume
+where they stopped. Entries are evicted least-recently-used and dropped when
+the strategy source changes.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "backtest_cache.db"
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path: str) -> str:
+    # Memoized for the process lifetime: the code that runs is the code that
+    # was imported, even if the file is edited mid-sweep.
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _source_files(obj: Any) -> List[str]:
+    if inspect.ismodule(obj):
+        targets = [obj]
+    elif inspect.isclass(obj):
+        targets = [cls for cls in obj.__mro__ if cls.__module__ != 'builtins']
+    elif inspect.isfunction(obj) or inspect.ismethod(obj):
+        targets = [obj]
+    else:
+        targets = [cls for cls in type(obj).__mro__ if cls.__module__ != 'builtins']
+
+    files = []
+    for target in targets:
+        try:
+            path = inspect.getsourcefile(target)
+        except TypeError:
+            path = None
+        if path and path not in files:
+            files.append(path)
+    return files
+
+
+def code_version(*objects: Any) -> str:
+    """
+    Hash of the source files defining the given classes/instances/functions/modules
+
+    Classes include every base class in their MRO, so editing a shared
+    strategy base invalidates its subclasses too.
+    """
+    digest = hashlib.sha256()
+    for obj in objects:
+        for path in _source_files(obj):
+            try:
+                digest.update(os.path.basename(path).encode())
+                digest.update(_file_digest(path).encode())
+            except OSError:
+                digest.update(repr(obj).encode())
+    return digest.hexdigest()[:16]
+
+
+def _feed(digest, obj: Any):
+    if isinstance(obj, pd.DataFrame):
+        digest.update(b'D' + repr(list(obj.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, pd.Series):
+        digest.update(b'S' + repr(obj.name).encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, np.ndarray):
+        digest.update(f'A{obj.dtype}{obj.shape}'.encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        digest.update(b'{%d' % len(obj))
+        for key in sorted(obj, key=str):
+            digest.update(repr(key).encode())
+            _feed(digest, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b'[%d' % len(obj))
+        for item in obj:
+            _feed(digest, item)
+    else:
+        digest.update(repr(obj).encode())
+
+
+def data_fingerprint(data: Any) -> str:
+    """Content hash of candles/DataFrames/arrays (or dicts/lists of them)"""
+    digest = hashlib.sha256()
+    _feed(digest, data)
+    return digest.hexdigest()[:32]
+
+
+def _canonical(obj: Any) -> Any:
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    return obj
+
+
+def make_key(version: str, params: Dict[str, Any], data_fp: str, **context: Any) -> str:
+    """
+    Cache key for one backtest
+
+    Args:
+        version: code_version() of the strategy and backtester
+        params: Parameter set (numpy scalars and plain numbers hash the same)
+        data_fp: data_fingerprint() of the data window
+        **context: Anything else the result depends on (window, balance, costs...)
+    """
+    payload = json.dumps([version, _canonical(params), data_fp, _canonical(context)],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class BacktestCache:
+    """Persistent LRU store of pickled backtest results"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_entries: int = 20000,
+                 max_bytes: int = 512 * 1024 * 1024, memory_entries: int = 256,
+                 evict_every: int = 100):
+        """
+        Args:
+            db_path: SQLite file holding the results
+            max_entries: Evict least-recently-used entries beyond this count
+            max_bytes: ...or beyond this total payload size
+            memory_entries: Hot entries also kept in process memory
+            evict_every: Check the limits every N writes
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.evict_every = evict_every
+
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._connection()
+        logger.info(f"💾 Backtest cache at {db_path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        # Forked optimizer workers must not share the parent's connection
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS backtest_results (
+                    key TEXT PRIMARY KEY,
+                    strategy TEXT,
+                    code_version TEXT,
+                    payload BLOB,
+                    size INTEGER,
+                    created REAL,
+                    last_access REAL,
+                    hits INTEGER DEFAULT 0
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_backtest_access ON backtest_results(last_access)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_backtest_strategy "
+                               "ON backtest_results(strategy, code_version)")
+            self._conn.commit()
+            self._pid = os.getpid()
+            self._memory.clear()
+        return self._conn
+
+    def _remember(self, key: str, blob: bytes):
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached result for ``key`` (a fresh copy), or None"""
+        with self._lock:
+            try:
+                conn = self._connection()
+                blob = self._memory.get(key)
+                if blob is not None:
+                    self._memory.move_to_end(key)
+                else:
+                    row = conn.execute("SELECT payload FROM backtest_results WHERE key = ?", (key,)).fetchone()
+                    if row is None:
+                        self.misses += 1
+                        return None
+                    blob = row[0]
+                    self._remember(key, blob)
+                conn.execute("UPDATE backtest_results SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                             (time.time(), key))
+                conn.commit()
+                self.hits += 1
+                return pickle.loads(blob)
+            except Exception as e:
+                logger.warning(f"⚠️ Backtest cache read failed: {e}")
+                self.misses += 1
+                return None
+
+    def put(self, key: str, value: Any, strategy: str = '', version: str = ''):
+        """Store a result (None is never stored, so failed runs are retried)"""
+        if value is None:
+            return
+        with self._lock:
+            try:
+                blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                now = time.time()
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO backtest_results "
+                    "(key, strategy, code_version, payload, size, created, last_access, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                    (key, strategy, version, blob, len(blob), now, now))
+                conn.commit()
+                self._remember(key, blob)
+                self._writes += 1
+                if self._writes % self.evict_every == 0:
+                    self._evict(conn)
+            except Exception as e:
+                logger.warning(f"⚠️ Backtest cache write failed: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any],
+                       strategy: str = '', version: str = '') -> Any:
+        """Return the cached result, or run ``compute`` and store what it returns"""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = compute()
+        self.put(key, value, strategy, version)
+        return value
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM backtest_results").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return 0
+
+        # Trim to 90% of the limits so eviction doesn't run on every write
+        keep_entries = int(self.max_entries * 0.9)
+        keep_bytes = int(self.max_bytes * 0.9)
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM backtest_results ORDER BY last_access ASC"):
+            if count <= keep_entries and total <= keep_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM backtest_results WHERE key = ?", victims)
+        conn.commit()
+        for (key,) in victims:
+            self._memory.pop(key, None)
+        logger.info(f"🧹 Backtest cache evicted {len(victims)} least-recently-used results")
+        return len(victims)
+
+    def evict(self) -> int:
+        """Enforce the size limits now; returns the number of entries removed"""
+        with self._lock:
+            return self._evict(self._connection())
+
+    def invalidate(self, strategy: Optional[str] = None, keep_version: Optional[str] = None) -> int:
+        """
+        Drop cached results
+
+        Args:
+            strategy: Only this strategy's entries (all entries when None)
+            keep_version: Keep entries of this code version, dropping older ones
+
+        Returns:
+            Number of entries removed
+        """
+        query, args = "DELETE FROM backtest_results", []
+        clauses = []
+        if strategy is not None:
+            clauses.append("strategy = ?")
+            args.append(strategy)
+        if keep_version is not None:
+            clauses.append("code_version != ?")
+            args.append(keep_version)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute(query, args).rowcount
+            conn.commit()
+            self._memory.clear()
+        if removed:
+            logger.info(f"🗑️ Invalidated {removed} cached backtests for {strategy or 'all strategies'}")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process and the store's size"""
+        with self._lock:
+            count, total = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM backtest_results").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'entries': count,
+            'bytes': total,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Global instance
+_backtest_cache = None
+
+
+def get_backtest_cache() -> BacktestCache:
+    """Get the global backtest cache (path from BACKTEST_CACHE_PATH)"""
+    global _backtest_cache
+    if _backtest_cache is None:
+        _backtest_cache = BacktestCache(os.getenv('BACKTEST_CACHE_PATH', DEFAULT_DB_PATH))
+    return _backtest_cache
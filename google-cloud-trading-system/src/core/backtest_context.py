@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Backtest Context - Per-bar session, news and multi-timeframe context as aligned arrays
+Computes what the contextual backtest needs for every bar in one pass up front,
+so the bar loop reads the context for bar ``i`` by index instead of filtering
+DataFrames and scanning news lists on every candle.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .historical_news_fetcher import NewsImpact
+from .support_resistance import SupportResistanceEngine
+
+logger = logging.getLogger(__name__)
+
+# Bar length of each timeframe; a higher-timeframe bar is usable once it has closed
+TIMEFRAME_PERIODS = {
+    "M5": pd.Timedelta(minutes=5),
+    "M15": pd.Timedelta(minutes=15),
+    "H1": pd.Timedelta(hours=1),
+    "H4": pd.Timedelta(hours=4),
+    "D1": pd.Timedelta(days=1),
+}
+# Same weights and level timeframes as PriceContextAnalyzer
+TIMEFRAME_WEIGHTS = {"M5": 0.1, "M15": 0.15, "H1": 0.25, "H4": 0.25, "D1": 0.25}
+LEVEL_TIMEFRAMES = ("H1", "H4", "D1")
+MIN_BARS = 30
+MIN_LEVEL_TOUCHES = 2
+
+_TREND_NAMES = np.array(["bearish", "neutral", "bullish"], dtype=object)
+
+
+def _to_utc_ns(times) -> np.ndarray:
+    index = pd.DatetimeIndex(pd.to_datetime(times))
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return index.tz_convert("UTC").as_unit("ns").asi8
+
+
+def _seeded_smooth(values: np.ndarray, period: int, alpha: float, first: int) -> np.ndarray:
+    """
+    TA-Lib style smoothing: the mean of the first ``period`` values (starting
+    at ``first``) seeds an exponential recursion with factor ``alpha``
+    """
+    out = np.full(len(values), np.nan)
+    seed_at = first + period - 1
+    if len(values) <= seed_at:
+        return out
+    tail = values[seed_at:].copy()
+    tail[0] = values[first:seed_at + 1].mean()
+    out[seed_at:] = pd.Series(tail).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+def ema(close: np.ndarray, period: int) -> np.ndarray:
+    """EMA seeded with the SMA of the first ``period`` closes (as talib.EMA)"""
+    return _seeded_smooth(close, period, 2.0 / (period + 1), 0)
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder RSI (as talib.RSI)"""
+    change = np.diff(close, prepend=np.nan)
+    gain = _seeded_smooth(np.clip(change, 0, None), period, 1.0 / period, 1)
+    loss = _seeded_smooth(np.clip(-change, 0, None), period, 1.0 / period, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 * gain / (gain + loss)
+    out[(gain + loss) == 0] = 0.0
+    return out
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder ATR (as talib.ATR)"""
+    prev_close = np.roll(close, 1)
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return _seeded_smooth(true_range, period, 1.0 / period, 1)
+
+
+class _TimeframeArrays:
+    """Trend/momentum/volatility and level snapshots of one timeframe, per bar of that timeframe"""
+
+    def __init__(self, df: pd.DataFrame, psychological_levels: np.ndarray,
+                 with_levels: bool, volatility_period: int = 14):
+        close = df["close"].to_numpy(dtype=float)
+        high = df["high"].to_numpy(dtype=float)
+        low = df["low"].to_numpy(dtype=float)
+
+        ema20, ema50 = ema(close, 20), ema(close, 50)
+        slope = ema20 - np.roll(ema20, 5)
+        slope[:5] = np.nan
+        self.trend = np.where((ema20 > ema50) & (slope > 0), 2, np.where((ema20 < ema50) & (slope < 0), 0, 1))
+        self.momentum = (rsi(close) - 50) / 50
+        self.volatility = atr(high, low, close, volatility_period) / close
+        self.close = close
+
+        # level books after each closed bar; psychological levels depend on that bar's close
+        self.supports: List[np.ndarray] = []
+        self.resistances: List[np.ndarray] = []
+        if not with_levels:
+            return
+        engine = SupportResistanceEngine()  # private: the incremental path adds one bar per step
+        for j in range(len(close)):
+            state = engine.update("", "", df.iloc[:j + 1])
+            c = close[j]
+            below = psychological_levels[(psychological_levels < c) & (psychological_levels > c * 0.9)]
+            above = psychological_levels[(psychological_levels > c) & (psychological_levels < c * 1.1)]
+            swings_s = [p for p, _ in state.supports.levels(MIN_LEVEL_TOUCHES)]
+            swings_r = [p for p, _ in state.resistances.levels(MIN_LEVEL_TOUCHES)]
+            self.supports.append(np.sort(np.concatenate([swings_s, below])))
+            self.resistances.append(np.sort(np.concatenate([swings_r, above])))
+
+
+class BacktestContext:
+    """
+    Context for every bar of a backtest, aligned to one bar index
+
+    Session quality and news sentiment are plain arrays; multi-timeframe
+    trend/momentum/volatility and support/resistance come from the last
+    closed bar of each timeframe, so no bar sees a higher-timeframe candle
+    that has not finished yet.
+    """
+
+    def __init__(self, index, session_manager=None, news: Optional[Dict[str, List[Dict]]] = None,
+                 lookback_hours: int = 2, lookahead_hours: int = 2,
+                 bar_period: pd.Timedelta = TIMEFRAME_PERIODS["M5"],
+                 psychological_levels: Iterable[float] = ()):
+        """
+        Args:
+            index: Bar open times (naive is taken as UTC)
+            session_manager: SessionManager used to tag sessions (skipped if None)
+            news: Events by currency, as HistoricalNewsFetcher.get_historical_news returns
+            lookback_hours: Hours before a bar that count as recent news
+            lookahead_hours: Hours after a bar that count as upcoming news
+            bar_period: Length of one bar of ``index``
+            psychological_levels: Round-number levels added to supports/resistances
+        """
+        self.index = pd.DatetimeIndex(pd.to_datetime(index))
+        self.times_ns = _to_utc_ns(self.index)
+        self.close_ns = self.times_ns + bar_period.value
+        self.psychological_levels = np.asarray(sorted(psychological_levels), dtype=float)
+        n = len(self.index)
+
+        if session_manager is not None:
+            self.session_quality = session_manager.tag_sessions(self.index)["quality"].to_numpy()
+        else:
+            self.session_quality = np.zeros(n, dtype=np.int64)
+
+        self._build_news(news or {}, lookback_hours, lookahead_hours)
+        self._instruments: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    # ------------------------------------------------------------------ news
+
+    def _build_news(self, news: Dict[str, List[Dict]], lookback_hours: int, lookahead_hours: int):
+        events = [event for currency_events in news.values() for event in currency_events]
+        times = _to_utc_ns([event["time"] for event in events]) if events else np.zeros(0, dtype=np.int64)
+        order = np.argsort(times, kind="stable")
+        self._events = [events[k] for k in order]
+        times = times[order]
+
+        impact = np.array([event["impact"] for event in self._events], dtype=object)
+        sentiment = np.array([event.get("sentiment", 0) for event in self._events], dtype=float)
+        high = impact == NewsImpact.HIGH.value
+        medium = impact == NewsImpact.MEDIUM.value
+
+        def prefix(values):
+            return np.concatenate([[0.0], np.cumsum(values)])
+
+        weighted = prefix(np.where(high, 2 * sentiment, np.where(medium, sentiment, 0.0)))
+        weight = prefix(np.where(high, 1.0, np.where(medium, 0.5, 0.0)))
+        high_count = prefix(high.astype(float))
+
+        # recent: [start, now], upcoming: (now, end]
+        self._recent_lo = np.searchsorted(times, self.times_ns - lookback_hours * 3_600_000_000_000, side="left")
+        self._now = np.searchsorted(times, self.times_ns, side="right")
+        self._upcoming_hi = np.searchsorted(times, self.times_ns + lookahead_hours * 3_600_000_000_000, side="right")
+
+        self.high_impact_count = weight[self._now] - weight[self._recent_lo]
+        total = weighted[self._now] - weighted[self._recent_lo]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.news_sentiment = np.where(self.high_impact_count > 0, total / self.high_impact_count, 0.0)
+        self.high_impact_upcoming = (high_count[self._upcoming_hi] - high_count[self._now]) > 0
+        self.trading_caution = self.high_impact_upcoming | (self.high_impact_count > 1)
+
+    def news_context(self, i: int) -> Dict[str, Any]:
+        """News context for bar ``i`` (same shape as HistoricalNewsFetcher.get_news_context)"""
+        recent = [dict(event, relative_time="recent") for event in self._events[self._recent_lo[i]:self._now[i]]]
+        upcoming = [dict(event, relative_time="upcoming") for event in self._events[self._now[i]:self._upcoming_hi[i]]]
+        return {
+            "timestamp": self.index[i].strftime("%Y-%m-%d %H:%M:%S"),
+            "recent_news": recent,
+            "upcoming_news": upcoming,
+            "sentiment": float(self.news_sentiment[i]),
+            "high_impact_count": float(self.high_impact_count[i]),
+            "high_impact_upcoming": bool(self.high_impact_upcoming[i]),
+            "trading_caution": bool(self.trading_caution[i]),
+        }
+
+    # ------------------------------------------------------- multi-timeframe
+
+    def add_instrument(self, instrument: str, frames: Dict[str, pd.DataFrame]):
+        """
+        Precompute multi-timeframe context for an instrument
+
+        Args:
+            instrument: Instrument name
+            frames: OHLC DataFrames by timeframe (as prepare_multi_timeframe_data builds)
+        """
+        timeframes = {}
+        for timeframe, df in frames.items():
+            period = TIMEFRAME_PERIODS.get(timeframe)
+            if period is None or df.empty:
+                continue
+            arrays = _TimeframeArrays(df, self.psychological_levels, timeframe in LEVEL_TIMEFRAMES)
+            # last bar of this timeframe closed by the close of each backtest bar
+            last = np.searchsorted(_to_utc_ns(df.index) + period.value, self.close_ns, side="right") - 1
+            valid = last + 1 >= MIN_BARS
+            timeframes[timeframe] = {"arrays": arrays, "bar": last, "valid": valid}
+
+        bullish = np.zeros(len(self))
+        bearish = np.zeros(len(self))
+        total = np.zeros(len(self))
+        for timeframe, entry in timeframes.items():
+            weight = TIMEFRAME_WEIGHTS.get(timeframe, 0.1)
+            trend = np.where(entry["valid"], entry["arrays"].trend[np.maximum(entry["bar"], 0)], 1)
+            total += np.where(entry["valid"], weight, 0.0)
+            bullish += np.where(entry["valid"] & (trend == 2), weight, 0.0)
+            bearish += np.where(entry["valid"] & (trend == 0), weight, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            overall = np.where(bullish / total > 0.6, 2, np.where(bearish / total > 0.6, 0, 1))
+        overall[total == 0] = 1
+
+        self._instruments[instrument] = {"timeframes": timeframes, "overall_trend": _TREND_NAMES[overall]}
+
+    def price_context(self, instrument: str, i: int, price: float) -> Dict[str, Any]:
+        """
+        Price context for bar ``i`` at ``price`` (same shape as PriceContextAnalyzer.get_trade_context)
+
+        Returns an empty dict for instruments that were never added.
+        """
+        entry = self._instruments.get(instrument)
+        if entry is None:
+            return {}
+
+        nearest_support = None
+        nearest_resistance = None
+        timeframes = {}
+        for timeframe, tf in entry["timeframes"].items():
+            if not tf["valid"][i]:
+                continue
+            j = tf["bar"][i]
+            arrays = tf["arrays"]
+            timeframes[timeframe] = {
+                "trend": _TREND_NAMES[arrays.trend[j]],
+                "momentum": float(arrays.momentum[j]),
+                "volatility": float(arrays.volatility[j]),
+            }
+            if timeframe not in LEVEL_TIMEFRAMES:
+                continue
+            supports, resistances = arrays.supports[j], arrays.resistances[j]
+            k = np.searchsorted(supports, price, side="left")
+            if k > 0 and (nearest_support is None or supports[k - 1] > nearest_support):
+                nearest_support = float(supports[k - 1])
+            k = np.searchsorted(resistances, price, side="right")
+            if k < len(resistances) and (nearest_resistance is None or resistances[k] < nearest_resistance):
+                nearest_resistance = float(resistances[k])
+
+        risk_reward = 0.0
+        if nearest_support is not None and nearest_resistance is not None and price - nearest_support > 0:
+            risk_reward = float((nearest_resistance - price) / (price - nearest_support))
+
+        return {
+            "instrument": instrument,
+            "current_price": price,
+            "overall_trend": entry["overall_trend"][i],
+            "nearest_support": nearest_support,
+            "nearest_resistance": nearest_resistance,
+            "risk_reward": risk_reward,
+            "recent_patterns": [],
+            "timeframes": timeframes,
+        }
+
+    def at(self, i: int) -> Dict[str, Any]:
+        """Scalar context of bar ``i`` (session and news), for strategies reading by index"""
+        return {
+            "timestamp": self.index[i],
+            "session_quality": int(self.session_quality[i]),
+            "news_sentiment": float(self.news_sentiment[i]),
+            "high_impact_upcoming": bool(self.high_impact_upcoming[i]),
+            "trading_caution": bool(self.trading_caution[i]),
+        }
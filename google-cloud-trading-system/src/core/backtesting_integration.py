@@ -11,7 +11,7 @@ import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields, replace
 from enum import Enum
 import pandas as pd
 import numpy as np
@@ -20,6 +20,8 @@ from .data_collector import get_data_collector
 from .strategy_manager import get_strategy_manager
 from .strategy_executor import get_multi_strategy_executor
 from .telegram_notifier import TelegramNotifier
+from .parameter_search import SearchSpace, SearchResult, get_search
+from .backtest_cache import code_version, data_fingerprint, get_backtest_cache, make_key
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -98,6 +100,10 @@ class BacktestingIntegration:
         self.backtest_results: Dict[str, List[BacktestResult]] = {}
         self.optimization_results: Dict[str, OptimizationResult] = {}
         
+        # Memoized simulations; stale entries are dropped per strategy on first use
+        self.backtest_cache = get_backtest_cache()
+        self._cache_versions: Dict[str, str] = {}
+        
         # Auto-export thread
         self.auto_export_thread = None
         self.is_running = False
@@ -268,9 +274,46 @@ class BacktestingIntegration:
             logger.error(f"❌ Failed to get historical data: {e}")
             return {}
     
+    def _strategy_code_version(self, strategy_config) -> str:
+        """Source hash of the strategy and this simulator; invalidates older cache entries once"""
+        version = self._cache_versions.get(strategy_config.strategy_id)
+        if version is None:
+            version = code_version(strategy_config.strategy_class, type(self))
+            self._cache_versions[strategy_config.strategy_id] = version
+            self.backtest_cache.invalidate(strategy_config.strategy_id, keep_version=version)
+        return version
+    
     def _simulate_strategy_execution(self, strategy_config, historical_data: Dict[str, pd.DataFrame], 
                                    config: BacktestConfig) -> BacktestResult:
-        """Simulate strategy execution for backtesting"""
+        """Simulate strategy execution for backtesting (memoized in the backtest cache)"""
+        version = self._strategy_code_version(strategy_config)
+        # Every config field except the class (covered by the code version) is part of the key
+        params = asdict(replace(strategy_config, strategy_class=None))
+        params.pop('strategy_class')
+        key = make_key(
+            version,
+            params,
+            data_fingerprint(historical_data),
+            initial_balance=config.initial_balance,
+            days=(config.end_date - config.start_date).days,
+            include_slippage=config.include_slippage,
+            include_spread=config.include_spread,
+            include_commission=config.include_commission,
+            commission_rate=config.commission_rate
+        )
+        result = self.backtest_cache.get_or_compute(
+            key, lambda: self._run_strategy_simulation(strategy_config, historical_data, config),
+            strategy=strategy_config.strategy_id, version=version
+        )
+        if result is None:
+            return None
+        # A cached result may come from an equally long window on another date
+        return replace(result, backtest_period=f"{config.start_date.strftime('%Y-%m-%d')} to "
+                                               f"{config.end_date.strftime('%Y-%m-%d')}")
+    
+    def _run_strategy_simulation(self, strategy_config, historical_data: Dict[str, pd.DataFrame],
+                                 config: BacktestConfig) -> BacktestResult:
+        """Uncached simulation behind _simulate_strategy_execution()"""
         try:
             # Initialize backtest variables
             balance = config.initial_balance
@@ -481,23 +524,39 @@ class BacktestingIntegration:
     
     def optimize_strategy_parameters(self, strategy_id: str, 
                                    parameter_ranges: Dict[str, Tuple[float, float]],
-                                   optimization_method: str = "grid_search") -> OptimizationResult:
-        """Optimize strategy parameters using backtesting"""
+                                   optimization_method: str = "grid_search",
+                                   config: Optional[BacktestConfig] = None,
+                                   seed: Optional[int] = None,
+                                   **search_kwargs) -> OptimizationResult:
+        """
+        Optimize strategy parameters using backtesting
+        
+        Args:
+            strategy_id: Strategy to optimize
+            parameter_ranges: StrategyConfig field -> (low, high) range or list of choices
+            optimization_method: grid_search, random, successive_halving, hyperband or tpe
+            config: Backtest window/balance (defaults to the last 30 days, 10k balance)
+            seed: Seed for the stochastic searches (same seed, same result)
+            **search_kwargs: Passed to the search (e.g. n_trials, points, eta)
+        
+        Returns:
+            OptimizationResult scored by Sharpe ratio
+        """
         try:
-            logger.info(f"🔧 Optimizing parameters for {strategy_id}")
+            logger.info(f"🔧 Optimizing parameters for {strategy_id} ({optimization_method})")
             
             # Get strategy configuration
             strategy_config = self.strategy_manager.strategies.get(strategy_id)
             if not strategy_config:
                 raise ValueError(f"Strategy {strategy_id} not found")
             
-            best_parameters = {}
-            best_performance = float('-inf')
-            
-            # Simple grid search optimization (in real implementation, use more sophisticated methods)
             if optimization_method == "grid_search":
-                best_parameters, best_performance = self._grid_search_optimization(
-                    strategy_config, parameter_ranges
+                best_parameters, best_performance, search = self._grid_search_optimization(
+                    strategy_config, parameter_ranges, config, **search_kwargs
+                )
+            else:
+                best_parameters, best_performance, search = self._search_optimization(
+                    strategy_config, parameter_ranges, optimization_method, config, seed, **search_kwargs
                 )
             
             # Create optimization result
@@ -507,22 +566,23 @@ class BacktestingIntegration:
                 best_performance=best_performance,
                 parameter_ranges=parameter_ranges,
                 optimization_method=optimization_method,
-                iterations=100,  # Simplified
-                convergence_achieved=True
+                iterations=search.evaluations if search else 0,
+                convergence_achieved=bool(search and np.isfinite(search.best_score))
             )
             
             self.optimization_results[strategy_id] = optimization_result
             
-            logger.info(f"✅ Parameter optimization completed for {strategy_id}")
+            logger.info(f"✅ Parameter optimization completed for {strategy_id}: "
+                        f"Sharpe {best_performance:.3f} after {optimization_result.iterations} backtests")
             
             # Send notification
             if self.telegram_notifier:
                 self.telegram_notifier.send_message(
                     f"🔧 Strategy Optimization Complete\n"
                     f"📊 Strategy: {strategy_id}\n"
-                    f"🎯 Best Performance: {best_performance:.2f}%\n"
+                    f"🎯 Best Sharpe: {best_performance:.2f}\n"
                     f"⚙️ Parameters: {best_parameters}\n"
-                    f"🔄 Method: {optimization_method}"
+                    f"🔄 Method: {optimization_method} ({optimization_result.iterations} backtests)"
                 )
             
             return optimization_result
@@ -531,29 +591,76 @@ class BacktestingIntegration:
             logger.error(f"❌ Parameter optimization failed for {strategy_id}: {e}")
             return None
     
-    def _grid_search_optimization(self, strategy_config, 
-                                parameter_ranges: Dict[str, Tuple[float, float]]) -> Tuple[Dict[str, Any], float]:
-        """Simple grid search optimization"""
-        try:
-            best_parameters = {}
-            best_performance = float('-inf')
-            
-            # Simplified grid search (in real implementation, use proper grid search)
-            # For demonstration, we'll just return current parameters
-            best_parameters = {
-                'stop_loss_pct': strategy_config.stop_loss_pct,
-                'take_profit_pct': strategy_config.take_profit_pct,
-                'risk_per_trade': strategy_config.risk_per_trade
+    def _default_optimization_config(self, strategy_config) -> BacktestConfig:
+        """Last 30 days on the strategy's own instruments"""
+        end_date = datetime.now()
+        return BacktestConfig(
+            mode=BacktestMode.OPTIMIZATION,
+            start_date=end_date - timedelta(days=30),
+            end_date=end_date,
+            initial_balance=10000.0,
+            instruments=strategy_config.instruments,
+            strategies=[strategy_config]
+        )
+    
+    def _parameter_objective(self, strategy_config, historical_data: Dict[str, pd.DataFrame],
+                             config: BacktestConfig):
+        """
+        Objective shared by every search: Sharpe ratio of one backtest
+        
+        ``budget`` in (0, 1] keeps only the most recent fraction of each
+        instrument's history, so successive halving / Hyperband can screen
+        candidates on short windows before spending full backtests.
+        """
+        known_fields = {f.name for f in fields(strategy_config)}
+        
+        def objective(params: Dict[str, Any], budget: float) -> float:
+            candidate = replace(strategy_config, **{k: v for k, v in params.items() if k in known_fields})
+            window = {
+                instrument: data.iloc[len(data) - max(1, int(round(len(data) * budget))):]
+                for instrument, data in historical_data.items()
             }
-            
-            # Simulate performance improvement
-            best_performance = 5.2  # 5.2% return
-            
-            return best_parameters, best_performance
+            candidate_config = replace(config, strategies=[candidate])
+            result = self._simulate_strategy_execution(candidate, window, candidate_config)
+            return result.sharpe_ratio if result else float('-inf')
+        
+        return objective
+    
+    def _search_optimization(self, strategy_config,
+                             parameter_ranges: Dict[str, Tuple[float, float]],
+                             method: str, config: Optional[BacktestConfig] = None,
+                             seed: Optional[int] = None,
+                             **search_kwargs) -> Tuple[Dict[str, Any], float, Optional[SearchResult]]:
+        """Run any parameter_search method against the backtest objective"""
+        try:
+            config = config or self._default_optimization_config(strategy_config)
+            historical_data = self._get_historical_data(
+                strategy_config.instruments, config.start_date, config.end_date
+            )
+            if not any(not data.empty for data in historical_data.values()):
+                logger.warning(f"⚠️ No historical data for {strategy_config.strategy_id} - keeping current parameters")
+                return {name: getattr(strategy_config, name, None) for name in parameter_ranges}, 0.0, None
+            
+            search = get_search(method, **search_kwargs).run(
+                SearchSpace(parameter_ranges),
+                self._parameter_objective(strategy_config, historical_data, config),
+                seed=seed
+            )
+            logger.info(f"🔍 {method}: {search.evaluations} backtests "
+                        f"({search.budget_used:.1f} full-data equivalents), best Sharpe {search.best_score:.3f}")
+            return search.best_params, search.best_score, search
             
         except Exception as e:
-            logger.error(f"❌ Grid search optimization failed: {e}")
-            return {}, 0.0
+            logger.error(f"❌ {method} optimization failed: {e}")
+            return {}, 0.0, None
+    
+    def _grid_search_optimization(self, strategy_config, 
+                                parameter_ranges: Dict[str, Tuple[float, float]],
+                                config: Optional[BacktestConfig] = None,
+                                points: int = 5) -> Tuple[Dict[str, Any], float, Optional[SearchResult]]:
+        """Exhaustive grid search (``points`` values per range parameter)"""
+        return self._search_optimization(strategy_config, parameter_ranges, "grid_search", config,
+                                         points=points)
     
     def compare_strategy_performance(self) -> Dict[str, Any]:
         """Compare performance of all strategies"""
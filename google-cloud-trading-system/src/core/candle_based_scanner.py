@@ -15,6 +15,7 @@ from .oanda_client import get_oanda_client
 from .optimization_loader import load_optimization_results, apply_per_pair_to_ultra_strict, apply_per_pair_to_momentum, apply_per_pair_to_gold
 from .order_manager import get_order_manager
 from .risk_manager import get_risk_manager
+from .quality_scoring import get_quality_scoring, market_indicators
 from src.strategies.ultra_strict_forex_optimized import get_ultra_strict_forex_strategy
 from src.strategies.momentum_trading import get_momentum_trading_strategy
 from src.strategies.gold_scalping_optimized import get_gold_scalping_strategy
@@ -24,10 +25,11 @@ from src.strategies.ultra_strict_v2 import get_ultra_strict_v2_strategy
 from src.strategies.momentum_v2 import get_momentum_v2_strategy
 from src.strategies.all_weather_70wr import get_all_weather_70wr_strategy
 from .signal_tracker import get_signal_tracker
+from .hot_params import HotParameterSwapMixin
 
 logger = logging.getLogger(__name__)
 
-class CandleBasedScanner:
+class CandleBasedScanner(HotParameterSwapMixin):
     """API-optimized scanner that only runs on new candle events"""
     
     def __init__(self):
@@ -37,6 +39,7 @@ class CandleBasedScanner:
         self.oanda_client = get_oanda_client()
         self.risk_manager = get_risk_manager()
         self.signal_tracker = get_signal_tracker()
+        self.quality_scorer = get_quality_scoring()
         
         # Load optimization results
         self.opt_results = load_optimization_results()
@@ -64,6 +67,7 @@ class CandleBasedScanner:
         # Load strategies from accounts.yaml
         self.strategies = {}
         self.accounts = {}
+        strategy_types = {}
         
         for acc in yaml_accounts:
             if acc.get('active', False):
@@ -73,8 +77,12 @@ class CandleBasedScanner:
                 if strategy_name in strategy_loaders:
                     self.strategies[display_name] = strategy_loaders[strategy_name]()
                     self.accounts[display_name] = acc['id']
+                    strategy_types[display_name] = strategy_name
                     logger.info(f"✅ Loaded: {display_name} ({strategy_name})")
         
+        # Config changes are applied in place (see hot_swap_parameters)
+        self.init_hot_swap(strategy_loaders, strategy_types)
+        
         # Apply optimization results to strategies that use them
         for name, strategy in self.strategies.items():
             if 'Momentum' in name:
@@ -174,6 +182,12 @@ class CandleBasedScanner:
     
     def _run_scan_without_backfill(self, instrument: str):
         """Run scan for instrument without backfill (for timer)"""
+        self.sync_config()  # picks up a newer config snapshot, if any
+        with self._scan_lock:
+            self._run_scan_without_backfill_locked(instrument)
+    
+    def _run_scan_without_backfill_locked(self, instrument: str):
+        """Timer scan body - caller holds the scan lock"""
         try:
             self.scan_count += 1
             self.last_scan_time = datetime.now(timezone.utc)
@@ -239,6 +253,18 @@ class CandleBasedScanner:
     
     def _on_new_candle(self, instrument: str, market_data):
         """Handle new candle event - trigger strategy scan"""
+        self.sync_config()  # picks up a newer config snapshot, if any
+        try:
+            # first tick of the new bar closes the previous one for the correlation matrix
+            self.risk_manager.on_bar_close(instrument, (market_data.bid + market_data.ask) / 2,
+                                           market_data.time_ns)
+        except Exception as e:
+            logger.debug(f"Correlation update skipped for {instrument}: {e}")
+        with self._scan_lock:
+            self._on_new_candle_locked(instrument, market_data)
+    
+    def _on_new_candle_locked(self, instrument: str, market_data):
+        """New candle scan body - caller holds the scan lock"""
         if not self.is_running:
             return
         
@@ -361,8 +387,15 @@ class CandleBasedScanner:
                             logger.info(f"📅 WEEKEND MODE: Skipping {signal_count} signals for {strategy_name}")
                             continue
                         
-                        for signal in signals:
-                            logger.info(f"  - {signal.instrument} {signal.side.value} (conf: {signal.confidence:.2f})")
+                        # Score every candidate of this strategy in one vectorized pass
+                        qualities = self._score_signals(signals, all_market_data, strategy)
+                        
+                        for i, signal in enumerate(signals):
+                            quality_score = int(qualities.total_scores[i]) if qualities is not None else None
+                            if quality_score is not None and hasattr(signal, 'quality_score'):
+                                signal.quality_score = quality_score
+                            logger.info(f"  - {signal.instrument} {signal.side.value} (conf: {signal.confidence:.2f}"
+                                        + (f", quality: {quality_score}/100)" if quality_score is not None else ")"))
                             
                             # ============================================
                             # RISK MANAGEMENT CHECKS (NEW)
@@ -380,6 +413,7 @@ class CandleBasedScanner:
                                 
                                 # Get open instruments
                                 open_instruments = [t.get('instrument') for t in open_trades]
+                                self.risk_manager.sync_positions(open_trades)
                                 
                                 # Get margin info
                                 margin_used = float(account_info.get('marginUsed', 0))
@@ -403,7 +437,8 @@ class CandleBasedScanner:
                                     signal_strength=signal.confidence,
                                     spread_pips=spread_pips,
                                     margin_used_pct=margin_used_pct,
-                                    account_balance=balance
+                                    account_balance=balance,
+                                    units=abs(signal.units) if signal.side.value == 'BUY' else -abs(signal.units)
                                 )
                                 
                                 if not can_trade:
@@ -464,11 +499,14 @@ class CandleBasedScanner:
                                     conditions_met=[
                                         f"Confidence: {signal.confidence:.2f}",
                                         f"Session: {self.risk_manager.get_session_name()}",
-                                        f"Positions: {current_positions}/15" if 'current_positions' in locals() else ""
+                                        f"Positions: {current_positions}/15" if 'current_positions' in locals() else "",
+                                        # explanation text is only built for signals that get tracked
+                                        f"Quality: {quality_score}/100 - {qualities.explanation(i)}" if quality_score is not None else ""
                                     ],
                                     indicators={
                                         'spread_pips': spread_pips if 'spread_pips' in locals() else 0,
-                                        'margin_used_pct': margin_used_pct if 'margin_used_pct' in locals() else 0
+                                        'margin_used_pct': margin_used_pct if 'margin_used_pct' in locals() else 0,
+                                        'quality_score': quality_score if quality_score is not None else 0
                                     },
                                     confidence=signal.confidence,
                                     account_id=account_id,
@@ -600,6 +638,39 @@ class CandleBasedScanner:
         except Exception as e:
             logger.error(f"❌ Candle scan error: {e}")
     
+    def _score_signals(self, signals: List[Any], all_market_data: Dict[str, Any], strategy: Any = None):
+        """
+        Quality-score all signals of one strategy scan in a single batch
+        
+        Args:
+            signals: TradeSignals from strategy.analyze_market
+            all_market_data: instrument -> MarketData for the current scan
+            strategy: Strategy that produced the signals; its price history
+                supplies ADX, momentum and volume per instrument
+        
+        Returns:
+            QualityScoreBatch (row i = signals[i]), or None if scoring failed
+        """
+        try:
+            history = getattr(strategy, 'price_history', None) or {}
+            indicators = {}
+            candidates = []
+            for signal in signals:
+                if signal.instrument not in indicators:
+                    indicators[signal.instrument] = market_indicators(history.get(signal.instrument, []))
+                md = all_market_data.get(signal.instrument)
+                price = (md.bid + md.ask) / 2 if md else signal.entry_price
+                context = {'current_price': price, 'timestamp': datetime.now(timezone.utc)}
+                if price and signal.stop_loss and signal.take_profit:
+                    risk = abs(price - signal.stop_loss)
+                    if risk > 0:
+                        context['risk_reward'] = abs(signal.take_profit - price) / risk
+                candidates.append((signal.instrument, signal.side.value.upper(), indicators[signal.instrument], context))
+            return self.quality_scorer.score_signals_batch(candidates)
+        except Exception as e:
+            logger.warning(f"⚠️ Batch quality scoring failed: {e}")
+            return None
+    
     def _generate_ai_insight(self, signal, strategy_name: str, market_data, strategy_data) -> str:
         """
         Generate AI insight explaining why the signal was triggered
@@ -5,82 +5,241 @@ Handles configuration file watching, hot-reload, and system restart signaling
 """
 
 import os
+import sys
 import time
+import select
+import struct
+import ctypes
+import ctypes.util
 import threading
 import logging
 from datetime import datetime
-from typing import Dict, List, Callable, Optional, Any
+from typing import Dict, List, Callable, Optional, Any, Tuple
 from pathlib import Path
 
+import yaml
+
 logger = logging.getLogger(__name__)
 
 
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _Inotify:
+    """Minimal ctypes binding to Linux inotify watching whole directories"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs: Dict[int, str] = {}
+
+    def watch_dir(self, directory: str):
+        # Only completed writes and renames: IN_CLOSE_WRITE fires after the
+        # writer closes the file, IN_MOVED_TO when an atomic rename lands
+        wd = self._add_watch(self.fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+        self.dirs[wd] = directory
+
+    def read_paths(self) -> Tuple[List[str], bool]:
+        """Drain pending events; returns (changed paths, queue overflowed)"""
+        paths, overflow = [], False
+        while True:
+            try:
+                buf = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                elif wd in self.dirs and name:
+                    paths.append(os.path.join(self.dirs[wd], os.fsdecode(name)))
+        return paths, overflow
+
+    def close(self):
+        os.close(self.fd)
+
+
 class ConfigReloader:
     """Manages hot-reload of strategy parameters and config change notifications"""
     
-    def __init__(self):
+    def __init__(self, debounce_seconds: float = 0.25, poll_interval: float = 2.0):
         self.watch_thread = None
         self.is_watching = False
         self.last_modification_times = {}
         self.config_change_callbacks = []
+        self.config_paths: List[Path] = []
+        self.backend = None
+        
+        # Bursts of events for one file (editor saves, copy then chmod) are
+        # coalesced; polling only fires once a file's stat has stopped changing
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self._file_signatures: Dict[str, Optional[Tuple]] = {}
+        self._inotify: Optional[_Inotify] = None
+        self._wake_r = self._wake_w = None
         
         logger.info("✅ Config Reloader initialized")
     
-    def start_watching(self, config_paths: List[Path]):
-        """Start watching configuration files for changes"""
+    def start_watching(self, config_paths: List[Path], use_inotify: Optional[bool] = None):
+        """
+        Start watching configuration files for changes
+        
+        Args:
+            config_paths: Files to watch (their directories are watched, so atomic
+                renames onto these paths are seen)
+            use_inotify: Force the backend; default is inotify when available
+        """
         if self.is_watching:
             logger.warning("⚠️ Already watching config files")
             return
         
         self.is_watching = True
-        self.config_paths = config_paths
+        self.config_paths = [Path(p).resolve() for p in config_paths]
         
-        # Initialize last modification times
-        for path in config_paths:
+        # Initialize last modification times and stat signatures
+        for path in self.config_paths:
+            self._file_signatures[str(path)] = self._signature(path)
             if path.exists():
                 self.last_modification_times[str(path)] = path.stat().st_mtime
         
+        self.backend = 'polling'
+        if use_inotify is not False and sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify()
+                for directory in sorted({str(p.parent) for p in self.config_paths}):
+                    self._inotify.watch_dir(directory)
+                self._wake_r, self._wake_w = os.pipe()
+                self.backend = 'inotify'
+            except (OSError, AttributeError) as e:
+                if use_inotify:
+                    raise
+                logger.warning(f"⚠️ inotify unavailable ({e}) - falling back to polling")
+                if self._inotify:
+                    self._inotify.close()
+                self._inotify = None
+        
         # Start watch thread
-        self.watch_thread = threading.Thread(target=self._watch_loop, daemon=True)
+        target = self._inotify_loop if self.backend == 'inotify' else self._watch_loop
+        self.watch_thread = threading.Thread(target=target, name='config-watcher', daemon=True)
         self.watch_thread.start()
         
-        logger.info(f"👀 Watching {len(config_paths)} config files")
+        logger.info(f"👀 Watching {len(self.config_paths)} config files ({self.backend})")
     
     def stop_watching(self):
         """Stop watching configuration files"""
         self.is_watching = False
+        if self._wake_w is not None:
+            os.write(self._wake_w, b'x')
         if self.watch_thread:
             self.watch_thread.join(timeout=5.0)
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
         logger.info("⏹️ Stopped watching config files")
     
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple]:
+        """Stat identity of a file; changes on in-place writes and on renames"""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+    
+    def _inotify_loop(self):
+        """Block on inotify - no wakeups until a watched file is written or renamed"""
+        watched = {str(p) for p in self.config_paths}
+        while self.is_watching:
+            try:
+                ready, _, _ = select.select([self._inotify.fd, self._wake_r], [], [])
+                if self._wake_r in ready:
+                    break
+                changed, overflow = set(), False
+                # Debounce: keep draining until the directory goes quiet
+                while True:
+                    paths, lost = self._inotify.read_paths()
+                    changed.update(p for p in paths if p in watched)
+                    overflow = overflow or lost
+                    ready, _, _ = select.select([self._inotify.fd, self._wake_r], [], [], self.debounce_seconds)
+                    if not ready or self._wake_r in ready:
+                        break
+                if overflow:
+                    changed = watched
+                for path_str in sorted(changed):
+                    self._process_change(Path(path_str))
+            except Exception as e:
+                if self.is_watching:
+                    logger.error(f"❌ Error in watch loop: {e}")
+                    time.sleep(1)
+    
     def _watch_loop(self):
-        """Background thread that watches for config file changes"""
+        """Polling fallback: a change fires once the file's stat has been stable for the debounce window"""
+        pending: Dict[str, float] = {}
         while self.is_watching:
             try:
+                now = time.monotonic()
                 for config_path in self.config_paths:
-                    if not config_path.exists():
-                        continue
-                    
                     path_str = str(config_path)
-                    current_mtime = config_path.stat().st_mtime
-                    last_mtime = self.last_modification_times.get(path_str)
-                    
-                    if last_mtime and current_mtime > last_mtime:
-                        logger.info(f"📝 Config file changed: {config_path.name}")
-                        self.last_modification_times[path_str] = current_mtime
-                        self._handle_config_change(config_path)
+                    signature = self._signature(config_path)
+                    if signature != self._file_signatures.get(path_str):
+                        self._file_signatures[path_str] = signature
+                        pending[path_str] = now
+                    elif path_str in pending and now - pending[path_str] >= self.debounce_seconds:
+                        del pending[path_str]
+                        self._process_change(config_path, signature)
                 
-                time.sleep(2)  # Check every 2 seconds
+                time.sleep(self.debounce_seconds if pending else self.poll_interval)
                 
             except Exception as e:
                 logger.error(f"❌ Error in watch loop: {e}")
                 time.sleep(5)  # Wait longer on error
     
-    def _handle_config_change(self, config_path: Path):
+    def _process_change(self, config_path: Path, signature: Optional[Tuple] = None):
+        """Parse a changed file and notify callbacks if it is complete and valid"""
+        path_str = str(config_path)
+        if not config_path.exists():
+            return
+        
+        try:
+            with open(config_path, 'r') as f:
+                parsed = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            # A truncated/half-written file fails to parse; the completing write will fire again
+            logger.warning(f"⚠️ Ignoring unparseable config {config_path.name}: {e}")
+            return
+        
+        self._file_signatures[path_str] = signature or self._signature(config_path)
+        self.last_modification_times[path_str] = config_path.stat().st_mtime
+        logger.info(f"📝 Config file changed: {config_path.name}")
+        self._handle_config_change(config_path, parsed)
+    
+    def _handle_config_change(self, config_path: Path, parsed: Any = None):
         """Handle configuration file change"""
         try:
             change_info = {
                 'file': config_path.name,
+                'path': str(config_path),
+                'config': parsed,
                 'timestamp': datetime.now().isoformat()
             }
             
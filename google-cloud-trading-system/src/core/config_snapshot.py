@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Config Snapshot - Immutable, versioned view of the parsed YAML configuration
+Consumers hold a reference and read plain dict/list lookups; a new snapshot
+(with a higher version) is only published when a config file changes.
+"""
+
+import copy
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError("config snapshot is read-only - use YAMLManager.read_config() for a mutable copy")
+
+
+class FrozenDict(dict):
+    """dict that refuses mutation (still an instance of dict for isinstance checks)"""
+    __slots__ = ()
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """list that refuses mutation (still an instance of list for isinstance checks)"""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __copy__(self):
+        return list(self)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts/lists to their read-only counterparts"""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively convert a frozen structure back into plain mutable dicts/lists"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return copy.deepcopy(value)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """One consistent, read-only view of accounts.yaml and strategy_config.yaml"""
+    version: int
+    accounts_config: FrozenDict
+    strategy_config: FrozenDict
+    # path -> (inode, size, mtime_ns) of the files this snapshot was parsed from
+    sources: Dict[str, Optional[Tuple]] = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def accounts(self) -> FrozenList:
+        return self.accounts_config.get('accounts', FrozenList())
+
+    @property
+    def strategies(self) -> FrozenDict:
+        return self.accounts_config.get('strategies', FrozenDict())
+
+    def strategy_section(self, strategy_name: str) -> FrozenDict:
+        """strategy_config.yaml section for one strategy ({} if absent)"""
+        return self.strategy_config.get(strategy_name, FrozenDict())
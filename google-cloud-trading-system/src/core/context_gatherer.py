@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Context Gatherer
+Fetches independent context sources concurrently with per-source deadlines.
+Sources that miss their deadline (or fail) answer with their last good value,
+and a source already being fetched for one request is joined by the others.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def account_ids(accounts: Iterable[Any]) -> List[str]:
+    """
+    Account ids from app config, which holds either ids or accounts.yaml entries
+
+    Args:
+        accounts: Account id strings and/or dicts with an 'id' (or 'account_id')
+
+    Returns:
+        Account id strings, in order, without blanks
+    """
+    ids = []
+    for account in accounts or []:
+        if isinstance(account, dict):
+            account = account.get('id') or account.get('account_id')
+        if account:
+            ids.append(str(account))
+    return ids
+
+
+@dataclass
+class ContextSource:
+    """One piece of assistant context and how long to wait for it"""
+    fetch: Callable[[], Any]
+    ttl: float = 30.0          # seconds a fetched value is served without refetching
+    deadline: float = 1.5      # seconds a request waits before using the last value
+    fallback: Any = None       # answer when there is no last value yet
+
+
+class ContextGatherer:
+    """Concurrent, deadline-bounded source fetches shared across requests"""
+
+    def __init__(self, max_workers: int = 8):
+        """
+        Args:
+            max_workers: Threads available for source fetches across all requests
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='context')
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._values: Dict[str, tuple] = {}  # key -> (fetched_at, value), kept past ttl as the stale answer
+
+    def gather(self, sources: Dict[str, ContextSource]) -> Dict[str, Any]:
+        """
+        Fetch every source at once and wait for each up to its own deadline
+
+        Args:
+            sources: Cache key -> source; keys are shared with concurrent requests,
+                so include any parameters that change the answer
+
+        Returns:
+            Cache key -> value (fresh, last good, or fallback); sources answering
+            None are left out
+        """
+        started = time.monotonic()
+        pending: Dict[str, Future] = {}
+        results: Dict[str, Any] = {}
+
+        with self._lock:
+            for key, source in sources.items():
+                cached = self._values.get(key)
+                if cached and started - cached[0] <= source.ttl:
+                    results[key] = cached[1]
+                    continue
+                future = self._inflight.get(key)
+                if future is None:
+                    future = self._inflight[key] = self._executor.submit(self._fetch, key, source.fetch)
+                pending[key] = future
+
+        for key, future in pending.items():
+            source = sources[key]
+            remaining = max(0.0, started + source.deadline - time.monotonic())
+            try:
+                results[key] = future.result(timeout=remaining)
+            except FutureTimeout:
+                logger.warning(f"⏱️ Context source {key} missed its {source.deadline}s deadline - using last value")
+                results[key] = self._last_value(key, source)
+            except Exception as e:
+                logger.warning(f"⚠️ Context source {key} failed: {e} - using last value")
+                results[key] = self._last_value(key, source)
+
+        return {key: results[key] for key in sources if results.get(key) is not None}
+
+    def _fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Run one fetch and record it, even if every waiting request gave up on it"""
+        try:
+            value = fetch()
+        except BaseException:
+            with self._lock:
+                self._inflight.pop(key, None)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._values[key] = (time.monotonic(), value)
+        return value
+
+    def _last_value(self, key: str, source: ContextSource) -> Any:
+        with self._lock:
+            cached = self._values.get(key)
+        return cached[1] if cached else source.fallback
+
+    def clear(self):
+        """Forget stored values (in-flight fetches still complete)"""
+        with self._lock:
+            self._values.clear()
+
+
+# Global instance
+_context_gatherer: Optional[ContextGatherer] = None
+
+
+def get_context_gatherer() -> ContextGatherer:
+    """Get global context gatherer instance"""
+    global _context_gatherer
+    if _context_gatherer is None:
+        _context_gatherer = ContextGatherer()
+    return _context_gatherer
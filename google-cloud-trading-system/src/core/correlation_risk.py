@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Correlation Risk - Rolling co-movement and currency exposure for RiskManager
+Keeps a rolling correlation matrix of bar-close log returns, updated
+incrementally from running sums as each bar closes, and a net USD exposure
+per currency leg for the open positions. Works the same on live bar closes
+and on stored candles.
+"""
+
+import logging
+import math
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class RollingCorrelation:
+    """Rolling correlation of bar returns across instruments, O(N²) per bar"""
+
+    def __init__(self, window: int = 500, min_periods: int = 50, bar_seconds: int = 60,
+                 instruments: Optional[Iterable[str]] = None):
+        """
+        Args:
+            window: Bars in the rolling window
+            min_periods: Bars needed before correlations are trusted
+            bar_seconds: Bar length used to group live closes into one row
+            instruments: Instruments known up front (others are added on first close)
+        """
+        self.window = window
+        self.min_periods = min_periods
+        self.bar_seconds = bar_seconds
+
+        self.instruments: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.last_close: Dict[str, float] = {}
+        self._rows: deque = deque()
+        self._sum = np.zeros(0)
+        self._cross = np.zeros((0, 0))
+        self._corr = np.zeros((0, 0))
+        self._pending: Dict[str, float] = {}
+        self._pending_bar: Optional[int] = None
+        self._bars_since_rebuild = 0
+        self.version = 0  # bumped whenever the matrix changes
+
+        for instrument in instruments or ():
+            self.ensure_instrument(instrument)
+
+    def ensure_instrument(self, instrument: str) -> int:
+        """Column index of the instrument, adding it if new"""
+        idx = self.index.get(instrument)
+        if idx is not None:
+            return idx
+        idx = len(self.instruments)
+        self.instruments.append(instrument)
+        self.index[instrument] = idx
+        # a new column has no history: zero returns in the buffered rows
+        self._rows = deque(np.append(row, 0.0) for row in self._rows)
+        self._sum = np.append(self._sum, 0.0)
+        self._cross = np.pad(self._cross, ((0, 1), (0, 1)))
+        self._corr = np.pad(self._corr, ((0, 1), (0, 1)))
+        return idx
+
+    @property
+    def bars(self) -> int:
+        return len(self._rows)
+
+    @property
+    def ready(self) -> bool:
+        return len(self._rows) >= self.min_periods
+
+    def update(self, closes: Dict[str, float]):
+        """
+        Add one bar of closes (instruments that did not trade keep their last close)
+
+        Args:
+            closes: Instrument -> bar close
+        """
+        for instrument in closes:
+            self.ensure_instrument(instrument)
+        row = np.zeros(len(self.instruments))
+        for instrument, close in closes.items():
+            previous = self.last_close.get(instrument)
+            if previous and close > 0:
+                row[self.index[instrument]] = math.log(close / previous)
+            if close > 0:
+                self.last_close[instrument] = close
+        self._push(row)
+
+    def on_bar_close(self, instrument: str, close: float, time_ns: int):
+        """
+        Live entry point: closes arriving within one bar are grouped into one row
+
+        The row is committed when the first close of the next bar arrives.
+        """
+        bar = time_ns // int(self.bar_seconds * 1e9)
+        if self._pending_bar is not None and bar != self._pending_bar and self._pending:
+            self.update(self._pending)
+            self._pending = {}
+        self._pending_bar = bar
+        self._pending[instrument] = close
+
+    def _push(self, row: np.ndarray):
+        self._rows.append(row)
+        self._sum += row
+        self._cross += np.outer(row, row)
+        if len(self._rows) > self.window:
+            old = self._rows.popleft()
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+
+        # running sums drift with float error; rebuild from the buffer once per window
+        self._bars_since_rebuild += 1
+        if self._bars_since_rebuild >= self.window:
+            rows = np.array(self._rows)
+            self._sum = rows.sum(axis=0)
+            self._cross = rows.T @ rows
+            self._bars_since_rebuild = 0
+        self._recompute()
+
+    def _recompute(self):
+        n = len(self._rows)
+        if n < 2:
+            return
+        mean = self._sum / n
+        cov = self._cross / n - np.outer(mean, mean)
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.outer(std, std)
+        corr = np.nan_to_num(np.clip(corr, -1.0, 1.0))
+        np.fill_diagonal(corr, 1.0)
+        self._corr = corr
+        self.version += 1
+
+    def matrix(self) -> pd.DataFrame:
+        """Current correlation matrix as a labelled DataFrame"""
+        return pd.DataFrame(self._corr.copy(), index=self.instruments, columns=self.instruments)
+
+    def corr(self, a: str, b: str) -> float:
+        """Correlation between two instruments (0.0 if either is unknown)"""
+        ia, ib = self.index.get(a), self.index.get(b)
+        if ia is None or ib is None:
+            return 0.0
+        return float(self._corr[ia, ib])
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._corr
+
+    @classmethod
+    def from_candles(cls, candles: Dict[str, Any], **kwargs) -> 'RollingCorrelation':
+        """
+        Build from stored candles
+
+        Args:
+            candles: Instrument -> DataFrame with a 'close' column (time index), or
+                OANDA candle dicts with 'time' and 'mid'/'bid' closes
+            **kwargs: RollingCorrelation arguments
+        """
+        tracker = cls(instruments=sorted(candles), **kwargs)
+        tracker.load_candles(candles)
+        return tracker
+
+    def load_candles(self, candles: Dict[str, Any]):
+        """Feed stored candles through update(), aligned on bar time"""
+        closes = pd.DataFrame({instrument: _close_series(data) for instrument, data in candles.items()})
+        closes = closes.sort_index().ffill()
+        for _, row in closes.iterrows():
+            self.update({instrument: close for instrument, close in row.items() if not pd.isna(close)})
+        logger.info(f"📈 Correlation matrix built from {len(closes)} bars of {len(candles)} instruments")
+
+
+def _close_series(data: Any) -> pd.Series:
+    if isinstance(data, pd.DataFrame):
+        return data['close'].astype(float)
+    times, closes = [], []
+    for candle in data:
+        if not candle.get('complete', True):
+            continue
+        prices = candle.get('mid') or candle.get('bid') or candle.get('ask')
+        times.append(pd.Timestamp(candle['time']))
+        closes.append(float(prices['c']))
+    return pd.Series(closes, index=times, dtype=float)
+
+
+def currency_legs(instrument: str) -> Tuple[str, str]:
+    """('EUR', 'USD') for 'EUR_USD'"""
+    base, _, quote = instrument.partition('_')
+    return base, quote
+
+
+def usd_notional(instrument: str, units: float, prices: Dict[str, float]) -> float:
+    """
+    Signed USD value of ``units`` of the instrument's base currency
+
+    Uses the instrument's own price for USD-quoted pairs and the base
+    currency's USD pair from ``prices`` for crosses; falls back to units.
+    """
+    base, quote = currency_legs(instrument)
+    if base == 'USD':
+        return units
+    if quote == 'USD':
+        return units * prices.get(instrument, 1.0)
+    if f'{base}_USD' in prices:
+        return units * prices[f'{base}_USD']
+    if f'USD_{base}' in prices and prices[f'USD_{base}'] > 0:
+        return units / prices[f'USD_{base}']
+    return units
+
+
+def currency_exposure(positions: Dict[str, float], prices: Dict[str, float]) -> Dict[str, float]:
+    """
+    Net USD exposure per currency leg
+
+    A long EUR_USD position is long EUR and short USD by the same notional.
+    """
+    exposure: Dict[str, float] = {}
+    for instrument, units in positions.items():
+        notional = usd_notional(instrument, units, prices)
+        base, quote = currency_legs(instrument)
+        exposure[base] = exposure.get(base, 0.0) + notional
+        exposure[quote] = exposure.get(quote, 0.0) - notional
+    return exposure
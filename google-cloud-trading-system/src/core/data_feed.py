@@ -7,35 +7,285 @@ Production-ready real-time market data streaming for Google Cloud deployment
 import os
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Callable, Union
 from dataclasses import dataclass, asdict
 import threading
 import queue
 import time
 
-from .oanda_client import OandaClient, OandaPrice, get_oanda_client
+import numpy as np
+
+from .oanda_client import (OandaClient, OandaPrice, get_oanda_client,
+                           parse_oanda_time_ns, parse_oanda_times_ns)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _to_time_ns(value: Union[int, float, str, datetime, None]) -> int:
+    """Coerce a timestamp (epoch ns, ISO string or datetime) to epoch nanoseconds.
+
+    Naive datetimes are treated as UTC, which is what OANDA reports.
+    """
+    if value is None or value == '':
+        return time.time_ns()
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value * 1_000_000_000)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        delta = value - _EPOCH
+        return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+    return parse_oanda_time_ns(value)
+
+
+def _time_ns_to_datetime(time_ns: int) -> datetime:
+    """Convert epoch nanoseconds to an aware UTC datetime (microsecond precision)"""
+    return _EPOCH + timedelta(microseconds=time_ns // 1_000)
+
+
 class MarketData:
-    """Enhanced market data with validation"""
-    pair: str
-    bid: float
-    ask: float
-    timestamp: str
-    is_live: bool
-    data_source: str
-    spread: float
-    last_update_age: int
-    volatility_score: float = 0.0
-    regime: str = 'unknown'
-    correlation_risk: float = 0.0
-    confidence: float = 1.0
-    validation_status: str = 'valid'
+    """Compact market tick with an integer-nanosecond timestamp.
+
+    Uses ``__slots__`` instead of a per-instance ``__dict__``. The constructor
+    keeps the field order of the old dataclass, and ``timestamp`` still reads
+    as an ISO string (formatted lazily), so existing strategies keep working.
+    ``instrument`` is accepted as an alias for ``pair``.
+    """
+
+    __slots__ = (
+        'pair', 'bid', 'ask', 'time_ns', 'is_live', 'data_source', 'spread',
+        'last_update_age', 'volatility_score', 'regime', 'correlation_risk',
+        'confidence', 'validation_status', '_timestamp_str',
+    )
+
+    def __init__(self, pair: str = None, bid: float = 0.0, ask: float = 0.0,
+                 timestamp: Union[int, str, datetime, None] = None, is_live: bool = True,
+                 data_source: str = 'OANDA', spread: Optional[float] = None,
+                 last_update_age: int = 0, volatility_score: float = 0.0,
+                 regime: str = 'unknown', correlation_risk: float = 0.0,
+                 confidence: float = 1.0, validation_status: str = 'valid',
+                 instrument: str = None, time_ns: Optional[int] = None):
+        self.pair = pair if pair is not None else instrument
+        self.bid = bid
+        self.ask = ask
+        if time_ns is not None:
+            self.time_ns = time_ns
+            self._timestamp_str = None
+        else:
+            self.time_ns = _to_time_ns(timestamp)
+            # Keep the caller's string so round-trips are byte-identical
+            self._timestamp_str = timestamp if isinstance(timestamp, str) and timestamp else None
+        self.is_live = is_live
+        self.data_source = data_source
+        self.spread = spread if spread is not None else ask - bid
+        self.last_update_age = last_update_age
+        self.volatility_score = volatility_score
+        self.regime = regime
+        self.correlation_risk = correlation_risk
+        self.confidence = confidence
+        self.validation_status = validation_status
+
+    @property
+    def instrument(self) -> str:
+        return self.pair
+
+    def move_to(self, bid: float, ask: float, time_ns: int, timestamp: Optional[str] = None):
+        """Reprice this tick in place (bulk replays keep one object per instrument)"""
+        self.bid = bid
+        self.ask = ask
+        self.spread = ask - bid
+        self.time_ns = time_ns
+        self._timestamp_str = timestamp or None
+
+    @property
+    def timestamp(self) -> str:
+        """ISO-8601 timestamp string (compatibility view of ``time_ns``)"""
+        if self._timestamp_str is None:
+            self._timestamp_str = self.datetime_utc.isoformat()
+        return self._timestamp_str
+
+    @timestamp.setter
+    def timestamp(self, value: Union[int, str, datetime]):
+        self.time_ns = _to_time_ns(value)
+        self._timestamp_str = value if isinstance(value, str) and value else None
+
+    @property
+    def datetime_utc(self) -> datetime:
+        """Timestamp as an aware UTC datetime"""
+        return _time_ns_to_datetime(self.time_ns)
+
+    @property
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with the old dataclass fields (replacement for ``asdict``)"""
+        return {
+            'pair': self.pair,
+            'bid': self.bid,
+            'ask': self.ask,
+            'timestamp': self.timestamp,
+            'is_live': self.is_live,
+            'data_source': self.data_source,
+            'spread': self.spread,
+            'last_update_age': self.last_update_age,
+            'volatility_score': self.volatility_score,
+            'regime': self.regime,
+            'correlation_risk': self.correlation_risk,
+            'confidence': self.confidence,
+            'validation_status': self.validation_status,
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MarketData):
+            return NotImplemented
+        return (self.pair == other.pair and self.bid == other.bid and self.ask == other.ask
+                and self.time_ns == other.time_ns)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"MarketData(pair={self.pair!r}, bid={self.bid}, ask={self.ask}, "
+                f"timestamp={self.timestamp!r}, is_live={self.is_live})")
+
+
+def market_data_to_dict(market: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-ready copy of an instrument -> MarketData mapping (MarketData has no ``__dict__``)"""
+    return {instrument: md.to_dict() if isinstance(md, MarketData) else md
+            for instrument, md in market.items()}
+
+
+class TickBatch:
+    """Struct-of-arrays tick container for one instrument.
+
+    Bulk paths (candle backfill, backtest loops) append into preallocated
+    numpy columns instead of allocating one ``MarketData`` per tick.
+    Indexing materialises a ``MarketData`` on demand.
+    """
+
+    __slots__ = ('pair', 'data_source', 'time_ns', 'bid', 'ask', '_size')
+
+    def __init__(self, pair: str, capacity: int = 1024, data_source: str = 'OANDA'):
+        self.pair = pair
+        self.data_source = data_source
+        capacity = max(int(capacity), 1)
+        self.time_ns = np.empty(capacity, dtype=np.int64)
+        self.bid = np.empty(capacity, dtype=np.float64)
+        self.ask = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, needed: int):
+        capacity = len(self.bid)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        for name in ('time_ns', 'bid', 'ask'):
+            old = getattr(self, name)
+            grown = np.empty(new_capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def append(self, time_ns: int, bid: float, ask: float):
+        """Append a single tick"""
+        self._grow(self._size + 1)
+        i = self._size
+        self.time_ns[i] = time_ns
+        self.bid[i] = bid
+        self.ask[i] = ask
+        self._size = i + 1
+
+    def extend(self, time_ns, bid, ask):
+        """Append equally sized arrays of ticks"""
+        time_ns = np.asarray(time_ns, dtype=np.int64)
+        n = len(time_ns)
+        self._grow(self._size + n)
+        end = self._size + n
+        self.time_ns[self._size:end] = time_ns
+        self.bid[self._size:end] = bid
+        self.ask[self._size:end] = ask
+        self._size = end
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.time_ns[:self._size]
+
+    @property
+    def bids(self) -> np.ndarray:
+        return self.bid[:self._size]
+
+    @property
+    def asks(self) -> np.ndarray:
+        return self.ask[:self._size]
+
+    @property
+    def mid(self) -> np.ndarray:
+        return (self.bids + self.asks) / 2
+
+    @property
+    def spread(self) -> np.ndarray:
+        return self.asks - self.bids
+
+    def __getitem__(self, index: int) -> MarketData:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('TickBatch index out of range')
+        bid = float(self.bid[index])
+        ask = float(self.ask[index])
+        return MarketData(pair=self.pair, bid=bid, ask=ask, time_ns=int(self.time_ns[index]),
+                          is_live=False, data_source=self.data_source, spread=ask - bid)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def to_market_data(self) -> List[MarketData]:
+        """Materialise every row (for code that still wants a list of ticks)"""
+        return list(self)
+
+    @classmethod
+    def from_ticks(cls, ticks: List[MarketData]) -> 'TickBatch':
+        """Build a batch from existing ``MarketData`` objects"""
+        pair = ticks[0].pair if ticks else ''
+        batch = cls(pair, capacity=len(ticks))
+        batch.extend([t.time_ns for t in ticks], [t.bid for t in ticks], [t.ask for t in ticks])
+        return batch
+
+    @classmethod
+    def from_candles(cls, pair: str, candles: List[Dict[str, Any]], complete_only: bool = True,
+                     data_source: str = 'OANDA_CANDLES') -> 'TickBatch':
+        """Build a batch of close prices from raw OANDA candle dicts.
+
+        Uses bid/ask closes when present, otherwise mid closes for both sides.
+        """
+        stamps, bids, asks = [], [], []
+        for c in candles:
+            if complete_only and not c.get('complete', True):
+                continue
+            bid_c = c.get('bid', {}).get('c')
+            ask_c = c.get('ask', {}).get('c')
+            mid_c = c.get('mid', {}).get('c')
+            if bid_c is None or ask_c is None:
+                if mid_c is None:
+                    continue
+                bid_c = ask_c = mid_c
+            stamps.append(c['time'])
+            bids.append(float(bid_c))
+            asks.append(float(ask_c))
+        batch = cls(pair, capacity=len(stamps), data_source=data_source)
+        batch.extend(parse_oanda_times_ns(stamps), bids, asks)
+        return batch
+
 
 @dataclass
 class DataValidationResult:
@@ -215,7 +465,7 @@ class LiveDataFeed:
             pair=oanda_price.instrument,
             bid=oanda_price.bid,
             ask=oanda_price.ask,
-            timestamp=oanda_price.timestamp.isoformat(),
+            time_ns=_to_time_ns(oanda_price.timestamp),
             is_live=oanda_price.is_live,
             data_source='OANDA',
             spread=oanda_price.spread,
@@ -10,7 +10,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
-from .oanda_client import OandaClient, OandaAccount
+from .oanda_client import OandaClient, OandaAccount, get_account_client as get_registered_client
 from .config_loader import get_config_loader, AccountConfig as YAMLAccountConfig
 
 logger = logging.getLogger(__name__)
@@ -241,12 +241,12 @@ class DynamicAccountManager:
         logger.info(f"✅ Loaded {len(self.account_configs)} accounts from environment variables")
     
     def _initialize_accounts(self):
-        """Initialize OANDA clients for each account"""
+        """Attach the shared registry client of each account (one pool and limiter per login)"""
         for account_id, config in self.account_configs.items():
             try:
-                client = OandaClient(
-                    api_key=config.api_key,
+                client = get_registered_client(
                     account_id=account_id,
+                    api_key=config.api_key,
                     environment=config.environment
                 )
                 
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Exit Simulator - Intrabar stop-loss / take-profit / trailing exits for backtests
+Open positions live in numpy arrays; each bar resolves every open position
+against that bar's open/high/low in one vectorized step. Closed positions are
+swap-removed, so a step only touches the positions that are still open.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Which exit wins when a bar's range touches both the stop and the target
+STOP_FIRST = 'stop_first'          # conservative: assume the adverse move came first
+TARGET_FIRST = 'target_first'      # optimistic
+NEAREST_TO_OPEN = 'nearest_to_open'  # whichever level is closer to the bar open
+SAME_BAR_RULES = (STOP_FIRST, TARGET_FIRST, NEAREST_TO_OPEN)
+
+
+@dataclass
+class ExitEvent:
+    """A position closed by the simulator"""
+    position_id: int
+    instrument: str
+    side: str
+    entry_price: float
+    exit_price: float
+    reason: str                 # stop_loss, take_profit, trailing_stop, end_of_data
+    entry_bar: int
+    exit_bar: int
+    entry_time: Any
+    exit_time: Any
+    max_favorable_excursion: float
+    max_adverse_excursion: float
+    tag: Any = None
+
+    @property
+    def price_move(self) -> float:
+        """Exit minus entry in the trade's favour (negative for a loss)"""
+        sign = 1.0 if self.side == 'BUY' else -1.0
+        return sign * (self.exit_price - self.entry_price)
+
+
+class ExitSimulator:
+    """
+    Vectorized exit resolution for any number of open positions
+
+    Rules applied per bar, in order:
+      1. A bar that opens beyond the stop (or target) exits at the open (gap).
+      2. Stop and target are checked against the bar's low/high; if both are
+         inside the range, ``same_bar_rule`` decides which filled first.
+      3. Trailing stops ratchet from the bar's favourable extreme *after* the
+         exit check, so a bar never stops out on a level it created itself.
+    Positions opened on a bar are only checked from the next bar onwards.
+    """
+
+    def __init__(self, instruments: Sequence[str], same_bar_rule: str = STOP_FIRST,
+                 capacity: int = 64):
+        if same_bar_rule not in SAME_BAR_RULES:
+            raise ValueError(f"Unknown same-bar rule '{same_bar_rule}' (expected one of {SAME_BAR_RULES})")
+        self.instruments = list(instruments)
+        self._inst_index = {inst: i for i, inst in enumerate(self.instruments)}
+        self.same_bar_rule = same_bar_rule
+        self._n = 0          # open positions occupy slots [0, _n)
+        self._next_id = 0
+        self._alloc(capacity)
+        self._tags: List[Any] = []
+        self._entry_times: List[Any] = []
+
+    def _alloc(self, capacity: int):
+        def grow(name, dtype, fill):
+            old = getattr(self, name, None)
+            arr = np.full(capacity, fill, dtype=dtype)
+            if old is not None:
+                arr[:len(old)] = old
+            setattr(self, name, arr)
+        grow('_inst', np.int32, -1)
+        grow('_direction', np.int8, 0)       # +1 long, -1 short
+        grow('_entry', float, np.nan)
+        grow('_stop', float, np.nan)
+        grow('_stop0', float, np.nan)        # stop at entry, to tell trailing exits apart
+        grow('_target', float, np.nan)
+        grow('_trail', float, np.nan)        # trailing distance in price units
+        grow('_best', float, np.nan)         # favourable extreme since entry
+        grow('_mfe', float, 0.0)
+        grow('_mae', float, 0.0)
+        grow('_entry_bar', np.int64, -1)
+        grow('_id', np.int64, -1)            # position id (stable while slots move)
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        """Number of open positions"""
+        return self._n
+
+    def open_position(self, instrument: str, side: str, entry_price: float,
+                      stop_loss: Optional[float] = None, take_profit: Optional[float] = None,
+                      trailing_distance: Optional[float] = None, bar_index: int = 0,
+                      entry_time: Any = None, tag: Any = None) -> int:
+        """
+        Register a new open position
+
+        Args:
+            instrument: Instrument traded (must be one of ``instruments``)
+            side: 'BUY' or 'SELL'
+            entry_price: Fill price
+            stop_loss: Initial stop (None for no stop)
+            take_profit: Target (None for no target)
+            trailing_distance: Trail the stop this far behind the best price (None to disable)
+            bar_index: Bar the position was opened on
+            entry_time: Opaque timestamp carried into the ExitEvent
+            tag: Opaque caller object carried into the ExitEvent
+
+        Returns:
+            Position id
+        """
+        if self._n == self._capacity:
+            self._alloc(self._capacity * 2)
+        i = self._n
+        direction = 1 if side == 'BUY' else -1
+        self._inst[i] = self._inst_index[instrument]
+        self._direction[i] = direction
+        self._entry[i] = entry_price
+        self._stop[i] = np.nan if stop_loss is None else stop_loss
+        self._stop0[i] = self._stop[i]
+        self._target[i] = np.nan if take_profit is None else take_profit
+        self._trail[i] = np.nan if trailing_distance is None else trailing_distance
+        self._best[i] = entry_price
+        self._mfe[i] = 0.0
+        self._mae[i] = 0.0
+        self._entry_bar[i] = bar_index
+        self._id[i] = position_id = self._next_id
+        self._tags.append(tag)
+        self._entry_times.append(entry_time)
+        self._n += 1
+        self._next_id += 1
+        return position_id
+
+    def step(self, high: Sequence[float], low: Sequence[float],
+             open_: Optional[Sequence[float]] = None, bar_index: int = 0,
+             bar_time: Any = None) -> List[ExitEvent]:
+        """
+        Resolve one bar for every open position
+
+        Args:
+            high, low, open_: Bar prices, one per entry in ``instruments``
+                (NaN for an instrument without a bar). Without ``open_`` no gap
+                fills are modelled and NEAREST_TO_OPEN falls back to STOP_FIRST.
+            bar_index: Index of this bar
+            bar_time: Timestamp carried into ExitEvents
+
+        Returns:
+            Positions closed on this bar
+        """
+        idx = np.flatnonzero(self._entry_bar[:self._n] < bar_index)
+        if idx.size == 0:
+            return []
+
+        high = np.asarray(high, dtype=float)[self._inst[idx]]
+        low = np.asarray(low, dtype=float)[self._inst[idx]]
+        has_bar = ~(np.isnan(high) | np.isnan(low))
+        bar_open = np.asarray(open_, dtype=float)[self._inst[idx]] if open_ is not None else None
+
+        d = self._direction[idx]
+        long = d > 0
+        entry = self._entry[idx]
+        stop = self._stop[idx]
+        target = self._target[idx]
+        # adverse / favourable extremes of the bar from the position's side
+        adverse = np.where(long, low, high)
+        favourable = np.where(long, high, low)
+
+        with np.errstate(invalid='ignore'):
+            stop_hit = has_bar & ~np.isnan(stop) & (d * (adverse - stop) <= 0)
+            target_hit = has_bar & ~np.isnan(target) & (d * (favourable - target) >= 0)
+
+        exit_price = np.full(idx.size, np.nan)
+        reason = np.full(idx.size, '', dtype=object)
+
+        if bar_open is not None:
+            with np.errstate(invalid='ignore'):
+                gap_stop = stop_hit & (d * (bar_open - stop) <= 0)
+                gap_target = target_hit & ~gap_stop & (d * (bar_open - target) >= 0)
+            exit_price[gap_stop] = bar_open[gap_stop]
+            exit_price[gap_target] = bar_open[gap_target]
+            reason[gap_stop] = 'stop'
+            reason[gap_target] = 'take_profit'
+            stop_hit &= ~(gap_stop | gap_target)
+            target_hit &= ~(gap_stop | gap_target)
+
+        both = stop_hit & target_hit
+        if self.same_bar_rule == TARGET_FIRST:
+            stop_hit &= ~both
+        elif self.same_bar_rule == NEAREST_TO_OPEN and bar_open is not None:
+            target_closer = both & (np.abs(target - bar_open) < np.abs(bar_open - stop))
+            stop_hit &= ~target_closer
+            target_hit &= ~(both & ~target_closer)
+        else:
+            target_hit &= ~both
+
+        exit_price[stop_hit] = stop[stop_hit]
+        exit_price[target_hit] = target[target_hit]
+        reason[stop_hit] = 'stop'
+        reason[target_hit] = 'take_profit'
+
+        # excursions use the whole bar, capped at the exit level for closed positions
+        closed = ~np.isnan(exit_price)
+        fav_move = np.where(has_bar, d * (favourable - entry), 0.0)
+        adv_move = np.where(has_bar, d * (adverse - entry), 0.0)
+        fav_move = np.where(target_hit, d * (target - entry), fav_move)
+        adv_move = np.where(stop_hit, d * (stop - entry), adv_move)
+        self._mfe[idx] = np.maximum(self._mfe[idx], fav_move)
+        self._mae[idx] = np.minimum(self._mae[idx], adv_move)
+
+        # ratchet trailing stops for positions still open
+        trail = self._trail[idx]
+        trailing = has_bar & ~closed & ~np.isnan(trail)
+        if trailing.any():
+            best = np.where(long, np.fmax(self._best[idx], high), np.fmin(self._best[idx], low))
+            candidate = best - d * trail
+            current = np.where(np.isnan(stop), -d * np.inf, stop)
+            new_stop = np.where(long, np.maximum(current, candidate), np.minimum(current, candidate))
+            self._best[idx[trailing]] = best[trailing]
+            self._stop[idx[trailing]] = new_stop[trailing]
+
+        events = []
+        for j in np.flatnonzero(closed):
+            i = int(idx[j])
+            why = reason[j]
+            if why == 'stop':
+                # a stop that was moved by the trail is reported as a trailing exit
+                moved = not np.isnan(self._stop[i]) and self._stop[i] != self._stop0[i]
+                why = 'trailing_stop' if moved else 'stop_loss'
+            events.append(self._event(i, float(exit_price[j]), why, bar_index, bar_time))
+        self._remove(idx[closed])
+        return sorted(events, key=lambda e: e.position_id)
+
+    def close_all(self, prices: Sequence[float], bar_index: int = 0, bar_time: Any = None,
+                  reason: str = 'end_of_data') -> List[ExitEvent]:
+        """Close every open position at the given per-instrument price"""
+        prices = np.asarray(prices, dtype=float)
+        events = [self._event(i, float(prices[self._inst[i]]), reason, bar_index, bar_time)
+                  for i in range(self._n)]
+        self._remove(np.arange(self._n))
+        return sorted(events, key=lambda e: e.position_id)
+
+    _COLUMNS = ('_inst', '_direction', '_entry', '_stop', '_stop0', '_target', '_trail',
+                '_best', '_mfe', '_mae', '_entry_bar', '_id')
+
+    def _remove(self, slots: np.ndarray):
+        """Swap-remove closed slots: the last open position moves into each freed slot"""
+        for i in sorted((int(i) for i in slots), reverse=True):
+            last = self._n - 1
+            if i != last:
+                for name in self._COLUMNS:
+                    column = getattr(self, name)
+                    column[i] = column[last]
+                self._tags[i] = self._tags[last]
+                self._entry_times[i] = self._entry_times[last]
+            self._tags.pop()
+            self._entry_times.pop()
+            self._n = last
+
+    def _event(self, i: int, price: float, reason: str, bar_index: int, bar_time: Any) -> ExitEvent:
+        return ExitEvent(
+            position_id=int(self._id[i]),
+            instrument=self.instruments[self._inst[i]],
+            side='BUY' if self._direction[i] > 0 else 'SELL',
+            entry_price=float(self._entry[i]),
+            exit_price=price,
+            reason=reason,
+            entry_bar=int(self._entry_bar[i]),
+            exit_bar=bar_index,
+            entry_time=self._entry_times[i],
+            exit_time=bar_time,
+            max_favorable_excursion=float(self._mfe[i]),
+            max_adverse_excursion=float(self._mae[i]),
+            tag=self._tags[i],
+        )
+
+    def bar_arrays(self, bars: Dict[str, Dict[str, float]]):
+        """(open, high, low) arrays aligned to ``instruments`` from {instrument: candle}"""
+        n = len(self.instruments)
+        o, h, l = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+        for inst, candle in bars.items():
+            k = self._inst_index.get(inst)
+            if k is not None:
+                o[k] = candle.get('open', np.nan)
+                h[k] = candle['high']
+                l[k] = candle['low']
+        return o, h, l
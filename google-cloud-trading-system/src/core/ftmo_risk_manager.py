@@ -2,11 +2,17 @@
 """
 FTMO Risk Manager
 Implements strict FTMO challenge rules and risk management
+
+Open positions are marked to market on every price tick, so equity, the
+intraday high-water mark and the daily/total drawdown buffers are always
+current; headroom() answers the order path in O(1).
 """
 
 import logging
-from datetime import datetime, date
-from typing import Dict, Optional, Tuple
+import os
+import time
+from datetime import datetime, date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 logging.basicConfig(level=logging.INFO)
@@ -29,6 +35,49 @@ class FTMOAccount:
     last_trade_date: Optional[date] = None
     start_date: date = field(default_factory=lambda: datetime.now().date())
     trading_days: int = 0
+    current_equity: float = 0.0
+    daily_high_equity: float = 0.0
+    open_pnl: float = 0.0
+    daily_date: Optional[date] = None
+
+
+@dataclass
+class Headroom:
+    """Loss the account can still take before an FTMO limit is hit"""
+    equity: float
+    daily_loss_room: float
+    total_loss_room: float
+    daily_drawdown: float
+    total_drawdown: float
+    drawdown_from_high: float
+    
+    @property
+    def room(self) -> float:
+        """Dollars to the nearer of the daily and total loss limits"""
+        return min(self.daily_loss_room, self.total_loss_room)
+    
+    @property
+    def can_trade(self) -> bool:
+        return self.room > 0
+
+
+# Currencies OANDA quotes against USD as CCY_USD; the rest trade as USD_CCY
+_USD_QUOTED = {'EUR', 'GBP', 'AUD', 'NZD', 'XAU', 'XAG'}
+
+
+def conversion_instrument(currency: str) -> str:
+    """OANDA instrument whose price gives the currency's USD rate"""
+    return f"{currency}_USD" if currency in _USD_QUOTED else f"USD_{currency}"
+
+
+def _pnl(instrument: str, units: float, entry_price: float, price: float,
+         quote_to_usd: float = 1.0) -> float:
+    """P&L in USD (``quote_to_usd`` converts a cross's quote-currency P&L)"""
+    pnl = units * (price - entry_price)
+    if instrument.startswith('USD_') and price > 0:
+        return pnl / price
+    return pnl * quote_to_usd
+
 
 class FTMORiskManager:
     """
@@ -73,9 +122,25 @@ class FTMORiskManager:
             current_balance=initial_balance,
             peak_balance=initial_balance,
             daily_start_balance=initial_balance,
-            daily_peak_balance=initial_balance
+            daily_peak_balance=initial_balance,
+            current_equity=initial_balance,
+            daily_high_equity=initial_balance,
+            daily_date=datetime.now().date()
         )
         
+        # trade_id -> {'instrument', 'units' (signed), 'entry_price', 'pnl'}
+        self.positions: Dict[str, Dict] = {}
+        self._by_instrument: Dict[str, Dict[str, Dict]] = {}
+        # currency -> USD per unit, from USD-pair ticks; crosses are marked with it
+        self._usd_rates: Dict[str, float] = {}
+        self._missing_rates = set()
+        self._feeds: List[Any] = []
+        self._client = None
+        self._last_sync = 0.0
+        self.refresh_seconds = 30.0
+        self._next_day_ns = self._midnight_ns(self.account.daily_date)
+        self._update_floors()
+        
         # Set profit target based on phase
         self.profit_target = self.PHASE_1_TARGET if phase == 1 else self.PHASE_2_TARGET
         
@@ -89,12 +154,12 @@ class FTMORiskManager:
     
     def check_daily_drawdown(self) -> Tuple[bool, float, float]:
         """
-        Check if daily drawdown limit has been breached
+        Check if daily drawdown limit has been breached (on live equity)
         
         Returns:
             (can_trade, current_drawdown, remaining_buffer)
         """
-        current_drawdown = (self.account.daily_start_balance - self.account.current_balance) / self.account.daily_start_balance
+        current_drawdown = (self.account.daily_start_balance - self.account.current_equity) / self.account.daily_start_balance
         remaining_buffer = self.MAX_DAILY_DRAWDOWN - current_drawdown
         
         can_trade = current_drawdown < self.MAX_DAILY_DRAWDOWN
@@ -103,18 +168,223 @@ class FTMORiskManager:
     
     def check_total_drawdown(self) -> Tuple[bool, float, float]:
         """
-        Check if total drawdown limit has been breached
+        Check if total drawdown limit has been breached (on live equity)
         
         Returns:
             (can_trade, current_drawdown, remaining_buffer)
         """
-        current_drawdown = (self.account.peak_balance - self.account.current_balance) / self.account.peak_balance
+        current_drawdown = (self.account.peak_balance - self.account.current_equity) / self.account.peak_balance
         remaining_buffer = self.MAX_TOTAL_DRAWDOWN - current_drawdown
         
         can_trade = current_drawdown < self.MAX_TOTAL_DRAWDOWN
         
         return can_trade, current_drawdown, remaining_buffer
     
+    # ---------- Real-time equity ----------
+    @staticmethod
+    def _midnight_ns(day: date) -> int:
+        return int(datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp() * 1e9)
+    
+    def _update_floors(self):
+        # Equity levels at which the limits are hit; they only move when the
+        # day starts or the peak balance changes, so ticks never recompute them
+        account = self.account
+        self._daily_floor = account.daily_start_balance * (1 - self.MAX_DAILY_DRAWDOWN)
+        self._total_floor = account.peak_balance * (1 - self.MAX_TOTAL_DRAWDOWN)
+    
+    def _start_day(self, day: date):
+        account = self.account
+        account.daily_date = day
+        account.trades_today = 0
+        account.daily_start_balance = account.current_balance
+        account.daily_peak_balance = account.current_balance
+        account.daily_high_equity = account.current_equity
+        self._next_day_ns = self._midnight_ns(day)
+        self._update_floors()
+    
+    def _set_open_pnl(self, open_pnl: float):
+        account = self.account
+        account.open_pnl = open_pnl
+        account.current_equity = account.current_balance + open_pnl
+        if account.current_equity > account.daily_high_equity:
+            account.daily_high_equity = account.current_equity
+    
+    def _set_balance(self, balance: float):
+        account = self.account
+        account.current_balance = balance
+        if balance > account.peak_balance:
+            account.peak_balance = balance
+            self._update_floors()
+        if balance > account.daily_peak_balance:
+            account.daily_peak_balance = balance
+        self._set_open_pnl(account.open_pnl)
+    
+    def _quote_to_usd(self, instrument: str) -> Optional[float]:
+        """USD per unit of the instrument's quote currency (None until a rate is seen)"""
+        quote = instrument.rsplit('_', 1)[-1]
+        if quote == 'USD' or instrument.startswith('USD_'):
+            return 1.0
+        rate = self._usd_rates.get(quote)
+        if rate is None and quote not in self._missing_rates:
+            self._missing_rates.add(quote)
+            pair = conversion_instrument(quote)
+            logger.warning(f"⚠️ No {quote}->USD rate yet - {instrument} is marked once {pair} ticks")
+            for feed in self._feeds:
+                feed.add_instruments([pair])
+        return rate
+    
+    def track_position(self, trade_id: str, instrument: str, units: float, entry_price: float,
+                       price: Optional[float] = None):
+        """
+        Mark an open position to market from now on
+        
+        Args:
+            trade_id: Broker trade ID
+            instrument: Instrument (e.g. 'XAU_USD')
+            units: Signed units (negative = short)
+            entry_price: Fill price
+            price: Current exit-side price (defaults to the entry price)
+        """
+        self.forget_position(trade_id)
+        position = {'instrument': instrument, 'units': float(units), 'entry_price': float(entry_price),
+                    'pnl': 0.0}
+        rate = self._quote_to_usd(instrument)
+        if price is not None and rate is not None:
+            position['pnl'] = _pnl(instrument, position['units'], position['entry_price'], price, rate)
+        self.positions[trade_id] = position
+        self._by_instrument.setdefault(instrument, {})[trade_id] = position
+        self._set_open_pnl(self.account.open_pnl + position['pnl'])
+    
+    def forget_position(self, trade_id: str) -> Optional[Dict]:
+        """Stop marking a position (its open P&L leaves equity)"""
+        position = self.positions.pop(trade_id, None)
+        if position is None:
+            return None
+        del self._by_instrument[position['instrument']][trade_id]
+        if not self._by_instrument[position['instrument']]:
+            del self._by_instrument[position['instrument']]
+        self._set_open_pnl(self.account.open_pnl - position['pnl'] if self.positions else 0.0)
+        return position
+    
+    def update_price(self, instrument: str, bid: float, ask: float, time_ns: Optional[int] = None):
+        """
+        Mark positions on one instrument to a new quote
+        
+        Longs are marked at the bid and shorts at the ask. Only the changed
+        positions' P&L is re-computed, so each tick is O(1) per position.
+        USD pairs also refresh the rate crosses are converted with.
+        """
+        if time_ns is not None and time_ns >= self._next_day_ns:
+            self._start_day(datetime.fromtimestamp(time_ns / 1e9).date())
+        
+        if instrument.endswith('_USD'):
+            self._usd_rates[instrument[:-4]] = (bid + ask) / 2
+        elif instrument.startswith('USD_') and bid + ask > 0:
+            self._usd_rates[instrument[4:]] = 2 / (bid + ask)
+        
+        positions = self._by_instrument.get(instrument)
+        if not positions:
+            return
+        rate = self._quote_to_usd(instrument)
+        if rate is None:
+            return
+        delta = 0.0
+        for position in positions.values():
+            price = bid if position['units'] > 0 else ask
+            pnl = _pnl(instrument, position['units'], position['entry_price'], price, rate)
+            delta += pnl - position['pnl']
+            position['pnl'] = pnl
+        self._set_open_pnl(self.account.open_pnl + delta)
+    
+    def on_tick(self, tick):
+        """Mark to a MarketData tick"""
+        self.update_price(tick.pair, tick.bid, tick.ask, tick.time_ns)
+    
+    def on_prices(self, market_data: Dict):
+        """LiveDataFeed callback (re-syncs with the broker when due)"""
+        if self._client is not None and time.time() - self._last_sync >= self.refresh_seconds:
+            self.sync_account()
+        for tick in market_data.values():
+            if tick is not None:
+                self.on_tick(tick)
+    
+    def sync_account(self, client=None) -> int:
+        """
+        Mirror the broker's balance and open trades
+        
+        Trades closed since the last sync leave the book and their realized
+        P&L arrives through the broker balance, so fills made by any order
+        path are counted exactly once.
+        
+        Returns:
+            Number of positions being marked
+        """
+        client = client or self._client
+        if client is None:
+            return len(self.positions)
+        try:
+            balance = client.get_account_info().balance
+            trades = client.get_open_trades()
+        except Exception as e:
+            logger.warning(f"⚠️ FTMO account sync failed: {e}")
+            return len(self.positions)
+        
+        seen = set()
+        for trade in trades:
+            trade_id = str(trade['id'])
+            units, entry_price = float(trade.get('currentUnits', 0)), float(trade['price'])
+            seen.add(trade_id)
+            known = self.positions.get(trade_id)
+            if known is None or known['units'] != units or known['entry_price'] != entry_price:
+                self.track_position(trade_id, trade['instrument'], units, entry_price)
+        for trade_id in [t for t in self.positions if t not in seen]:
+            self.forget_position(trade_id)
+        self._set_balance(balance)
+        self._last_sync = time.time()
+        return len(self.positions)
+    
+    def attach(self, feed, client=None) -> 'FTMORiskManager':
+        """
+        Subscribe to a LiveDataFeed so equity follows every tick
+        
+        Args:
+            feed: LiveDataFeed for the FTMO account
+            client: OandaClient of that account; when given, balance and open
+                trades are loaded now and re-synced every refresh_seconds
+        """
+        if any(attached is feed for attached in self._feeds):
+            return self
+        # conversion pairs for crosses already tracked; later ones are added as they appear
+        feed.add_instruments(sorted({conversion_instrument(quote) for quote in self._missing_rates}))
+        self._feeds.append(feed)
+        if client is not None:
+            self._client = client
+            self.sync_account()
+        feed.add_data_callback(self.on_prices)
+        logger.info(f"📡 FTMO equity tracker attached to live feed ({len(self.positions)} positions)")
+        return self
+    
+    def headroom(self) -> Headroom:
+        """
+        Current distance to the FTMO loss limits, for the order path
+        
+        Returns:
+            Headroom with dollar room to the daily and total limits and the
+            live drawdowns; O(1), safe to call before every order
+        """
+        if time.time_ns() >= self._next_day_ns:
+            self._start_day(datetime.now().date())
+        account = self.account
+        equity = account.current_equity
+        return Headroom(
+            equity=equity,
+            daily_loss_room=equity - self._daily_floor,
+            total_loss_room=equity - self._total_floor,
+            daily_drawdown=(account.daily_start_balance - equity) / account.daily_start_balance,
+            total_drawdown=(account.peak_balance - equity) / account.peak_balance,
+            drawdown_from_high=(account.daily_high_equity - equity) / account.daily_high_equity,
+        )
+    
     def can_trade(self, open_positions: int = 0) -> Tuple[bool, str]:
         """
         Check if trading is allowed based on FTMO rules
@@ -122,6 +392,9 @@ class FTMORiskManager:
         Returns:
             (can_trade, reason)
         """
+        if time.time_ns() >= self._next_day_ns:
+            self._start_day(datetime.now().date())
+        
         # Check daily drawdown
         daily_ok, daily_dd, daily_buffer = self.check_daily_drawdown()
         if not daily_ok:
@@ -153,8 +426,12 @@ class FTMORiskManager:
         Returns:
             units to trade
         """
-        # Calculate risk per trade in dollars
-        risk_dollars = self.account.current_balance * self.MAX_RISK_PER_TRADE
+        # Calculate risk per trade in dollars, never more than a stop-out can afford
+        risk_dollars = min(self.account.current_balance * self.MAX_RISK_PER_TRADE,
+                           max(0.0, self.headroom().room))
+        if risk_dollars <= 0:
+            logger.warning("⚠️ No drawdown headroom left - position size 0")
+            return 0
         
         # Calculate pip value based on instrument
         if instrument == "XAU_USD":
@@ -235,10 +512,9 @@ class FTMORiskManager:
         today = datetime.now().date()
         
         # Reset daily counters if new day
+        if self.account.daily_date != today:
+            self._start_day(today)
         if self.account.last_trade_date != today:
-            self.account.trades_today = 0
-            self.account.daily_start_balance = self.account.current_balance
-            self.account.daily_peak_balance = self.account.current_balance
             self.account.trading_days += 1
             self.account.last_trade_date = today
             logger.info(f"📅 New trading day {self.account.trading_days}")
@@ -250,18 +526,28 @@ class FTMORiskManager:
         logger.info(f"   Units: {units}, SL: {stop_loss}, TP: {take_profit}")
         logger.info(f"   Trades today: {self.account.trades_today}/{self.MAX_DAILY_TRADES}")
     
-    def record_trade_exit(self, profit_loss: float, is_win: bool):
-        """Record trade exit and update account state"""
-        # Update balance
-        self.account.current_balance += profit_loss
+    def record_trade_exit(self, profit_loss: float, is_win: bool, trade_id: Optional[str] = None):
+        """
+        Record trade exit and update account state
         
-        # Update peak balance
-        if self.account.current_balance > self.account.peak_balance:
-            self.account.peak_balance = self.account.current_balance
+        Args:
+            profit_loss: Realized P&L
+            is_win: Whether the trade won
+            trade_id: Tracked position being closed (its open P&L is released)
         
-        # Update daily peak
-        if self.account.current_balance > self.account.daily_peak_balance:
-            self.account.daily_peak_balance = self.account.current_balance
+        With a broker client attached the broker is the only source of balance
+        and open positions: the exit re-syncs instead of adding ``profit_loss``
+        to a balance that already contains it. Without one (backtests) the P&L
+        is booked here and only the given ``trade_id`` is released.
+        """
+        if self._client is not None:
+            self.sync_account()
+        else:
+            if trade_id is not None:
+                self.forget_position(trade_id)
+            elif self.positions:
+                logger.warning("⚠️ Trade exit recorded without trade_id - tracked positions left as they are")
+            self._set_balance(self.account.current_balance + profit_loss)
         
         # Update win/loss stats
         if is_win:
@@ -293,6 +579,7 @@ class FTMORiskManager:
         
         daily_dd_ok, daily_dd, daily_buffer = self.check_daily_drawdown()
         total_dd_ok, total_dd, total_buffer = self.check_total_drawdown()
+        headroom = self.headroom()
         
         win_rate = (self.account.wins / self.account.total_trades * 100) if self.account.total_trades > 0 else 0
         
@@ -315,6 +602,11 @@ class FTMORiskManager:
             'phase': self.phase,
             'status': status,
             'balance': self.account.current_balance,
+            'equity': self.account.current_equity,
+            'open_pnl': self.account.open_pnl,
+            'open_positions': len(self.positions),
+            'headroom': headroom.room,
+            'daily_high_equity': self.account.daily_high_equity,
             'profit': profit,
             'profit_pct': profit_pct,
             'target_profit': target_profit,
@@ -379,14 +671,15 @@ Consecutive Losses: {report['consecutive_losses']} (max: {report['max_consecutiv
     
     def reset_daily_counters(self):
         """Reset daily counters at start of new trading day"""
-        self.account.trades_today = 0
-        self.account.daily_start_balance = self.account.current_balance
-        self.account.daily_peak_balance = self.account.current_balance
+        self._start_day(datetime.now().date())
         logger.info("🔄 Daily counters reset")
 
 # Singleton instance
 _ftmo_risk_manager = None
 
+# Account whose equity the live FTMO tracker follows (unset = no FTMO account)
+FTMO_ACCOUNT_ENV = 'FTMO_ACCOUNT_ID'
+
 def get_ftmo_risk_manager(initial_balance: float = 100000, phase: int = 1) -> FTMORiskManager:
     """Get or create FTMO risk manager singleton"""
     global _ftmo_risk_manager
@@ -395,5 +688,24 @@ def get_ftmo_risk_manager(initial_balance: float = 100000, phase: int = 1) -> FT
     return _ftmo_risk_manager
 
 
+def attach_ftmo_account(feed) -> Optional[FTMORiskManager]:
+    """
+    Follow the FTMO account's live equity at trading-system startup
 
+    Attaches the FTMO risk manager to that account's LiveDataFeed (or the
+    matching feed of a MultiAccountDataFeed) with the account's shared OANDA
+    client, so open positions and balance are mirrored from the broker.
 
+    Returns:
+        The attached manager, or None when FTMO_ACCOUNT_ID is unset or has no feed
+    """
+    account_id = os.getenv(FTMO_ACCOUNT_ENV)
+    if not account_id:
+        return None
+    feeds = getattr(feed, 'data_feeds', None)
+    account_feed = feeds.get(account_id) if feeds is not None else feed
+    if account_feed is None:
+        logger.warning(f"⚠️ No live feed for FTMO account {account_id} - equity tracking not attached")
+        return None
+    from .oanda_client import get_account_client
+    return get_ftmo_risk_manager().attach(account_feed, client=get_account_client(account_id))
@@ -216,65 +216,71 @@ class GracefulRestartManager:
                 'error': str(e)
             }
     
+    def _live_scanners(self) -> List[Any]:
+        """Scanner instances already running in this process (never creates one)"""
+        import sys
+        scanners = []
+        main_module = sys.modules.get('__main__')
+        candidates = [
+            getattr(main_module, 'scanner', None) if main_module else None,
+            getattr(sys.modules.get('src.core.simple_timer_scanner'), '_simple_scanner', None),
+            getattr(sys.modules.get('src.core.candle_based_scanner'), '_scanner', None),
+        ]
+        for scanner in candidates:
+            if scanner is not None and all(scanner is not s for s in scanners):
+                scanners.append(scanner)
+        return scanners
+    
     def restart_scanner(self) -> Dict[str, Any]:
         """
-        Restart the trading scanner with new configuration
+        Apply the new configuration to the running scanner(s) in place
+        
+        Strategy instances keep their price histories, indicator state and
+        cooldown timers; only changed parameters are swapped in between scans.
+        History is only re-fetched when a change needs a longer lookback.
         
         Returns:
             Dict with success status
         """
         try:
-            # Get the global scanner instance
-            import sys
-            main_module = sys.modules.get('__main__')
-            
-            if not main_module:
-                return {
-                    'success': False,
-                    'error': 'Main module not found'
-                }
-            
-            scanner = getattr(main_module, 'scanner', None)
+            scanners = self._live_scanners()
             
-            if not scanner:
+            if not scanners:
                 logger.warning("⚠️ Scanner not found, will initialize on next run")
                 return {
                     'success': True,
                     'message': 'Scanner will be initialized on next scheduled run'
                 }
             
-            # Stop current scanner if running
-            if hasattr(scanner, 'is_running') and scanner.is_running:
-                logger.info("🛑 Stopping current scanner...")
-                if hasattr(scanner, 'stop'):
-                    scanner.stop()
-                time.sleep(2)
-            
-            # Reinitialize scanner with new config
-            logger.info("🔄 Reinitializing scanner with new configuration...")
-            from ..core.simple_timer_scanner import get_simple_scanner
-            
-            # Force recreation of singleton
-            import importlib
-            scanner_module = sys.modules.get('src.core.simple_timer_scanner')
-            if scanner_module and hasattr(scanner_module, '_simple_scanner'):
-                scanner_module._simple_scanner = None
-            
-            new_scanner = get_simple_scanner()
+            swaps = []
+            skipped = []
+            for scanner in scanners:
+                if not hasattr(scanner, 'hot_swap_parameters'):
+                    logger.warning(f"⚠️ {type(scanner).__name__} does not support hot swap - skipping")
+                    skipped.append(type(scanner).__name__)
+                    continue
+                logger.info(f"🔁 Hot-swapping parameters on {type(scanner).__name__}...")
+                swaps.append(scanner.hot_swap_parameters())
             
-            # Update global reference
-            if main_module:
-                setattr(main_module, 'scanner', new_scanner)
+            if not swaps:
+                logger.error(f"❌ No running scanner supports hot swap ({', '.join(skipped)}) - configuration not applied")
+                return {
+                    'success': False,
+                    'error': 'No running scanner supports hot swap',
+                    'skipped': skipped
+                }
             
-            logger.info("✅ Scanner restarted successfully")
+            logger.info("✅ Scanner configuration updated in place")
             
             return {
                 'success': True,
-                'scanner_reinitialized': True
+                'scanner_reinitialized': False,
+                'hot_swaps': swaps,
+                'skipped': skipped
             }
             
         except Exception as e:
-            logger.error(f"❌ Failed to restart scanner: {e}")
+            logger.error(f"❌ Failed to update scanner: {e}")
             logger.exception("Full traceback:")
             return {
                 'success': False,
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Hot Parameter Swap - Apply strategy config changes to live strategies in place
+Price histories, indicator state and cooldown timers survive a config change;
+only changed fields are swapped in, atomically between scans.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# strategy_config.yaml keys that describe wiring, not strategy attributes
+STRUCTURAL_KEYS = {'locked', 'enabled', 'account', 'instruments', 'name', 'display_name', 'description'}
+
+# Integer attributes ending in one of these set how many bars a strategy looks back
+LOOKBACK_SUFFIXES = ('_period', '_lookback', 'lookback', '_window')
+
+DEFAULT_GRANULARITY = 'M5'
+
+
+def flatten_strategy_params(section: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten one strategy's strategy_config.yaml section to attribute -> value
+
+    Nested groups (parameters, entry, risk, profit_protection, ...) are
+    flattened by leaf name; structural keys are dropped.
+    """
+    flat = {}
+    for key, value in (section or {}).items():
+        if key in STRUCTURAL_KEYS:
+            continue
+        if isinstance(value, dict):
+            flat.update(flatten_strategy_params(value))
+        else:
+            flat[key] = value
+    return flat
+
+
+def _coerce(current: Any, new: Any) -> Any:
+    """Keep the attribute's existing numeric type (YAML gives 15 for 15.0)"""
+    if isinstance(current, bool) or isinstance(new, bool):
+        return new
+    if isinstance(current, float) and isinstance(new, int):
+        return float(new)
+    return new
+
+
+def hot_swappable(strategy) -> frozenset:
+    """Attributes the strategy allows config to change live (``HOT_SWAP_PARAMS``); none if undeclared"""
+    return frozenset(getattr(strategy, 'HOT_SWAP_PARAMS', ()))
+
+
+def _attribute_changes(strategy, params: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    changes = {}
+    for key, value in params.items():
+        if key.startswith('_') or not hasattr(strategy, key):
+            continue
+        current = getattr(strategy, key)
+        if callable(current) or isinstance(current, (dict, list, set)):
+            continue
+        new = _coerce(current, value)
+        if current != new:
+            changes[key] = (current, new)
+    return changes
+
+
+def diff_parameters(strategy, params: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Hot-swappable parameters that exist on the strategy and would change
+
+    Returns:
+        {attribute: (old_value, new_value)}
+    """
+    allowed = hot_swappable(strategy)
+    return {key: change for key, change in _attribute_changes(strategy, params).items() if key in allowed}
+
+
+def refused_parameters(strategy, params: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Config values that would change a strategy attribute not declared hot-swappable
+
+    Risk limits and sizing are hardcoded in the strategies on purpose; these
+    are reported and left alone.
+
+    Returns:
+        {attribute: (current_value, requested_value)}
+    """
+    allowed = hot_swappable(strategy)
+    return {key: change for key, change in _attribute_changes(strategy, params).items() if key not in allowed}
+
+
+def required_lookback(strategy, overrides: Optional[Dict[str, Any]] = None) -> int:
+    """Longest lookback (in bars) implied by the strategy's period-like attributes"""
+    values = {k: v for k, v in vars(strategy).items() if k.endswith(LOOKBACK_SUFFIXES)}
+    if overrides:
+        values.update({k: v for k, v in overrides.items() if k.endswith(LOOKBACK_SUFFIXES)})
+    bars = [int(v) for v in values.values()
+            if isinstance(v, (int, float)) and not isinstance(v, bool) and v > 0]
+    return max(bars, default=0)
+
+
+def history_shortfall(strategy, bars: int) -> List[str]:
+    """Instruments whose price history is shorter than ``bars``"""
+    history = getattr(strategy, 'price_history', None)
+    if not isinstance(history, dict) or bars <= 0:
+        return []
+    return [inst for inst in getattr(strategy, 'instruments', [])
+            if len(history.get(inst, [])) < bars]
+
+
+def history_cap(strategy) -> Optional[int]:
+    """Most bars the strategy keeps per instrument (``max_history``), None if unbounded"""
+    cap = getattr(strategy, 'max_history', None)
+    return int(cap) if isinstance(cap, int) and not isinstance(cap, bool) and cap > 0 else None
+
+
+def _as_history_element(bar: Dict[str, Any], sample: Any) -> Any:
+    """
+    Shape a fetched bar like an element the strategy already keeps
+
+    Float histories get the close; dict-candle histories get the same keys
+    as ``sample``. Returns None for element types we cannot reproduce.
+    """
+    if isinstance(sample, (int, float)) and not isinstance(sample, bool):
+        return float(bar['close'])
+    if isinstance(sample, dict):
+        if not set(sample) <= set(bar):
+            return None
+        element = {key: bar[key] for key in sample}
+        if 'timestamp' in element and isinstance(sample['timestamp'], datetime):
+            element['timestamp'] = datetime.strptime(str(bar['timestamp'])[:19], '%Y-%m-%dT%H:%M:%S')
+        return element
+    return None
+
+
+def merge_older_history(existing: List[Any], fetched: List[Dict[str, Any]],
+                        cap: Optional[int] = None) -> List[Any]:
+    """
+    Prepend fetched bars older than the live history, shaped like its elements
+
+    ``fetched`` ends at the latest closed bar, as does ``existing``; only the
+    leading part that the live history does not already cover is added, so
+    live ticks appended since the fetch are kept as they are. With ``cap``
+    no more is added than the strategy would keep. An empty history or an
+    element type we cannot reproduce is returned unchanged.
+    """
+    room = len(fetched) - len(existing)
+    if cap is not None:
+        room = min(room, cap - len(existing))
+    if room <= 0 or not existing:
+        return list(existing)
+    older = [_as_history_element(bar, existing[0]) for bar in fetched[:len(fetched) - len(existing)][-room:]]
+    if any(element is None for element in older):
+        return list(existing)
+    return older + list(existing)
+
+
+def _candle_bars(candles: Dict[str, Any]) -> List[Dict[str, Any]]:
+    bars = []
+    for candle in (candles or {}).get('candles', []):
+        for side in ('mid', 'bid', 'ask'):
+            prices = candle.get(side)
+            if isinstance(prices, dict) and prices.get('c'):
+                bars.append({
+                    'timestamp': candle.get('time', ''),
+                    'open': float(prices.get('o', prices['c'])),
+                    'high': float(prices.get('h', prices['c'])),
+                    'low': float(prices.get('l', prices['c'])),
+                    'close': float(prices['c']),
+                    'volume': candle.get('volume', 0),
+                })
+                break
+    return bars
+
+
+class HotParameterSwapMixin:
+    """
+    Mixin giving a scanner in-place parameter updates
+
+    Only attributes a strategy lists in its ``HOT_SWAP_PARAMS`` are changed;
+    other config values matching a strategy attribute are logged and refused.
+
+    The scanner must hold ``self.strategies`` (display name -> instance) and
+    ``self.accounts`` (display name -> account id), and wrap each scan in
+    ``self._scan_lock`` so swaps land between scans.
+    """
+
+    def init_hot_swap(self, strategy_loaders: Dict[str, Callable], strategy_types: Dict[str, str]):
+        """Remember how strategies were built so config changes can be reconciled"""
+        self._scan_lock = threading.RLock()
+        self._strategy_loaders = strategy_loaders
+        self.strategy_types = strategy_types
+        self.last_hot_swap = None
+        self.config_version = None
+        try:
+            from .yaml_manager import get_yaml_manager
+            self.config_version = get_yaml_manager().get_snapshot().version
+        except Exception as e:
+            logger.warning(f"⚠️ Config snapshot unavailable for hot swap: {e}")
+
+    def sync_config(self) -> Optional[Dict[str, Any]]:
+        """
+        Hot-swap if a newer config snapshot has been published since the last swap
+
+        Cheap enough to call before every scan: an int comparison unless the
+        config files actually changed.
+        """
+        try:
+            from .yaml_manager import get_yaml_manager
+            snapshot = get_yaml_manager().get_snapshot()
+        except Exception as e:
+            logger.warning(f"⚠️ Config snapshot unavailable: {e}")
+            return None
+        if snapshot.version == self.config_version:
+            return None
+        return self.hot_swap_parameters(snapshot.strategy_config, snapshot.accounts, version=snapshot.version)
+
+    def _fetch_candles(self, instrument: str, granularity: str, count: int) -> List[Dict[str, Any]]:
+        """Recent OHLCV bars from OANDA - only used when a longer lookback is needed"""
+        client = getattr(self, 'oanda', None) or getattr(self, 'oanda_client', None)
+        if client is None:
+            from .oanda_client import get_oanda_client
+            client = get_oanda_client()
+        return _candle_bars(client.get_candles(instrument, granularity=granularity,
+                                                 count=count, price='M'))
+
+    def _reconcile_accounts(self, yaml_accounts: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """Work out which strategies to add or drop for the new accounts config"""
+        wanted = {}
+        for acc in yaml_accounts:
+            if acc.get('active', False) and acc.get('strategy') in self._strategy_loaders:
+                wanted[acc.get('display_name', acc.get('name'))] = (acc['strategy'], acc['id'])
+        added = [n for n, (stype, _) in wanted.items()
+                 if n not in self.strategies or self.strategy_types.get(n) != stype]
+        removed = [n for n in self.strategies if n not in wanted]
+        return {'wanted': wanted, 'added': added, 'removed': removed}
+
+    def hot_swap_parameters(self, strategy_config: Optional[Dict[str, Any]] = None,
+                            yaml_accounts: Optional[List[Dict[str, Any]]] = None,
+                            version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Apply strategy_config.yaml / accounts.yaml changes without rebuilding the scanner
+
+        Args:
+            strategy_config: Parsed strategy_config.yaml (current snapshot if None)
+            yaml_accounts: Accounts from accounts.yaml (current snapshot if None)
+            version: Snapshot version the config came from
+
+        Returns:
+            Summary with changed and refused fields per strategy and any history top-ups
+        """
+        if strategy_config is None or yaml_accounts is None:
+            from .yaml_manager import get_yaml_manager
+            snapshot = get_yaml_manager().get_snapshot()
+            version = snapshot.version
+            if strategy_config is None:
+                strategy_config = snapshot.strategy_config
+            if yaml_accounts is None:
+                yaml_accounts = snapshot.accounts
+
+        accounts = self._reconcile_accounts(yaml_accounts) if yaml_accounts else None
+
+        # Plan outside the lock: scans keep running while we diff and fetch
+        new_strategies = {}
+        if accounts:
+            for name in accounts['added']:
+                stype = accounts['wanted'][name][0]
+                new_strategies[name] = self._strategy_loaders[stype]()
+
+        plans = {}
+        refusals = {}
+        candidates = dict(self.strategies)
+        candidates.update(new_strategies)
+        for name, strategy in candidates.items():
+            if accounts and name in accounts['removed']:
+                continue
+            stype = accounts['wanted'][name][0] if accounts else self.strategy_types.get(name)
+            params = flatten_strategy_params(strategy_config.get(stype, {}))
+            changes = diff_parameters(strategy, params)
+            refused = refused_parameters(strategy, params)
+            if refused:
+                logger.warning(f"⚠️ {name}: {', '.join(sorted(refused))} not hot-swappable - keeping "
+                               + ', '.join(f"{k}={old}" for k, (old, _) in sorted(refused.items())))
+                refusals[name] = refused
+            bars = required_lookback(strategy, {k: new for k, (_, new) in changes.items()})
+            short = history_shortfall(strategy, bars) if bars > required_lookback(strategy) else []
+            cap = history_cap(strategy)
+            if cap is not None and bars > cap:
+                logger.warning(f"⚠️ {name} lookback of {bars} bars exceeds its {cap}-bar history - topping up to {cap}")
+                bars = cap
+                short = history_shortfall(strategy, bars) if short else []
+            if changes or short:
+                plans[name] = {'strategy': strategy, 'changes': changes, 'bars': bars, 'short': short}
+
+        # Network only when a change needs more history than the strategy holds
+        fetched = {}
+        for name, plan in plans.items():
+            strategy = plan['strategy']
+            granularity = getattr(strategy, 'granularity', None) or getattr(strategy, 'timeframe', None) or DEFAULT_GRANULARITY
+            for inst in plan['short']:
+                try:
+                    fetched[(name, inst)] = self._fetch_candles(inst, granularity, plan['bars'])
+                except Exception as e:
+                    logger.warning(f"⚠️ History top-up failed for {name} {inst}: {e}")
+
+        topped_up = []
+        with self._scan_lock:
+            if accounts:
+                for name in accounts['removed']:
+                    self.strategies.pop(name, None)
+                    self.accounts.pop(name, None)
+                    self.strategy_types.pop(name, None)
+                for name in accounts['added']:
+                    stype, account_id = accounts['wanted'][name]
+                    self.strategies[name] = new_strategies[name]
+                    self.accounts[name] = account_id
+                    self.strategy_types[name] = stype
+            for name, plan in plans.items():
+                strategy = plan['strategy']
+                for key, (_, new) in plan['changes'].items():
+                    setattr(strategy, key, new)
+                for inst in plan['short']:
+                    bars = fetched.get((name, inst))
+                    if not bars:
+                        continue
+                    existing = strategy.price_history.get(inst, [])
+                    merged = merge_older_history(existing, bars, history_cap(strategy))
+                    if len(merged) > len(existing):
+                        strategy.price_history[inst] = merged
+                        topped_up.append(f"{name}:{inst}")
+
+        summary = {
+            'timestamp': datetime.now().isoformat(),
+            'changed': {name: {k: {'old': old, 'new': new} for k, (old, new) in plan['changes'].items()}
+                        for name, plan in plans.items() if plan['changes']},
+            'refused': {name: {k: {'current': old, 'requested': new} for k, (old, new) in refused.items()}
+                        for name, refused in refusals.items()},
+            'history_topped_up': sorted(topped_up),
+            'added': accounts['added'] if accounts else [],
+            'removed': accounts['removed'] if accounts else [],
+            'config_version': version,
+        }
+        self.last_hot_swap = summary
+        if version is not None:
+            self.config_version = version
+        n_fields = sum(len(c) for c in summary['changed'].values())
+        logger.info(f"🔁 Hot swap applied: {n_fields} field(s) across {len(summary['changed'])} strategies, "
+                    f"{len(topped_up)} history top-up(s), +{len(summary['added'])}/-{len(summary['removed'])} strategies")
+        return summary
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Ledger Monte Carlo - Vectorized resampling over a precomputed trade ledger
+Signals and per-trade outcomes are computed once by a backtest; every Monte
+Carlo path is then a numpy resample of that ledger (bootstrap, block
+bootstrap or trade-order shuffle) with drawdown and ruin statistics.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('bootstrap', 'block_bootstrap', 'shuffle')
+
+
+def _chronological(trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Trades sorted by exit time (or entry time); input order if neither is usable"""
+    for key in ('exit_time', 'timestamp'):
+        if trades and all(t.get(key) is not None for t in trades):
+            try:
+                return sorted(trades, key=lambda t: t[key])  # stable: ties keep backtest order
+            except TypeError as e:
+                logger.warning(f"⚠️ Trade ledger left in backtest order - '{key}' values not comparable: {e}")
+                return list(trades)
+    return list(trades)
+
+
+@dataclass
+class TradeLedger:
+    """Per-trade outcomes of one backtest, as fractions of equity at entry"""
+    returns: np.ndarray
+    pnl: np.ndarray
+    initial_balance: float
+    timestamps: List[Any] = field(default_factory=list)
+    instruments: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.returns)
+
+    @classmethod
+    def from_trades(cls, trades: List[Dict[str, Any]], initial_balance: float) -> 'TradeLedger':
+        """
+        Build a ledger from backtest trade dicts (with 'pnl')
+
+        Trades are put in the order their P&L was realised ('exit_time', else
+        the entry 'timestamp'): backtests often assemble them one instrument at
+        a time. Each trade's return is its P&L over the balance just before
+        it, so resampled paths compound the way risk-based position sizing does.
+        """
+        trades = _chronological(trades)
+        pnl = np.array([float(t['pnl']) for t in trades], dtype=float)
+        balance_before = initial_balance + np.concatenate(([0.0], np.cumsum(pnl)[:-1]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.where(balance_before > 0, pnl / balance_before, -1.0)
+        return cls(
+            returns=returns,
+            pnl=pnl,
+            initial_balance=float(initial_balance),
+            timestamps=[t.get('timestamp') for t in trades],
+            instruments=[t.get('instrument') for t in trades],
+        )
+
+
+@dataclass
+class MonteCarloPaths:
+    """Per-path outcomes of a ledger Monte Carlo run"""
+    method: str
+    final_returns: np.ndarray      # % return per path
+    max_drawdowns: np.ndarray      # % peak-to-trough per path
+    ruined: np.ndarray             # bool: equity touched the ruin level
+    ruin_trade: np.ndarray         # trade index of ruin (-1 if never)
+    max_loss_streaks: np.ndarray
+    max_win_streaks: np.ndarray
+    ruin_level: float
+
+    def summary(self) -> Dict[str, Any]:
+        """Return, drawdown and ruin distributions as plain numbers"""
+        pct = (5, 25, 50, 75, 95)
+        r, dd = self.final_returns, self.max_drawdowns
+        ruin_times = self.ruin_trade[self.ruined]
+        return {
+            'method': self.method,
+            'paths': int(len(r)),
+            'mean_return': float(r.mean()),
+            'std_return': float(r.std()),
+            'min_return': float(r.min()),
+            'max_return': float(r.max()),
+            'return_percentiles': {p: float(v) for p, v in zip(pct, np.percentile(r, pct))},
+            'probability_of_profit': float(np.mean(r > 0) * 100),
+            'probability_of_loss': float(np.mean(r <= 0) * 100),
+            'mean_max_drawdown': float(dd.mean()),
+            'drawdown_percentiles': {p: float(v) for p, v in zip(pct, np.percentile(dd, pct))},
+            'probability_of_ruin': float(self.ruined.mean() * 100),
+            'ruin_level': self.ruin_level,
+            'median_trades_to_ruin': float(np.median(ruin_times)) + 1 if len(ruin_times) else None,
+            'max_consecutive_losses': int(self.max_loss_streaks.max(initial=0)),
+            'max_consecutive_wins': int(self.max_win_streaks.max(initial=0)),
+        }
+
+
+def _longest_streak(mask: np.ndarray) -> np.ndarray:
+    """Longest run of True per row"""
+    n = mask.shape[1]
+    idx = np.arange(n)
+    last_break = np.maximum.accumulate(np.where(mask, -1, idx), axis=1)
+    return (idx - last_break).max(axis=1, initial=0) if n else np.zeros(len(mask), dtype=int)
+
+
+def resample_indices(n_trades: int, n_paths: int, path_length: int, method: str,
+                     rng: np.random.Generator, block_size: Optional[int] = None) -> np.ndarray:
+    """
+    Trade indices for every path, shape (n_paths, path_length)
+
+    bootstrap: i.i.d. draws with replacement
+    block_bootstrap: circular blocks of consecutive trades (keeps streaks/clustering)
+    shuffle: a permutation of the whole ledger per path (same trades, new order)
+    """
+    if method == 'bootstrap':
+        return rng.integers(0, n_trades, size=(n_paths, path_length))
+    if method == 'block_bootstrap':
+        block = block_size or max(1, int(round(np.sqrt(n_trades))))
+        n_blocks = -(-path_length // block)
+        starts = rng.integers(0, n_trades, size=(n_paths, n_blocks, 1))
+        idx = (starts + np.arange(block)) % n_trades
+        return idx.reshape(n_paths, n_blocks * block)[:, :path_length]
+    if method == 'shuffle':
+        return np.argsort(rng.random((n_paths, n_trades)), axis=1)
+    raise ValueError(f"Unknown Monte Carlo method '{method}' (expected one of {METHODS})")
+
+
+def run_ledger_monte_carlo(ledger: TradeLedger, n_paths: int = 10000, method: str = 'bootstrap',
+                           path_length: Optional[int] = None, block_size: Optional[int] = None,
+                           ruin_threshold: float = 0.5, seed: Optional[int] = None,
+                           chunk_size: int = 2000) -> MonteCarloPaths:
+    """
+    Vectorized Monte Carlo over a trade ledger
+
+    Args:
+        ledger: Precomputed per-trade outcomes
+        n_paths: Number of simulated equity paths
+        method: 'bootstrap', 'block_bootstrap' or 'shuffle'
+        path_length: Trades per path (defaults to the ledger length; ignored for shuffle)
+        block_size: Block length for block_bootstrap (default sqrt(n_trades))
+        ruin_threshold: Fraction of initial balance that counts as ruin (0.5 = -50%)
+        seed: Seed for reproducible paths
+        chunk_size: Paths simulated per numpy batch (bounds memory)
+
+    Returns:
+        MonteCarloPaths with per-path returns, drawdowns, ruin and streaks
+    """
+    n_trades = len(ledger)
+    if n_trades == 0:
+        raise ValueError("Trade ledger is empty - nothing to resample")
+    length = n_trades if method == 'shuffle' or not path_length else int(path_length)
+    rng = np.random.default_rng(seed)
+    log_growth = np.log1p(np.maximum(ledger.returns, -1 + 1e-12))
+    log_ruin = np.log(ruin_threshold)
+
+    finals, drawdowns, ruined, ruin_at, loss_streaks, win_streaks = [], [], [], [], [], []
+    for start in range(0, n_paths, chunk_size):
+        paths = min(chunk_size, n_paths - start)
+        idx = resample_indices(n_trades, paths, length, method, rng, block_size)
+        log_equity = np.cumsum(log_growth[idx], axis=1)
+        peak = np.maximum(np.maximum.accumulate(log_equity, axis=1), 0.0)
+        drawdown = 1.0 - np.exp(log_equity - peak)
+
+        below = log_equity <= log_ruin
+        hit = below.any(axis=1)
+        first = np.where(hit, below.argmax(axis=1), -1)
+
+        finals.append((np.exp(log_equity[:, -1]) - 1.0) * 100)
+        drawdowns.append(drawdown.max(axis=1) * 100)
+        ruined.append(hit)
+        ruin_at.append(first)
+        trade_returns = ledger.returns[idx]
+        loss_streaks.append(_longest_streak(trade_returns < 0))
+        win_streaks.append(_longest_streak(trade_returns > 0))
+
+    return MonteCarloPaths(
+        method=method,
+        final_returns=np.concatenate(finals),
+        max_drawdowns=np.concatenate(drawdowns),
+        ruined=np.concatenate(ruined),
+        ruin_trade=np.concatenate(ruin_at),
+        max_loss_streaks=np.concatenate(loss_streaks),
+        max_win_streaks=np.concatenate(win_streaks),
+        ruin_level=ruin_threshold,
+    )
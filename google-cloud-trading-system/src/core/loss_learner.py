@@ -2,19 +2,81 @@
 """
 Loss Learning System - Learn from past mistakes to improve future trades
 Tracks losing conditions and adjusts risk (NEVER relaxes entry thresholds)
+
+Win/loss events are appended to a JSON-lines log with epoch timestamps and
+folded into per-instrument and per-regime time-bucketed counters as they are
+written, so risk checks never rescan the history.
 """
 
 import logging
 import json
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from collections import defaultdict, deque
+from itertools import islice
 import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DAY_SECONDS = 86400
+
+
+class WindowedCounter:
+    """
+    Per-key event counts over fixed trailing windows
+
+    Events are grouped into time buckets; each window keeps a deque of
+    (bucket, count) per key plus a running total, so adding an event and
+    reading a window count are amortized O(1).
+    """
+
+    def __init__(self, windows_days: Tuple[int, ...] = (7, 14), bucket_seconds: int = 60):
+        self.bucket_seconds = bucket_seconds
+        self.windows_days = tuple(sorted(set(windows_days)))
+        # days -> key -> deque([bucket, count]) / running total
+        self._buckets: Dict[int, Dict[str, deque]] = {d: defaultdict(deque) for d in self.windows_days}
+        self._totals: Dict[int, Dict[str, int]] = {d: defaultdict(int) for d in self.windows_days}
+
+    def add(self, key: str, ts: float):
+        bucket = int(ts // self.bucket_seconds)
+        for days in self.windows_days:
+            buckets = self._buckets[days][key]
+            if buckets and buckets[-1][0] == bucket:
+                buckets[-1][1] += 1
+            else:
+                buckets.append([bucket, 1])
+            self._totals[days][key] += 1
+            self._expire(days, key, time.time())
+
+    def _expire(self, days: int, key: str, now: float):
+        cutoff = int((now - days * DAY_SECONDS) // self.bucket_seconds)
+        buckets = self._buckets[days].get(key)
+        if not buckets:
+            return
+        totals = self._totals[days]
+        while buckets and buckets[0][0] < cutoff:
+            totals[key] -= buckets.popleft()[1]
+        if not buckets:
+            del self._buckets[days][key]
+            del totals[key]
+
+    def count(self, key: str, days: int, now: Optional[float] = None) -> int:
+        """Events for ``key`` in the trailing ``days`` (must be one of the windows)"""
+        if days not in self._totals:
+            raise ValueError(f"No {days}-day window (have {self.windows_days})")
+        self._expire(days, key, now if now is not None else time.time())
+        return self._totals[days].get(key, 0)
+
+    def counts(self, days: int, now: Optional[float] = None) -> Dict[str, int]:
+        """All non-zero counts in the trailing ``days``"""
+        now = now if now is not None else time.time()
+        for key in list(self._buckets[days]):
+            self._expire(days, key, now)
+        return dict(self._totals[days])
+
 
 class LossLearner:
     """
@@ -25,20 +87,31 @@ class LossLearner:
     - Independent per-strategy tracking
     """
     
-    def __init__(self, strategy_name: str):
+    MAX_LOSSES = 200          # loss records kept in memory for pattern matching
+    PATTERN_LOSSES = 30       # most recent losses compared by is_failure_pattern
+    COMPACT_EVENTS = 2000     # rewrite the event log once it grows past this
+    WINDOWS_DAYS = (7, 14)    # risk check / avoidance list windows
+    
+    def __init__(self, strategy_name: str, data_dir: Optional[str] = None):
         """Initialize loss learner for a specific strategy"""
         self.strategy_name = strategy_name
-        self.data_dir = os.path.join(
+        self.data_dir = data_dir or os.path.join(
             os.path.dirname(__file__), '../../strategy_learning_data'
         )
         os.makedirs(self.data_dir, exist_ok=True)
         
+        self.events_file = os.path.join(
+            self.data_dir, f'{strategy_name}_events.jsonl'
+        )
+        # Pre-event-log history, migrated on first load
         self.data_file = os.path.join(
             self.data_dir, f'{strategy_name}_losses.json'
         )
         
-        # Load existing data
-        self.loss_history = self._load_loss_history()
+        self.loss_history: deque = deque(maxlen=self.MAX_LOSSES)
+        self._instrument_losses = WindowedCounter(self.WINDOWS_DAYS)
+        self._regime_losses = WindowedCounter(self.WINDOWS_DAYS)
+        self._all_losses = WindowedCounter(self.WINDOWS_DAYS)
         
         # Performance tracking
         self.recent_performance = {
@@ -50,27 +123,148 @@ class LossLearner:
             'total_losses': 0
         }
         
+        # Load existing data
+        self._event_count = 0
+        self._compact_at = self.COMPACT_EVENTS
+        self._load_events()
+        
         logger.info(f"✅ Loss Learner initialized for {strategy_name}")
         logger.info(f"📊 Loaded {len(self.loss_history)} historical losses")
     
-    def _load_loss_history(self) -> List[Dict]:
-        """Load historical loss data from file"""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Could not load loss history: {e}")
-                return []
-        return []
+    # ---------- Event log ----------
+    def _load_events(self):
+        """Replay the event log (migrating the legacy JSON list if present)"""
+        if not os.path.exists(self.events_file) and os.path.exists(self.data_file):
+            self._migrate_legacy_history()
+        if not os.path.exists(self.events_file):
+            return
+        losses = []
+        try:
+            with open(self.events_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                        self._apply(event)
+                    except (ValueError, KeyError) as e:
+                        logger.warning(f"Skipping bad loss-learner event: {e}")
+                        continue
+                    self._event_count += 1
+                    if event['type'] == 'LOSS':
+                        losses.append(event)
+        except Exception as e:
+            logger.warning(f"Could not load loss history: {e}")
+        if self._event_count > self._compact_at:
+            self._compact(losses)
+    
+    def _migrate_legacy_history(self):
+        try:
+            with open(self.data_file, 'r') as f:
+                legacy = json.load(f)
+            events = []
+            for loss in legacy:
+                event = {k: v for k, v in loss.items() if k != 'timestamp'}
+                event['type'] = 'LOSS'
+                event['ts'] = datetime.fromisoformat(loss['timestamp']).timestamp()
+                events.append(event)
+            self._write_events(events)
+            logger.info(f"📦 Migrated {len(events)} losses to {os.path.basename(self.events_file)}")
+        except Exception as e:
+            logger.warning(f"Could not migrate loss history: {e}")
+    
+    def _write_events(self, events: List[Dict]):
+        """Atomically replace the event log"""
+        tmp = self.events_file + '.tmp'
+        with open(tmp, 'w') as f:
+            for event in events:
+                f.write(json.dumps(event, default=str) + '\n')
+        os.replace(tmp, self.events_file)
     
-    def _save_loss_history(self):
-        """Save loss history to file"""
+    def _append_event(self, event: Dict):
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.loss_history, f, indent=2, default=str)
+            with open(self.events_file, 'a') as f:
+                f.write(json.dumps(event, default=str) + '\n')
+            self._event_count += 1
         except Exception as e:
             logger.error(f"Could not save loss history: {e}")
+            return
+        if self._event_count > self._compact_at:
+            self._compact(self._logged_losses())
+    
+    def _logged_losses(self) -> List[Dict]:
+        """Loss events currently in the log (memory only holds the last MAX_LOSSES)"""
+        losses = []
+        try:
+            with open(self.events_file, 'r') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if event.get('type') == 'LOSS':
+                        losses.append(event)
+        except Exception as e:
+            logger.warning(f"Could not read loss history: {e}")
+        return losses
+    
+    def _compact(self, losses: List[Dict]):
+        """
+        Rewrite the log as a performance snapshot plus the losses still in use
+        
+        Losses inside the longest counting window or among the last MAX_LOSSES
+        are kept; the snapshot already includes them in the totals. The next
+        compaction waits until the log has doubled, so a window full of
+        losses is not rewritten on every append.
+        """
+        # one bucket of slack: counters keep whole buckets that straddle the cutoff
+        cutoff = time.time() - max(self.WINDOWS_DAYS) * DAY_SECONDS - self._all_losses.bucket_seconds
+        first_recent = max(0, len(losses) - self.MAX_LOSSES)
+        kept = [dict(loss, counted=False) for i, loss in enumerate(losses)
+                if i >= first_recent or loss['ts'] >= cutoff]
+        snapshot = {'type': 'SNAPSHOT', 'ts': time.time(), 'performance': self.recent_performance}
+        try:
+            self._write_events([snapshot] + kept)
+            self._event_count = 1 + len(kept)
+            self._compact_at = max(self.COMPACT_EVENTS, 2 * self._event_count)
+            logger.info(f"🗜️ Compacted {self.strategy_name} loss log to {self._event_count} events")
+        except Exception as e:
+            logger.warning(f"Could not compact loss history: {e}")
+    
+    def _apply(self, event: Dict):
+        """Fold one event into the in-memory state"""
+        kind = event['type']
+        if kind == 'SNAPSHOT':
+            self.recent_performance = dict(event['performance'])
+            self.recent_performance['last_10_trades'] = list(self.recent_performance['last_10_trades'])
+            return
+        
+        performance = self.recent_performance
+        if kind == 'LOSS':
+            record = {k: v for k, v in event.items() if k not in ('type', 'counted')}
+            self.loss_history.append(record)
+            self._instrument_losses.add(record.get('instrument', 'UNKNOWN'), record['ts'])
+            self._regime_losses.add(record.get('regime', 'UNKNOWN'), record['ts'])
+            self._all_losses.add('*', record['ts'])
+            if event.get('counted', True):
+                performance['consecutive_losses'] += 1
+                performance['total_losses'] += 1
+                performance['total_trades'] += 1
+                performance['last_10_trades'].append('LOSS')
+        elif kind == 'WIN':
+            performance['consecutive_losses'] = 0
+            performance['total_wins'] += 1
+            performance['total_trades'] += 1
+            performance['last_10_trades'].append('WIN')
+        else:
+            raise ValueError(f"unknown event type {kind}")
+        
+        if len(performance['last_10_trades']) > 10:
+            performance['last_10_trades'].pop(0)
+        wins = performance['last_10_trades'].count('WIN')
+        total = len(performance['last_10_trades'])
+        performance['last_10_win_rate'] = wins / total if total > 0 else 0.0
     
     def record_loss(
         self,
@@ -80,7 +274,8 @@ class LossLearner:
         momentum: float,
         volume: float,
         pnl: float,
-        conditions: Dict
+        conditions: Dict,
+        timestamp: Optional[float] = None
     ):
         """
         Record a losing trade to learn from
@@ -93,9 +288,11 @@ class LossLearner:
             volume: Volume indicator at entry
             pnl: Profit/loss (negative)
             conditions: Additional conditions dict
+            timestamp: Epoch seconds of the loss (now by default)
         """
-        loss_record = {
-            'timestamp': datetime.now().isoformat(),
+        event = {
+            'type': 'LOSS',
+            'ts': timestamp if timestamp is not None else time.time(),
             'instrument': instrument,
             'regime': regime,
             'adx': adx,
@@ -104,44 +301,22 @@ class LossLearner:
             'pnl': pnl,
             'conditions': conditions
         }
-        
-        self.loss_history.append(loss_record)
-        
-        # Keep only last 200 losses (don't grow forever)
-        if len(self.loss_history) > 200:
-            self.loss_history = self.loss_history[-200:]
-        
-        self._save_loss_history()
-        
-        # Update performance tracking
-        self.recent_performance['consecutive_losses'] += 1
-        self.recent_performance['total_losses'] += 1
-        self.recent_performance['total_trades'] += 1
-        self.recent_performance['last_10_trades'].append('LOSS')
-        if len(self.recent_performance['last_10_trades']) > 10:
-            self.recent_performance['last_10_trades'].pop(0)
-        
-        # Calculate win rate
-        wins = self.recent_performance['last_10_trades'].count('WIN')
-        total = len(self.recent_performance['last_10_trades'])
-        self.recent_performance['last_10_win_rate'] = wins / total if total > 0 else 0.0
+        self._apply(event)
+        self._append_event(event)
         
         logger.info(f"📉 Recorded loss: {instrument} in {regime} market, PnL: ${pnl:.2f}")
         logger.info(f"   Consecutive losses: {self.recent_performance['consecutive_losses']}")
     
-    def record_win(self, instrument: str, pnl: float):
+    def record_win(self, instrument: str, pnl: float, timestamp: Optional[float] = None):
         """Record a winning trade"""
-        self.recent_performance['consecutive_losses'] = 0
-        self.recent_performance['total_wins'] += 1
-        self.recent_performance['total_trades'] += 1
-        self.recent_performance['last_10_trades'].append('WIN')
-        if len(self.recent_performance['last_10_trades']) > 10:
-            self.recent_performance['last_10_trades'].pop(0)
-        
-        # Calculate win rate
-        wins = self.recent_performance['last_10_trades'].count('WIN')
-        total = len(self.recent_performance['last_10_trades'])
-        self.recent_performance['last_10_win_rate'] = wins / total if total > 0 else 0.0
+        event = {
+            'type': 'WIN',
+            'ts': timestamp if timestamp is not None else time.time(),
+            'instrument': instrument,
+            'pnl': pnl
+        }
+        self._apply(event)
+        self._append_event(event)
         
         logger.info(f"📈 Recorded win: {instrument}, PnL: ${pnl:.2f}")
     
@@ -188,29 +363,11 @@ class LossLearner:
     
     def _get_instrument_loss_count(self, instrument: str, days: int = 7) -> int:
         """Count losses for specific instrument in recent days"""
-        cutoff = datetime.now() - timedelta(days=days)
-        count = 0
-        for loss in self.loss_history:
-            try:
-                loss_time = datetime.fromisoformat(loss['timestamp'])
-                if loss_time >= cutoff and loss['instrument'] == instrument:
-                    count += 1
-            except:
-                continue
-        return count
+        return self._instrument_losses.count(instrument, days)
     
     def _get_regime_loss_count(self, regime: str, days: int = 7) -> int:
         """Count losses in specific regime in recent days"""
-        cutoff = datetime.now() - timedelta(days=days)
-        count = 0
-        for loss in self.loss_history:
-            try:
-                loss_time = datetime.fromisoformat(loss['timestamp'])
-                if loss_time >= cutoff and loss.get('regime') == regime:
-                    count += 1
-            except:
-                continue
-        return count
+        return self._regime_losses.count(regime, days)
     
     def is_failure_pattern(self, conditions: Dict) -> bool:
         """
@@ -231,7 +388,7 @@ class LossLearner:
         
         similar_count = 0
         
-        for loss in self.loss_history[-30:]:  # Check last 30 losses
+        for loss in islice(reversed(self.loss_history), self.PATTERN_LOSSES):  # Check last 30 losses
             similarity_score = 0
             
             # Check instrument match
@@ -268,29 +425,19 @@ class LossLearner:
         """
         Get list of conditions to avoid based on recent losses
         
+        Args:
+            days: Lookback window (one of WINDOWS_DAYS)
+        
         Returns: List of dicts with problematic conditions
         """
-        cutoff = datetime.now() - timedelta(days=days)
-        recent_losses = []
-        
-        for loss in self.loss_history:
-            try:
-                loss_time = datetime.fromisoformat(loss['timestamp'])
-                if loss_time >= cutoff:
-                    recent_losses.append(loss)
-            except:
-                continue
-        
-        if len(recent_losses) < 5:
+        if self._all_losses.count('*', days) < 5:
             return []  # Not enough data
         
         # Analyze patterns
         avoidance_patterns = []
         
-        # Group by instrument
-        instrument_losses = defaultdict(int)
-        for loss in recent_losses:
-            instrument_losses[loss.get('instrument', 'UNKNOWN')] += 1
+        # Losses per instrument
+        instrument_losses = self._instrument_losses.counts(days)
         
         # Avoid instruments with 4+ losses
         for instrument, count in instrument_losses.items():
@@ -302,10 +449,8 @@ class LossLearner:
                     'severity': 'HIGH'
                 })
         
-        # Group by regime
-        regime_losses = defaultdict(int)
-        for loss in recent_losses:
-            regime_losses[loss.get('regime', 'UNKNOWN')] += 1
+        # Losses per regime
+        regime_losses = self._regime_losses.counts(days)
         
         # Avoid regimes with 6+ losses
         for regime, count in regime_losses.items():
@@ -7,9 +7,12 @@ and adapts trading criteria accordingly
 
 import logging
 import numpy as np
+import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
+from .support_resistance import SupportResistanceEngine, cluster_levels, swing_mask
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,11 @@ class MarketRegimeDetector:
         self.ranging_multiplier = 1.15   # Harder entry (15% higher thresholds)
         self.choppy_multiplier = 1.30    # Much harder (30% higher thresholds)
         
+        # Pivots (extreme of the 11-bar window) kept incrementally per instrument
+        self.level_engine = SupportResistanceEngine(window=5, edge=5, tolerance=0.003)
+        # instrument -> (bar number of prices[0], prices) from the previous call
+        self._bar_numbers: Dict[str, Tuple[int, np.ndarray]] = {}
+        
         logger.info(f"✅ {self.name} initialized")
     
     def _calc_direction_consistency(self, prices: List[float]) -> float:
@@ -94,18 +102,14 @@ class MarketRegimeDetector:
         if len(prices) < 50:
             return {'support': [], 'resistance': []}
         
-        highs = []
-        lows = []
-        
-        # Find local highs and lows
-        for i in range(5, len(prices) - 5):
-            # Local high (pivot high)
-            if prices[i] == max(prices[i-5:i+6]):
-                highs.append(prices[i])
-            # Local low (pivot low)
-            if prices[i] == min(prices[i-5:i+6]):
-                lows.append(prices[i])
-        
+        # Find local highs and lows (pivot = extreme of the 11-bar window)
+        values = np.asarray(prices, dtype=float)
+        highs = values[swing_mask(values, 5, "high")].tolist()
+        lows = values[swing_mask(values, 5, "low")].tolist()
+        return self._levels_from_pivots(highs, lows)
+    
+    def _levels_from_pivots(self, highs: List[float], lows: List[float]) -> Dict[str, List[float]]:
+        """Cluster pivot prices into the top support/resistance levels"""
         # Cluster nearby levels (within 0.3%)
         resistance_levels = self._cluster_levels(highs, tolerance=0.003)
         support_levels = self._cluster_levels(lows, tolerance=0.003)
@@ -115,33 +119,43 @@ class MarketRegimeDetector:
             'support': support_levels[:3]          # Top 3 support levels
         }
     
+    def _first_bar_number(self, instrument: str, values: np.ndarray) -> int:
+        """
+        Stable number for values[0] so a rolled or extended series lines up with the last call
+        
+        A series that starts k bars into the previous one (same overlapping prices)
+        gets the previous number + k; anything else gets fresh numbers.
+        """
+        previous = self._bar_numbers.get(instrument)
+        first = 0
+        if previous is not None:
+            prev_first, old = previous
+            first = prev_first + len(old) + 1  # no overlap: numbers the engine has not seen
+            for k in np.flatnonzero(old == values[0]):
+                overlap = len(old) - k
+                if overlap <= len(values) and np.array_equal(values[:overlap], old[k:]):
+                    first = prev_first + int(k)
+                    break
+        self._bar_numbers[instrument] = (first, values)
+        return first
+    
+    def _get_key_levels(self, instrument: str, prices: List[float]) -> Dict[str, List[float]]:
+        """_find_key_levels via the shared engine - only bars new since the last call are scanned"""
+        if len(prices) < 50:
+            return {'support': [], 'resistance': []}
+        values = np.asarray(prices, dtype=float)
+        first = self._first_bar_number(instrument, values)
+        frame = pd.DataFrame({'high': values, 'low': values},
+                             index=pd.RangeIndex(first, first + len(values)))
+        state = self.level_engine.update(instrument, 'close', frame)
+        return self._levels_from_pivots(state.swing_prices('high'), state.swing_prices('low'))
+    
     def _cluster_levels(self, levels: List[float], tolerance: float = 0.003) -> List[float]:
         """
         Cluster nearby price levels together
         tolerance: 0.003 = 0.3%
         """
-        if not levels:
-            return []
-        
-        sorted_levels = sorted(levels)
-        clusters = []
-        current_cluster = [sorted_levels[0]]
-        
-        for level in sorted_levels[1:]:
-            # If within tolerance of cluster mean, add to cluster
-            cluster_mean = np.mean(current_cluster)
-            if abs(level - cluster_mean) / cluster_mean < tolerance:
-                current_cluster.append(level)
-            else:
-                # Start new cluster
-                clusters.append(np.mean(current_cluster))
-                current_cluster = [level]
-        
-        # Add final cluster
-        if current_cluster:
-            clusters.append(np.mean(current_cluster))
-        
-        return clusters
+        return cluster_levels(levels, tolerance)
     
     def _trending_regime(self, prices: List[float], adx: float, 
                         direction_consistency: float) -> Dict:
@@ -241,7 +255,7 @@ class MarketRegimeDetector:
         # Calculate key metrics
         direction_consistency = self._calc_direction_consistency(prices)
         volatility_trend = self._calc_volatility_trend(prices)
-        support_resistance = self._find_key_levels(prices)
+        support_resistance = self._get_key_levels(instrument, prices)
         
         # Classify regime
         if adx >= self.trending_adx_threshold and direction_consistency >= self.direction_consistency_threshold:
@@ -8,13 +8,15 @@ import os
 import json
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
+import numpy as np
 import requests
 from dataclasses import dataclass, asdict
 import threading
 import queue
-import re
+from concurrent.futures import Future
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -76,11 +78,207 @@ class OandaPosition:
     unrealized_pl: float
     margin_used: float
 
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NS_PER_SECOND = 1_000_000_000
+# Length of OANDA's fixed RFC3339 format: 'YYYY-MM-DDTHH:MM:SS.nnnnnnnnnZ'
+_OANDA_TIME_LEN = 30
+
+
+@lru_cache(maxsize=4096)
+def _day_epoch_seconds(date_str: str) -> int:
+    """Epoch seconds at midnight UTC for 'YYYY-MM-DD' (cached - ticks share few dates)"""
+    return (date.fromisoformat(date_str).toordinal() - _EPOCH_ORDINAL) * 86_400
+
+
+def parse_oanda_time_ns(timestamp_str: str) -> int:
+    """Parse an OANDA timestamp straight to integer epoch nanoseconds.
+
+    The fast path handles OANDA's fixed 'YYYY-MM-DDTHH:MM:SS.nnnnnnnnnZ'
+    format with slicing and a cached date lookup - no regex and no datetime
+    allocation. Other RFC3339 variants (shorter fractions, offsets) and
+    OANDA's 'UNIX' datetime format ('1757945667.714891445') fall back to a
+    general parse. Raises ValueError on unparseable input.
+    """
+    if len(timestamp_str) == _OANDA_TIME_LEN and timestamp_str[29] == 'Z' and timestamp_str[19] == '.':
+        seconds = (_day_epoch_seconds(timestamp_str[:10])
+                   + int(timestamp_str[11:13]) * 3600
+                   + int(timestamp_str[14:16]) * 60
+                   + int(timestamp_str[17:19]))
+        return seconds * _NS_PER_SECOND + int(timestamp_str[20:29])
+    return _parse_time_ns_slow(timestamp_str)
+
+
+def _parse_time_ns_slow(timestamp_str: str) -> int:
+    """General RFC3339 / UNIX-seconds fallback for parse_oanda_time_ns"""
+    if not timestamp_str:
+        raise ValueError("empty timestamp")
+    if timestamp_str[0].isdigit() and 'T' not in timestamp_str and '-' not in timestamp_str:
+        whole, _, frac = timestamp_str.partition('.')
+        return int(whole) * _NS_PER_SECOND + int(frac.ljust(9, '0')[:9] or 0)
+    ts = timestamp_str.replace('Z', '+00:00')
+    frac_ns = 0
+    dot = ts.find('.', 19)
+    if dot != -1:
+        end = dot + 1
+        while end < len(ts) and ts[end].isdigit():
+            end += 1
+        frac_ns = int(ts[dot + 1:end].ljust(9, '0')[:9])
+        ts = ts[:dot] + ts[end:]
+    parsed = datetime.fromisoformat(ts)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    delta = parsed - _EPOCH_UTC
+    return (delta.days * 86_400 + delta.seconds) * _NS_PER_SECOND + frac_ns
+
+
+def parse_oanda_times_ns(timestamps: List[str]) -> np.ndarray:
+    """Vectorized parse of many OANDA timestamps into an int64 ns array.
+
+    When every string is in the fixed 30-character format (true for candle
+    pages), the whole batch is decoded as one uint8 digit matrix; otherwise
+    each element goes through parse_oanda_time_ns.
+    """
+    n = len(timestamps)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    joined = ''.join(timestamps)
+    if len(joined) != n * _OANDA_TIME_LEN or not joined.isascii():
+        return np.fromiter((parse_oanda_time_ns(t) for t in timestamps), dtype=np.int64, count=n)
+    raw = np.frombuffer(joined.encode('ascii'), dtype=np.uint8).reshape(n, _OANDA_TIME_LEN)
+    if not ((raw[:, 29] == ord('Z')).all() and (raw[:, 19] == ord('.')).all()):
+        return np.fromiter((parse_oanda_time_ns(t) for t in timestamps), dtype=np.int64, count=n)
+    d = raw.astype(np.int64) - ord('0')
+
+    def _num(start: int, end: int) -> np.ndarray:
+        out = np.zeros(n, dtype=np.int64)
+        for col in range(start, end):
+            out = out * 10 + d[:, col]
+        return out
+
+    year, month, day = _num(0, 4), _num(5, 7), _num(8, 10)
+    # days_from_civil (proleptic Gregorian), vectorized
+    y = year - (month <= 2)
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    mp = (month + 9) % 12
+    doy = (153 * mp + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+    seconds = days * 86_400 + _num(11, 13) * 3600 + _num(14, 16) * 60 + _num(17, 19)
+    return seconds * _NS_PER_SECOND + _num(20, 29)
+
+
+class SharedTransport:
+    """Connection pool, rate limiter and price cache shared by the clients of one API key"""
+
+    def __init__(self, min_request_interval: float = 0.1, response_ttl: float = 0.0, pool_size: int = 16,
+                 max_requests_per_second: float = 100.0):
+        """
+        Args:
+            min_request_interval: Minimum spacing between one account's requests
+            response_ttl: Seconds a completed GET response is served to other callers
+            pool_size: Keep-alive connections held open to the API host
+            max_requests_per_second: Cap across every account on the login
+                (OANDA allows 120 per second), so accounts do not queue behind each other
+        """
+        self.session = requests.Session()
+        self.session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=pool_size))
+        self.min_request_interval = min_request_interval
+        self.max_requests_per_second = max_requests_per_second
+        self.response_ttl = response_ttl
+        self.prices: Dict[str, 'OandaPrice'] = {}
+
+        self._rate_lock = threading.Lock()
+        self._next_slots: Dict[str, float] = {}  # account -> earliest next request
+        self._login_slots: List[float] = []      # reserved request times near now, any account
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._responses: Dict[str, tuple] = {}  # url -> (expires_at, body)
+
+    def wait_turn(self, account: str = ''):
+        """
+        Reserve the account's next request slot, sleeping until it arrives
+
+        An account waiting out its own spacing does not hold back the others;
+        a slot is only pushed later when the login already has
+        max_requests_per_second requests reserved within a second of it.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slots.get(account, 0.0))
+            self._login_slots = [t for t in self._login_slots if t > now - 1.0]
+            cap = max(1, int(self.max_requests_per_second))
+            while True:
+                near = sorted(t for t in self._login_slots if abs(t - slot) < 1.0)
+                if len(near) < cap:
+                    break
+                slot = near[-cap] + 1.0
+            self._login_slots.append(slot)
+            self._next_slots[account] = slot + self.min_request_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def get(self, url: str, fetch, ttl: float) -> bytes:
+        """
+        Body for a GET, shared with concurrent and recent callers of the same URL
+
+        Args:
+            url: Request URL (the cache key)
+            fetch: Callable performing the request and returning the body
+            ttl: Seconds the completed body may be reused (0 shares only in-flight calls)
+        """
+        with self._lock:
+            cached = self._responses.get(url)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = self._inflight[url] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            body = fetch()
+        except BaseException as e:
+            with self._lock:
+                if self._inflight.get(url) is future:
+                    del self._inflight[url]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            # invalidate() may have detached this request; its answer predates a write
+            if self._inflight.get(url) is future:
+                del self._inflight[url]
+                if ttl > 0:
+                    self._responses[url] = (time.monotonic() + ttl, body)
+        future.set_result(body)
+        return body
+
+    def invalidate(self, prefix: str):
+        """Drop cached responses for ``prefix`` and everything below it
+
+        Reads already in flight keep their callers, but later callers start a
+        new request instead of joining one that may have been sent before a write.
+        """
+        with self._lock:
+            for cache in (self._responses, self._inflight):
+                for url in [u for u in cache if u == prefix or u.startswith(prefix + '/')]:
+                    del cache[url]
+
+
 class OandaClient:
     """Production OANDA API Client for Google Cloud deployment"""
     
-    def __init__(self, api_key: str = None, account_id: str = None, environment: str = None):
-        """Initialize OANDA client with credentials"""
+    def __init__(self, api_key: str = None, account_id: str = None, environment: str = None,
+                 transport: Optional[SharedTransport] = None):
+        """Initialize OANDA client with credentials
+
+        Args:
+            transport: Shared pool/rate limiter/price cache (see get_account_client);
+                a private one is created when omitted
+        """
         self.api_key = api_key or os.getenv('OANDA_API_KEY')
         self.account_id = account_id or os.getenv('OANDA_ACCOUNT_ID') or os.getenv('PRIMARY_ACCOUNT')
         self.environment = environment or os.getenv('OANDA_ENVIRONMENT', 'practice')
@@ -111,12 +309,12 @@ class OandaClient:
             'Content-Type': 'application/json'
         }
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        # Connection pool, rate limiting and price cache
+        self.transport = transport or SharedTransport()
+        self.account_url = f"{self.accounts_endpoint}/{self.account_id}"
         
         # Data storage
-        self.current_prices: Dict[str, OandaPrice] = {}
+        self.current_prices: Dict[str, OandaPrice] = self.transport.prices
         self.account_info: Optional[OandaAccount] = None
         self.positions: Dict[str, OandaPosition] = {}
         self.orders: Dict[str, OandaOrder] = {}
@@ -130,62 +328,48 @@ class OandaClient:
         logger.info(f"📊 Account ID: {self.account_id}")
     
     def _rate_limit(self):
-        """Enforce rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        self.last_request_time = time.time()
+        """Enforce rate limiting (per account, under the transport's login-wide cap)"""
+        self.transport.wait_turn(self.account_id)
 
     @staticmethod
     def _parse_oanda_time(timestamp_str: str) -> datetime:
         """Parse OANDA ISO8601 timestamps with up to nanosecond precision.
 
         OANDA returns timestamps like '2025-09-15T14:14:27.714891445Z'.
-        Python's datetime supports microseconds (max 6 digits). We truncate
-        fractional seconds to 6 digits and preserve timezone info.
+        Python's datetime supports microseconds (max 6 digits), so the
+        nanosecond remainder is dropped. Returns an aware UTC datetime.
         """
         if not timestamp_str:
             return datetime.utcnow()
-        ts = timestamp_str.replace('Z', '+00:00')
-        # Split timezone
-        match = re.match(r"^(.*?)(\.\d+)?([+-]\d{2}:?\d{2})$", ts)
-        if match:
-            base = match.group(1)
-            frac = match.group(2) or ''
-            tz = match.group(3)
-            if frac:
-                # Keep only 6 digits
-                digits = re.sub(r"[^0-9]", "", frac)
-                frac6 = digits[:6].ljust(6, '0')
-                ts_clean = f"{base}.{frac6}{tz}"
-            else:
-                ts_clean = f"{base}{tz}"
-            return datetime.fromisoformat(ts_clean)
-        # Fallback: if no timezone part, append Z
         try:
-            return datetime.fromisoformat(ts)
-        except Exception:
+            time_ns = parse_oanda_time_ns(timestamp_str)
+        except ValueError:
             return datetime.utcnow()
+        return _EPOCH_UTC + timedelta(microseconds=time_ns // 1_000)
     
     def _make_request(self, method: str, url: str, data: Optional[Dict] = None) -> Dict:
-        """Make authenticated request to OANDA API with error handling"""
-        self._rate_limit()
+        """Make authenticated request to OANDA API with error handling
+
+        GETs are shared with concurrent callers of the same URL on the
+        transport. Account reads (balance, trades, positions, orders, prices)
+        feed risk checks, so a completed one is never reused; other reads
+        (candles, instrument data) are kept for the transport's response_ttl.
+        Writes detach the account's in-flight reads.
+        """
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
+            raise ValueError(f"Unsupported HTTP method: {method}")
         
         try:
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=self.headers, timeout=10)
-            elif method.upper() == 'POST':
-                response = requests.post(url, headers=self.headers, json=data, timeout=10)
-            elif method.upper() == 'PUT':
-                response = requests.put(url, headers=self.headers, json=data, timeout=10)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, headers=self.headers, timeout=10)
+            if method == 'GET':
+                # prices have their own cache; account state is always read fresh
+                account_read = url == self.account_url or url.startswith(self.account_url + '/')
+                ttl = 0.0 if account_read else self.transport.response_ttl
+                body = self.transport.get(url, lambda: self._send(method, url), ttl)
             else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            response.raise_for_status()
-            return response.json()
+                body = self._send(method, url, data)
+                self.transport.invalidate(self.account_url)
+            return json.loads(body)
             
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ OANDA API request failed: {e}")
@@ -193,6 +377,13 @@ class OandaClient:
                 logger.error(f"Response: {e.response.text}")
             raise
     
+    def _send(self, method: str, url: str, data: Optional[Dict] = None) -> bytes:
+        """One rate-limited request over the pooled session, returning the body"""
+        self._rate_limit()
+        response = self.transport.session.request(method, url, headers=self.headers, json=data, timeout=10)
+        response.raise_for_status()
+        return response.content
+    
     def get_account_info(self) -> OandaAccount:
         """Get account information"""
         try:
@@ -756,6 +947,51 @@ class OandaClient:
             logger.error(f"❌ OANDA connection check failed: {e}")
             return False
 
+# Process-wide client registry: one transport per login, one client per account
+_registry_lock = threading.Lock()
+_transports: Dict[tuple, SharedTransport] = {}
+_clients: Dict[tuple, OandaClient] = {}
+
+# Seconds a registry client's non-account read (candles, instrument data) is reused;
+# account, trade and position reads are never served from this cache
+SHARED_RESPONSE_TTL = 2.0
+
+
+def get_account_client(account_id: str = None, api_key: str = None, environment: str = None) -> OandaClient:
+    """
+    Long-lived client for an account, shared across the process
+
+    Clients for the same API key and environment share one connection pool,
+    one rate limiter (spacing each account's requests, capped across the
+    login) and one price cache, and concurrent reads of the same account
+    resolve to a single upstream call.
+
+    Args:
+        account_id: OANDA account (defaults as OandaClient)
+        api_key: API key (defaults to OANDA_API_KEY)
+        environment: 'practice' or 'live' (defaults to OANDA_ENVIRONMENT)
+
+    Returns:
+        The registered OandaClient for the account
+    """
+    api_key = api_key or os.getenv('OANDA_API_KEY')
+    account_id = account_id or os.getenv('OANDA_ACCOUNT_ID') or os.getenv('PRIMARY_ACCOUNT')
+    environment = environment or os.getenv('OANDA_ENVIRONMENT', 'practice')
+    key = (api_key, environment, account_id)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _registry_lock:
+        client = _clients.get(key)
+        if client is None:
+            transport = _transports.get(key[:2])
+            if transport is None:
+                transport = _transports[key[:2]] = SharedTransport(response_ttl=SHARED_RESPONSE_TTL)
+            client = _clients[key] = OandaClient(api_key, account_id, environment, transport=transport)
+        return client
+
+
 # Global OANDA client instance (lazy initialization)
 oanda_client = None
 
@@ -763,5 +999,5 @@ def get_oanda_client() -> OandaClient:
     """Get the global OANDA client instance"""
     global oanda_client
     if oanda_client is None:
-        oanda_client = OandaClient()
+        oanda_client = get_account_client()
     return oanda_client
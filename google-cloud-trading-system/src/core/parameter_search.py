@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Parameter Search - Pluggable search strategies for strategy optimization
+Grid, random, successive halving, Hyperband and a TPE-style sampler, all
+driving the same ``objective(params, budget) -> score`` (higher is better)
+and deterministic for a fixed seed.
+"""
+
+import itertools
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# objective(params, budget) -> score; budget is the fraction of the data (0, 1]
+Objective = Callable[[Dict[str, Any], float], float]
+
+
+class SearchSpace:
+    """
+    Parameter ranges as used by the optimizers
+
+    Each entry is either a (low, high) tuple - ints give an integer range,
+    floats a continuous one - or a list of discrete choices.
+    """
+
+    def __init__(self, ranges: Dict[str, Union[Tuple[float, float], Sequence[Any]]]):
+        self.ranges = dict(ranges)
+        self.names = list(self.ranges)
+
+    def is_choice(self, name: str) -> bool:
+        return not isinstance(self.ranges[name], tuple)
+
+    def is_categorical(self, name: str) -> bool:
+        """Choices without a numeric order (numeric grids are searched as ordinal ranges)"""
+        if not self.is_choice(name):
+            return False
+        values = list(self.ranges[name])
+        numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values)
+        return not (numeric and values == sorted(values))
+
+    def is_int(self, name: str) -> bool:
+        low, high = self.ranges[name]
+        return isinstance(low, int) and isinstance(high, int) and not isinstance(low, bool)
+
+    def decode(self, unit: np.ndarray) -> Dict[str, Any]:
+        """Map a point in [0, 1]^d to parameters"""
+        params = {}
+        for name, u in zip(self.names, unit):
+            u = float(min(max(u, 0.0), 1.0))
+            if self.is_choice(name):
+                choices = list(self.ranges[name])
+                params[name] = choices[min(int(u * len(choices)), len(choices) - 1)]
+            else:
+                low, high = self.ranges[name]
+                value = low + u * (high - low)
+                params[name] = int(round(value)) if self.is_int(name) else float(value)
+        return params
+
+    def sample(self, rng: np.random.Generator, n: int) -> List[Dict[str, Any]]:
+        """n independent uniform draws"""
+        return [self.decode(u) for u in rng.random((n, len(self.names)))]
+
+    def grid(self, points: int = 5) -> List[Dict[str, Any]]:
+        """Cartesian grid: every choice, ``points`` evenly spaced values per range"""
+        axes = []
+        for name in self.names:
+            if self.is_choice(name):
+                axes.append(list(self.ranges[name]))
+            else:
+                low, high = self.ranges[name]
+                values = np.linspace(low, high, points)
+                axes.append(sorted({int(round(v)) for v in values}) if self.is_int(name)
+                            else [float(v) for v in values])
+        return [dict(zip(self.names, combo)) for combo in itertools.product(*axes)]
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a search run"""
+    method: str
+    best_params: Dict[str, Any]
+    best_score: float
+    evaluations: int
+    # cost in full-data backtest equivalents (sum of budgets)
+    budget_used: float
+    history: List[Dict[str, Any]] = field(default_factory=list)
+
+    def top(self, n: int = 5, full_budget_only: bool = True) -> List[Dict[str, Any]]:
+        """Best evaluations, optionally only those run on the full data"""
+        rows = [h for h in self.history if not full_budget_only or h['budget'] >= 1.0]
+        return sorted(rows, key=lambda h: h['score'], reverse=True)[:n]
+
+
+class _Recorder:
+    """Wraps the objective to keep history, the incumbent and the spend"""
+
+    def __init__(self, objective: Objective):
+        self.objective = objective
+        self.history: List[Dict[str, Any]] = []
+        self.best_params: Optional[Dict[str, Any]] = None
+        self.best_score = float('-inf')
+        self.budget_used = 0.0
+
+    def __call__(self, params: Dict[str, Any], budget: float = 1.0) -> float:
+        try:
+            score = float(self.objective(params, budget))
+        except Exception as e:
+            logger.debug(f"Objective failed for {params}: {e}")
+            score = float('-inf')
+        if not np.isfinite(score):
+            score = float('-inf')
+        self.history.append({'params': params, 'budget': budget, 'score': score})
+        self.budget_used += budget
+        # only full-budget scores are comparable across candidates
+        if budget >= 1.0 and score > self.best_score:
+            self.best_params, self.best_score = params, score
+        return score
+
+    def result(self, method: str) -> SearchResult:
+        return SearchResult(method, dict(self.best_params or {}), self.best_score,
+                            len(self.history), round(self.budget_used, 6), self.history)
+
+
+class GridSearch:
+    """Exhaustive Cartesian grid (the baseline the other searches replace)"""
+    name = 'grid_search'
+
+    def __init__(self, points: int = 5):
+        self.points = points
+
+    def run(self, space: SearchSpace, objective: Objective, seed: Optional[int] = None) -> SearchResult:
+        record = _Recorder(objective)
+        for params in space.grid(self.points):
+            record(params, 1.0)
+        return record.result(self.name)
+
+
+class RandomSearch:
+    """Uniform random sampling with a fixed number of full-data trials"""
+    name = 'random'
+
+    def __init__(self, n_trials: int = 50):
+        self.n_trials = n_trials
+
+    def run(self, space: SearchSpace, objective: Objective, seed: Optional[int] = None) -> SearchResult:
+        record = _Recorder(objective)
+        for params in space.sample(np.random.default_rng(seed), self.n_trials):
+            record(params, 1.0)
+        return record.result(self.name)
+
+
+def _successive_halving(record: _Recorder, candidates: List[Dict[str, Any]],
+                        min_budget: float, eta: int) -> None:
+    budget = min_budget
+    while candidates:
+        scores = [record(params, min(budget, 1.0)) for params in candidates]
+        if budget >= 1.0 or len(candidates) == 1:
+            if budget < 1.0:
+                record(candidates[0], 1.0)
+            return
+        keep = max(1, len(candidates) // eta)
+        # stable ordering keeps ties deterministic
+        order = sorted(range(len(candidates)), key=lambda i: (-scores[i], i))[:keep]
+        candidates = [candidates[i] for i in order]
+        budget *= eta
+
+
+class SuccessiveHalving:
+    """
+    Evaluate many candidates on a slice of the data, keep the best 1/eta,
+    give survivors eta times more data, until the last ones run on all of it
+    """
+    name = 'successive_halving'
+
+    def __init__(self, n_candidates: int = 81, eta: int = 3, min_budget: Optional[float] = None):
+        self.n_candidates = n_candidates
+        self.eta = eta
+        rounds = max(1, int(math.log(n_candidates, eta)))
+        self.min_budget = min_budget or float(eta) ** -rounds
+
+    def run(self, space: SearchSpace, objective: Objective, seed: Optional[int] = None) -> SearchResult:
+        record = _Recorder(objective)
+        rng = np.random.default_rng(seed)
+        _successive_halving(record, space.sample(rng, self.n_candidates), self.min_budget, self.eta)
+        return record.result(self.name)
+
+
+class Hyperband:
+    """Successive halving brackets trading off candidate count against starting budget"""
+    name = 'hyperband'
+
+    def __init__(self, min_budget: float = 1 / 27, eta: int = 3, sampler: Optional['TPESampler'] = None):
+        self.min_budget = min_budget
+        self.eta = eta
+        self.sampler = sampler
+
+    def run(self, space: SearchSpace, objective: Objective, seed: Optional[int] = None) -> SearchResult:
+        record = _Recorder(objective)
+        rng = np.random.default_rng(seed)
+        s_max = int(round(math.log(1.0 / self.min_budget, self.eta)))
+        for s in range(s_max, -1, -1):
+            n = int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s))
+            if self.sampler is not None:
+                candidates = [self.sampler.suggest(space, record.history, rng) for _ in range(n)]
+            else:
+                candidates = space.sample(rng, n)
+            _successive_halving(record, candidates, float(self.eta) ** -s, self.eta)
+        return record.result(self.name)
+
+
+class TPESampler:
+    """
+    Tree-structured Parzen estimator in numpy
+
+    Trials are split into the best ``gamma`` fraction and the rest. Range
+    parameters and numeric grids are modelled jointly (one product kernel per trial, so
+    correlated parameters such as stop and target distances stay paired);
+    unordered choices use smoothed frequencies. The candidate maximizing
+    l(x)/g(x) is proposed. Falls back to uniform sampling until
+    ``n_startup`` trials exist at some budget.
+    """
+
+    def __init__(self, n_startup: int = 8, gamma: float = 0.25, n_ei_candidates: int = 24,
+                 prior_weight: float = 1.0):
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+        self.prior_weight = prior_weight
+
+    @staticmethod
+    def _encode(space: SearchSpace, params: Dict[str, Any]) -> np.ndarray:
+        unit = []
+        for name in space.names:
+            value = params[name]
+            if space.is_choice(name):
+                choices = list(space.ranges[name])
+                unit.append((choices.index(value) + 0.5) / len(choices))
+            else:
+                low, high = space.ranges[name]
+                unit.append((value - low) / (high - low) if high != low else 0.5)
+        return np.array(unit, dtype=float)
+
+    def _bandwidths(self, centers: np.ndarray) -> np.ndarray:
+        """
+        Kernel widths for one dimension, plus a broad prior kernel at 0.5
+
+        Each width is the larger gap to its sorted neighbours (the range ends
+        count as neighbours), clipped so it never collapses.
+        """
+        n = len(centers)
+        mus = np.append(centers, 0.5)
+        order = np.argsort(mus, kind='stable')
+        padded = np.concatenate(([0.0], mus[order], [1.0]))
+        gaps = np.maximum(padded[1:-1] - padded[:-2], padded[2:] - padded[1:-1])
+        sigmas = np.empty(n + 1)
+        sigmas[order] = np.clip(gaps, 1.0 / min(100.0, 1.0 + n), 1.0)
+        sigmas[-1] = 1.0
+        return sigmas
+
+    def _mixture(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Product-kernel mixture over the range dimensions (one kernel per trial + prior)"""
+        n, d = points.shape
+        mus = np.vstack([points, np.full((1, d), 0.5)])
+        sigmas = np.column_stack([self._bandwidths(points[:, j]) for j in range(d)]) if d else mus
+        weights = np.append(np.ones(n), self.prior_weight)
+        return mus, sigmas, weights / weights.sum()
+
+    @staticmethod
+    def _mixture_logpdf(x: np.ndarray, mus: np.ndarray, sigmas: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        z = (x[:, None, :] - mus[None]) / sigmas[None]
+        log_kernels = (-0.5 * z ** 2 - np.log(sigmas[None] * math.sqrt(2 * math.pi))).sum(axis=-1)
+        peak = log_kernels.max(axis=1, keepdims=True)
+        return peak[:, 0] + np.log((np.exp(log_kernels - peak) * weights[None]).sum(axis=1))
+
+    def _choice_logpmf(self, idx: np.ndarray, observed: np.ndarray, k: int) -> np.ndarray:
+        counts = np.bincount(observed, minlength=k).astype(float) + self.prior_weight
+        return np.log(counts / counts.sum())[idx]
+
+    def suggest(self, space: SearchSpace, history: List[Dict[str, Any]],
+                rng: np.random.Generator) -> Dict[str, Any]:
+        """Propose the next parameters given the evaluations so far"""
+        # model the largest budget with enough trials (scores across budgets don't compare)
+        by_budget: Dict[float, List[Dict[str, Any]]] = {}
+        for h in history:
+            if np.isfinite(h['score']):
+                by_budget.setdefault(h['budget'], []).append(h)
+        usable = [b for b, rows in by_budget.items() if len(rows) >= self.n_startup]
+        if not usable:
+            return space.decode(rng.random(len(space.names)))
+
+        trials = sorted(by_budget[max(usable)], key=lambda h: h['score'], reverse=True)
+        n_good = max(1, int(math.ceil(self.gamma * len(trials))))
+        encoded = np.array([self._encode(space, h['params']) for h in trials])
+        good, bad = encoded[:n_good], encoded[n_good:]
+
+        unit = np.empty(len(space.names))
+        ranged = [d for d, name in enumerate(space.names) if not space.is_categorical(name)]
+        if ranged:
+            mus, sigmas, weights = self._mixture(good[:, ranged])
+            # draw from l(x): pick a kernel, then sample around it
+            pick = rng.choice(len(mus), size=self.n_ei_candidates, p=weights)
+            cand = np.clip(rng.normal(mus[pick], sigmas[pick]), 0.0, 1.0)
+            score = self._mixture_logpdf(cand, mus, sigmas, weights)
+            if len(bad):
+                score = score - self._mixture_logpdf(cand, *self._mixture(bad[:, ranged]))
+            unit[ranged] = cand[int(np.argmax(score))]
+
+        for d, name in enumerate(space.names):
+            if not space.is_categorical(name):
+                continue
+            k = len(space.ranges[name])
+            good_idx = np.minimum((good[:, d] * k).astype(int), k - 1)
+            bad_idx = np.minimum((bad[:, d] * k).astype(int), k - 1)
+            weights = np.bincount(good_idx, minlength=k) + self.prior_weight
+            cand = rng.choice(k, size=self.n_ei_candidates, p=weights / weights.sum())
+            score = self._choice_logpmf(cand, good_idx, k) - self._choice_logpmf(cand, bad_idx, k)
+            unit[d] = (cand[int(np.argmax(score))] + 0.5) / k
+        return space.decode(unit)
+
+
+class TPESearch:
+    """Sequential model-based search with the TPE sampler, full data per trial"""
+    name = 'tpe'
+
+    def __init__(self, n_trials: int = 50, sampler: Optional[TPESampler] = None):
+        self.n_trials = n_trials
+        self.sampler = sampler or TPESampler()
+
+    def run(self, space: SearchSpace, objective: Objective, seed: Optional[int] = None) -> SearchResult:
+        record = _Recorder(objective)
+        rng = np.random.default_rng(seed)
+        for _ in range(self.n_trials):
+            record(self.sampler.suggest(space, record.history, rng), 1.0)
+        return record.result(self.name)
+
+
+SEARCH_METHODS = {
+    'grid_search': GridSearch,
+    'random': RandomSearch,
+    'successive_halving': SuccessiveHalving,
+    'hyperband': Hyperband,
+    'tpe': TPESearch,
+}
+
+
+def get_search(method: str, **kwargs):
+    """Build a search strategy by name (see SEARCH_METHODS)"""
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"Unknown search method '{method}' (expected one of {list(SEARCH_METHODS)})")
+    return SEARCH_METHODS[method](**kwargs)
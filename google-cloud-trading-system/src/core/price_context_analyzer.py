@@ -12,6 +12,8 @@ from enum import Enum
 from dataclasses import dataclass
 import talib
 
+from .support_resistance import SupportResistanceEngine
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -111,6 +113,12 @@ class PriceContextAnalyzer:
         self.psychological_levels = []
         self.generate_psychological_levels()
         
+        # Swing/level engine (incremental per instrument+timeframe), clustering at level_tolerance
+        self.level_engine = SupportResistanceEngine(tolerance=self.level_tolerance)
+        
+        # Last computed context per (instrument, timeframe)
+        self._context_cache: Dict[Tuple[str, str], Tuple[Any, TimeframeContext]] = {}
+        
         logger.info(f"✅ {self.name} initialized")
     
     def generate_psychological_levels(self):
@@ -148,6 +156,14 @@ class PriceContextAnalyzer:
                 logger.warning(f"⚠️ Not enough data for {instrument} {timeframe}")
                 continue
             
+            # Reuse the cached context if no new bar has closed
+            cache_key = (instrument, timeframe)
+            fingerprint = (len(df), df.index[-1], float(df["close"].iloc[-1]))
+            cached = self._context_cache.get(cache_key)
+            if cached is not None and cached[0] == fingerprint:
+                context_by_timeframe[timeframe] = cached[1]
+                continue
+            
             # Analyze this timeframe
             try:
                 # Detect trend
@@ -183,6 +199,7 @@ class PriceContextAnalyzer:
                 )
                 
                 context_by_timeframe[timeframe] = context
+                self._context_cache[cache_key] = (fingerprint, context)
                 
             except Exception as e:
                 logger.error(f"❌ Error analyzing {instrument} {timeframe}: {e}")
@@ -190,6 +207,13 @@ class PriceContextAnalyzer:
         
         return context_by_timeframe
     
+    def _level_series(self, instrument: str, timeframe: str, df: pd.DataFrame):
+        """Swing levels for df, rebuilding the engine if level_tolerance was changed"""
+        if self.level_engine.tolerance != self.level_tolerance:
+            self.level_engine = SupportResistanceEngine(tolerance=self.level_tolerance)
+            self._context_cache.clear()
+        return self.level_engine.update(instrument, timeframe, df)
+    
     def _detect_trend(self, df: pd.DataFrame) -> str:
         """
         Detect trend direction using multiple indicators
@@ -290,36 +314,17 @@ class PriceContextAnalyzer:
         support_levels = []
         
         try:
-            # Find local minima
-            for i in range(5, len(df) - 5):
-                if (df["low"].iloc[i] <= df["low"].iloc[i-1] and 
-                    df["low"].iloc[i] <= df["low"].iloc[i-2] and
-                    df["low"].iloc[i] <= df["low"].iloc[i+1] and
-                    df["low"].iloc[i] <= df["low"].iloc[i+2]):
-                    
-                    # Potential support level
-                    level_price = df["low"].iloc[i]
-                    
-                    # Check if near existing level
-                    is_near_existing = False
-                    for level in support_levels:
-                        if abs(level_price - level.price) / level.price < self.level_tolerance:
-                            # Update existing level
-                            level.touches += 1
-                            level.strength = min(1.0, level.strength + 0.1)
-                            is_near_existing = True
-                            break
-                    
-                    if not is_near_existing:
-                        # Add new level
-                        support_levels.append(PriceLevel(
-                            price=level_price,
-                            type="support",
-                            strength=0.5,  # Initial strength
-                            touches=1,
-                            timeframe=timeframe,
-                            description=f"{instrument} {timeframe} support"
-                        ))
+            # Swing lows clustered into levels (incremental engine)
+            series = self._level_series(instrument, timeframe, df)
+            for level_price, touches in series.supports.levels():
+                support_levels.append(PriceLevel(
+                    price=level_price,
+                    type="support",
+                    strength=min(1.0, 0.5 + 0.1 * (touches - 1)),
+                    touches=touches,
+                    timeframe=timeframe,
+                    description=f"{instrument} {timeframe} support"
+                ))
             
             # Add psychological levels
             current_price = df["close"].iloc[-1]
@@ -364,36 +369,17 @@ class PriceContextAnalyzer:
         resistance_levels = []
         
         try:
-            # Find local maxima
-            for i in range(5, len(df) - 5):
-                if (df["high"].iloc[i] >= df["high"].iloc[i-1] and 
-                    df["high"].iloc[i] >= df["high"].iloc[i-2] and
-                    df["high"].iloc[i] >= df["high"].iloc[i+1] and
-                    df["high"].iloc[i] >= df["high"].iloc[i+2]):
-                    
-                    # Potential resistance level
-                    level_price = df["high"].iloc[i]
-                    
-                    # Check if near existing level
-                    is_near_existing = False
-                    for level in resistance_levels:
-                        if abs(level_price - level.price) / level.price < self.level_tolerance:
-                            # Update existing level
-                            level.touches += 1
-                            level.strength = min(1.0, level.strength + 0.1)
-                            is_near_existing = True
-                            break
-                    
-                    if not is_near_existing:
-                        # Add new level
-                        resistance_levels.append(PriceLevel(
-                            price=level_price,
-                            type="resistance",
-                            strength=0.5,  # Initial strength
-                            touches=1,
-                            timeframe=timeframe,
-                            description=f"{instrument} {timeframe} resistance"
-                        ))
+            # Swing highs clustered into levels (incremental engine)
+            series = self._level_series(instrument, timeframe, df)
+            for level_price, touches in series.resistances.levels():
+                resistance_levels.append(PriceLevel(
+                    price=level_price,
+                    type="resistance",
+                    strength=min(1.0, 0.5 + 0.1 * (touches - 1)),
+                    touches=touches,
+                    timeframe=timeframe,
+                    description=f"{instrument} {timeframe} resistance"
+                ))
             
             # Add psychological levels
             current_price = df["close"].iloc[-1]
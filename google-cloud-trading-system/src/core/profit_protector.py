@@ -158,12 +158,12 @@ class ProfitProtector:
             # Only move stop if it improves protection
             if side == 'BUY' or side.upper() == 'BUY':
                 if breakeven_sl > current_sl:
-                    logger.info(f"✅ {instrument}: Moving to break-even @ {breakeven_sl:.5f} "
+                    logger.debug(f"✅ {instrument}: Moving to break-even @ {breakeven_sl:.5f} "
                                f"(profit: +{profit_pct*100:.2f}%)")
                     return breakeven_sl
             else:  # SELL
                 if breakeven_sl < current_sl:
-                    logger.info(f"✅ {instrument}: Moving to break-even @ {breakeven_sl:.5f} "
+                    logger.debug(f"✅ {instrument}: Moving to break-even @ {breakeven_sl:.5f} "
                                f"(profit: +{profit_pct*100:.2f}%)")
                     return breakeven_sl
         
@@ -179,7 +179,7 @@ class ProfitProtector:
                 new_sl = max(current_sl, trail_sl, breakeven)
                 
                 if new_sl > current_sl:
-                    logger.info(f"📈 {instrument}: Trailing stop → {new_sl:.5f} "
+                    logger.debug(f"📈 {instrument}: Trailing stop → {new_sl:.5f} "
                                f"(peak: {peak_price:.5f}, profit: +{profit_pct*100:.2f}%)")
                     return new_sl
             
@@ -188,7 +188,7 @@ class ProfitProtector:
                 new_sl = min(current_sl, trail_sl, breakeven)
                 
                 if new_sl < current_sl:
-                    logger.info(f"📈 {instrument}: Trailing stop → {new_sl:.5f} "
+                    logger.debug(f"📈 {instrument}: Trailing stop → {new_sl:.5f} "
                                f"(peak: {peak_price:.5f}, profit: +{profit_pct*100:.2f}%)")
                     return new_sl
         
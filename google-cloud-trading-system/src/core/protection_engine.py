@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Profit Protection Engine - Tick-driven breakeven/trailing stops for every open trade
+Subscribes to the live price feed, keeps per-trade peaks in memory and runs
+ProfitProtector on each tick for all open positions, whatever strategy opened
+them. A stop modification is only sent to OANDA when the new stop moves by a
+meaningful amount, from worker threads so the feed callback never blocks on
+the broker. Recorded tick files can be replayed through the same path.
+"""
+
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .data_feed import MarketData
+from .profit_protector import ProfitProtector, get_profit_protector
+
+try:
+    from ..utils.pips_calculator import get_pip_value
+except ImportError:
+    from src.utils.pips_calculator import get_pip_value
+
+logger = logging.getLogger(__name__)
+
+
+def _price_dp(instrument: str) -> int:
+    """Price precision OANDA accepts for the instrument"""
+    if instrument.endswith('_JPY'):
+        return 3
+    if instrument == 'XAU_USD':
+        return 2
+    return 5
+
+
+@dataclass
+class StopUpdate:
+    """One stop-loss decision made by the engine"""
+    trade_id: str
+    instrument: str
+    old_stop: float
+    new_stop: float
+    price: float
+    time_ns: int
+    pushed: bool
+    error: Optional[str] = None
+
+
+class ProtectionEngine:
+    """Evaluates every open position on each tick and pushes meaningful stop moves"""
+
+    def __init__(self, client=None, protector: Optional[ProfitProtector] = None,
+                 min_move_pips: float = 2.0, min_move_fraction: float = 0.0001,
+                 min_update_seconds: float = 5.0, refresh_seconds: float = 30.0,
+                 max_workers: int = 4):
+        """
+        Args:
+            client: OandaClient used to list trades and modify stops (None = dry run)
+            protector: Breakeven/trailing rules (the global ProfitProtector by default)
+            min_move_pips: Smallest stop move worth an API call, in pips...
+            min_move_fraction: ...and as a fraction of price (gold/JPY pips are tiny)
+            min_update_seconds: Minimum tick time between two modifications of one trade
+            refresh_seconds: Wall-clock interval for re-reading open trades from OANDA
+            max_workers: Threads sending stop moves/partial closes (one trade at a time each)
+        """
+        self.client = client
+        self.protector = protector or get_profit_protector()
+        self.min_move_pips = min_move_pips
+        self.min_move_fraction = min_move_fraction
+        self.min_update_seconds = min_update_seconds
+        self.refresh_seconds = refresh_seconds
+        self.max_workers = max_workers
+
+        # trade_id -> position dict (entry_price, stop_loss, side, instrument, peak_price, ...)
+        self.positions: Dict[str, Dict[str, Any]] = {}
+        self._by_instrument: Dict[str, List[str]] = {}
+        self.updates: deque = deque(maxlen=1000)  # recent decisions for monitoring
+        self._last_sync = 0.0
+        self._lock = threading.RLock()
+        self._feeds: List[Any] = []  # feeds already delivering ticks to on_prices
+        # broker calls run on worker threads, never on the feed callback
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Dict[str, Any]] = {}  # trade_id -> latest unsent {'stop', 'partial'}
+        self._inflight: Dict[str, Future] = {}  # trade_id -> worker draining its queue
+        self._sync_future: Optional[Future] = None
+
+        logger.info(f"🛡️ Protection engine ready (min stop move {min_move_pips} pips / "
+                    f"{min_move_fraction*100:.3f}%, {'live' if client else 'dry run'})")
+
+    # ---------- Position book ----------
+    def _reindex(self):
+        by_instrument: Dict[str, List[str]] = {}
+        for trade_id, position in self.positions.items():
+            by_instrument.setdefault(position['instrument'], []).append(trade_id)
+        self._by_instrument = by_instrument
+
+    def track(self, trade_id: str, instrument: str, side: str, entry_price: float,
+              stop_loss: float, units: float = 0.0, take_profit: Optional[float] = None):
+        """Start (or keep) protecting a trade; its in-memory peak survives re-syncs"""
+        with self._lock:
+            position = self.positions.get(trade_id)
+            if position is None:
+                position = {'trade_id': trade_id, 'peak_price': entry_price, 'last_update_ns': 0,
+                            'partial_closed': False}
+                self.positions[trade_id] = position
+            position.update({
+                'instrument': instrument,
+                'side': side.upper(),
+                'entry_price': float(entry_price),
+                'stop_loss': float(stop_loss),
+                'take_profit': take_profit,
+                'units': units,
+            })
+            self._reindex()
+
+    def forget(self, trade_id: str):
+        """Stop protecting a trade (closed or no longer ours)"""
+        with self._lock:
+            if self.positions.pop(trade_id, None) is not None:
+                self._reindex()
+
+    def sync_trades(self, trades: Optional[List[Dict[str, Any]]] = None) -> int:
+        """
+        Mirror OANDA's open trades into the position book
+
+        Args:
+            trades: Raw OANDA trade dicts (fetched from the client when None)
+
+        Returns:
+            Number of trades being protected
+        """
+        if trades is None:
+            if self.client is None:
+                return len(self.positions)
+            try:
+                trades = self.client.get_open_trades()
+            except Exception as e:
+                logger.warning(f"⚠️ Protection engine could not refresh open trades: {e}")
+                return len(self.positions)
+
+        with self._lock:
+            seen = set()
+            for trade in trades:
+                stop_order = trade.get('stopLossOrder') or {}
+                if 'price' not in stop_order:
+                    # no stop to ratchet - the strategy/ensure_protective_stop owns that
+                    continue
+                units = float(trade.get('currentUnits', 0))
+                take_profit = (trade.get('takeProfitOrder') or {}).get('price')
+                self.track(str(trade['id']), trade['instrument'], 'BUY' if units > 0 else 'SELL',
+                           float(trade['price']), float(stop_order['price']), units,
+                           float(take_profit) if take_profit is not None else None)
+                seen.add(str(trade['id']))
+            for trade_id in [t for t in self.positions if t not in seen]:
+                self.positions.pop(trade_id)
+            self._reindex()
+            self._last_sync = time.time()
+            return len(self.positions)
+
+    # ---------- Tick path ----------
+    def _min_move(self, instrument: str, price: float) -> float:
+        return max(self.min_move_pips * get_pip_value(instrument), self.min_move_fraction * price)
+
+    def on_tick(self, tick: MarketData) -> List[StopUpdate]:
+        """
+        Evaluate every open position on the tick's instrument
+
+        Longs are marked at the bid and shorts at the ask (the price they would
+        exit at). Only decides: stop moves and partial closes are queued for the
+        broker workers so the feed callback never waits on OANDA. Returns the
+        stop moves decided on this tick.
+        """
+        decisions = []
+        with self._lock:
+            for trade_id in self._by_instrument.get(tick.pair, ()):
+                position = self.positions[trade_id]
+                price = tick.bid if position['side'] == 'BUY' else tick.ask
+
+                new_stop = self.protector.update_stops(position, price)
+                if new_stop is not None:
+                    update = self._decide_stop(position, new_stop, price, tick.time_ns)
+                    if update is not None:
+                        decisions.append(update)
+
+                fraction = self.protector.should_close_partial(position, price)
+                if fraction and not position['partial_closed']:
+                    self._decide_partial(position, fraction)
+
+        self.updates.extend(decisions)
+        return decisions
+
+    def _decide_stop(self, position: Dict[str, Any], new_stop: float, price: float,
+                     time_ns: int) -> Optional[StopUpdate]:
+        old_stop = position['stop_loss']
+        new_stop = round(new_stop, _price_dp(position['instrument']))
+        if abs(new_stop - old_stop) < self._min_move(position['instrument'], price):
+            return None
+        if time_ns - position['last_update_ns'] < self.min_update_seconds * 1e9:
+            return None
+
+        update = StopUpdate(position['trade_id'], position['instrument'], old_stop, new_stop,
+                            price, time_ns, pushed=False)
+        # the book moves at once so later ticks ratchet from here; a rejected push reverts it
+        position['stop_loss'] = new_stop
+        position['last_update_ns'] = time_ns
+        if self.client is None:
+            logger.info(f"🛡️ {position['instrument']} trade {position['trade_id']}: stop "
+                        f"{old_stop:.{_price_dp(position['instrument'])}f} → {new_stop} "
+                        f"(price {price}, peak {position['peak_price']}, dry run)")
+            return update
+
+        queued = self._pending.setdefault(position['trade_id'], {})
+        if 'stop' in queued:
+            # not sent yet: only the latest stop goes out, reverting to the last one OANDA has
+            queued['stop'].error = 'superseded'
+            update.old_stop = queued['stop'].old_stop
+        queued['stop'] = update
+        self._schedule(position['trade_id'])
+        return update
+
+    def _decide_partial(self, position: Dict[str, Any], fraction: float):
+        units = int(abs(position['units']) * fraction)
+        if units <= 0:
+            return
+        position['partial_closed'] = True
+        if self.client is None:
+            return
+        self._pending.setdefault(position['trade_id'], {})['partial'] = units
+        self._schedule(position['trade_id'])
+
+    # ---------- Broker workers ----------
+    def _schedule(self, trade_id: str):
+        """Start a worker for the trade unless one is already draining its queue (lock held)"""
+        if trade_id in self._inflight:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='protection')
+        self._inflight[trade_id] = self._executor.submit(self._drain, trade_id)
+
+    def _drain(self, trade_id: str):
+        """Send a trade's queued broker actions one at a time, outside the lock"""
+        while True:
+            with self._lock:
+                queued = self._pending.pop(trade_id, None)
+                if not queued:
+                    self._inflight.pop(trade_id, None)
+                    return
+            if 'stop' in queued:
+                self._push_stop(queued['stop'])
+            if 'partial' in queued:
+                self._push_partial(trade_id, queued['partial'])
+
+    def _push_stop(self, update: StopUpdate):
+        try:
+            self.client.update_trade_protective_orders(update.trade_id, stop_loss=update.new_stop)
+            update.pushed = True
+        except Exception as e:
+            # retry on a later tick, but no faster than min_update_seconds
+            update.error = str(e)
+            logger.warning(f"⚠️ Stop update failed for trade {update.trade_id}: {e}")
+            with self._lock:
+                position = self.positions.get(update.trade_id)
+                if position is not None and position['stop_loss'] == update.new_stop:
+                    position['stop_loss'] = update.old_stop
+            return
+        logger.info(f"🛡️ {update.instrument} trade {update.trade_id}: stop "
+                    f"{update.old_stop:.{_price_dp(update.instrument)}f} → {update.new_stop} "
+                    f"(price {update.price})")
+
+    def _push_partial(self, trade_id: str, units: int):
+        try:
+            self.client.close_trade(trade_id, units=units)
+            logger.info(f"💰 Trade {trade_id}: closed {units} units")
+        except Exception as e:
+            logger.warning(f"⚠️ Partial close failed for trade {trade_id}: {e}")
+            with self._lock:
+                position = self.positions.get(trade_id)
+                if position is not None:
+                    position['partial_closed'] = False
+
+    def _sync_in_background(self):
+        try:
+            self.sync_trades()
+        finally:
+            with self._lock:
+                self._sync_future = None
+
+    def flush(self):
+        """Wait until every queued broker action (and trade refresh) has been sent"""
+        while True:
+            with self._lock:
+                futures = list(self._inflight.values())
+                if self._sync_future is not None:
+                    futures.append(self._sync_future)
+            if not futures:
+                return
+            wait(futures)
+
+    def on_prices(self, market_data: Dict[str, MarketData]):
+        """LiveDataFeed callback: queue a book refresh when due, then process each tick"""
+        if self.client is not None and time.time() - self._last_sync >= self.refresh_seconds:
+            with self._lock:
+                if self._sync_future is None:
+                    # the refresh is a REST call too - never made on the feed thread
+                    self._last_sync = time.time()
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                            thread_name_prefix='protection')
+                    self._sync_future = self._executor.submit(self._sync_in_background)
+        for tick in market_data.values():
+            if tick is not None:
+                self.on_tick(tick)
+
+    def attach(self, feed) -> 'ProtectionEngine':
+        """Subscribe to a LiveDataFeed and load the current open trades (once per feed)"""
+        if any(attached is feed for attached in self._feeds):
+            return self
+        self.sync_trades()
+        feed.add_data_callback(self.on_prices)
+        self._feeds.append(feed)
+        logger.info(f"🛡️ Protection engine attached to live feed ({len(self.positions)} open trades)")
+        return self
+
+    def replay(self, ticks: Iterable[MarketData]) -> List[StopUpdate]:
+        """
+        Run recorded ticks through the tick path; returns every stop move decided
+
+        Broker actions are flushed after each tick, as if OANDA answered
+        between ticks, so a replay is deterministic.
+        """
+        decisions = []
+        for tick in ticks:
+            decisions.extend(self.on_tick(tick))
+            self.flush()
+        return decisions
+
+
+def load_tick_file(path: str) -> Iterator[MarketData]:
+    """
+    Read recorded ticks in time order
+
+    Supports CSV with time,instrument,bid,ask columns and JSON lines holding
+    either the same flat fields or OANDA pricing-stream PRICE messages.
+    """
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                yield MarketData(pair=row['instrument'], bid=float(row['bid']), ask=float(row['ask']),
+                                 timestamp=row['time'], is_live=False, data_source='RECORDED')
+        return
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            message = json.loads(line)
+            if message.get('type', 'PRICE') != 'PRICE':
+                continue  # stream heartbeats
+            if 'bids' in message:
+                bid = float(message['bids'][0]['price'])
+                ask = float(message['asks'][0]['price'])
+            else:
+                bid, ask = float(message['bid']), float(message['ask'])
+            yield MarketData(pair=message['instrument'], bid=bid, ask=ask, timestamp=message['time'],
+                             is_live=False, data_source='RECORDED')
+
+
+class TickRecorder:
+    """LiveDataFeed callback that appends each tick to a JSON-lines file for replay"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._last: Dict[str, int] = {}
+
+    def __call__(self, market_data: Dict[str, MarketData]):
+        with open(self.path, 'a') as f:
+            for tick in market_data.values():
+                if tick is None or self._last.get(tick.pair) == tick.time_ns:
+                    continue  # the feed re-delivers unchanged prices
+                self._last[tick.pair] = tick.time_ns
+                f.write(json.dumps({'instrument': tick.pair, 'time': tick.timestamp,
+                                    'bid': tick.bid, 'ask': tick.ask}) + '\n')
+
+
+# Global instances, one per account (None = the default OANDA account)
+_protection_engines: Dict[Optional[str], ProtectionEngine] = {}
+_engines_lock = threading.Lock()
+
+def get_protection_engine(account_id: Optional[str] = None) -> ProtectionEngine:
+    """Get the protection engine for an account (live, using that account's shared OANDA client)"""
+    with _engines_lock:
+        engine = _protection_engines.get(account_id)
+        if engine is None:
+            from .oanda_client import get_account_client, get_oanda_client
+            client = get_account_client(account_id) if account_id else get_oanda_client()
+            engine = _protection_engines[account_id] = ProtectionEngine(client=client)
+        return engine
+
+
+def protect_accounts(feed) -> Dict[Optional[str], ProtectionEngine]:
+    """
+    Attach protection engines to the live feed at trading-system startup
+
+    A MultiAccountDataFeed gets one engine per account, fed by that account's
+    LiveDataFeed; a single LiveDataFeed protects the default account. Skipped
+    while TRADING_DISABLED is set, since stop moves are live orders.
+
+    Returns:
+        Account id -> attached engine
+    """
+    if os.getenv('TRADING_DISABLED', 'false').lower() == 'true':
+        logger.info("🛡️ Trading disabled - protection engine not attached")
+        return {}
+    feeds = getattr(feed, 'data_feeds', None)
+    if feeds is None:
+        feeds = {None: feed}
+    engines = {}
+    for account_id, account_feed in feeds.items():
+        try:
+            engines[account_id] = get_protection_engine(account_id).attach(account_feed)
+        except Exception as e:
+            logger.error(f"❌ Protection engine not attached for {account_id or 'default account'}: {e}")
+    return engines
+
+
+def main(poll_seconds: float = 1.0):
+    """
+    Protect one account's open trades (credentials from OANDA_API_KEY / OANDA_ACCOUNT_ID)
+
+    Standalone runner for start_profit_protection.sh when the trading system is
+    not running: polls prices for the instruments with open trades and feeds
+    them through the tick path. The trading system attaches its own engines to
+    the live feed at startup (protect_accounts), so do not run both.
+    """
+    from .oanda_client import OandaClient
+
+    client = OandaClient()
+    engine = ProtectionEngine(client=client)
+    logger.info(f"🛡️ Protecting open trades on account {client.account_id}")
+    while True:
+        try:
+            if time.time() - engine._last_sync >= engine.refresh_seconds:
+                engine.sync_trades()
+            instruments = sorted(engine._by_instrument)
+            if instruments:
+                prices = client.get_current_prices(instruments, force_refresh=True)
+                engine.on_prices({
+                    instrument: MarketData(pair=instrument, bid=price.bid, ask=price.ask,
+                                           timestamp=price.timestamp)
+                    for instrument, price in prices.items()
+                })
+        except Exception as e:
+            logger.error(f"❌ Protection loop error: {e}")
+            time.sleep(10)
+        time.sleep(poll_seconds)
+
+
+if __name__ == '__main__':
+    main()
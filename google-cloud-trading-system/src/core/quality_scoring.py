@@ -49,6 +49,134 @@ class QualityScore:
     expected_win_rate: float  # 0.0-1.0
     expected_risk_reward: float  # Expected R:R ratio
 
+# Column order of QualityScoreBatch.factor_scores
+FACTOR_ORDER: List[QualityFactor] = list(QualityFactor)
+
+_IMPACT_MULTIPLIERS = {"high": 1.5, "medium": 1.2}
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return np.convolve(values, np.ones(window) / window, mode="valid")
+
+
+def market_indicators(history: List[Any], adx_period: int = 14, momentum_period: int = 20) -> Dict[str, float]:
+    """
+    ADX, momentum and relative volume for the scorer from a strategy's price history
+    
+    Args:
+        history: Closes (floats) or candle dicts with 'close' and, when kept,
+            'high', 'low' and 'volume'
+        adx_period: ADX smoothing period (close-to-close range without highs/lows)
+        momentum_period: Bars the fractional momentum is measured over
+        
+    Returns:
+        {"adx", "momentum", "volume"} - volume is relative to its recent
+        average, 1.0 when the history carries none; ADX is 0 until there
+        are 2 * adx_period bars
+    """
+    if not history:
+        return {"adx": 0.0, "momentum": 0.0, "volume": 1.0}
+    if isinstance(history[0], dict):
+        closes = np.array([bar["close"] for bar in history], dtype=float)
+        highs = np.array([bar.get("high", bar["close"]) for bar in history], dtype=float)
+        lows = np.array([bar.get("low", bar["close"]) for bar in history], dtype=float)
+        volumes = np.array([bar.get("volume") or 0 for bar in history], dtype=float)
+    else:
+        closes = highs = lows = np.asarray(history, dtype=float)
+        volumes = None
+
+    adx = 0.0
+    if len(closes) >= adx_period * 2 + 1:
+        prev_close = closes[:-1]
+        true_range = np.maximum.reduce([highs[1:] - lows[1:], np.abs(highs[1:] - prev_close),
+                                        np.abs(lows[1:] - prev_close)])
+        up, down = np.diff(highs), -np.diff(lows)
+        dm_plus = np.where((up > down) & (up > 0), up, 0.0)
+        dm_minus = np.where((down > up) & (down > 0), down, 0.0)
+        tr_smooth = _rolling_mean(true_range, adx_period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            di_plus = 100 * _rolling_mean(dm_plus, adx_period) / tr_smooth
+            di_minus = 100 * _rolling_mean(dm_minus, adx_period) / tr_smooth
+            dx = np.nan_to_num(100 * np.abs(di_plus - di_minus) / (di_plus + di_minus))
+        adx = float(dx[-adx_period:].mean())
+
+    start = closes[-min(momentum_period, len(closes))]
+    momentum = float((closes[-1] - start) / start) if start else 0.0
+
+    volume = 1.0
+    if volumes is not None and volumes[-1] > 0:
+        average = volumes[-20:].mean()
+        volume = float(volumes[-1] / average) if average > 0 else 1.0
+
+    return {"adx": adx, "momentum": momentum, "volume": volume}
+
+
+@dataclass
+class QualityScoreBatch:
+    """Vectorized quality scores for every candidate signal of a scan.
+
+    Row ``i`` corresponds to the i-th candidate. Factor scores are an
+    (n, 10) array in ``FACTOR_ORDER``. Explanations and ``QualityScore``
+    objects are only built on request, for the signals that are actually
+    shown or executed.
+    """
+    instruments: List[str]
+    sides: List[str]
+    factor_scores: np.ndarray  # (n, len(FACTOR_ORDER)), 0-100
+    total_scores: np.ndarray  # (n,), rounded 0-100
+    confidence: np.ndarray  # (n,), 0.0-1.0
+    expected_win_rate: np.ndarray  # (n,), 0.0-1.0
+    expected_risk_reward: np.ndarray  # (n,)
+    inputs: Dict[str, np.ndarray]  # raw adx / momentum / risk_reward used in explanations
+    thresholds: Dict[str, float]
+
+    def __len__(self) -> int:
+        return len(self.instruments)
+
+    @property
+    def recommendations(self) -> np.ndarray:
+        """Recommendation label per row"""
+        t = self.thresholds
+        return np.select(
+            [self.total_scores >= t["strong_buy"], self.total_scores >= t["buy"],
+             self.total_scores >= t["neutral"], self.total_scores >= t["sell"]],
+            ["strong_buy", "buy", "neutral", "sell"], default="strong_sell")
+
+    def passing(self, min_score: float) -> np.ndarray:
+        """Indices of rows whose total score is at least ``min_score``"""
+        return np.flatnonzero(self.total_scores >= min_score)
+
+    def explanation(self, i: int) -> str:
+        """Human-readable explanation for row ``i`` (same text as score_trade_quality)"""
+        f = self.factor_scores[i]
+        adx = self.inputs["adx"][i]
+        momentum = self.inputs["momentum"][i]
+        risk_reward = self.inputs["risk_reward"][i]
+        return " | ".join([
+            f"Trend strength: {f[0]:.0f}/100 (ADX: {adx:.1f})",
+            f"Momentum: {f[1]:.0f}/100 ({momentum:.4f})",
+            f"Volume: {f[2]:.0f}/100",
+            f"Pattern quality: {f[3]:.0f}/100",
+            f"Session quality: {f[4]:.0f}/100",
+            f"News alignment: {f[5]:.0f}/100",
+            f"Multi-timeframe alignment: {f[6]:.0f}/100",
+            f"Key level proximity: {f[7]:.0f}/100",
+            f"Risk-reward: {f[8]:.0f}/100 (R:R {risk_reward:.1f})",
+            f"Historical win rate: {f[9]:.0f}/100",
+        ])
+
+    def to_quality_score(self, i: int) -> QualityScore:
+        """Materialise row ``i`` as a regular QualityScore"""
+        return QualityScore(
+            total_score=int(self.total_scores[i]),
+            factors={factor: float(self.factor_scores[i, j]) for j, factor in enumerate(FACTOR_ORDER)},
+            explanation=self.explanation(i),
+            recommendation=str(self.recommendations[i]),
+            confidence=float(self.confidence[i]),
+            expected_win_rate=float(self.expected_win_rate[i]),
+            expected_risk_reward=float(self.expected_risk_reward[i])
+        )
+
 class QualityScoring:
     """
     Comprehensive quality scoring system
@@ -217,6 +345,184 @@ class QualityScoring:
             expected_risk_reward=expected_risk_reward
         )
     
+    def score_trade_quality_batch(self, instruments: List[str], sides: List[str],
+                                  adx, momentum, volume,
+                                  pattern_strength=None, news_sentiment=None,
+                                  news_impact: Optional[List[str]] = None,
+                                  mtf_aligned=None, mtf_total=None,
+                                  current_price=None, nearest_support=None,
+                                  nearest_resistance=None, risk_reward=None,
+                                  timestamps: Optional[List[Optional[datetime]]] = None) -> QualityScoreBatch:
+        """
+        Score all candidate signals of a scan in one vectorized pass
+        
+        Produces the same factor and total scores as calling
+        score_trade_quality per signal. Optional columns use NaN (or None)
+        for "not available", which maps to the same neutral defaults.
+        
+        Args:
+            instruments: Instrument per candidate
+            sides: "BUY" or "SELL" per candidate
+            adx, momentum, volume: Market data columns
+            pattern_strength: Pattern strength 0-1 (NaN = no pattern)
+            news_sentiment: News sentiment -1..1 (NaN = no news)
+            news_impact: "low"/"medium"/"high" per candidate
+            mtf_aligned, mtf_total: Aligned / total timeframe counts
+            current_price, nearest_support, nearest_resistance: Key level inputs
+            risk_reward: Reward/risk ratio (NaN = unknown, scored as 1.0)
+            timestamps: Per-candidate timestamp for session scoring (None = now)
+            
+        Returns:
+            QualityScoreBatch with one row per candidate
+        """
+        n = len(instruments)
+
+        def _col(values, default: float = np.nan) -> np.ndarray:
+            if values is None:
+                return np.full(n, default, dtype=float)
+            return np.array([default if v is None else v for v in values], dtype=float)
+
+        adx = _col(adx, 0.0)
+        momentum = _col(momentum, 0.0)
+        volume = _col(volume, 0.0)
+        rr_raw = _col(risk_reward)
+        rr = np.where(np.isnan(rr_raw), 1.0, rr_raw)
+        direction = np.where(np.asarray(sides) == "BUY", 1.0, -1.0)
+        is_buy = direction > 0
+
+        factors = np.empty((n, len(FACTOR_ORDER)), dtype=float)
+
+        # 1. Trend strength (ADX)
+        factors[:, 0] = np.select(
+            [adx >= 50, adx >= 25, adx >= 15],
+            [100.0, 75 + (adx - 25) * 25 / 25, 50 + (adx - 15) * 25 / 10],
+            default=adx * 50 / 15)
+
+        # 2. Momentum alignment
+        factors[:, 1] = (1 + direction * momentum) / 2 * 100
+
+        # 3. Volume
+        factors[:, 2] = np.select(
+            [volume >= 2.0, volume >= 1.5, volume >= 1.0, volume >= 0.75, volume >= 0.5, volume >= 0.25],
+            [100, 90, 75, 60, 40, 25], default=10)
+
+        # 4. Pattern quality
+        pattern = _col(pattern_strength)
+        factors[:, 3] = np.where(np.isnan(pattern), 50.0, pattern * 100)
+
+        # 5. Session quality - one lookup per distinct timestamp
+        stamps = timestamps if timestamps is not None else [None] * n
+        session_cache: Dict[Any, float] = {}
+        session = np.empty(n, dtype=float)
+        for i, ts in enumerate(stamps):
+            if ts not in session_cache:
+                session_cache[ts] = self._score_session_quality(ts)
+            session[i] = session_cache[ts]
+        factors[:, 4] = session
+
+        # 6. News alignment
+        sentiment = _col(news_sentiment)
+        impacts = news_impact if news_impact is not None else ["low"] * n
+        impact_mult = np.array([_IMPACT_MULTIPLIERS.get(imp, 1.0) for imp in impacts], dtype=float)
+        news = np.minimum(100.0, (1 + direction * sentiment) / 2 * 100 * impact_mult)
+        factors[:, 5] = np.where(np.isnan(sentiment), 50.0, news)
+
+        # 7. Multi-timeframe alignment
+        aligned = _col(mtf_aligned, 0.0)
+        total_tf = _col(mtf_total, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factors[:, 6] = np.where(total_tf > 0, aligned / total_tf * 100, 50.0)
+
+        # 8. Key level proximity
+        price = np.nan_to_num(_col(current_price), nan=0.0)
+        support = np.nan_to_num(_col(nearest_support), nan=0.0)
+        resistance = np.nan_to_num(_col(nearest_resistance), nan=0.0)
+        has_levels = (price != 0) & (support != 0) & (resistance != 0)
+        safe_price = np.where(price == 0, 1.0, price)
+        distance = np.where(is_buy, np.abs(price - support), np.abs(resistance - price)) / safe_price
+        factors[:, 7] = np.where(has_levels, (1.0 - np.minimum(1.0, distance * 100)) * 100, 50.0)
+
+        # 9. Risk-reward
+        factors[:, 8] = np.select(
+            [rr >= 3.0, rr >= 2.0, rr >= 1.5, rr >= 1.0],
+            [100.0, 80 + (rr - 2.0) * 20, 60 + (rr - 1.5) * 40, 40 + (rr - 1.0) * 40],
+            default=np.maximum(0, rr * 40))
+
+        # 10. Historical win rate
+        base_win_rate = np.array([self.historical_win_rates.get(inst, 0.5) for inst in instruments], dtype=float)
+        factors[:, 9] = base_win_rate * 100
+
+        weights = np.array([self.weights[factor] for factor in FACTOR_ORDER], dtype=float)
+        total_scores = np.round(factors @ weights)
+        confidence = (np.abs(factors - 50) > 10).mean(axis=1)
+        expected_win_rate = np.clip(base_win_rate + (total_scores - 50) / 200, 0.05, 0.95)
+
+        return QualityScoreBatch(
+            instruments=list(instruments),
+            sides=list(sides),
+            factor_scores=factors,
+            total_scores=total_scores,
+            confidence=confidence,
+            expected_win_rate=expected_win_rate,
+            expected_risk_reward=rr,
+            inputs={"adx": adx, "momentum": momentum, "risk_reward": rr},
+            thresholds=dict(self.recommendation_thresholds)
+        )
+
+    def score_signals_batch(self, signals: List[Tuple[str, str, Dict[str, Any], Optional[Dict[str, Any]]]]) -> QualityScoreBatch:
+        """
+        Batch-score (instrument, side, market_data, context) tuples
+        
+        Convenience wrapper that extracts the columns from the same dicts
+        score_trade_quality accepts and calls score_trade_quality_batch.
+        """
+        instruments, sides = [], []
+        adx, momentum, volume = [], [], []
+        pattern, sentiment, impact = [], [], []
+        mtf_aligned, mtf_total = [], []
+        price, support, resistance, rr, stamps = [], [], [], [], []
+        for instrument, side, market_data, context in signals:
+            context = context or {}
+            instruments.append(instrument)
+            sides.append(side)
+            adx.append(market_data.get("adx", 0))
+            momentum.append(market_data.get("momentum", 0))
+            volume.append(market_data.get("volume", 0))
+            pattern_data = context.get("pattern")
+            if "pattern" not in context:
+                pattern.append(None)
+            else:
+                pattern.append(pattern_data.get("strength", 0.5) if pattern_data else None)
+            news = context.get("news")
+            if "news" in context:
+                sentiment.append(news.get("sentiment", 0))
+                impact.append(news.get("impact", "low"))
+            else:
+                sentiment.append(None)
+                impact.append("low")
+            aligned = total = 0
+            for tf_data in context.get("timeframes", {}).values():
+                if "trend" in tf_data:
+                    total += 1
+                    if (side == "BUY" and tf_data["trend"] == "bullish") or \
+                       (side == "SELL" and tf_data["trend"] == "bearish"):
+                        aligned += 1
+            mtf_aligned.append(aligned)
+            mtf_total.append(total)
+            price.append(context.get("current_price") or 0)
+            support.append(context.get("nearest_support") or 0)
+            resistance.append(context.get("nearest_resistance") or 0)
+            rr.append(context.get("risk_reward", 1.0))
+            stamps.append(context.get("timestamp"))
+
+        return self.score_trade_quality_batch(
+            instruments, sides, adx, momentum, volume,
+            pattern_strength=pattern, news_sentiment=sentiment, news_impact=impact,
+            mtf_aligned=mtf_aligned, mtf_total=mtf_total,
+            current_price=price, nearest_support=support, nearest_resistance=resistance,
+            risk_reward=rr, timestamps=stamps
+        )
+    
     def _score_trend_strength(self, adx: float) -> float:
         """
         Score trend strength based on ADX
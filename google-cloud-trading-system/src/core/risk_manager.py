@@ -2,14 +2,21 @@
 """
 Advanced Risk Management System
 Implements position limits, correlation checks, spread filters, and time filters
+
+Correlation checks use a rolling correlation matrix fed from bar closes once
+enough bars are in; until then the static correlation groups apply.
 """
 
 import logging
 from datetime import datetime, time
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 import os
 
+import numpy as np
+
+from .correlation_risk import RollingCorrelation, currency_exposure, usd_notional
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -21,6 +28,11 @@ class RiskLimits:
     max_spread_pips: float = 3.0
     max_correlated_pairs: int = 2
     min_margin_available_pct: float = 30.0
+    correlation_threshold: float = 0.7       # |corr| counted as correlated
+    correlation_window: int = 500            # bars in the rolling matrix
+    correlation_min_bars: int = 50           # bars before the matrix replaces the static groups
+    max_correlated_exposure: float = 10.0    # correlation-weighted USD exposure, x balance
+    max_currency_exposure: float = 10.0      # net USD exposure per currency, x balance
 
 class RiskManager:
     """Advanced risk management for trading system"""
@@ -42,6 +54,18 @@ class RiskManager:
     def __init__(self, limits: Optional[RiskLimits] = None):
         """Initialize risk manager with limits"""
         self.limits = limits or RiskLimits()
+        self.correlations = RollingCorrelation(window=self.limits.correlation_window,
+                                               min_periods=self.limits.correlation_min_bars)
+        
+        # Net signed units per instrument, and the vectors derived from them
+        self.positions: Dict[str, float] = {}
+        self._exposure_key: Optional[Tuple[int, int]] = None
+        self._positions_version = 0
+        self._correlated_exposure = np.zeros(0)
+        self._correlated_count = np.zeros(0, dtype=int)
+        self._open_mask = np.zeros(0, dtype=bool)
+        self.currency_exposure: Dict[str, float] = {}
+        
         logger.info(f"✅ Risk Manager initialized:")
         logger.info(f"   Max positions: {self.limits.max_concurrent_positions}")
         logger.info(f"   Max margin: {self.limits.max_margin_usage_pct}%")
@@ -56,11 +80,15 @@ class RiskManager:
         signal_strength: float,
         spread_pips: float,
         margin_used_pct: float,
-        account_balance: float
+        account_balance: float,
+        units: Optional[float] = None
     ) -> tuple[bool, str]:
         """
         Check if we can open a new position
         
+        Args:
+            units: Signed units of the new trade (enables the exposure check)
+        
         Returns:
             (can_open: bool, reason: str)
         """
@@ -95,10 +123,115 @@ class RiskManager:
         if margin_available_pct < self.limits.min_margin_available_pct:
             return False, f"Insufficient margin available ({margin_available_pct:.1f}% < {self.limits.min_margin_available_pct}%)"
         
+        # Check 8: Correlation-weighted and per-currency exposure
+        if units:
+            exceeds, reason = self.would_exceed_correlated_risk(instrument, units, account_balance)
+            if exceeds:
+                return False, reason
+        
         return True, "All checks passed"
     
+    # ---------- Correlation and exposure ----------
+    def on_bar_close(self, instrument: str, close: float, time_ns: int):
+        """Feed a live bar close into the rolling correlation matrix"""
+        self.correlations.on_bar_close(instrument, close, time_ns)
+    
+    def load_candles(self, candles: Dict[str, Any]):
+        """Warm the correlation matrix from stored candles (DataFrames or OANDA candle lists)"""
+        self.correlations.load_candles(candles)
+    
+    def sync_positions(self, open_trades: List[Dict[str, Any]]):
+        """Set net positions from OANDA trade dicts (instrument, currentUnits)"""
+        positions: Dict[str, float] = {}
+        for trade in open_trades:
+            units = float(trade.get('currentUnits', trade.get('units', 0)))
+            positions[trade['instrument']] = positions.get(trade['instrument'], 0.0) + units
+        self.set_positions(positions)
+    
+    def set_positions(self, positions: Dict[str, float]):
+        """Set net signed units per instrument"""
+        self.positions = {instrument: units for instrument, units in positions.items() if units}
+        self._positions_version += 1
+    
+    def _refresh_exposure(self):
+        """Rebuild the exposure vectors when the matrix or the positions changed"""
+        for instrument in self.positions:
+            self.correlations.ensure_instrument(instrument)
+        key = (self.correlations.version, self._positions_version, len(self.correlations.instruments))
+        if key == self._exposure_key:
+            return
+        
+        prices = self.correlations.last_close
+        index = self.correlations.index
+        notional = np.zeros(len(index))
+        for instrument, units in self.positions.items():
+            notional[index[instrument]] = usd_notional(instrument, units, prices)
+        corr = self.correlations.values
+        self._open_mask = notional != 0
+        # exposure each instrument would add to, and open positions strongly correlated with it
+        self._correlated_exposure = corr @ notional
+        strong = np.abs(corr) >= self.limits.correlation_threshold  # diagonal: same instrument counts
+        self._correlated_count = strong.astype(int) @ self._open_mask.astype(int)
+        self.currency_exposure = currency_exposure(self.positions, prices)
+        self._exposure_key = key
+    
+    def correlated_exposure(self, instrument: str) -> float:
+        """Correlation-weighted USD exposure already held in the instrument's direction"""
+        self._refresh_exposure()
+        idx = self.correlations.index.get(instrument)
+        return float(self._correlated_exposure[idx]) if idx is not None else 0.0
+    
+    def would_exceed_correlated_risk(self, instrument: str, units: float,
+                                     account_balance: float) -> Tuple[bool, str]:
+        """
+        Would a new trade push correlated or single-currency exposure past the limits?
+        
+        Args:
+            instrument: Instrument to trade
+            units: Signed units (negative = short)
+            account_balance: Balance the limits are multiples of
+        
+        Returns:
+            (exceeds, reason)
+        """
+        if account_balance <= 0:
+            return False, "No balance to compare against"
+        self._refresh_exposure()
+        prices = self.correlations.last_close
+        notional = usd_notional(instrument, units, prices)
+        
+        if self.correlations.ready:
+            idx = self.correlations.index.get(instrument)
+            held = self._correlated_exposure[idx] if idx is not None else 0.0
+            # only exposure on the same side as the new trade adds risk
+            after = abs(held + notional) if held * notional > 0 else abs(notional)
+            limit = self.limits.max_correlated_exposure * account_balance
+            if after > limit:
+                return True, (f"Correlated exposure too high (${after:,.0f} > ${limit:,.0f} "
+                              f"with {instrument})")
+        
+        base, _, quote = instrument.partition('_')
+        limit = self.limits.max_currency_exposure * account_balance
+        for currency, change in ((base, notional), (quote, -notional)):
+            after = self.currency_exposure.get(currency, 0.0) + change
+            if abs(after) > limit and abs(after) > abs(self.currency_exposure.get(currency, 0.0)):
+                return True, f"{currency} exposure too high (${abs(after):,.0f} > ${limit:,.0f})"
+        
+        return False, "Exposure within limits"
+    
     def _count_correlated_pairs(self, instrument: str, open_instruments: List[str]) -> int:
         """Count how many correlated pairs are already open"""
+        if self.correlations.ready and instrument in self.correlations.index:
+            self._refresh_exposure()
+            if set(open_instruments) == set(self.positions):
+                return int(self._correlated_count[self.correlations.index[instrument]])
+            row = self.correlations.values[self.correlations.index[instrument]]
+            threshold = self.limits.correlation_threshold
+            index = self.correlations.index
+            return sum(1 for open_inst in set(open_instruments)
+                       if open_inst in index and abs(row[index[open_inst]]) >= threshold)
+        
+        # Not enough bars yet - fall back to the static groups
         correlated_count = 0
         
         # Find which correlation groups this instrument belongs to
@@ -254,6 +387,11 @@ class RiskManager:
     
     def get_correlated_pairs(self, instrument: str) -> Set[str]:
         """Get all pairs correlated with given instrument"""
+        if self.correlations.ready and instrument in self.correlations.index:
+            row = self.correlations.values[self.correlations.index[instrument]]
+            return {other for other, idx in self.correlations.index.items()
+                    if other != instrument and abs(row[idx]) >= self.limits.correlation_threshold}
+        
         correlated = set()
         
         for group_name, pairs in self.CORRELATION_GROUPS.items():
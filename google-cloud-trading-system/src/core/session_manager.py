@@ -5,10 +5,13 @@ Tracks active market sessions and provides timezone-aware scheduling
 """
 
 import logging
+import time as _time
+import numpy as np
+import pandas as pd
 import pytz
 from datetime import datetime, time, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, FrozenSet, List, Optional, Tuple, Set
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +37,55 @@ class SessionQuality(Enum):
     POOR = 1     # Poor liquidity (Sydney, late night)
     AVOID = 0    # Avoid trading (weekend, off-hours)
 
+HOURS_PER_WEEK = 168
+# 1970-01-01 was a Thursday: shifts epoch hours so Monday 00:00 UTC is hour 0
+_EPOCH_HOUR_OF_WEEK = 3 * 24
+
+# Each centre's session is set in its own local time, so it follows that centre's DST
+SESSION_ZONES = {
+    MarketSession.SYDNEY: 'Australia/Sydney',
+    MarketSession.TOKYO: 'Asia/Tokyo',
+    MarketSession.LONDON: 'Europe/London',
+    MarketSession.NEWYORK: 'America/New_York',
+}
+
+# Overlaps are the hours both sessions are open
+SESSION_OVERLAPS = {
+    MarketSession.OVERLAP_LONDON_NY: (MarketSession.LONDON, MarketSession.NEWYORK),
+    MarketSession.OVERLAP_TOKYO_LONDON: (MarketSession.TOKYO, MarketSession.LONDON),
+}
+
+
+def _epoch_hour(timestamp: Optional[datetime] = None) -> int:
+    """Whole UTC hours since 1970 (naive timestamps are taken as UTC)"""
+    if timestamp is None:
+        return int(_time.time()) // 3600
+    if timestamp.tzinfo is None or timestamp.utcoffset() is None:
+        timestamp = timestamp.replace(tzinfo=pytz.UTC)
+    return int(timestamp.timestamp()) // 3600
+
+
+def hour_of_week(timestamp: Optional[datetime] = None) -> int:
+    """
+    UTC hour of the week (Monday 00:00 = 0 ... Sunday 23:00 = 167)
+
+    Aware timestamps are placed by their UTC offset; naive ones are taken as UTC.
+    """
+    return (_epoch_hour(timestamp) + _EPOCH_HOUR_OF_WEEK) % HOURS_PER_WEEK
+
+
+class _WeekCalendar:
+    """Sessions, quality and per-session flags for each UTC hour of one DST regime"""
+
+    __slots__ = ('sessions', 'quality', 'quality_list', 'flags')
+
+    def __init__(self, sessions: List[FrozenSet[MarketSession]], quality: np.ndarray, flags: np.ndarray):
+        self.sessions = sessions
+        self.quality = quality
+        self.quality_list = quality.tolist()
+        self.flags = flags
+
+
 class SessionManager:
     """
     Manages market session information and timezone conversions
@@ -47,18 +99,17 @@ class SessionManager:
         # Primary timezone (London)
         self.primary_tz = pytz.timezone('Europe/London')
         
-        # Session times in UTC
-        # Sydney: 22:00-07:00 UTC
-        # Tokyo: 00:00-09:00 UTC
-        # London: 08:00-16:00 UTC
-        # New York: 13:00-21:00 UTC
+        # Session hours in each centre's local time (see SESSION_ZONES); overlaps
+        # come from SESSION_OVERLAPS. In UTC, winter / summer:
+        # Sydney: 21:00-06:00 / 22:00-07:00 (Sydney's summer is January)
+        # Tokyo: 00:00-09:00 (no DST)
+        # London: 08:00-16:00 / 07:00-15:00
+        # New York: 13:00-21:00 / 12:00-20:00
         self.session_times = {
-            MarketSession.SYDNEY: (22, 7),    # 22:00-07:00 UTC
-            MarketSession.TOKYO: (0, 9),      # 00:00-09:00 UTC
-            MarketSession.LONDON: (8, 16),    # 08:00-16:00 UTC
-            MarketSession.NEWYORK: (13, 21),  # 13:00-21:00 UTC
-            MarketSession.OVERLAP_LONDON_NY: (13, 16),  # 13:00-16:00 UTC (prime trading hours)
-            MarketSession.OVERLAP_TOKYO_LONDON: (8, 9)  # 08:00-09:00 UTC
+            MarketSession.SYDNEY: (8, 17),     # 08:00-17:00 Sydney
+            MarketSession.TOKYO: (9, 18),      # 09:00-18:00 Tokyo
+            MarketSession.LONDON: (8, 16),     # 08:00-16:00 London
+            MarketSession.NEWYORK: (8, 16),    # 08:00-16:00 New York
         }
         
         # Session quality scores (0-100)
@@ -76,46 +127,70 @@ class SessionManager:
         # Weekend days (5=Saturday, 6=Sunday)
         self.weekend_days = {5, 6}
         
+        # Hour-of-week calendar: sessions and quality for each UTC hour
+        self.rebuild_calendar()
+        
         logger.info(f"✅ {self.name} initialized")
     
-    def get_current_sessions(self, timestamp: Optional[datetime] = None) -> Set[MarketSession]:
+    def rebuild_calendar(self):
+        """Drop the hour-of-week tables (call after changing session_times or scores)"""
+        self._calendar_columns = list(MarketSession)
+        self._zones = [pytz.timezone(SESSION_ZONES[session]) for session in self.session_times]
+        self._weeks: Dict[int, _WeekCalendar] = {}     # UTC week number -> calendar
+        self._regimes: Dict[tuple, _WeekCalendar] = {}  # zone offsets over the week -> calendar
+    
+    def _week_calendar(self, week: int) -> _WeekCalendar:
         """
-        Get currently active market sessions
+        Calendar for one UTC week (Monday 00:00 UTC onwards)
         
-        Args:
-            timestamp: Optional timestamp to check (defaults to now)
-            
-        Returns:
-            Set of active MarketSession enums
+        Weeks with the same weekday offsets in every zone share one table, so
+        there are only a handful of tables however long a backtest runs.
         """
-        # Use provided timestamp or current time
-        if timestamp is None:
-            timestamp = datetime.now(pytz.UTC)
-        elif timestamp.tzinfo is None:
-            # Assume UTC if no timezone provided
-            timestamp = pytz.UTC.localize(timestamp)
-        else:
-            # Convert to UTC
-            timestamp = timestamp.astimezone(pytz.UTC)
-        
+        calendar = self._weeks.get(week)
+        if calendar is None:
+            start = (week * HOURS_PER_WEEK - _EPOCH_HOUR_OF_WEEK) * 3600
+            # Weekend hours are closed whatever the clocks say, so they do not split regimes
+            offsets = tuple(
+                tuple(0 if how // 24 in self.weekend_days else
+                      int(datetime.fromtimestamp(start + how * 3600, zone).utcoffset().total_seconds()) // 60
+                      for how in range(HOURS_PER_WEEK))
+                for zone in self._zones)
+            calendar = self._regimes.get(offsets)
+            if calendar is None:
+                calendar = self._regimes[offsets] = self._build_calendar(offsets)
+            self._weeks[week] = calendar
+        return calendar
+    
+    def _build_calendar(self, offsets: tuple) -> _WeekCalendar:
+        """Hour-of-week table for the given per-zone UTC offsets (minutes, one per hour)"""
+        sessions = []
+        quality = np.zeros(HOURS_PER_WEEK, dtype=np.int64)
+        for how in range(HOURS_PER_WEEK):
+            local_hours = [((how % 24) * 60 + zone_offsets[how]) % 1440 // 60 for zone_offsets in offsets]
+            active = frozenset(self._sessions_at(how // 24, dict(zip(self.session_times, local_hours))))
+            sessions.append(active)
+            quality[how] = self._quality_of(active)
+        flags = np.array([[session in active for session in self._calendar_columns] for active in sessions])
+        return _WeekCalendar(sessions, quality, flags)
+    
+    @staticmethod
+    def _in_hours(hour: int, start_hour: int, end_hour: int) -> bool:
+        # Handle sessions that cross midnight
+        if start_hour > end_hour:
+            return hour >= start_hour or hour < end_hour
+        return start_hour <= hour < end_hour
+    
+    def _sessions_at(self, weekday: int, local_hours: Dict[MarketSession, int]) -> Set[MarketSession]:
+        """Active sessions for a UTC weekday, given each centre's local hour"""
         # Check if weekend
-        if timestamp.weekday() in self.weekend_days:
+        if weekday in self.weekend_days:
             return {MarketSession.WEEKEND}
         
-        # Get current hour in UTC
-        current_hour = timestamp.hour
-        
         # Find active sessions
-        active_sessions = set()
-        
-        for session, (start_hour, end_hour) in self.session_times.items():
-            # Handle sessions that cross midnight
-            if start_hour > end_hour:
-                if current_hour >= start_hour or current_hour < end_hour:
-                    active_sessions.add(session)
-            else:
-                if start_hour <= current_hour < end_hour:
-                    active_sessions.add(session)
+        active_sessions = {session for session, (start_hour, end_hour) in self.session_times.items()
+                           if self._in_hours(local_hours[session], start_hour, end_hour)}
+        active_sessions |= {overlap for overlap, parts in SESSION_OVERLAPS.items()
+                            if all(part in active_sessions for part in parts)}
         
         # If no sessions active, it's off-hours
         if not active_sessions:
@@ -123,6 +198,25 @@ class SessionManager:
         
         return active_sessions
     
+    def _quality_of(self, active_sessions: Set[MarketSession]) -> int:
+        """Highest quality score among the sessions (0 on weekends)"""
+        if MarketSession.WEEKEND in active_sessions:
+            return 0
+        return max(self.session_quality_scores.get(session, 0) for session in active_sessions)
+    
+    def get_current_sessions(self, timestamp: Optional[datetime] = None) -> Set[MarketSession]:
+        """
+        Get currently active market sessions
+        
+        Args:
+            timestamp: Optional timestamp to check (defaults to now; naive is taken as UTC)
+            
+        Returns:
+            Frozen set of active MarketSession enums
+        """
+        week, how = divmod(_epoch_hour(timestamp) + _EPOCH_HOUR_OF_WEEK, HOURS_PER_WEEK)
+        return self._week_calendar(week).sessions[how]
+    
     def get_session_quality(self, timestamp: Optional[datetime] = None) -> Tuple[int, Set[MarketSession]]:
         """
         Get session quality score (0-100) for trading
@@ -133,16 +227,37 @@ class SessionManager:
         Returns:
             Tuple of (quality_score, active_sessions)
         """
-        active_sessions = self.get_current_sessions(timestamp)
-        
-        # If weekend, quality is 0
-        if MarketSession.WEEKEND in active_sessions:
-            return 0, active_sessions
-        
-        # Get highest quality score from active sessions
-        quality_score = max(self.session_quality_scores.get(session, 0) for session in active_sessions)
+        week, how = divmod(_epoch_hour(timestamp) + _EPOCH_HOUR_OF_WEEK, HOURS_PER_WEEK)
+        calendar = self._week_calendar(week)
+        return calendar.quality_list[how], calendar.sessions[how]
+    
+    def tag_sessions(self, index: pd.DatetimeIndex) -> pd.DataFrame:
+        """
+        Session tags for every timestamp of a backtest index in one pass
         
-        return quality_score, active_sessions
+        Args:
+            index: DatetimeIndex (naive is taken as UTC, aware is converted)
+            
+        Returns:
+            DataFrame on the same index with 'quality', 'sessions' (frozensets)
+            and one boolean column per MarketSession name
+        """
+        index = pd.DatetimeIndex(index)
+        utc = index if index.tz is None else index.tz_convert('UTC').tz_localize(None)
+        hours = utc.values.astype('datetime64[h]').astype(np.int64) + _EPOCH_HOUR_OF_WEEK
+        weeks, how = np.divmod(hours, HOURS_PER_WEEK)
+        unique_weeks, row = np.unique(weeks, return_inverse=True)
+        calendars = [self._week_calendar(int(week)) for week in unique_weeks]
+        
+        tags = pd.DataFrame({'quality': np.stack([c.quality for c in calendars])[row, how]}, index=index)
+        sessions = np.empty((len(calendars), HOURS_PER_WEEK), dtype=object)
+        for i, calendar in enumerate(calendars):
+            sessions[i, :] = calendar.sessions
+        tags['sessions'] = sessions[row, how]
+        flags = np.stack([c.flags for c in calendars])[row, how]
+        for col, session in enumerate(self._calendar_columns):
+            tags[session.name] = flags[:, col]
+        return tags
     
     def is_session_active(self, session: MarketSession, timestamp: Optional[datetime] = None) -> bool:
         """
@@ -183,6 +298,24 @@ class SessionManager:
         quality, _ = self.get_session_quality(timestamp)
         return quality >= min_quality
     
+    def _session_window(self, session: MarketSession, day) -> Tuple[datetime, datetime]:
+        """UTC start and end of a session on a local calendar day (overlaps: both parts' day)"""
+        if session in SESSION_OVERLAPS:
+            windows = [self._session_window(part, day) for part in SESSION_OVERLAPS[session]]
+            start = max(w[0] for w in windows)
+            return start, max(start, min(w[1] for w in windows))
+        zone = pytz.timezone(SESSION_ZONES.get(session, 'UTC'))
+        start_hour, end_hour = self.session_times.get(session, (0, 0))
+        start = zone.localize(datetime(day.year, day.month, day.day, start_hour))
+        end_day = day + timedelta(days=1) if start_hour > end_hour else day
+        end = zone.localize(datetime(end_day.year, end_day.month, end_day.day, end_hour))
+        return start.astimezone(pytz.UTC), end.astimezone(pytz.UTC)
+    
+    @staticmethod
+    def _session_zone(session: MarketSession):
+        anchor = SESSION_OVERLAPS.get(session, (session,))[0]
+        return pytz.timezone(SESSION_ZONES.get(anchor, 'UTC'))
+    
     def get_next_session_time(self, session: MarketSession, from_time: Optional[datetime] = None) -> datetime:
         """
         Get next time when specified session starts
@@ -192,7 +325,7 @@ class SessionManager:
             from_time: Optional start time (defaults to now)
             
         Returns:
-            datetime of next session start
+            UTC datetime of next session start (in the session's local time, so DST-correct)
         """
         if from_time is None:
             from_time = datetime.now(pytz.UTC)
@@ -201,19 +334,13 @@ class SessionManager:
         else:
             from_time = from_time.astimezone(pytz.UTC)
         
-        # Get session start hour
-        start_hour, _ = self.session_times.get(session, (0, 0))
-        
-        # Create target time for today
-        target = from_time.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-        
-        # If target is in the past, move to next day
-        if target <= from_time:
-            target += timedelta(days=1)
+        day = from_time.astimezone(self._session_zone(session)).date()
+        target, _ = self._session_window(session, day)
         
-        # If session is on weekend, move to Monday
-        while target.weekday() in self.weekend_days:
-            target += timedelta(days=1)
+        # Move to the next local day while the start has passed or falls on a weekend
+        while target <= from_time or target.weekday() in self.weekend_days:
+            day += timedelta(days=1)
+            target, _ = self._session_window(session, day)
         
         return target
     
@@ -223,31 +350,18 @@ class SessionManager:
         
         Args:
             session: MarketSession to get times for
-            date: Optional date (defaults to today)
+            date: Optional date (defaults to today); its calendar day in the
+                session's own timezone picks the session
             
         Returns:
-            Tuple of (session_start, session_end) datetimes
+            Tuple of (session_start, session_end) UTC datetimes
         """
         if date is None:
             date = datetime.now(pytz.UTC)
         elif date.tzinfo is None:
             date = pytz.UTC.localize(date)
-        else:
-            date = date.astimezone(pytz.UTC)
-        
-        # Get session hours
-        start_hour, end_hour = self.session_times.get(session, (0, 0))
         
-        # Create start and end times
-        start_time = date.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-        
-        # Handle sessions that cross midnight
-        if start_hour > end_hour:
-            end_time = start_time.replace(hour=end_hour) + timedelta(days=1)
-        else:
-            end_time = start_time.replace(hour=end_hour)
-        
-        return start_time, end_time
+        return self._session_window(session, date.astimezone(self._session_zone(session)).date())
     
     def get_session_progress(self, session: MarketSession, timestamp: Optional[datetime] = None) -> float:
         """
@@ -329,15 +443,8 @@ class SessionManager:
         Returns:
             Duration in minutes
         """
-        start_hour, end_hour = self.session_times.get(session, (0, 0))
-        
-        # Handle sessions that cross midnight
-        if start_hour > end_hour:
-            duration_hours = (24 - start_hour) + end_hour
-        else:
-            duration_hours = end_hour - start_hour
-        
-        return duration_hours * 60
+        start_time, end_time = self.get_session_start_end(session)
+        return int((end_time - start_time).total_seconds() // 60)
     
     def format_time_for_location(self, timestamp: datetime, timezone_str: str = 'Europe/London') -> str:
         """
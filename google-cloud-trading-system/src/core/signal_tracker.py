@@ -5,8 +5,9 @@ Stores pending signals, active trades, and completed signals with metadata and A
 """
 import logging
 import threading
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 import uuid
@@ -76,6 +77,10 @@ class SignalTracker:
     """
     Tracks all trading signals throughout their lifecycle
     Singleton pattern for global access
+    
+    Signals are kept in insertion (= generation) order, so retention pops
+    the oldest entries from the front in O(1). Per-instrument, per-strategy
+    and per-status indexes serve the dashboard queries without a full scan.
     """
     
     _instance = None
@@ -93,9 +98,15 @@ class SignalTracker:
         if self._initialized:
             return
             
-        self.signals: Dict[str, SignalMetadata] = {}
+        self.signals: 'OrderedDict[str, SignalMetadata]' = OrderedDict()
         self.max_signals = 100  # Keep last 100 signals in memory
         self.expiry_hours = 1  # Signals expire after 1 hour
+        self.retention_hours = 24  # Drop signals older than this (open trades are kept)
+        
+        # Secondary indexes: key -> signal ids in generation order
+        self._by_instrument: Dict[str, 'OrderedDict[str, None]'] = {}
+        self._by_strategy: Dict[str, 'OrderedDict[str, None]'] = {}
+        self._by_status: Dict[SignalStatus, 'OrderedDict[str, None]'] = {status: OrderedDict() for status in SignalStatus}
         self._lock = threading.Lock()
         self._initialized = True
         
@@ -148,6 +159,9 @@ class SignalTracker:
             )
             
             self.signals[signal_id] = signal
+            self._by_instrument.setdefault(instrument, OrderedDict())[signal_id] = None
+            self._by_strategy.setdefault(strategy_name, OrderedDict())[signal_id] = None
+            self._by_status[signal.status][signal_id] = None
             
             # Cleanup old signals if exceeding max
             self._cleanup_old_signals()
@@ -173,7 +187,7 @@ class SignalTracker:
                 return False
             
             signal = self.signals[signal_id]
-            signal.status = status
+            self._set_status(signal, status)
             
             # Update timestamp based on status
             if status == SignalStatus.ACTIVE and 'executed_at' not in kwargs:
@@ -231,6 +245,31 @@ class SignalTracker:
         with self._lock:
             return self.signals.get(signal_id)
     
+    def _candidates(self, status: SignalStatus = None, instrument: str = None,
+                    strategy: str = None) -> Iterable[SignalMetadata]:
+        """Matching signals, newest first, read from the narrowest index"""
+        indexes = []
+        if instrument:
+            indexes.append(self._by_instrument.get(instrument, {}))
+        if strategy:
+            indexes.append(self._by_strategy.get(strategy, {}))
+        
+        if indexes:
+            ids = min(indexes, key=len)
+            for signal_id in reversed(ids):
+                signal = self.signals[signal_id]
+                if ((status is None or signal.status == status)
+                        and (not instrument or signal.instrument == instrument)
+                        and (not strategy or signal.strategy_name == strategy)):
+                    yield signal
+        elif status is not None:
+            # status index is in transition order; re-sort the (small) subset by age
+            yield from sorted((self.signals[i] for i in self._by_status[status]),
+                              key=lambda x: x.generated_at, reverse=True)
+        else:
+            for signal_id in reversed(self.signals):
+                yield self.signals[signal_id]
+    
     def get_pending_signals(self, instrument: str = None, strategy: str = None) -> List[SignalMetadata]:
         """
         Get all pending signals with optional filtering
@@ -240,20 +279,10 @@ class SignalTracker:
             strategy: Filter by strategy name
             
         Returns:
-            List of pending signals
+            List of pending signals (newest first)
         """
         with self._lock:
-            signals = [s for s in self.signals.values() if s.status == SignalStatus.PENDING]
-            
-            if instrument:
-                signals = [s for s in signals if s.instrument == instrument]
-            if strategy:
-                signals = [s for s in signals if s.strategy_name == strategy]
-            
-            # Sort by time (newest first)
-            signals.sort(key=lambda x: x.generated_at, reverse=True)
-            
-            return signals
+            return list(self._candidates(SignalStatus.PENDING, instrument, strategy))
     
     def get_active_signals(self, instrument: str = None, strategy: str = None) -> List[SignalMetadata]:
         """
@@ -267,12 +296,7 @@ class SignalTracker:
             List of active signals
         """
         with self._lock:
-            signals = [s for s in self.signals.values() if s.status == SignalStatus.ACTIVE]
-            
-            if instrument:
-                signals = [s for s in signals if s.instrument == instrument]
-            if strategy:
-                signals = [s for s in signals if s.strategy_name == strategy]
+            signals = list(self._candidates(SignalStatus.ACTIVE, instrument, strategy))
             
             # Sort by execution time (newest first)
             signals.sort(key=lambda x: x.executed_at or x.generated_at, reverse=True)
@@ -291,40 +315,34 @@ class SignalTracker:
             limit: Maximum number of signals to return
             
         Returns:
-            List of signals
+            List of signals (newest first)
         """
         with self._lock:
-            signals = list(self.signals.values())
-            
-            if status:
-                signals = [s for s in signals if s.status == status]
-            if instrument:
-                signals = [s for s in signals if s.instrument == instrument]
-            if strategy:
-                signals = [s for s in signals if s.strategy_name == strategy]
-            
-            # Sort by time (newest first)
-            signals.sort(key=lambda x: x.generated_at, reverse=True)
-            
-            return signals[:limit]
+            signals = []
+            for signal in self._candidates(status, instrument, strategy):
+                if len(signals) >= limit:
+                    break
+                signals.append(signal)
+            return signals
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about signals"""
         with self._lock:
             total = len(self.signals)
-            pending = len([s for s in self.signals.values() if s.status == SignalStatus.PENDING])
-            active = len([s for s in self.signals.values() if s.status == SignalStatus.ACTIVE])
-            filled = len([s for s in self.signals.values() if s.status == SignalStatus.FILLED])
-            stopped = len([s for s in self.signals.values() if s.status == SignalStatus.STOPPED])
+            pending = len(self._by_status[SignalStatus.PENDING])
+            active = len(self._by_status[SignalStatus.ACTIVE])
+            filled = len(self._by_status[SignalStatus.FILLED])
+            stopped = len(self._by_status[SignalStatus.STOPPED])
             
             # Calculate win rate
             closed_trades = filled + stopped
             win_rate = (filled / closed_trades * 100) if closed_trades > 0 else 0
             
             # Calculate average hold time for closed trades
-            closed_signals = [s for s in self.signals.values() 
-                            if s.status in [SignalStatus.FILLED, SignalStatus.STOPPED] 
-                            and s.executed_at and s.closed_at]
+            closed_signals = [self.signals[i]
+                            for status in (SignalStatus.FILLED, SignalStatus.STOPPED)
+                            for i in self._by_status[status]]
+            closed_signals = [s for s in closed_signals if s.executed_at and s.closed_at]
             
             if closed_signals:
                 durations = [(s.closed_at - s.executed_at).total_seconds() / 60 
@@ -343,39 +361,61 @@ class SignalTracker:
                 'avg_hold_time_minutes': round(avg_hold_time, 1)
             }
     
+    def _set_status(self, signal: SignalMetadata, status: SignalStatus):
+        """Change a signal's status and move it between status indexes"""
+        if signal.status != status:
+            self._by_status[signal.status].pop(signal.signal_id, None)
+            self._by_status[status][signal.signal_id] = None
+            signal.status = status
+    
+    def _remove_signal(self, signal_id: str):
+        """Drop a signal and its index entries"""
+        signal = self.signals.pop(signal_id)
+        for index, key in ((self._by_instrument, signal.instrument), (self._by_strategy, signal.strategy_name)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.pop(signal_id, None)
+                if not ids:
+                    del index[key]
+        self._by_status[signal.status].pop(signal_id, None)
+    
     def _cleanup_old_signals(self):
-        """Remove old signals to maintain memory limit"""
-        if len(self.signals) <= self.max_signals:
-            return
+        """Remove old signals to maintain the count and age limits (amortized O(1))"""
+        removed = 0
         
-        # Sort by time and remove oldest
-        sorted_signals = sorted(
-            self.signals.items(),
-            key=lambda x: x[1].generated_at,
-            reverse=True
-        )
+        # Count bound: the oldest signal is always at the front
+        while len(self.signals) > self.max_signals:
+            self._remove_signal(next(iter(self.signals)))
+            removed += 1
         
-        # Keep only max_signals newest
-        self.signals = dict(sorted_signals[:self.max_signals])
+        # Age bound: pop expired signals from the front, stopping at an open trade
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.retention_hours)
+        while self.signals:
+            oldest = self.signals[next(iter(self.signals))]
+            if oldest.generated_at >= cutoff or oldest.status == SignalStatus.ACTIVE:
+                break
+            self._remove_signal(oldest.signal_id)
+            removed += 1
         
-        logger.info(f"🧹 Cleaned up old signals, kept {len(self.signals)}")
+        if removed:
+            logger.info(f"🧹 Cleaned up {removed} old signals, kept {len(self.signals)}")
     
     def expire_old_pending_signals(self):
         """Mark old pending signals as expired"""
         with self._lock:
-            now = datetime.now(timezone.utc)
-            expiry_time = timedelta(hours=self.expiry_hours)
-            
-            expired_count = 0
-            for signal in self.signals.values():
-                if signal.status == SignalStatus.PENDING:
-                    age = now - signal.generated_at
-                    if age > expiry_time:
-                        signal.status = SignalStatus.EXPIRED
-                        expired_count += 1
-            
-            if expired_count > 0:
-                logger.info(f"⏰ Expired {expired_count} old pending signals")
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=self.expiry_hours)
+            
+            # Pending ids are in generation order: stop at the first fresh one
+            expired = []
+            for signal_id in self._by_status[SignalStatus.PENDING]:
+                if self.signals[signal_id].generated_at >= cutoff:
+                    break
+                expired.append(self.signals[signal_id])
+            for signal in expired:
+                self._set_status(signal, SignalStatus.EXPIRED)
+            
+            if expired:
+                logger.info(f"⏰ Expired {len(expired)} old pending signals")
 
 
 # Singleton getter
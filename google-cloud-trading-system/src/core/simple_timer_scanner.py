@@ -11,12 +11,14 @@ from datetime import datetime
 from typing import Dict, List
 
 from .oanda_client import get_oanda_client
+from .data_feed import TickBatch
 from .telegram_notifier import get_telegram_notifier
 from .optimization_loader import load_optimization_results, apply_per_pair_to_ultra_strict, apply_per_pair_to_momentum, apply_per_pair_to_gold
 from .yaml_manager import get_yaml_manager
 from .economic_calendar import get_economic_calendar
 from .trump_dna_framework import get_trump_dna_planner
 from .adaptive_scanner_integration import AdaptiveScannerMixin
+from .hot_params import HotParameterSwapMixin
 from src.strategies.ultra_strict_forex_optimized import get_ultra_strict_forex_strategy
 from src.strategies.momentum_trading import get_momentum_trading_strategy
 from src.strategies.gold_scalping_optimized import get_gold_scalping_strategy
@@ -28,7 +30,7 @@ from src.strategies.all_weather_70wr import get_all_weather_70wr_strategy
 
 logger = logging.getLogger(__name__)
 
-class SimpleTimerScanner:
+class SimpleTimerScanner(HotParameterSwapMixin):
     """Simple scanner that just scans every 5 minutes"""
     
     def __init__(self):
@@ -71,6 +73,7 @@ class SimpleTimerScanner:
         
         self.strategies = {}
         self.accounts = {}
+        strategy_types = {}
         
         # Load strategies from YAML
         for acc in yaml_accounts:
@@ -81,8 +84,12 @@ class SimpleTimerScanner:
                 if strategy_name in strategy_loaders:
                     self.strategies[display_name] = strategy_loaders[strategy_name]()
                     self.accounts[display_name] = acc['id']
+                    strategy_types[display_name] = strategy_name
                     logger.info(f"✅ Loaded: {display_name} ({strategy_name}) → {acc['id']}")
         
+        # Config changes are applied in place (see hot_swap_parameters)
+        self.init_hot_swap(strategy_loaders, strategy_types)
+        
         logger.info(f"✅ SimpleTimerScanner initialized with {len(self.strategies)} strategies from accounts.yaml")
         
         # Backfill on initialization (APScheduler version)
@@ -120,8 +127,10 @@ class SimpleTimerScanner:
                     candles = self.oanda.get_candles(instrument, count=60, granularity='M5')
                     
                     if candles and 'candles' in candles:
-                        candle_list = candles['candles']
-                        logger.info(f"📥 Got {len(candle_list)} candles for {instrument}")
+                        # Parsed once into columns (bid/ask or mid closes, completed candles only)
+                        batch = TickBatch.from_candles(instrument, candles['candles'])
+                        closes = batch.mid.tolist()
+                        logger.info(f"📥 Got {len(closes)} candles for {instrument}")
                         
                         # Add to each strategy that trades this instrument
                         for strategy in self.strategies.values():
@@ -132,9 +141,7 @@ class SimpleTimerScanner:
                                     strategy.price_history[instrument] = []
                                 
                                 # Add candles to history
-                                for candle in candle_list:
-                                    mid_price = float(candle['mid']['c'])
-                                    strategy.price_history[instrument].append(mid_price)
+                                strategy.price_history[instrument].extend(closes)
                     
                 except Exception as e:
                     logger.error(f"❌ Backfill failed for {instrument}: {e}")
@@ -156,6 +163,12 @@ class SimpleTimerScanner:
         # Not used with APScheduler - APScheduler calls _run_scan() directly
     
     def _run_scan(self):
+        """Run one complete scan; hot parameter swaps wait for it to finish"""
+        self.sync_config()  # picks up a newer config snapshot, if any
+        with self._scan_lock:
+            self._run_scan_locked()
+    
+    def _run_scan_locked(self):
         """Run one complete scan - WITH TRUMP DNA + ADAPTIVE"""
         try:
             self.scan_count += 1
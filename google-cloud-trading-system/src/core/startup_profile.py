@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Startup Profile - Lazy imports, lazy services and cold start timings
+Keeps process start cheap: heavy modules and services resolve on first use,
+readiness is signalled with events instead of fixed sleeps.
+"""
+
+import importlib
+import importlib.util
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Environment flag telling main.py it is being imported for profiling only
+IMPORT_PROFILING_ENV = 'IMPORT_PROFILING'
+
+
+def lazy_import(module_name: str):
+    """
+    Import a module whose body only executes on first attribute access
+
+    Raises ImportError straight away when the module cannot be found, so
+    callers keep the same failure semantics as a plain import.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named '{module_name}'")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    loader.exec_module(module)
+    return module
+
+
+def lazy_callable(module_name: str, attr: str) -> Callable:
+    """Return a function that imports ``module_name`` and calls ``attr`` on first use"""
+    resolved = []
+
+    def call(*args, **kwargs):
+        if not resolved:
+            resolved.append(getattr(importlib.import_module(module_name), attr))
+        return resolved[0](*args, **kwargs)
+
+    call.__name__ = attr
+    call.__qualname__ = attr
+    call.__doc__ = f"Lazily resolved {module_name}.{attr}"
+    return call
+
+
+class StartupProfile:
+    """Wall-clock timings for startup phases, service inits and milestones"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self._phases: List[Dict[str, Any]] = []
+        self._milestones: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        """Seconds since the profile was created"""
+        return time.perf_counter() - self._t0
+
+    def record(self, name: str, duration: float, start: Optional[float] = None, **extra):
+        """Record a completed phase"""
+        entry = {
+            'name': name,
+            'start_s': round(self.elapsed() - duration if start is None else start, 4),
+            'duration_s': round(duration, 4),
+            'thread': threading.current_thread().name,
+        }
+        entry.update(extra)
+        with self._lock:
+            self._phases.append(entry)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of startup work"""
+        start = self.elapsed()
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t, start=start)
+
+    def mark(self, name: str) -> float:
+        """Record a milestone once (e.g. first health response); returns its offset"""
+        with self._lock:
+            if name not in self._milestones:
+                self._milestones[name] = round(self.elapsed(), 4)
+            return self._milestones[name]
+
+    def report(self) -> Dict[str, Any]:
+        """Phases sorted by start time plus milestones"""
+        with self._lock:
+            phases = sorted(self._phases, key=lambda p: p['start_s'])
+            milestones = dict(self._milestones)
+        return {
+            'started_at': self.started_at,
+            'uptime_s': round(self.elapsed(), 4),
+            'phases': phases,
+            'milestones': milestones,
+        }
+
+
+def parse_import_times(stderr_text: str) -> List[Dict[str, Any]]:
+    """
+    Parse ``python -X importtime`` output into a tree
+
+    Returns:
+        Top-level import nodes: {'module', 'self_us', 'cumulative_us', 'children'}
+    """
+    roots: List[Dict[str, Any]] = []
+    # importtime prints children before their parent, so collect pending
+    # children per depth until the parent line arrives
+    pending: Dict[int, List[Dict[str, Any]]] = {}
+    for line in stderr_text.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        if not self_us.strip().isdigit():
+            continue  # header line
+        stripped = name.lstrip(' ')
+        # one separator space, then two spaces per level starting at level 1
+        depth = max(0, (len(name) - len(stripped) - 3) // 2)
+        node = {
+            'module': stripped,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'children': pending.pop(depth + 1, []),
+        }
+        if depth == 0:
+            roots.append(node)
+        else:
+            pending.setdefault(depth, []).append(node)
+    return roots
+
+
+def import_time_tree(module: str = 'main', cwd: Optional[str] = None, top: int = 25,
+                     timeout: float = 120.0) -> Dict[str, Any]:
+    """
+    Import ``module`` in a fresh interpreter with -X importtime
+
+    Command-line use only (never from a request handler). The child runs with
+    IMPORT_PROFILING and TRADING_DISABLED set, so main.py imports without
+    starting its scheduler, dashboard or monitor threads.
+
+    Args:
+        module: Module to import
+        cwd: Working directory for the child process
+        top: Number of slowest imports to return in the flat list
+
+    Returns:
+        {'total_ms', 'slowest': [...], 'tree': [...]} with times in ms
+    """
+    env = dict(os.environ, **{IMPORT_PROFILING_ENV: 'true', 'TRADING_DISABLED': 'true'})
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=timeout)
+    tree = parse_import_times(proc.stderr)
+
+    flat = []
+
+    def walk(nodes):
+        for node in nodes:
+            flat.append((node['module'], node['self_us'], node['cumulative_us']))
+            walk(node['children'])
+
+    def to_ms(nodes, min_us=1000):
+        return [{
+            'module': n['module'],
+            'self_ms': round(n['self_us'] / 1000, 2),
+            'cumulative_ms': round(n['cumulative_us'] / 1000, 2),
+            'children': to_ms(n['children'], min_us),
+        } for n in nodes if n['cumulative_us'] >= min_us]
+
+    walk(tree)
+    slowest = sorted(flat, key=lambda x: x[2], reverse=True)[:top]
+    return {
+        'module': module,
+        'returncode': proc.returncode,
+        'total_ms': round(sum(n['cumulative_us'] for n in tree) / 1000, 2),
+        'slowest': [{'module': m, 'self_ms': round(s / 1000, 2), 'cumulative_ms': round(c / 1000, 2)}
+                    for m, s, c in slowest],
+        'tree': to_ms(tree),
+    }
+
+
+class ServiceRegistry:
+    """
+    Lazily constructed, thread-safe services with readiness events
+
+    Each service is built once by its factory on the first ``get()``;
+    concurrent callers wait for that single construction. A failed factory
+    leaves the service as None (the behaviour of the old app.config getters)
+    and still sets the readiness event so waiters are released.
+    """
+
+    PENDING = 'pending'
+    INITIALIZING = 'initializing'
+    READY = 'ready'
+    FAILED = 'failed'
+
+    def __init__(self, store: Optional[Dict[str, Any]] = None,
+                 profile: Optional[StartupProfile] = None):
+        # store may be a Flask app.config so existing lookups keep working
+        self._store = store if store is not None else {}
+        self._profile = profile
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self._states: Dict[str, str] = {}
+        self._init_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Register a factory; nothing is constructed until first use"""
+        self._factories[name] = factory
+        self._locks.setdefault(name, threading.Lock())
+        self._events.setdefault(name, threading.Event())
+        self._states.setdefault(name, self.PENDING)
+
+    def get(self, name: str) -> Any:
+        """Resolve a service, constructing it on first use"""
+        if self._events[name].is_set():
+            return self._store.get(name)
+        with self._locks[name]:
+            if self._events[name].is_set():
+                return self._store.get(name)
+            self._states[name] = self.INITIALIZING
+            start = time.perf_counter()
+            try:
+                value = self._factories[name]()
+            except Exception as e:
+                logger.error(f"❌ Service '{name}' failed to initialize: {e}")
+                self._errors[name] = str(e)
+                value = None
+            duration = time.perf_counter() - start
+            self._store[name] = value
+            self._init_seconds[name] = round(duration, 4)
+            self._states[name] = self.READY if value is not None else self.FAILED
+            if self._profile is not None:
+                self._profile.record(f'service:{name}', duration, state=self._states[name])
+            self._events[name].set()
+            return value
+
+    def is_ready(self, name: str) -> bool:
+        return self._states.get(name) == self.READY
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> bool:
+        """Block until the service finished initializing; True if it is ready"""
+        self._events[name].wait(timeout)
+        return self.is_ready(name)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """State and init time of every registered service"""
+        return {
+            name: {
+                'state': self._states[name],
+                'init_seconds': self._init_seconds.get(name),
+                'error': self._errors.get(name),
+            }
+            for name in self._factories
+        }
+
+
+def format_import_tree(nodes: List[Dict[str, Any]], depth: int = 0) -> List[str]:
+    """Indented text lines for the ms tree returned by import_time_tree()"""
+    lines = []
+    for node in sorted(nodes, key=lambda n: n['cumulative_ms'], reverse=True):
+        lines.append(f"{node['cumulative_ms']:>10.2f} ms {node['self_ms']:>9.2f} ms  "
+                     f"{'  ' * depth}{node['module']}")
+        lines.extend(format_import_tree(node['children'], depth + 1))
+    return lines
+
+
+# Global instance
+_startup_profile = None
+
+def get_startup_profile() -> StartupProfile:
+    """Get the process-wide startup profile"""
+    global _startup_profile
+    if _startup_profile is None:
+        _startup_profile = StartupProfile()
+    return _startup_profile
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description='Import-time profile of a module (default: main)')
+    parser.add_argument('module', nargs='?', default='main')
+    parser.add_argument('--top', type=int, default=25, help='Slowest imports in the summary')
+    parser.add_argument('--json', action='store_true', help='Print the full result, tree included, as JSON')
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = import_time_tree(args.module, cwd=root, top=args.top)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(json.dumps({k: v for k, v in result.items() if k != 'tree'}, indent=2))
+        print(f"\n{'cumulative':>13} {'self':>12}  module (imports >= 1 ms)")
+        print("\n".join(format_import_tree(result['tree'])))
@@ -7,9 +7,13 @@ Includes critical price history prefilling that ALL strategies need
 import logging
 import os
 import requests
+from dataclasses import dataclass
 from typing import Dict, List
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -121,16 +125,85 @@ def apply_universal_fixes_to_strategy(strategy):
     return strategy
 
 
+@dataclass
+class SignalArrays:
+    """Per-bar signals for a whole history: +1 BUY, -1 SELL, 0 none (stop/target NaN when none)"""
+    index: pd.Index
+    signal: np.ndarray
+    stop: np.ndarray
+    target: np.ndarray
+    confidence: np.ndarray
+    
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'signal': self.signal, 'stop': self.stop, 'target': self.target,
+                             'confidence': self.confidence}, index=self.index)
 
 
+def replay_signals(strategy, data: pd.DataFrame, pair: str = '') -> SignalArrays:
+    """
+    Bar-by-bar reference path: generate_signals on every prefix of the history
+    
+    Numeric state (daily trade counters and the like) is restored before each
+    bar, so every bar is judged independently, as in the batch pass.
+    
+    Args:
+        strategy: Strategy with generate_signals(data, pair) returning signal dicts
+        data: OHLC(V) history
+        pair: Instrument passed through to the strategy
+    
+    Returns:
+        SignalArrays built from the first signal of each bar
+    """
+    n = len(data)
+    signal = np.zeros(n, dtype=np.int8)
+    stop = np.full(n, np.nan)
+    target = np.full(n, np.nan)
+    confidence = np.zeros(n)
+    
+    state = {k: v for k, v in vars(strategy).items() if isinstance(v, (int, float))}
+    try:
+        for i in range(n):
+            vars(strategy).update(state)
+            signals = strategy.generate_signals(data.iloc[:i + 1], pair)
+            if signals:
+                first = signals[0]
+                signal[i] = 1 if first['signal'] == 'BUY' else -1
+                stop[i] = first['sl_price']
+                target[i] = first['tp_price']
+                confidence[i] = first['confidence']
+    finally:
+        vars(strategy).update(state)
+    return SignalArrays(index=data.index, signal=signal, stop=stop, target=target, confidence=confidence)
+
+
+def generate_signals_batch(strategy, data: pd.DataFrame, pair: str = '') -> SignalArrays:
+    """
+    Signals for every bar of a history, vectorized when the strategy supports it
+    
+    Strategies opt in by implementing generate_signals_batch(data); others are
+    replayed bar by bar.
+    """
+    if hasattr(strategy, 'generate_signals_batch'):
+        return strategy.generate_signals_batch(data)
+    return replay_signals(strategy, data, pair)
 
 
-
-
-
-
-
-
-
-
-
+def batch_mismatches(strategy, data: pd.DataFrame, pair: str = '', rtol: float = 1e-9) -> List[int]:
+    """
+    Bars where the batch pass disagrees with the bar-by-bar path
+    
+    Direction must match exactly; stop, target and confidence to ``rtol``.
+    
+    Returns:
+        Positions of mismatching bars (empty when equivalent)
+    """
+    batch = strategy.generate_signals_batch(data)
+    replay = replay_signals(strategy, data, pair)
+    same = ((batch.signal == replay.signal)
+            & np.isclose(batch.stop, replay.stop, rtol=rtol, equal_nan=True)
+            & np.isclose(batch.target, replay.target, rtol=rtol, equal_nan=True)
+            & np.isclose(batch.confidence, replay.confidence, rtol=rtol))
+    mismatches = np.flatnonzero(~same).tolist()
+    if mismatches:
+        logger.warning(f"⚠️ Batch signals differ from bar-by-bar on {len(mismatches)} bars (first: {mismatches[0]})")
+    return mismatches
@@ -3,10 +3,12 @@ OANDA Streaming Data Feed - API Optimized
 Uses OANDA Pricing Stream API to minimize API calls by 95%
 """
 import asyncio
+import itertools
 import json
 import logging
 import threading
 import time
+from collections import deque
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Callable
 import websocket
@@ -41,8 +43,8 @@ class StreamingDataFeed:
         self.is_streaming = False
         self.stream_thread = None
         self.last_prices = {}
-        self.price_history = {inst: [] for inst in instruments}
         self.max_history = 1000  # Keep last 1000 prices per instrument
+        self.price_history = {inst: deque(maxlen=self.max_history) for inst in instruments}
         
         # Callbacks
         self.on_price_update: Optional[Callable] = None
@@ -147,9 +149,9 @@ class StreamingDataFeed:
             if bid == 0 or ask == 0:
                 return
             
-            # Create MarketData object
+            # Create compact MarketData tick (ISO string kept, parsed once to ns)
             market_data = MarketData(
-                instrument=instrument,
+                pair=instrument,
                 bid=bid,
                 ask=ask,
                 timestamp=time_str,
@@ -159,10 +161,8 @@ class StreamingDataFeed:
             # Update last prices
             self.last_prices[instrument] = market_data
             
-            # Add to history
+            # Add to history (deque drops the oldest tick in O(1))
             self.price_history[instrument].append(market_data)
-            if len(self.price_history[instrument]) > self.max_history:
-                self.price_history[instrument].pop(0)
             
             # Check for new candle (M1)
             current_time = datetime.now(timezone.utc)
@@ -200,7 +200,9 @@ class StreamingDataFeed:
         if instrument not in self.price_history:
             return []
         
-        return self.price_history[instrument][-count:]
+        history = self.price_history[instrument]
+        start = max(len(history) - count, 0)
+        return list(itertools.islice(history, start, None))
     
     def get_api_usage_stats(self) -> Dict[str, Any]:
         """Get API usage statistics"""
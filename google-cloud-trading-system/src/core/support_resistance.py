@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Support/Resistance Engine - Vectorized swing detection with incremental updates
+Shared level computation for PriceContextAnalyzer and MarketRegimeDetector
+"""
+
+import bisect
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+
+def swing_mask(values: np.ndarray, window: int, kind: str, edge: Optional[int] = None) -> np.ndarray:
+    """
+    Boolean mask of swing points using a rolling window
+
+    A bar is a swing low when its value is <= every value within ``window``
+    bars on either side (swing high: >=). Bars closer than ``edge`` to either
+    end of the series are never swings (edge defaults to ``window``).
+
+    Args:
+        values: 1-D price array (lows for swing lows, highs for swing highs)
+        window: Bars on each side that must not undercut/exceed the bar
+        kind: "low" or "high"
+        edge: Bars excluded at both ends
+
+    Returns:
+        Boolean array, same length as values
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    edge = window if edge is None else max(edge, window)
+    mask = np.zeros(n, dtype=bool)
+    if n < 2 * window + 1 or n <= 2 * edge:
+        return mask
+
+    windows = sliding_window_view(values, 2 * window + 1)
+    centres = values[window:n - window]
+    if kind == "low":
+        is_swing = centres <= windows.min(axis=1)
+    else:
+        is_swing = centres >= windows.max(axis=1)
+    mask[window:n - window] = is_swing
+    mask[:edge] = False
+    mask[n - edge:] = False
+    return mask
+
+
+def cluster_levels(levels: List[float], tolerance: float) -> List[float]:
+    """
+    Cluster sorted-able levels by distance to the running cluster mean
+
+    Same result as the mean-based clustering in MarketRegimeDetector, but keeps
+    a running sum instead of re-averaging the cluster on every step.
+    """
+    if not levels:
+        return []
+    sorted_levels = sorted(levels)
+    clusters = []
+    cluster_sum = sorted_levels[0]
+    cluster_count = 1
+    for level in sorted_levels[1:]:
+        cluster_mean = cluster_sum / cluster_count
+        if abs(level - cluster_mean) / cluster_mean < tolerance:
+            cluster_sum += level
+            cluster_count += 1
+        else:
+            clusters.append(cluster_mean)
+            cluster_sum = level
+            cluster_count = 1
+    clusters.append(cluster_sum / cluster_count)
+    return clusters
+
+
+class LevelBook:
+    """
+    Price levels kept sorted by price for O(log k) clustering
+
+    A new swing joins the nearest existing level within ``tolerance``
+    (relative to the level price) or starts a new level at its own price.
+    Touches can also be removed again when a swing leaves the lookback window.
+    """
+
+    def __init__(self, tolerance: float):
+        self.tolerance = tolerance
+        self._prices: List[float] = []
+        self._touches: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def _nearest_within(self, price: float) -> int:
+        i = bisect.bisect_left(self._prices, price)
+        best, best_dist = -1, None
+        for j in (i - 1, i):
+            if 0 <= j < len(self._prices):
+                level = self._prices[j]
+                dist = abs(price - level) / level
+                if dist < self.tolerance and (best_dist is None or dist < best_dist):
+                    best, best_dist = j, dist
+        return best
+
+    def add_touch(self, price: float) -> float:
+        """Record a swing at ``price``; returns the level price it was attributed to"""
+        j = self._nearest_within(price)
+        if j >= 0:
+            self._touches[j] += 1
+            return self._prices[j]
+        i = bisect.bisect_left(self._prices, price)
+        self._prices.insert(i, price)
+        self._touches.insert(i, 1)
+        return price
+
+    def remove_touch(self, level_price: float):
+        """Undo a touch previously attributed to ``level_price``"""
+        i = bisect.bisect_left(self._prices, level_price)
+        if i < len(self._prices) and self._prices[i] == level_price:
+            self._touches[i] -= 1
+            if self._touches[i] <= 0:
+                del self._prices[i]
+                del self._touches[i]
+
+    def levels(self, min_touches: int = 1) -> List[Tuple[float, int]]:
+        """(price, touches) pairs in ascending price order"""
+        return [(p, t) for p, t in zip(self._prices, self._touches) if t >= min_touches]
+
+    def nearest_below(self, price: float, min_touches: int = 1) -> Optional[float]:
+        i = bisect.bisect_left(self._prices, price) - 1
+        while i >= 0:
+            if self._touches[i] >= min_touches:
+                return self._prices[i]
+            i -= 1
+        return None
+
+    def nearest_above(self, price: float, min_touches: int = 1) -> Optional[float]:
+        i = bisect.bisect_right(self._prices, price)
+        while i < len(self._prices):
+            if self._touches[i] >= min_touches:
+                return self._prices[i]
+            i += 1
+        return None
+
+
+class _SeriesLevels:
+    """Incremental swing/level state for one (instrument, timeframe) series
+
+    Bars are held for the current window only; swing dicts are keyed by the
+    absolute bar number (``base`` is the number of the first held bar).
+    """
+
+    def __init__(self, window: int, edge: int, tolerance: float, lookback: Optional[int]):
+        self.window = window
+        self.edge = edge
+        self.lookback = lookback
+        self.base = 0
+        self.highs: List[float] = []
+        self.lows: List[float] = []
+        self.last_label = None
+        self.supports = LevelBook(tolerance)
+        self.resistances = LevelBook(tolerance)
+        # bar number -> level price the swing was attributed to
+        self.support_swings: Dict[int, float] = {}
+        self.resistance_swings: Dict[int, float] = {}
+
+    def rebuild(self, highs: np.ndarray, lows: np.ndarray):
+        self.base = 0
+        self.highs = list(map(float, highs))
+        self.lows = list(map(float, lows))
+        self.supports = LevelBook(self.supports.tolerance)
+        self.resistances = LevelBook(self.resistances.tolerance)
+        self.support_swings = {}
+        self.resistance_swings = {}
+        n = len(self.lows)
+        start = n - self.lookback if self.lookback else 0
+        low_mask = swing_mask(lows, self.window, "low", self.edge)
+        high_mask = swing_mask(highs, self.window, "high", self.edge)
+        for i in np.flatnonzero(low_mask):
+            if i >= start:
+                self.support_swings[int(i)] = self.supports.add_touch(self.lows[i])
+        for i in np.flatnonzero(high_mask):
+            if i >= start:
+                self.resistance_swings[int(i)] = self.resistances.add_touch(self.highs[i])
+
+    def append_bar(self, high: float, low: float):
+        """Add one closed bar; confirms at most one swing per side and evicts at most one bar"""
+        self.highs.append(float(high))
+        self.lows.append(float(low))
+        n = len(self.lows)
+        i = n - 1 - self.edge
+        w = self.window
+        if i >= self.edge:
+            lo = self.lows[i - w:i + w + 1]
+            if self.lows[i] <= min(lo):
+                self.support_swings[self.base + i] = self.supports.add_touch(self.lows[i])
+            hi = self.highs[i - w:i + w + 1]
+            if self.highs[i] >= max(hi):
+                self.resistance_swings[self.base + i] = self.resistances.add_touch(self.highs[i])
+        if self.lookback:
+            expired = self.base + n - 1 - self.lookback
+            if expired in self.support_swings:
+                self.supports.remove_touch(self.support_swings.pop(expired))
+            if expired in self.resistance_swings:
+                self.resistances.remove_touch(self.resistance_swings.pop(expired))
+
+    def drop_front(self, count: int):
+        """Forget the oldest ``count`` bars of a rolled window, and swings a rebuild would no longer see"""
+        if count <= 0:
+            return
+        self.base += count
+        del self.highs[:count]
+        del self.lows[:count]
+        # bars within ``edge`` of the window start are never swings
+        first_valid = self.base + self.edge
+        for swings, book in ((self.support_swings, self.supports), (self.resistance_swings, self.resistances)):
+            for bar in [b for b in swings if b < first_valid]:
+                book.remove_touch(swings.pop(bar))
+
+    def swing_prices(self, kind: str) -> List[float]:
+        """Raw prices of the current swing lows ("low") or highs ("high"), oldest first"""
+        if kind == "low":
+            return [self.lows[b - self.base] for b in sorted(self.support_swings)]
+        return [self.highs[b - self.base] for b in sorted(self.resistance_swings)]
+
+
+class SupportResistanceEngine:
+    """
+    Cached, incrementally updated support/resistance levels
+
+    State is kept per (instrument, timeframe). The DataFrame passed in is
+    aligned on the last cached index label: for a growing history or a
+    rolling window (e.g. the last 100 candles) only the newly closed bars
+    are processed and bars that rolled off the front are dropped. Anything
+    else (different history, revised bars) triggers a vectorized rebuild.
+    With a rolling window the swing set always equals a rebuild's; level
+    anchors may differ since they depend on the order swings were added.
+    """
+
+    def __init__(self, window: int = 2, edge: int = 5, tolerance: float = 0.0010,
+                 lookback: Optional[int] = None):
+        self.window = window
+        self.edge = edge
+        self.tolerance = tolerance
+        self.lookback = lookback
+        self._series: Dict[Tuple[str, str], _SeriesLevels] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _overlap(state: _SeriesLevels, df, highs: np.ndarray, lows: np.ndarray) -> Optional[int]:
+        """Position of the cached last bar in ``df``, if df continues the cached window"""
+        cached_n = len(state.lows)
+        if not cached_n:
+            return None
+        try:
+            pos = df.index.get_loc(state.last_label)
+        except (KeyError, TypeError):
+            return None
+        if not isinstance(pos, (int, np.integer)):
+            return None  # duplicate labels
+        dropped = cached_n - 1 - pos
+        if dropped < 0:
+            return None  # df reaches further back than the cache
+        if highs[pos] != state.highs[-1] or lows[pos] != state.lows[-1] \
+                or highs[0] != state.highs[dropped] or lows[0] != state.lows[dropped]:
+            return None
+        return int(pos)
+
+    def update(self, instrument: str, timeframe: str, df) -> _SeriesLevels:
+        """
+        Bring the levels for (instrument, timeframe) up to date with ``df``
+
+        Args:
+            instrument: Instrument being analyzed
+            timeframe: Timeframe of df
+            df: DataFrame with "high" and "low" columns
+
+        Returns:
+            Series state holding the support and resistance LevelBooks
+        """
+        highs = df["high"].to_numpy(dtype=float)
+        lows = df["low"].to_numpy(dtype=float)
+        n = len(lows)
+        key = (instrument, timeframe)
+
+        with self._lock:
+            state = self._series.get(key)
+            pos = self._overlap(state, df, highs, lows) if state is not None and n else None
+            if pos is not None:
+                state.drop_front(len(state.lows) - 1 - pos)
+                for i in range(pos + 1, n):
+                    state.append_bar(highs[i], lows[i])
+            else:
+                state = _SeriesLevels(self.window, self.edge, self.tolerance, self.lookback)
+                state.rebuild(highs, lows)
+                self._series[key] = state
+
+            state.last_label = df.index[n - 1] if n else None
+            return state
+
+    def get(self, instrument: str, timeframe: str) -> Optional[_SeriesLevels]:
+        """Cached levels without touching the data (None if never computed)"""
+        return self._series.get((instrument, timeframe))
+
+    def clear(self, instrument: Optional[str] = None):
+        """Drop cached state for one instrument or for everything"""
+        with self._lock:
+            if instrument is None:
+                self._series.clear()
+            else:
+                for key in [k for k in self._series if k[0] == instrument]:
+                    del self._series[key]
+
@@ -17,11 +17,14 @@ class TradeSizeValidator:
     """Validates trade sizes against minimum requirements"""
     
     def __init__(self, config_path: str = None):
-        """Initialize with config from strategy_config.yaml"""
-        if config_path is None:
-            config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'strategy_config.yaml')
+        """
+        Initialize with config from strategy_config.yaml
         
+        Without an explicit config_path the shared config snapshot is used and
+        re-applied whenever a newer snapshot version is published.
+        """
         self.config_path = config_path
+        self._config_version = None
         self.min_trade_size = 10000  # Default minimum
         self.enforce_minimum = True
         self.micro_trade_alert = True
@@ -34,8 +37,14 @@ class TradeSizeValidator:
     def _load_config(self):
         """Load configuration from strategy_config.yaml"""
         try:
-            with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            if self.config_path is None:
+                from .yaml_manager import get_yaml_manager
+                snapshot = get_yaml_manager().get_snapshot()
+                config = snapshot.strategy_config
+                self._config_version = snapshot.version
+            else:
+                with open(self.config_path, 'r') as f:
+                    config = yaml.safe_load(f)
             
             system_config = config.get('system', {})
             self.min_trade_size = system_config.get('min_trade_size', 10000)
@@ -51,6 +60,17 @@ class TradeSizeValidator:
             logger.error(f"Failed to load trade size config: {e}")
             # Use defaults
     
+    def _sync_config(self):
+        """Re-apply the system section if the shared config snapshot changed (dict reads only)"""
+        if self.config_path is not None:
+            return
+        try:
+            from .yaml_manager import get_yaml_manager
+            if get_yaml_manager().get_snapshot().version != self._config_version:
+                self._load_config()
+        except Exception as e:
+            logger.error(f"Failed to sync trade size config: {e}")
+    
     def validate_trade_size(self, instrument: str, units: int, strategy_name: str) -> Dict[str, Any]:
         """
         Validate trade size against minimum requirements
@@ -70,6 +90,7 @@ class TradeSizeValidator:
                 'should_alert': bool
             }
         """
+        self._sync_config()
         result = {
             'valid': True,
             'reason': 'Trade size acceptable',
@@ -111,6 +132,7 @@ class TradeSizeValidator:
                 'should_alert': bool
             }
         """
+        self._sync_config()
         result = {
             'valid': True,
             'reason': 'Profit potential acceptable',
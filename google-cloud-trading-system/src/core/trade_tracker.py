@@ -2,12 +2,19 @@
 """
 Comprehensive Trade Tracking and Logging System
 Tracks all trades, signals, and system performance for analysis and backtesting
+
+Each thread keeps one WAL-mode SQLite connection for the tracker's lifetime;
+statements are parameterized constants so SQLite's statement cache reuses
+them, and the tables carry indexes for the dashboard's status/time/account
+queries.
 """
 
 import os
 import json
 import sqlite3
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
@@ -90,21 +97,190 @@ class SystemLog:
     account: Optional[str] = None
     instrument: Optional[str] = None
 
+ACTIVE_STATUSES = ('pending', 'filled', 'partially_filled')
+
+# Indexes follow the query patterns below: status/time for active trades and
+# metrics, account/status/time for per-account metrics, time for history/export
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_trades_status_time ON trades(status, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_account_status_time ON trades(account, status, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_time ON trades(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_signals_time ON signals(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_system_logs_type_time ON system_logs(log_type, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_performance_account_time ON performance_metrics(account, timestamp)",
+)
+
+INSERT_SIGNAL_SQL = '''
+    INSERT INTO signals (
+        signal_id, timestamp, instrument, signal_type, entry_price,
+        stop_loss, take_profit, confidence, strategy, reasoning,
+        session, status, trade_id, execution_time, notes
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_TRADE_SQL = '''
+    INSERT INTO trades (
+        trade_id, timestamp, account, instrument, side, order_type,
+        units, entry_price, stop_loss, take_profit, strategy,
+        confidence, session, status, fill_price, fill_time,
+        exit_price, exit_time, pips_profit, pips_drawdown,
+        profit_loss, profit_loss_pct, max_drawdown_pips,
+        max_profit_pips, duration_minutes, notes
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+ACTIVE_TRADES_SQL = '''
+    SELECT * FROM trades
+    WHERE status IN (?, ?, ?)
+    ORDER BY timestamp DESC
+'''
+
+METRICS_SQL = '''
+    SELECT
+        COUNT(*) as total_trades,
+        SUM(CASE WHEN profit_loss > 0 THEN 1 ELSE 0 END) as winning_trades,
+        SUM(CASE WHEN profit_loss < 0 THEN 1 ELSE 0 END) as losing_trades,
+        AVG(profit_loss) as avg_profit_loss,
+        SUM(profit_loss) as total_profit_loss,
+        AVG(pips_profit) as avg_pips,
+        SUM(pips_profit) as total_pips,
+        MIN(profit_loss) as max_drawdown,
+        AVG(duration_minutes) as avg_duration
+    FROM trades
+    WHERE status = 'filled'
+    AND timestamp >= ?
+'''
+
+METRICS_BY_ACCOUNT_SQL = METRICS_SQL + "    AND account = ?\n"
+
+
+def _signal_row(signal: SignalEntry) -> Tuple:
+    return (
+        signal.signal_id,
+        signal.timestamp.isoformat(),
+        signal.instrument,
+        signal.signal_type,
+        signal.entry_price,
+        signal.stop_loss,
+        signal.take_profit,
+        signal.confidence,
+        signal.strategy,
+        signal.reasoning,
+        signal.session,
+        signal.status.value,
+        signal.trade_id,
+        signal.execution_time.isoformat() if signal.execution_time else None,
+        signal.notes
+    )
+
+
+def _trade_row(trade: TradeEntry) -> Tuple:
+    return (
+        trade.trade_id,
+        trade.timestamp.isoformat(),
+        trade.account,
+        trade.instrument,
+        trade.side,
+        trade.order_type,
+        trade.units,
+        trade.entry_price,
+        trade.stop_loss,
+        trade.take_profit,
+        trade.strategy,
+        trade.confidence,
+        trade.session,
+        trade.status.value,
+        trade.fill_price,
+        trade.fill_time.isoformat() if trade.fill_time else None,
+        trade.exit_price,
+        trade.exit_time.isoformat() if trade.exit_time else None,
+        trade.pips_profit,
+        trade.pips_drawdown,
+        trade.profit_loss,
+        trade.profit_loss_pct,
+        trade.max_drawdown_pips,
+        trade.max_profit_pips,
+        trade.duration_minutes,
+        trade.notes
+    )
+
+
+def _cutoff(days: int) -> str:
+    # Timestamps are stored as local isoformat strings, so compare against the same
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
 class TradeTracker:
     """Comprehensive trade tracking and logging system"""
     
     def __init__(self, db_path: str = "trading_system.db"):
         self.db_path = db_path
         self.log_file = f"trading_system_{datetime.now().strftime('%Y%m%d')}.log"
+        self._local = threading.local()
         self.setup_database()
         self.setup_logging()
         
         logger.info("📊 Trade Tracker initialized")
     
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's persistent connection (reopened after a fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._local.batch_depth = 0
+        return conn
+    
+    def _commit(self, conn: sqlite3.Connection):
+        # Inside batch() the transaction is committed once, on exit
+        if not self._local.batch_depth:
+            conn.commit()
+    
+    def _rollback(self):
+        # Discard a failed write so the persistent connection holds no open transaction
+        if not self._local.batch_depth:
+            try:
+                self._connection().rollback()
+            except sqlite3.Error:
+                pass
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group writes from this thread into one transaction
+        
+        Usage:
+            with tracker.batch():
+                tracker.log_signal(...)
+                tracker.log_trade(...)
+        """
+        conn = self._connection()
+        self._local.batch_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._local.batch_depth -= 1
+            if not self._local.batch_depth:
+                conn.rollback()
+            raise
+        self._local.batch_depth -= 1
+        if not self._local.batch_depth:
+            conn.commit()
+    
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
     def setup_database(self):
         """Setup SQLite database for trade tracking"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connection()
             cursor = conn.cursor()
             
             # Create trades table
@@ -193,8 +369,10 @@ class TradeTracker:
                 )
             ''')
             
+            for statement in INDEXES:
+                cursor.execute(statement)
+            
             conn.commit()
-            conn.close()
             
             logger.info("✅ Database setup completed")
             
@@ -228,35 +406,9 @@ class TradeTracker:
     def log_signal(self, signal: SignalEntry) -> bool:
         """Log a trading signal"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO signals (
-                    signal_id, timestamp, instrument, signal_type, entry_price,
-                    stop_loss, take_profit, confidence, strategy, reasoning,
-                    session, status, trade_id, execution_time, notes
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                signal.signal_id,
-                signal.timestamp.isoformat(),
-                signal.instrument,
-                signal.signal_type,
-                signal.entry_price,
-                signal.stop_loss,
-                signal.take_profit,
-                signal.confidence,
-                signal.strategy,
-                signal.reasoning,
-                signal.session,
-                signal.status.value,
-                signal.trade_id,
-                signal.execution_time.isoformat() if signal.execution_time else None,
-                signal.notes
-            ))
-            
-            conn.commit()
-            conn.close()
+            conn = self._connection()
+            conn.execute(INSERT_SIGNAL_SQL, _signal_row(signal))
+            self._commit(conn)
             
             # Log to file
             logger.info(f"📊 Signal logged: {signal.instrument} {signal.signal_type} "
@@ -265,55 +417,29 @@ class TradeTracker:
             return True
             
         except Exception as e:
+            self._rollback()
             logger.error(f"❌ Failed to log signal: {e}")
             return False
     
+    def log_signals(self, signals: List[SignalEntry]) -> bool:
+        """Log many signals in one statement and transaction"""
+        try:
+            conn = self._connection()
+            conn.executemany(INSERT_SIGNAL_SQL, [_signal_row(signal) for signal in signals])
+            self._commit(conn)
+            logger.info(f"📊 {len(signals)} signals logged")
+            return True
+        except Exception as e:
+            self._rollback()
+            logger.error(f"❌ Failed to log signals: {e}")
+            return False
+    
     def log_trade(self, trade: TradeEntry) -> bool:
         """Log a trade entry"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO trades (
-                    trade_id, timestamp, account, instrument, side, order_type,
-                    units, entry_price, stop_loss, take_profit, strategy,
-                    confidence, session, status, fill_price, fill_time,
-                    exit_price, exit_time, pips_profit, pips_drawdown,
-                    profit_loss, profit_loss_pct, max_drawdown_pips,
-                    max_profit_pips, duration_minutes, notes
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                trade.trade_id,
-                trade.timestamp.isoformat(),
-                trade.account,
-                trade.instrument,
-                trade.side,
-                trade.order_type,
-                trade.units,
-                trade.entry_price,
-                trade.stop_loss,
-                trade.take_profit,
-                trade.strategy,
-                trade.confidence,
-                trade.session,
-                trade.status.value,
-                trade.fill_price,
-                trade.fill_time.isoformat() if trade.fill_time else None,
-                trade.exit_price,
-                trade.exit_time.isoformat() if trade.exit_time else None,
-                trade.pips_profit,
-                trade.pips_drawdown,
-                trade.profit_loss,
-                trade.profit_loss_pct,
-                trade.max_drawdown_pips,
-                trade.max_profit_pips,
-                trade.duration_minutes,
-                trade.notes
-            ))
-            
-            conn.commit()
-            conn.close()
+            conn = self._connection()
+            conn.execute(INSERT_TRADE_SQL, _trade_row(trade))
+            self._commit(conn)
             
             # Log to file
             logger.info(f"💰 Trade logged: {trade.instrument} {trade.side} "
@@ -323,20 +449,35 @@ class TradeTracker:
             return True
             
         except Exception as e:
+            self._rollback()
             logger.error(f"❌ Failed to log trade: {e}")
             return False
     
+    def log_trades(self, trades: List[TradeEntry]) -> bool:
+        """Log many trades in one statement and transaction"""
+        try:
+            conn = self._connection()
+            conn.executemany(INSERT_TRADE_SQL, [_trade_row(trade) for trade in trades])
+            self._commit(conn)
+            logger.info(f"💰 {len(trades)} trades logged")
+            return True
+        except Exception as e:
+            self._rollback()
+            logger.error(f"❌ Failed to log trades: {e}")
+            return False
+    
     def update_trade_status(self, trade_id: str, status: TradeStatus, 
                           fill_price: Optional[float] = None,
                           exit_price: Optional[float] = None,
                           notes: Optional[str] = None) -> bool:
         """Update trade status and prices"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connection()
             cursor = conn.cursor()
             
             # Get current trade data
-            cursor.execute('SELECT * FROM trades WHERE trade_id = ?', (trade_id,))
+            cursor.execute('SELECT timestamp, side, units, entry_price FROM trades WHERE trade_id = ?',
+                           (trade_id,))
             trade_data = cursor.fetchone()
             
             if not trade_data:
@@ -344,8 +485,7 @@ class TradeTracker:
                 return False
             
             # Calculate pips and P&L
-            entry_price = trade_data[7]  # entry_price
-            side = trade_data[4]  # side
+            timestamp, side, units, entry_price = trade_data
             
             if fill_price:
                 # Calculate pips from entry to fill
@@ -362,11 +502,11 @@ class TradeTracker:
             if exit_price:
                 # Calculate final P&L
                 pips = self._calculate_pips(entry_price, exit_price, side)
-                profit_loss = self._calculate_profit_loss(entry_price, exit_price, side, trade_data[6])  # units
-                profit_loss_pct = (profit_loss / (entry_price * trade_data[6])) * 100
+                profit_loss = self._calculate_profit_loss(entry_price, exit_price, side, units)
+                profit_loss_pct = (profit_loss / (entry_price * units)) * 100
                 
                 # Calculate duration
-                entry_time = datetime.fromisoformat(trade_data[1])
+                entry_time = datetime.fromisoformat(timestamp)
                 duration_minutes = int((datetime.now() - entry_time).total_seconds() / 60)
                 
                 cursor.execute('''
@@ -378,13 +518,13 @@ class TradeTracker:
                 ''', (status.value, exit_price, datetime.now().isoformat(),
                       pips, profit_loss, profit_loss_pct, duration_minutes, notes, trade_id))
             
-            conn.commit()
-            conn.close()
+            self._commit(conn)
             
             logger.info(f"📊 Trade {trade_id} updated: {status.value}")
             return True
             
         except Exception as e:
+            self._rollback()
             logger.error(f"❌ Failed to update trade {trade_id}: {e}")
             return False
     
@@ -406,14 +546,8 @@ class TradeTracker:
     def get_active_trades(self) -> List[Dict[str, Any]]:
         """Get all active trades with current status"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT * FROM trades 
-                WHERE status IN ('pending', 'filled', 'partially_filled')
-                ORDER BY timestamp DESC
-            ''')
+            cursor = self._connection().cursor()
+            cursor.execute(ACTIVE_TRADES_SQL, ACTIVE_STATUSES)
             
             trades = []
             for row in cursor.fetchall():
@@ -441,7 +575,6 @@ class TradeTracker:
                 }
                 trades.append(trade)
             
-            conn.close()
             return trades
             
         except Exception as e:
@@ -451,9 +584,7 @@ class TradeTracker:
     def get_trade_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get trade history"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
+            cursor = self._connection().cursor()
             cursor.execute('''
                 SELECT * FROM trades 
                 ORDER BY timestamp DESC 
@@ -486,7 +617,6 @@ class TradeTracker:
                 }
                 trades.append(trade)
             
-            conn.close()
             return trades
             
         except Exception as e:
@@ -497,30 +627,11 @@ class TradeTracker:
                               days: int = 30) -> Dict[str, Any]:
         """Get performance metrics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Base query
-            base_query = '''
-                SELECT 
-                    COUNT(*) as total_trades,
-                    SUM(CASE WHEN profit_loss > 0 THEN 1 ELSE 0 END) as winning_trades,
-                    SUM(CASE WHEN profit_loss < 0 THEN 1 ELSE 0 END) as losing_trades,
-                    AVG(profit_loss) as avg_profit_loss,
-                    SUM(profit_loss) as total_profit_loss,
-                    AVG(pips_profit) as avg_pips,
-                    SUM(pips_profit) as total_pips,
-                    MIN(profit_loss) as max_drawdown,
-                    AVG(duration_minutes) as avg_duration
-                FROM trades 
-                WHERE status = 'filled' 
-                AND timestamp >= datetime('now', '-{} days')
-            '''.format(days)
-            
+            cursor = self._connection().cursor()
             if account:
-                base_query += f" AND account = '{account}'"
-            
-            cursor.execute(base_query)
+                cursor.execute(METRICS_BY_ACCOUNT_SQL, (_cutoff(days), account))
+            else:
+                cursor.execute(METRICS_SQL, (_cutoff(days),))
             result = cursor.fetchone()
             
             if result and result[0] > 0:
@@ -555,7 +666,6 @@ class TradeTracker:
                     'avg_duration_minutes': 0
                 }
             
-            conn.close()
             return metrics
             
         except Exception as e:
@@ -579,10 +689,8 @@ class TradeTracker:
                 instrument=instrument
             )
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            conn = self._connection()
+            conn.execute('''
                 INSERT INTO system_logs (
                     log_id, timestamp, log_type, level, message, data, account, instrument
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
@@ -597,28 +705,28 @@ class TradeTracker:
                 log_entry.instrument
             ))
             
-            conn.commit()
-            conn.close()
+            self._commit(conn)
             
             # Log to file
             log_level = getattr(logging, level.upper(), logging.INFO)
             logger.log(log_level, f"[{log_type}] {message}")
             
         except Exception as e:
+            self._rollback()
             logger.error(f"❌ Failed to log system event: {e}")
     
     def export_for_backtesting(self, days: int = 30) -> Dict[str, Any]:
         """Export trade data for backtesting analysis"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._connection().cursor()
+            cutoff = _cutoff(days)
             
             # Get all trades from last N days
             cursor.execute('''
                 SELECT * FROM trades 
-                WHERE timestamp >= datetime('now', '-{} days')
+                WHERE timestamp >= ?
                 ORDER BY timestamp ASC
-            '''.format(days))
+            ''', (cutoff,))
             
             trades_data = []
             for row in cursor.fetchall():
@@ -642,9 +750,9 @@ class TradeTracker:
             # Get signals data
             cursor.execute('''
                 SELECT * FROM signals 
-                WHERE timestamp >= datetime('now', '-{} days')
+                WHERE timestamp >= ?
                 ORDER BY timestamp ASC
-            '''.format(days))
+            ''', (cutoff,))
             
             signals_data = []
             for row in cursor.fetchall():
@@ -662,8 +770,6 @@ class TradeTracker:
                 }
                 signals_data.append(signal)
             
-            conn.close()
-            
             # Create export data
             export_data = {
                 'export_timestamp': datetime.now().isoformat(),
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Runner - Rolling/anchored train/test folds for the optimizers
+Each fold picks the best candidate on its training window and is scored only
+on the following unseen window; out-of-sample results are stitched together
+and parameter stability across folds is reported.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Fold:
+    """One train/test split, as [start, end) bar indices"""
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+@dataclass
+class FoldResult:
+    """Winner of one fold's in-sample search and its out-of-sample outcome"""
+    fold: Fold
+    best_params: Dict[str, Any]
+    in_sample_score: float
+    out_of_sample_score: float
+    out_of_sample: Dict[str, Any]
+    candidates_tested: int
+    seconds: float
+    error: Optional[str] = None  # set when the fold could not be scored
+
+
+@dataclass
+class WalkForwardResult:
+    """Stitched out-of-sample performance and parameter stability"""
+    folds: List[FoldResult]
+    oos_equity: List[float] = field(default_factory=list)
+    oos_pnl: float = 0.0
+    oos_trades: int = 0
+    walk_forward_efficiency: Optional[float] = None
+    parameter_stability: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Plain-dict report for logging / JSON"""
+        return {
+            'folds': [{
+                'fold': r.fold.index,
+                'train': [r.fold.train_start, r.fold.train_end],
+                'test': [r.fold.test_start, r.fold.test_end],
+                'best_params': r.best_params,
+                'in_sample_score': r.in_sample_score,
+                'out_of_sample_score': r.out_of_sample_score,
+                'oos_trades': len(r.out_of_sample.get('trades', [])),
+                'error': r.error,
+            } for r in self.folds],
+            'oos_pnl': self.oos_pnl,
+            'oos_trades': self.oos_trades,
+            'oos_final_equity': self.oos_equity[-1] if self.oos_equity else None,
+            'walk_forward_efficiency': self.walk_forward_efficiency,
+            'parameter_stability': self.parameter_stability,
+            'seconds': round(self.seconds, 2),
+        }
+
+
+def make_folds(n_bars: int, train_bars: int, test_bars: int, step: Optional[int] = None,
+               anchored: bool = False, start: int = 0) -> List[Fold]:
+    """
+    Cut ``n_bars`` of history into walk-forward folds
+
+    Args:
+        n_bars: Total bars available
+        train_bars: In-sample window length (initial length when anchored)
+        test_bars: Out-of-sample window length
+        step: Bars to advance per fold (defaults to test_bars, so test windows tile)
+        anchored: Keep the training window anchored at ``start`` and let it grow
+        start: First usable bar (e.g. after indicator warm-up)
+
+    Returns:
+        Folds in chronological order
+    """
+    step = step or test_bars
+    folds = []
+    train_start = start
+    train_end = start + train_bars
+    while train_end + test_bars <= n_bars:
+        folds.append(Fold(len(folds), train_start, train_end, train_end, train_end + test_bars))
+        train_end += step
+        if not anchored:
+            train_start += step
+    return folds
+
+
+def bars_per_day(timestamps: Sequence[Any]) -> int:
+    """Bars per day implied by the median spacing of ``timestamps`` (datetimes or ISO strings)"""
+    spacing = pd.Series(pd.to_datetime(list(timestamps), utc=True)).diff().median()
+    if pd.isna(spacing) or spacing.total_seconds() <= 0:
+        raise ValueError("need at least two distinct timestamps to infer candle spacing")
+    return max(1, int(round(86400 / spacing.total_seconds())))
+
+
+def parameter_stability(param_sets: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    How much each chosen parameter moves between folds
+
+    Numeric parameters report mean/std/coefficient of variation and how often
+    the value changed from one fold to the next; others report the most
+    common value and its share of folds.
+    """
+    stability = {}
+    keys = sorted({k for params in param_sets for k in params})
+    for key in keys:
+        values = [p.get(key) for p in param_sets]
+        changes = sum(1 for a, b in zip(values, values[1:]) if a != b)
+        numeric = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+        if len(numeric) == len(values) and values:
+            arr = np.array(numeric, dtype=float)
+            mean = float(arr.mean())
+            std = float(arr.std())
+            stability[key] = {
+                'values': values,
+                'mean': mean,
+                'std': std,
+                'cv': std / abs(mean) if mean else None,
+                'min': float(arr.min()),
+                'max': float(arr.max()),
+                'changes': changes,
+            }
+        else:
+            value, count = Counter(map(repr, values)).most_common(1)[0] if values else (None, 0)
+            stability[key] = {
+                'values': values,
+                'mode': next((v for v in values if repr(v) == value), None),
+                'mode_share': count / len(values) if values else 0.0,
+                'changes': changes,
+            }
+    return stability
+
+
+# State shared with forked workers: set in the parent right before the pool
+# starts so data/indicators are inherited instead of pickled per task.
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _run_fold(fold: Fold) -> FoldResult:
+    evaluate = _WORKER_STATE['evaluate']
+    data = _WORKER_STATE['data']
+    candidates = _WORKER_STATE['candidates']
+    score_key = _WORKER_STATE['score_key']
+
+    start = time.perf_counter()
+    best_params, best_score = None, -np.inf
+    tested = 0
+    for params in candidates:
+        try:
+            result = evaluate(params, data, fold.train_start, fold.train_end)
+        except Exception as e:
+            logger.debug(f"Fold {fold.index} candidate failed: {e}")
+            continue
+        tested += 1
+        score = float(result.get(score_key, -np.inf))
+        if score > best_score:
+            best_params, best_score = params, score
+
+    if best_params is None:
+        return FoldResult(fold, {}, float('-inf'), float('-inf'), {}, tested, time.perf_counter() - start,
+                          error='no candidate completed in-sample')
+
+    try:
+        oos = evaluate(best_params, data, fold.test_start, fold.test_end)
+    except Exception as e:
+        logger.warning(f"⚠️ Fold {fold.index} out-of-sample run failed: {e}")
+        return FoldResult(fold, dict(best_params), best_score, float('-inf'), {}, tested,
+                          time.perf_counter() - start, error=f"out-of-sample: {e}")
+    return FoldResult(
+        fold=fold,
+        best_params=dict(best_params),
+        in_sample_score=best_score,
+        out_of_sample_score=float(oos.get(score_key, float('-inf'))),
+        out_of_sample=oos,
+        candidates_tested=tested,
+        seconds=time.perf_counter() - start,
+    )
+
+
+class WalkForwardRunner:
+    """
+    Walk-forward optimization over precomputed data
+
+    ``evaluate(params, data, start, end)`` backtests one candidate and only
+    counts trades entered in bars [start, end); it may read bars before
+    ``start`` for warm-up, so indicators computed once over the full history
+    are shared by every fold. It returns a dict holding ``score_key`` and,
+    for stitched equity, a ``trades`` list whose items carry ``pnl``.
+    """
+
+    def __init__(self, evaluate: Callable[[Dict[str, Any], Any, int, int], Dict[str, Any]],
+                 candidates: List[Dict[str, Any]], score_key: str = 'score',
+                 n_workers: Optional[int] = None, initial_balance: float = 0.0):
+        self.evaluate = evaluate
+        self.candidates = list(candidates)
+        self.score_key = score_key
+        self.n_workers = n_workers if n_workers is not None else max(1, (os.cpu_count() or 2) - 1)
+        self.initial_balance = initial_balance
+
+    def run(self, data: Any, folds: List[Fold]) -> WalkForwardResult:
+        """
+        Optimize every fold and stitch the out-of-sample results
+
+        Args:
+            data: Precomputed history handed to ``evaluate`` unchanged
+            folds: Output of make_folds()
+
+        Returns:
+            WalkForwardResult
+        """
+        started = time.perf_counter()
+        logger.info(f"🚶 Walk-forward: {len(folds)} folds x {len(self.candidates)} candidates "
+                    f"on {self.n_workers} worker(s)")
+
+        _WORKER_STATE.update(evaluate=self.evaluate, data=data,
+                             candidates=self.candidates, score_key=self.score_key)
+        try:
+            workers = min(self.n_workers, len(folds))
+            if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+                ctx = multiprocessing.get_context('fork')
+                with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                    results = list(pool.map(_run_fold, folds))
+            else:
+                if workers > 1:
+                    logger.warning("⚠️ fork start method unavailable - running folds serially")
+                results = [_run_fold(fold) for fold in folds]
+        finally:
+            _WORKER_STATE.clear()
+
+        outcome = self._stitch(results)
+        outcome.seconds = time.perf_counter() - started
+        for r in results:
+            if r.error:
+                logger.warning(f"  Fold {r.fold.index}: failed - {r.error}")
+                continue
+            logger.info(f"  Fold {r.fold.index}: IS {r.in_sample_score:.3f} -> OOS {r.out_of_sample_score:.3f} "
+                        f"({len(r.out_of_sample.get('trades', []))} trades) {r.best_params}")
+        logger.info(f"✅ Walk-forward done in {outcome.seconds:.1f}s: OOS P&L {outcome.oos_pnl:.5f} "
+                    f"over {outcome.oos_trades} trades, efficiency {outcome.walk_forward_efficiency}")
+        return outcome
+
+    def _stitch(self, results: List[FoldResult]) -> WalkForwardResult:
+        pnl = [float(t.get('pnl', 0.0)) for r in results for t in r.out_of_sample.get('trades', [])]
+        equity = list(self.initial_balance + np.cumsum(pnl)) if pnl else []
+        scored = [r for r in results if np.isfinite(r.in_sample_score) and np.isfinite(r.out_of_sample_score)]
+        is_mean = np.mean([r.in_sample_score for r in scored]) if scored else 0.0
+        efficiency = (float(np.mean([r.out_of_sample_score for r in scored]) / is_mean)
+                      if scored and is_mean else None)
+        return WalkForwardResult(
+            folds=results,
+            oos_equity=[float(e) for e in equity],
+            oos_pnl=float(sum(pnl)),
+            oos_trades=len(pnl),
+            walk_forward_efficiency=efficiency,
+            parameter_stability=parameter_stability([r.best_params for r in results
+                                                     if r.best_params and not r.error]),
+        )
@@ -8,12 +8,19 @@ import os
 import yaml
 import logging
 import shutil
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+from .config_snapshot import ConfigSnapshot, freeze, thaw
+
 logger = logging.getLogger(__name__)
 
+# Without a running file watcher, reads stat the config files at most this often
+STAT_CHECK_INTERVAL = 1.0
+
 
 class YAMLManager:
     """Safe YAML file management with backup and validation"""
@@ -42,8 +49,13 @@ class YAMLManager:
             self.read_only_mode = True
             self.backup_dir = None
         
-        # Cache config in memory for read-only mode
-        self._cached_config = None
+        # Parsed config is published as immutable, versioned snapshots; files
+        # are only re-read when their stat signature changes
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+        self._auto_refresh = False
+        self._reloader = None
+        self._last_stat_check = 0.0
         
         # Strategy config path (separate file)
         self.strategy_config_path = self._find_strategy_config_file()
@@ -83,37 +95,129 @@ class YAMLManager:
         logger.warning(f"⚠️ YAML file not found, will create at: {default_path}")
         return default_path
     
-    def read_config(self) -> Dict[str, Any]:
-        """Read YAML configuration"""
+    @staticmethod
+    def _file_signature(path: Optional[Path]) -> Optional[Tuple]:
+        """(inode, size, mtime_ns) of a file, None if missing"""
+        try:
+            st = path.stat()
+        except (OSError, AttributeError):
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+    
+    def _load_accounts_file(self, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Parse accounts.yaml (defaults if missing, previous config if unreadable)"""
+        default_config = {'accounts': [], 'strategies': {}, 'global_settings': {}}
         try:
-            # Return cached config if available in read-only mode
-            if self.read_only_mode and self._cached_config:
-                return self._cached_config
-            
             if not self.yaml_path or not self.yaml_path.exists():
                 logger.warning("⚠️ YAML file doesn't exist yet")
-                default_config = {'accounts': [], 'strategies': {}, 'global_settings': {}}
-                if self.read_only_mode:
-                    self._cached_config = default_config
                 return default_config
             
             with open(self.yaml_path, 'r') as f:
                 config = yaml.safe_load(f)
             
-            result = config or {'accounts': [], 'strategies': {}, 'global_settings': {}}
+            return config or default_config
             
-            # Cache in read-only mode
-            if self.read_only_mode:
-                self._cached_config = result
+        except Exception as e:
+            logger.error(f"❌ Failed to read YAML: {e}")
+            return previous if previous is not None else default_config
+    
+    def _load_strategy_file(self, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Parse strategy_config.yaml ({} if missing, previous config if unreadable)"""
+        try:
+            if not self.strategy_config_path or not self.strategy_config_path.exists():
+                logger.warning("⚠️ strategy_config.yaml not found")
+                return {}
             
-            return result
+            with open(self.strategy_config_path, 'r') as f:
+                config = yaml.safe_load(f)
+            
+            return config or {}
             
         except Exception as e:
-            logger.error(f"❌ Failed to read YAML: {e}")
-            default_config = {'accounts': [], 'strategies': {}, 'global_settings': {}}
-            if self.read_only_mode:
-                self._cached_config = default_config
-            return default_config
+            logger.error(f"❌ Failed to read strategy config: {e}")
+            return previous if previous is not None else {}
+    
+    def refresh(self, force: bool = False) -> ConfigSnapshot:
+        """
+        Publish a new snapshot if either config file changed on disk
+        
+        Only files whose stat signature changed are re-parsed. Called by the
+        config watcher and after our own writes; the read path only calls it
+        (throttled) when the watcher is not running.
+        
+        Returns:
+            The current snapshot (new one if something changed)
+        """
+        with self._snapshot_lock:
+            self._last_stat_check = time.monotonic()
+            current = self._snapshot
+            accounts_sig = self._file_signature(self.yaml_path)
+            strategy_sig = self._file_signature(self.strategy_config_path)
+            sources = {str(self.yaml_path): accounts_sig, str(self.strategy_config_path): strategy_sig}
+            
+            if current is not None and not force and current.sources == sources:
+                return current
+            
+            if current is None or force or current.sources.get(str(self.yaml_path)) != accounts_sig:
+                accounts_config = freeze(self._load_accounts_file(current.accounts_config if current else None))
+            else:
+                accounts_config = current.accounts_config
+            
+            if current is None or force or current.sources.get(str(self.strategy_config_path)) != strategy_sig:
+                strategy_config = freeze(self._load_strategy_file(current.strategy_config if current else None))
+            else:
+                strategy_config = current.strategy_config
+            
+            self._snapshot = ConfigSnapshot(
+                version=(current.version + 1) if current else 1,
+                accounts_config=accounts_config,
+                strategy_config=strategy_config,
+                sources=sources
+            )
+            if current is not None:
+                logger.info(f"🔄 Config snapshot v{self._snapshot.version} published")
+            return self._snapshot
+    
+    def get_snapshot(self) -> ConfigSnapshot:
+        """
+        Current immutable config snapshot
+        
+        A reference while the config watcher runs; if it never started (or has
+        stopped) the files are stat-checked at most every STAT_CHECK_INTERVAL
+        seconds and re-parsed only when they changed.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh()
+        if self._reloader is not None and self._reloader.is_watching:
+            return snapshot
+        if time.monotonic() - self._last_stat_check >= STAT_CHECK_INTERVAL:
+            snapshot = self.refresh()
+        return snapshot
+    
+    def enable_auto_refresh(self) -> bool:
+        """Refresh snapshots from the config file watcher instead of re-reading on every call"""
+        if self._auto_refresh:
+            return True
+        try:
+            from .config_reloader import get_config_reloader
+            reloader = get_config_reloader()
+            if reloader.is_watching:
+                logger.warning("⚠️ Config reloader already watching other files - reads will stat-check the files")
+                return False
+            reloader.register_callback(lambda change: self.refresh())
+            paths = [p for p in (self.yaml_path, self.strategy_config_path) if p]
+            reloader.start_watching(paths)
+            self._reloader = reloader
+            self._auto_refresh = True
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Config auto-refresh unavailable: {e} - reads will stat-check the files")
+            return False
+    
+    def read_config(self) -> Dict[str, Any]:
+        """Read YAML configuration (mutable copy of the current snapshot)"""
+        return thaw(self.get_snapshot().accounts_config)
     
     def write_config(self, config: Dict[str, Any], backup: bool = True) -> bool:
         """
@@ -154,6 +258,7 @@ class YAMLManager:
             
             # Move temp to actual
             shutil.move(str(temp_path), str(self.yaml_path))
+            self.refresh()
             
             logger.info(f"✅ YAML configuration written successfully")
             return True
@@ -292,14 +397,12 @@ class YAMLManager:
             return False
     
     def get_all_accounts(self) -> List[Dict[str, Any]]:
-        """Get all accounts from YAML"""
-        config = self.read_config()
-        return config.get('accounts', [])
+        """Get all accounts from YAML (read-only, shared with the current snapshot)"""
+        return self.get_snapshot().accounts
     
     def get_all_strategies(self) -> Dict[str, Any]:
-        """Get all strategies from YAML"""
-        config = self.read_config()
-        return config.get('strategies', {})
+        """Get all strategies from YAML (read-only, shared with the current snapshot)"""
+        return self.get_snapshot().strategies
 
     def _find_strategy_config_file(self) -> Optional[Path]:
         """Find strategy_config.yaml file"""
@@ -316,20 +419,8 @@ class YAMLManager:
         return None
     
     def read_strategy_config(self) -> Dict[str, Any]:
-        """Read strategy configuration from strategy_config.yaml"""
-        try:
-            if not self.strategy_config_path or not self.strategy_config_path.exists():
-                logger.warning("⚠️ strategy_config.yaml not found")
-                return {}
-            
-            with open(self.strategy_config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            
-            return config or {}
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to read strategy config: {e}")
-            return {}
+        """Read strategy configuration from strategy_config.yaml (mutable copy of the current snapshot)"""
+        return thaw(self.get_snapshot().strategy_config)
     
     def write_strategy_config(self, config: Dict[str, Any], backup: bool = True) -> bool:
         """Write strategy configuration with backup"""
@@ -360,6 +451,7 @@ class YAMLManager:
             
             # Move temp to actual
             shutil.move(str(temp_path), str(self.strategy_config_path))
+            self.refresh()
             
             logger.info("✅ Strategy configuration written successfully")
             return True
@@ -459,6 +551,7 @@ def get_yaml_manager() -> YAMLManager:
     global _yaml_manager
     if _yaml_manager is None:
         _yaml_manager = YAMLManager()
+        _yaml_manager.enable_auto_refresh()
     return _yaml_manager
 
 
@@ -49,6 +49,7 @@ sys.path.append('/Users/mac/quant_system_clean/google-cloud-trading-system/src')
 # Import live trading components
 from src.core.dynamic_account_manager import get_account_manager
 from src.core.multi_account_data_feed import get_multi_account_data_feed
+from src.core.data_feed import market_data_to_dict
 from src.core.multi_account_order_manager import get_multi_account_order_manager
 from src.core.telegram_notifier import get_telegram_notifier
 from src.core.daily_bulletin_generator import DailyBulletinGenerator
@@ -394,6 +395,20 @@ class AdvancedDashboardManager:
                 bid = getattr(data, 'bid', data.get('bid', 0) if isinstance(data, dict) else 0)
                 logger.info(f"  📊 {inst}: age={age}s, bid={bid:.5f}")
         
+        # Breakeven/trailing stops for every open trade run on the live ticks
+        try:
+            from src.core.protection_engine import protect_accounts
+            protect_accounts(self._data_feed)
+        except Exception as e:
+            logger.error(f"❌ Profit protection not started: {e}")
+        
+        # FTMO limits follow that account's live equity (FTMO_ACCOUNT_ID)
+        try:
+            from src.core.ftmo_risk_manager import attach_ftmo_account
+            attach_ftmo_account(self._data_feed)
+        except Exception as e:
+            logger.error(f"❌ FTMO equity tracking not started: {e}")
+        
         # Force cache invalidation to get fresh data
         self._invalidate('status')
         self._invalidate('market')
@@ -548,7 +563,7 @@ class AdvancedDashboardManager:
                     try:
                         account_data = self.data_feed.get_latest_data(account_id)
                         if account_data:
-                            market_data[account_id] = account_data
+                            market_data[account_id] = market_data_to_dict(account_data)
                     except Exception as e:
                         logger.error(f"❌ Failed to get market data for {account_id}: {e}")
                 
@@ -589,7 +604,7 @@ class AdvancedDashboardManager:
                         
                         status['session_context'] = {
                             'quality': session_quality,
-                            'active_sessions': active_sessions,
+                            'active_sessions': sorted(session.value for session in active_sessions),
                             'description': session_desc,
                             'timestamp': self._safe_timestamp(now)
                         }
@@ -1105,11 +1120,13 @@ class AdvancedDashboardManager:
                             price_data[tf] = data
                     
                     if price_data:
+                        # Levels are cached per instrument/timeframe; unchanged bars are not recomputed
                         context = self.price_analyzer.analyze_price_context(instrument, price_data)
+                        m15 = context.get('M15')
                         insights['price_context'] = {
-                            'support_levels': context.get('M15', {}).get('support_levels', [])[:3],
-                            'resistance_levels': context.get('M15', {}).get('resistance_levels', [])[:3],
-                            'trend': context.get('M15', {}).get('trend', 'unknown')
+                            'support_levels': [level.price for level in m15.support_levels[:3]] if m15 else [],
+                            'resistance_levels': [level.price for level in m15.resistance_levels[:3]] if m15 else [],
+                            'trend': m15.trend if m15 else 'unknown'
                         }
                 except Exception as e:
                     logger.warning(f"⚠️ Price context unavailable: {e}")
@@ -7,8 +7,12 @@ import hashlib
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify, current_app
 from typing import Optional, List, Dict, Any
-import google.generativeai as genai
 from functools import lru_cache
+from src.core.startup_profile import lazy_import
+from src.core.context_gatherer import ContextSource, account_ids, get_context_gatherer
+
+# Gemini SDK is slow to import; its body only runs when GeminiAI first uses it
+genai = lazy_import('google.generativeai')
 
 from .ai_tools import summarize_market, get_positions_preview, preview_close_positions, enforce_policy, PolicyViolation, compute_portfolio_exposure
 
@@ -29,7 +33,6 @@ class SmartCache:
             'market_data': 30,      # 30 seconds
             'news_data': 300,       # 5 minutes
             'positions': 60,        # 1 minute
-            'system_status': 120,   # 2 minutes
             'ai_responses': 600     # 10 minutes
         }
     
@@ -192,110 +195,107 @@ def _get_managers():
     return account_manager, data_feed, order_manager, active_accounts, telegram_notifier
 
 
-def _gather_context_data(account_manager, data_feed, order_manager, active_accounts) -> Dict[str, Any]:
-    """Gather comprehensive context data with smart caching"""
-    context = {}
-    
-    # Market data with caching
-    market_cache_key = smart_cache.get_cache_key('market_data')
-    cached_market = smart_cache.get(market_cache_key, 'market_data')
-    
-    if cached_market:
-        context['market_data'] = cached_market
-    else:
-        try:
-            if data_feed and active_accounts:
-                market = summarize_market(data_feed, active_accounts)
-                context['market_data'] = {
-                    'instruments': list(market.keys()),
-                    'count': len(market),
-                    'summary': f"Tracking {len(market)} instruments"
-                }
-                smart_cache.set(market_cache_key, context['market_data'])
-        except Exception as e:
-            logger.error(f"❌ Market data error: {e}")
-            context['market_data'] = {'error': 'Market data unavailable'}
-    
-    # Positions with caching
-    positions_cache_key = smart_cache.get_cache_key('positions')
-    cached_positions = smart_cache.get(positions_cache_key, 'positions')
-    
-    if cached_positions:
-        context['positions'] = cached_positions
-    else:
-        try:
-            if order_manager and active_accounts:
-                total_positions = 0
-                position_details = []
-                for account in active_accounts[:3]:  # Limit to first 3 accounts
-                    try:
-                        positions = order_manager.get_positions(account)
-                        if positions:
-                            total_positions += len(positions)
-                            position_details.extend([f"{p.get('instrument', 'Unknown')}: {p.get('side', 'Unknown')} {p.get('units', 0)}" for p in positions[:2]])
-                    except Exception:
-                        continue
-                
-                context['positions'] = {
-                    'total': total_positions,
-                    'details': position_details[:5]  # Limit details
-                }
-                smart_cache.set(positions_cache_key, context['positions'])
-        except Exception as e:
-            logger.error(f"❌ Positions error: {e}")
-            context['positions'] = {'error': 'Positions unavailable'}
-    
-    # System status with caching
-    system_cache_key = smart_cache.get_cache_key('system_status')
-    cached_system = smart_cache.get(system_cache_key, 'system_status')
-    
-    if cached_system:
-        context['system_status'] = cached_system
-    else:
+# Seconds each context source may hold up an assistant reply before its last value is used
+CONTEXT_DEADLINES = {
+    'market_data': 1.5,
+    'positions': 2.0,
+    'news_data': 2.0
+}
+
+
+def _market_data_source(data_feed, active_accounts) -> Optional[Dict[str, Any]]:
+    if not (data_feed and active_accounts):
+        return None
+    market = summarize_market(data_feed, active_accounts)
+    return {
+        'instruments': list(market.keys()),
+        'count': len(market),
+        'summary': f"Tracking {len(market)} instruments"
+    }
+
+
+def _positions_source(order_manager, active_accounts) -> Optional[Dict[str, Any]]:
+    if not (order_manager and active_accounts):
+        return None
+    total_positions = 0
+    position_details = []
+    for account in active_accounts[:3]:  # Limit to first 3 accounts
         try:
-            context['system_status'] = {
-                'accounts_active': len(active_accounts),
-                'data_feed_status': 'active' if data_feed else 'inactive',
-                'order_manager_status': 'active' if order_manager else 'inactive',
-                'timestamp': datetime.now().isoformat()
-            }
-            smart_cache.set(system_cache_key, context['system_status'])
-        except Exception as e:
-            logger.error(f"❌ System status error: {e}")
-            context['system_status'] = {'error': 'System status unavailable'}
-    
-    # News data with caching
-    news_cache_key = smart_cache.get_cache_key('news_data')
-    cached_news = smart_cache.get(news_cache_key, 'news_data')
-    
-    if cached_news:
-        context['news_data'] = cached_news
-    else:
+            positions = order_manager.get_positions(account)
+            if positions:
+                total_positions += len(positions)
+                position_details.extend([f"{p.get('instrument', 'Unknown')}: {p.get('side', 'Unknown')} {p.get('units', 0)}" for p in positions[:2]])
+        except Exception:
+            continue
+    return {
+        'total': total_positions,
+        'details': position_details[:5]  # Limit details
+    }
+
+
+def _news_data_source() -> Dict[str, Any]:
+    # Import news integration
+    from ..core.news_integration import safe_news_integration
+
+    if not safe_news_integration.enabled:
+        return {'error': 'News integration disabled'}
+    # Get recent news analysis
+    news_analysis = safe_news_integration.get_news_analysis(['XAU_USD', 'EUR_USD', 'GBP_USD', 'USD_JPY'])
+    if not news_analysis:
+        return {'error': 'No news data available'}
+    return {
+        'recent_news': news_analysis.get('recent_news', []),
+        'market_sentiment': news_analysis.get('sentiment', 'neutral'),
+        'impact_events': news_analysis.get('high_impact_events', []),
+        'political_events': news_analysis.get('political_events', []),
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def _reported(label: str, fetch):
+    """Log a source failure under its own name; the gatherer then answers with its last value"""
+    def run():
         try:
-            # Import news integration
-            from ..core.news_integration import safe_news_integration
-            
-            if safe_news_integration.enabled:
-                # Get recent news analysis
-                news_analysis = safe_news_integration.get_news_analysis(['XAU_USD', 'EUR_USD', 'GBP_USD', 'USD_JPY'])
-                if news_analysis:
-                    context['news_data'] = {
-                        'recent_news': news_analysis.get('recent_news', []),
-                        'market_sentiment': news_analysis.get('sentiment', 'neutral'),
-                        'impact_events': news_analysis.get('high_impact_events', []),
-                        'political_events': news_analysis.get('political_events', []),
-                        'timestamp': datetime.now().isoformat()
-                    }
-                else:
-                    context['news_data'] = {'error': 'No news data available'}
-            else:
-                context['news_data'] = {'error': 'News integration disabled'}
-                
-            smart_cache.set(news_cache_key, context['news_data'])
+            return fetch()
         except Exception as e:
-            logger.error(f"❌ News data error: {e}")
-            context['news_data'] = {'error': 'News data unavailable'}
-    
+            logger.error(f"❌ {label} error: {e}")
+            raise
+    return run
+
+
+def _gather_context_data(account_manager, data_feed, order_manager, active_accounts) -> Dict[str, Any]:
+    """Gather context data concurrently; slow or failing sources answer with their last value"""
+    active_accounts = account_ids(active_accounts)
+    accounts_key = ','.join(active_accounts)
+    sources = {
+        'market_data': ContextSource(_reported('Market data', lambda: _market_data_source(data_feed, active_accounts)),
+                                     fallback={'error': 'Market data unavailable'}),
+        'positions': ContextSource(_reported('Positions', lambda: _positions_source(order_manager, active_accounts)),
+                                   fallback={'error': 'Positions unavailable'}),
+        'news_data': ContextSource(_reported('News data', _news_data_source),
+                                   fallback={'error': 'News data unavailable'})
+    }
+    for name, source in sources.items():
+        source.ttl = smart_cache.cache_ttl[name]
+        source.deadline = CONTEXT_DEADLINES[name]
+
+    # Keys are shared by simultaneous requests for the same accounts; news is account-independent
+    keys = {name: f"{name}:{accounts_key}" for name in sources}
+    keys['news_data'] = 'news_data'
+    try:
+        gathered = get_context_gatherer().gather({keys[name]: source for name, source in sources.items()})
+    except Exception as e:
+        logger.error(f"❌ Context gathering error: {e}")
+        gathered = {keys[name]: source.fallback for name, source in sources.items()}
+    context = {name: gathered[key] for name, key in keys.items() if key in gathered}
+
+    # System status describes this request's managers, so it is built fresh rather than shared
+    context['system_status'] = {
+        'accounts_active': len(active_accounts),
+        'data_feed_status': 'active' if data_feed else 'inactive',
+        'order_manager_status': 'active' if order_manager else 'inactive',
+        'timestamp': datetime.now().isoformat()
+    }
     return context
 
 
@@ -15,6 +15,7 @@ from typing import Optional, List, Dict, Any
 import json
 import hashlib
 import time
+from ..core.context_gatherer import ContextSource, account_ids, get_context_gatherer
 
 logger = logging.getLogger(__name__)
 
@@ -83,31 +84,53 @@ def _is_simple_query(message: str) -> bool:
     message_lower = message.lower()
     return any(pattern in message_lower for pattern in simple_patterns)
 
+# Seconds each context source is reused, and may hold up a reply before its last value is used
+CONTEXT_SOURCES = {
+    'system_health': {'ttl': 60, 'deadline': 1.0},
+    'recent_signals': {'ttl': 30, 'deadline': 1.0},
+    'market_context': {'ttl': 30, 'deadline': 2.0},
+    'gold_analysis': {'ttl': 30, 'deadline': 2.0},
+    'trading_history': {'ttl': 60, 'deadline': 2.0},
+    'strategy_performance': {'ttl': 120, 'deadline': 1.0}
+}
+
 def _build_trading_context(shadow_system) -> Dict[str, Any]:
-    """Build comprehensive trading context for AI analysis"""
+    """Build comprehensive trading context for AI analysis, fetching sources concurrently"""
     try:
         from .ai_tools import get_full_market_context, get_trading_history_summary, get_strategy_performance, get_gold_specific_analysis
         
-        # Get data feed and accounts from app config
+        # Get data feed and accounts from app config (worker threads have no app context)
         data_feed = current_app.config.get('DATA_FEED')
-        accounts = current_app.config.get('ACCOUNTS', [])
+        accounts = account_ids(current_app.config.get('ACCOUNTS', []))
         order_manager = current_app.config.get('ORDER_MANAGER')
         
-        context = {
-            'timestamp': datetime.now().isoformat(),
-            'system_health': shadow_system.get_system_health() if shadow_system else {},
-            'recent_signals': shadow_system.get_shadow_signals(limit=5) if shadow_system else []
-        }
-        
+        fetchers = {}
+        if shadow_system:
+            fetchers['system_health'] = shadow_system.get_system_health
+            fetchers['recent_signals'] = lambda: shadow_system.get_shadow_signals(limit=5)
+            fetchers['strategy_performance'] = lambda: get_strategy_performance(shadow_system)
         if data_feed and accounts:
-            context.update(get_full_market_context(data_feed, accounts, shadow_system))
-            context['gold_analysis'] = get_gold_specific_analysis(data_feed, accounts)
-        
+            # Health and signals are their own sources above rather than re-fetched here
+            fetchers['market_context'] = lambda: get_full_market_context(data_feed, accounts)
+            fetchers['gold_analysis'] = lambda: get_gold_specific_analysis(data_feed, accounts)
         if order_manager and accounts:
-            context['trading_history'] = get_trading_history_summary(order_manager, accounts)
+            fetchers['trading_history'] = lambda: get_trading_history_summary(order_manager, accounts)
         
-        if shadow_system:
-            context['strategy_performance'] = get_strategy_performance(shadow_system)
+        # Keys are shared by simultaneous requests for the same accounts
+        accounts_key = ','.join(accounts)
+        keys = {name: f"shadow_{name}:{accounts_key}" for name in fetchers}
+        sources = {keys[name]: ContextSource(fetch, **CONTEXT_SOURCES[name]) for name, fetch in fetchers.items()}
+        gathered = get_context_gatherer().gather(sources)
+        
+        context = {
+            'timestamp': datetime.now().isoformat(),
+            'system_health': gathered.get(keys.get('system_health'), {}),
+            'recent_signals': gathered.get(keys.get('recent_signals'), [])
+        }
+        context.update(gathered.get(keys.get('market_context'), {}))
+        for name in ('gold_analysis', 'trading_history', 'strategy_performance'):
+            if keys.get(name) in gathered:
+                context[name] = gathered[keys[name]]
         
         return context
     except Exception as e:
@@ -16,6 +16,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import logging
 
+from ..core.strategy_base import SignalArrays
+
 logger = logging.getLogger(__name__)
 
 class UltraSelective75WRChampion:
@@ -130,18 +132,26 @@ class UltraSelective75WRChampion:
         if len(data) < period + 1:
             return 0.0
         
-        # Simplified ADX calculation
-        high_diff = data['high'].diff()
-        low_diff = -data['low'].diff()
+        adx = self.adx_series(data, period)
+        return adx.iloc[-1] if len(adx) > 0 and not pd.isna(adx.iloc[-1]) else 0.0
+    
+    @staticmethod
+    def adx_series(data: pd.DataFrame, period: int = 14) -> pd.Series:
+        """Simplified ADX for every bar (positional, so any index type works)"""
+        high = data['high'].reset_index(drop=True)
+        low = data['low'].reset_index(drop=True)
+        close = data['close'].reset_index(drop=True)
+        high_diff = high.diff()
+        low_diff = -low.diff()
         
         plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0)
         minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0)
         
         tr = np.maximum(
-            data['high'] - data['low'],
+            high - low,
             np.maximum(
-                abs(data['high'] - data['close'].shift(1)),
-                abs(data['low'] - data['close'].shift(1))
+                abs(high - close.shift(1)),
+                abs(low - close.shift(1))
             )
         )
         
@@ -150,9 +160,7 @@ class UltraSelective75WRChampion:
         minus_di = 100 * (pd.Series(minus_dm).rolling(period).mean() / atr)
         
         dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10)
-        adx = dx.rolling(period).mean()
-        
-        return adx.iloc[-1] if len(adx) > 0 and not pd.isna(adx.iloc[-1]) else 0.0
+        return dx.rolling(period).mean()
     
     def check_volume_surge(self, data: pd.DataFrame, period: int = 20) -> bool:
         """Check if volume is 3x average"""
@@ -353,6 +361,79 @@ class UltraSelective75WRChampion:
         
         return signals
     
+    def generate_signals_batch(self, data: pd.DataFrame) -> SignalArrays:
+        """
+        generate_signals for every bar of a whole history in one vectorized pass
+        
+        Bar i gets the signal generate_signals would return for data.iloc[:i + 1]
+        with the daily limit not yet reached; the daily limit and trade counters
+        are left to the caller. Indicator columns (ema_20, ema_50, rsi, macd,
+        macd_signal) are used when present, exactly as the bar-by-bar path does.
+        
+        Args:
+            data: OHLC(V) history with a DatetimeIndex
+            
+        Returns:
+            SignalArrays with direction, stop, target and confidence per bar
+        """
+        n = len(data)
+        close = data['close'].to_numpy(dtype=float)
+        high = data['high'].to_numpy(dtype=float)
+        low = data['low'].to_numpy(dtype=float)
+        columns = data.columns
+        strength = np.zeros(n)
+        confluence = np.zeros(n, dtype=int)
+        
+        def add(passed, weight):
+            nonlocal strength, confluence
+            strength = np.where(passed, strength + weight, strength)
+            confluence += passed
+        
+        if 'ema_20' in columns and 'ema_50' in columns:
+            ema_20 = data['ema_20'].to_numpy(dtype=float)
+            ema_50 = data['ema_50'].to_numpy(dtype=float)
+            add(((close > ema_20) & (ema_20 > ema_50)) | ((close < ema_20) & (ema_20 < ema_50)), 0.25)
+        if 'rsi' in columns:
+            rsi = data['rsi'].to_numpy(dtype=float)
+            add((rsi >= 40) & (rsi <= 60), 0.20)
+        adx = self.adx_series(data, period=14).fillna(0.0).to_numpy()
+        add(adx >= self.min_adx, 0.25)
+        if 'volume' in columns:
+            volume = data['volume'].reset_index(drop=True).astype(float)
+            avg_volume = volume.rolling(20).mean().to_numpy()
+            add((np.arange(n) < 19) | (avg_volume == 0) | (volume.to_numpy() >= avg_volume * self.min_volume_mult), 0.15)
+        else:
+            add(np.ones(n, dtype=bool), 0.15)
+        if 'macd' in columns and 'macd_signal' in columns:
+            add(np.abs(data['macd'].to_numpy(dtype=float) - data['macd_signal'].to_numpy(dtype=float)) > 0.0001, 0.15)
+        
+        # last N closes: at least 4 moves the same way
+        moves = np.diff(close, prepend=np.nan)
+        window = self.confirmation_bars
+        up_moves = pd.Series(moves > 0).rolling(window, min_periods=1).sum().to_numpy()
+        down_moves = pd.Series(moves < 0).rolling(window, min_periods=1).sum().to_numpy()
+        direction = np.where(up_moves >= 4, 1, np.where(down_moves >= 4, -1, 0))
+        
+        prev_close = np.concatenate([[np.nan], close[:-1]])
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = pd.Series(tr).rolling(14).mean().to_numpy()
+        
+        hours = pd.DatetimeIndex(data.index).hour.to_numpy()
+        in_session = (((self.london_start <= hours) & (hours < self.london_end))
+                      | ((self.ny_start <= hours) & (hours < self.ny_end)))
+        
+        bars = np.arange(n)
+        signal = np.where(
+            (bars >= 49) & (bars >= window) & in_session
+            & (strength >= self.signal_strength_min) & (confluence >= self.confluence_required)
+            & (atr != 0) & ~np.isnan(atr),
+            direction, 0).astype(np.int8)
+        
+        stop = np.where(signal != 0, close - signal * atr * self.sl_atr_mult, np.nan)
+        target = np.where(signal != 0, close + signal * atr * self.tp_atr_mult, np.nan)
+        return SignalArrays(index=data.index, signal=signal, stop=stop, target=target,
+                            confidence=np.where(signal != 0, strength, 0.0))
+    
     def record_trade_result(self, result: str):
         """Record trade result for tracking"""
         if result == 'WIN':
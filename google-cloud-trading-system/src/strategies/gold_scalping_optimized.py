@@ -48,6 +48,11 @@ class ScalpingSignal:
 
 class GoldScalpingStrategy:
     """OPTIMIZED Gold Scalping Strategy - MAX 10 TRADES/DAY"""
+
+    # Signal filters strategy_config.yaml may change live; risk limits and sizing stay as set here
+    HOT_SWAP_PARAMS = frozenset({'min_signal_strength', 'quality_score_threshold', 'min_confirmations',
+                                 'breakout_threshold', 'volume_spike_multiplier'})
+    max_history = 100  # bars kept per instrument in price_history
     
     def __init__(self):
         """Initialize optimized strategy"""
@@ -278,8 +283,8 @@ class GoldScalpingStrategy:
                 self.price_history[instrument].append(mid_price)
                 
                 # Keep only last 100 prices for efficiency
-                if len(self.price_history[instrument]) > 100:
-                    self.price_history[instrument] = self.price_history[instrument][-100:]
+                if len(self.price_history[instrument]) > self.max_history:
+                    self.price_history[instrument] = self.price_history[instrument][-self.max_history:]
     
     def _generate_trade_signals(self, market_data: Dict[str, MarketData]) -> List[TradeSignal]:
         """Generate optimized trade signals with enhanced quality filters"""
@@ -14,10 +14,9 @@ import pandas as pd
 from ..core.order_manager import TradeSignal, OrderSide, get_order_manager
 from ..core.data_feed import MarketData, get_data_feed
 
-# Adaptive regime detection and profit protection
+# Adaptive regime detection
 try:
     from ..core.market_regime import get_market_regime_detector
-    from ..core.profit_protector import get_profit_protector
     ADAPTIVE_AVAILABLE = True
 except ImportError:
     ADAPTIVE_AVAILABLE = False
@@ -67,6 +66,12 @@ class MomentumSignal:
 
 class MomentumTradingStrategy:
     """OPTIMIZED Momentum Trading Strategy - MAX 10 TRADES/DAY"""
+
+    # Signal filters and lookbacks strategy_config.yaml may change live; risk limits, sizing
+    # and the tuned ADX/volume floors stay as set here
+    HOT_SWAP_PARAMS = frozenset({'min_signal_strength', 'quality_score_threshold', 'min_quality_score',
+                                 'momentum_period', 'trend_period', 'sniper_ema_period', 'sniper_tolerance'})
+    max_history = 200  # bars kept per instrument in price_history
     
     def __init__(self):
         """Initialize optimized strategy"""
@@ -200,19 +205,13 @@ class MomentumTradingStrategy:
         self.sniper_ema_period = 20
         self.sniper_tolerance = 0.002  # 0.2% from EMA
         
-        # Initialize regime detector and profit protector
+        # Initialize regime detector; breakeven/trailing stops are moved by the
+        # protection engine on live ticks, not by the strategy
         if self.adaptive_mode:
             self.regime_detector = get_market_regime_detector()
-            self.profit_protector = get_profit_protector({
-                'breakeven_at': 0.005,  # +0.5%
-                'trail_at': 0.015,      # +1.5%
-                'trail_distance': 0.008 # 0.8%
-            })
             logger.info("✅ Adaptive regime detection ENABLED")
-            logger.info("✅ Profit protection ENABLED")
         else:
             self.regime_detector = None
-            self.profit_protector = None
             logger.info("ℹ️  Running in standard mode (adaptive disabled)")
         
         # ===============================================
@@ -721,10 +720,11 @@ class MomentumTradingStrategy:
                 
                 # Keep more history for better calculations (was 100 - too small!)
                 # Increased to 200 to support 50-bar momentum + 100-bar trend
-                if len(self.price_history[instrument]) > 200:
-                    self.price_history[instrument] = self.price_history[instrument][-200:]
+                if len(self.price_history[instrument]) > self.max_history:
+                    self.price_history[instrument] = self.price_history[instrument][-self.max_history:]
     
-    def _generate_trade_signals(self, market_data: Dict[str, MarketData]) -> List[TradeSignal]:
+    def _generate_trade_signals(self, market_data: Dict[str, MarketData],
+                                context=None, bar: Optional[int] = None) -> List[TradeSignal]:
         """Generate optimized trade signals with enhanced quality filters"""
         self._reset_daily_counters()
         
@@ -736,6 +736,7 @@ class MomentumTradingStrategy:
         self._update_price_history(market_data)
         
         trade_signals = []
+        signal_indicators = {}  # instrument -> indicators for contextual quality scoring
         
         # Session filter - DISABLED FOR BACKTEST (uses current time, not historical time!)
         # TODO: Fix to use candle timestamp instead of datetime.now()
@@ -908,6 +909,7 @@ class MomentumTradingStrategy:
                 strategy_name=self.name
             )
             trade_signals.append(trade_signal)
+            signal_indicators[instrument] = {'adx': adx, 'momentum': momentum, 'volume': volume_score}
             
             # Log with adaptive info
             regime_type = quality_result.get('regime', 'STANDARD')
@@ -954,36 +956,43 @@ class MomentumTradingStrategy:
             except Exception as e:
                 logger.warning(f"⚠️  News integration error: {e}")
         
-        # Apply contextual quality scoring to filter signals
+        # Apply contextual quality scoring to filter signals - one batch for all of them
         if self.contextual_enabled and self.quality_scorer and trade_signals:
             try:
-                filtered_signals = []
+                candidates = []
                 for signal in trade_signals:
-                    # Get quality score for this setup
-                    # Get current price for entry_price calculation
                     current_price = market_data.get(signal.instrument)
-                    if current_price:
-                        entry_price = current_price.ask if signal.side == OrderSide.BUY else current_price.bid
-                    else:
-                        entry_price = 0.0  # Fallback
-                    
-                    quality = self.quality_scorer.score_trade_setup(
-                        instrument=signal.instrument,
-                        direction=signal.side.value,
-                        entry_price=entry_price,
-                        market_data=market_data
-                    )
+                    entry_price = (current_price.ask if signal.side == OrderSide.BUY else current_price.bid) if current_price else signal.entry_price
+                    scoring_context = {'current_price': entry_price, 'timestamp': signal.timestamp}
+                    if context is not None:
+                        # Backtest replay: the bar's own levels, session and news, not the wall clock
+                        scoring_context.update(context.price_context(signal.instrument, bar, entry_price))
+                        bar_context = context.at(bar)
+                        scoring_context['timestamp'] = bar_context['timestamp']
+                        scoring_context['news'] = {
+                            'sentiment': bar_context['news_sentiment'],
+                            'impact': 'high' if bar_context['high_impact_upcoming'] else 'low'}
+                    risk = abs(entry_price - signal.stop_loss) if entry_price and signal.stop_loss else 0
+                    if risk > 0 and signal.take_profit:
+                        scoring_context['risk_reward'] = abs(signal.take_profit - entry_price) / risk
+                    candidates.append((signal.instrument, signal.side.value.upper(),
+                                       signal_indicators.get(signal.instrument, {}), scoring_context))
+                qualities = self.quality_scorer.score_signals_batch(candidates)
+                
+                filtered_signals = []
+                for i, signal in enumerate(trade_signals):
+                    total_score = qualities.total_scores[i]
                     
                     # Add quality score to signal (if TradeSignal supports it)
                     if hasattr(signal, 'quality_score'):
-                        signal.quality_score = quality.total_score
+                        signal.quality_score = total_score
                     
                     # Only keep signals with minimum quality (20+ score) - RELAXED to allow more trades
-                    if quality.total_score >= 20:
+                    if total_score >= 20:
                         filtered_signals.append(signal)
-                        logger.info(f"✅ {signal.instrument} {signal.side.value}: Quality {quality.total_score}/100 - ACCEPTED")
+                        logger.info(f"✅ {signal.instrument} {signal.side.value}: Quality {total_score:.0f}/100 - ACCEPTED")
                     else:
-                        logger.info(f"⚠️ {signal.instrument} {signal.side.value}: Quality {quality.total_score}/100 - REJECTED (< 20)")
+                        logger.info(f"⚠️ {signal.instrument} {signal.side.value}: Quality {total_score:.0f}/100 - REJECTED (< 20)")
                 
                 if len(filtered_signals) < len(trade_signals):
                     logger.info(f"🎯 Contextual filtering: {len(filtered_signals)}/{len(trade_signals)} signals passed quality threshold")
@@ -994,10 +1003,18 @@ class MomentumTradingStrategy:
         
         return trade_signals
     
-    def analyze_market(self, market_data: Dict[str, MarketData]) -> List[TradeSignal]:
-        """Analyze market and generate trading signals"""
+    def analyze_market(self, market_data: Dict[str, MarketData], context=None,
+                       bar: Optional[int] = None) -> List[TradeSignal]:
+        """
+        Analyze market and generate trading signals
+        
+        Args:
+            market_data: Current price per instrument
+            context: Per-bar BacktestContext when replaying history (None when live)
+            bar: Index of the current bar in ``context``
+        """
         try:
-            signals = self._generate_trade_signals(market_data)
+            signals = self._generate_trade_signals(market_data, context, bar)
             
             if signals:
                 logger.info(f"🎯 {self.name} generated {len(signals)} signals")
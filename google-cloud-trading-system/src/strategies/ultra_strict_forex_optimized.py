@@ -58,6 +58,11 @@ class MomentumSignal:
 
 class UltraStrictForexStrategy:
     """OPTIMIZED Ultra Strict Forex Trading Strategy - MAX 10 TRADES/DAY"""
+
+    # Signal filters strategy_config.yaml may change live; risk limits and sizing stay as set here
+    HOT_SWAP_PARAMS = frozenset({'min_signal_strength', 'quality_score_threshold', 'min_confirmations',
+                                 'trend_strength_min', 'min_volume_multiplier'})
+    max_history = 100  # bars kept per instrument in price_history
     
     def __init__(self):
         """Initialize optimized strategy"""
@@ -267,8 +272,8 @@ class UltraStrictForexStrategy:
                 self.price_history[instrument].append(mid_price)
                 
                 # Keep only last 100 prices for efficiency
-                if len(self.price_history[instrument]) > 100:
-                    self.price_history[instrument] = self.price_history[instrument][-100:]
+                if len(self.price_history[instrument]) > self.max_history:
+                    self.price_history[instrument] = self.price_history[instrument][-self.max_history:]
     
     def _calculate_ema_signals(self) -> Dict[str, EMASignal]:
         """Calculate EMA crossover signals"""
@@ -31,6 +31,8 @@ class UltraStrictV2RegimeAware:
     Improved Ultra Strict Strategy - Regime-Aware
     Fixes: ESI < 0.60 by adapting to different market conditions
     """
+
+    max_history = 100  # bars kept per instrument in price_history
     
     def __init__(self, config: Dict = None):
         self.config = config or {}
@@ -412,7 +414,7 @@ def get_ultra_strict_v2_strategy():
                 })
                 
                 # Keep last 100 candles
-                self.price_history[pair] = self.price_history[pair][-100:]
+                self.price_history[pair] = self.price_history[pair][-self.max_history:]
             
             # Need minimum data
             if len(self.price_history.get(pair, [])) < 20:
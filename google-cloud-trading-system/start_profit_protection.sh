@@ -11,6 +11,9 @@ echo "  • Taking 50% profit at 20 pips"
 echo "  • Trailing stops after 25 pips (15 pips trailing distance)"
 echo "  • Time-based exits after 4 hours"
 echo ""
+echo "Only for accounts the trading system is NOT running: it attaches"
+echo "its own protection engine to the live feed at startup."
+echo ""
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 echo ""
 
@@ -35,7 +38,7 @@ echo ""
 for account in "101-004-30719775-006" "101-004-30719775-007" "101-004-30719775-008" "101-004-30719775-010" "101-004-30719775-011"
 do
     echo "Starting protection for account $account..."
-    OANDA_API_KEY=$OANDA_API_KEY OANDA_ACCOUNT_ID=$account OANDA_ENVIRONMENT=$OANDA_ENVIRONMENT nohup python3 -m src.core.profit_protector > logs/profit_protector_${account: -3}.log 2>&1 &
+    OANDA_API_KEY=$OANDA_API_KEY OANDA_ACCOUNT_ID=$account OANDA_ENVIRONMENT=$OANDA_ENVIRONMENT nohup python3 -m src.core.protection_engine > logs/profit_protector_${account: -3}.log 2>&1 &
     LAST_PID=$!
     echo "  PID: $LAST_PID"
     sleep 1
@@ -47,7 +50,7 @@ echo ""
 echo "✅ Profit Protection ACTIVE for all accounts!"
 echo ""
 echo "What's happening now:"
-echo "  🛡️ Checking trades every 30 seconds"
+echo "  🛡️ Evaluating every open trade on each price update"
 echo "  📊 Breakeven after +15 pips"
 echo "  💰 Partial profit at +20 pips (50%)"
 echo "  📈 Trailing after +25 pips"
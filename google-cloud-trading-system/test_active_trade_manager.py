@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test Active Trade Manager
+Verifies one price snapshot per cycle, bulk evaluation and concurrent closes - no OANDA credentials required
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from active_trade_manager import ActiveTradeManager
+
+
+class RecordingClient:
+    """Serves canned trades/prices and counts pricing calls"""
+
+    def __init__(self, trades, prices, fail_trades=False):
+        self.trades = trades
+        self.prices = prices
+        self.fail_trades = fail_trades
+        self.price_calls = []
+
+    def get_open_trades(self):
+        if self.fail_trades:
+            raise ConnectionError("503 from OANDA")
+        return list(self.trades)
+
+    def get_current_prices(self, instruments, force_refresh=False):
+        self.price_calls.append(list(instruments))
+        return {i: self.prices[i] for i in instruments if i in self.prices}
+
+
+class RecordingManager(ActiveTradeManager):
+    """Records closes instead of sending them; each close takes a while"""
+
+    close_delay = 0.0
+
+    def close_trade_by_id(self, client, trade_id):
+        time.sleep(self.close_delay)
+        with self._close_lock:
+            self.closed.append(trade_id)
+        return True
+
+    def send_telegram(self, message):
+        pass
+
+
+def _manager(clients, close_delay=0.0, max_workers=8):
+    manager = RecordingManager(clients=clients, max_workers=max_workers)
+    manager.closed = []
+    manager._close_lock = threading.Lock()
+    manager.close_delay = close_delay
+    return manager
+
+
+def _trade(trade_id, instrument, units, price):
+    return {'id': trade_id, 'instrument': instrument, 'currentUnits': str(units),
+            'price': str(price), 'unrealizedPL': '0'}
+
+
+PRICES = {
+    'EUR_USD': SimpleNamespace(bid=1.1000, ask=1.1001),
+    'XAU_USD': SimpleNamespace(bid=2650.0, ask=2650.5),
+    'GBP_USD': SimpleNamespace(bid=1.3000, ask=1.3001),
+}
+
+
+def test_one_price_snapshot_per_cycle():
+    """Every account's trades are priced from a single call on the union of instruments"""
+    clients = {
+        name: RecordingClient([_trade(f'{name}{i}', inst, 1000, PRICES[inst].bid) for i, inst in enumerate(insts)], PRICES)
+        for name, insts in {'PRIMARY': ['EUR_USD', 'XAU_USD'], 'GOLD': ['XAU_USD'] * 3,
+                            'ALPHA': ['GBP_USD', 'EUR_USD']}.items()
+    }
+    manager = _manager(clients)
+    assert manager.manage_all_positions() == 0
+    calls = [c for client in clients.values() for c in client.price_calls]
+    assert calls == [['EUR_USD', 'GBP_USD', 'XAU_USD']]
+    assert len(manager.trade_entry_times) == 7
+
+
+def test_bulk_evaluation_keeps_close_rules():
+    """Longs mark at the bid, shorts at the ask; losers get 20 minutes, everything 90"""
+    manager = _manager({'PRIMARY': RecordingClient([], PRICES)})
+    now = datetime(2025, 10, 20, 12, 0)
+    trades = {'PRIMARY': [
+        _trade('loss', 'EUR_USD', 1000, 1.1020),        # -0.18% -> early loss
+        _trade('profit', 'EUR_USD', -1000, 1.1015),     # short, +0.13% at the ask -> quick profit
+        _trade('small_loss', 'XAU_USD', 10, 2651.0),    # -0.04%, held 25min -> max loss time
+        _trade('flat_old', 'GBP_USD', 1000, 1.3000),    # flat, held 95min -> max time
+        _trade('flat_new', 'GBP_USD', -1000, 1.3001),   # flat, fresh -> keep
+        _trade('no_price', 'USD_JPY', 1000, 150.0),     # not in snapshot -> unrealizedPL fallback
+    ]}
+    manager.trade_entry_times.update({'small_loss': now - timedelta(minutes=25),
+                                      'flat_old': now - timedelta(minutes=95)})
+    decisions = manager.evaluate_positions(trades, PRICES, now)
+    reasons = {d['trade_id']: d['reason'].split(' (')[0] for d in decisions}
+    assert reasons == {'loss': 'EARLY LOSS', 'profit': 'QUICK PROFIT',
+                       'small_loss': 'MAX LOSS TIME', 'flat_old': 'MAX TIME'}
+    assert manager.trade_entry_times['no_price'] == now
+
+
+def test_closes_go_out_concurrently():
+    """Ten slow closes take about as long as one"""
+    trades = [_trade(str(i), 'EUR_USD', 1000, 1.1100) for i in range(10)]  # all -0.9%
+    manager = _manager({'PRIMARY': RecordingClient(trades, PRICES)}, close_delay=0.2, max_workers=10)
+    started = time.time()
+    assert manager.manage_all_positions() == 10
+    assert time.time() - started < 1.0
+    assert sorted(manager.closed, key=int) == [str(i) for i in range(10)]
+    assert manager.actions_taken == 10 and manager.trade_entry_times == {}
+
+
+def test_failed_account_keeps_its_entry_times():
+    """Trades closed elsewhere are forgotten, but an unreadable account keeps its clock"""
+    primary = RecordingClient([_trade('p1', 'EUR_USD', 1000, 1.1000)], PRICES)
+    gold = RecordingClient([_trade('g1', 'XAU_USD', 10, 2650.0)], PRICES)
+    manager = _manager({'PRIMARY': primary, 'GOLD': gold})
+    manager.manage_all_positions()
+    assert set(manager.trade_entry_times) == {'p1', 'g1'}
+
+    primary.trades = []
+    gold.fail_trades = True
+    manager.manage_all_positions()
+    assert set(manager.trade_entry_times) == {'g1'}
+
+
+if __name__ == '__main__':
+    test_one_price_snapshot_per_cycle()
+    test_bulk_evaluation_keeps_close_rules()
+    test_closes_go_out_concurrently()
+    test_failed_account_keeps_its_entry_times()
+    print("✅ All active trade manager tests passed!")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test Backtest Cache
+Verifies content-addressed keys, resume across runs, LRU eviction and source-change invalidation
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.backtest_cache import BacktestCache, code_version, data_fingerprint, make_key
+
+
+def _candles(n=50, shift=0.0):
+    index = pd.date_range('2025-10-01', periods=n, freq='15min')
+    close = 1.10 + np.arange(n) * 1e-4 + shift
+    return {'EUR_USD': pd.DataFrame({'close': close, 'high': close + 2e-4, 'low': close - 2e-4}, index=index)}
+
+
+def test_keys_follow_content_not_identity():
+    """Equal params/data hash the same; any change to either gives a new key"""
+    data, same = _candles(), _candles()
+    assert data_fingerprint(data) == data_fingerprint(same)
+    assert data_fingerprint(data) != data_fingerprint(_candles(shift=1e-5))
+    assert data_fingerprint([{'time': 't1', 'mid': {'c': '1.1'}}]) != data_fingerprint([{'time': 't1', 'mid': {'c': '1.2'}}])
+
+    fp = data_fingerprint(data)
+    key = make_key('v1', {'stop_loss_atr': 2.0, 'period': 20}, fp, window=(0, 10))
+    assert key == make_key('v1', {'period': np.int64(20), 'stop_loss_atr': np.float64(2.0)}, fp, window=(0, 10))
+    assert key != make_key('v2', {'stop_loss_atr': 2.0, 'period': 20}, fp, window=(0, 10))
+    assert key != make_key('v1', {'stop_loss_atr': 2.0, 'period': 20}, fp, window=(0, 11))
+
+
+def test_results_survive_restart_so_sweeps_resume():
+    """A second cache on the same file serves what the first stored; None is never cached"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.db')
+        calls = []
+
+        def backtest(p):
+            calls.append(p)
+            return {'params': p, 'score': p * 2, 'trades': [{'pnl': 1.0}]}
+
+        first = BacktestCache(path)
+        for p in range(3):
+            first.get_or_compute(f'k{p}', lambda p=p: backtest(p), strategy='s', version='v')
+        assert first.get_or_compute('fail', lambda: None) is None
+
+        resumed = BacktestCache(path)
+        results = [resumed.get_or_compute(f'k{p}', lambda p=p: backtest(p), strategy='s', version='v')
+                   for p in range(5)]
+        assert calls == [0, 1, 2, 3, 4]
+        assert [r['score'] for r in results] == [0, 2, 4, 6, 8]
+        assert resumed.stats()['hits'] == 3
+
+        # callers get independent copies
+        results[0]['trades'].clear()
+        assert resumed.get('k0')['trades'] == [{'pnl': 1.0}]
+
+
+def test_lru_eviction_keeps_recently_used():
+    """Past the entry limit the least-recently-used results go first"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = BacktestCache(os.path.join(tmp, 'cache.db'), max_entries=10, evict_every=1000)
+        for i in range(10):
+            cache.put(f'k{i}', i)
+        cache.get('k0')  # touch the oldest so it survives
+        for i in range(10, 12):
+            cache.put(f'k{i}', i)
+        removed = cache.evict()
+        assert removed == 12 - 9
+        assert cache.get('k0') == 0
+        assert cache.get('k1') is None and cache.get('k2') is None
+        assert cache.get('k11') == 11
+
+
+def test_source_change_invalidates_strategy_entries():
+    """Editing the strategy file changes its code version; stale entries are dropped"""
+    with tempfile.TemporaryDirectory() as tmp:
+        module_path = os.path.join(tmp, 'toy_strategy_cache_test.py')
+        with open(module_path, 'w') as f:
+            f.write("class ToyStrategy:\n    threshold = 1\n")
+        sys.path.insert(0, tmp)
+        try:
+            module = importlib.import_module('toy_strategy_cache_test')
+            old_version = code_version(module.ToyStrategy)
+            with open(module_path, 'w') as f:
+                f.write("class ToyStrategy:\n    threshold = 2\n")
+            from core import backtest_cache
+            backtest_cache._file_digest.cache_clear()
+            new_version = code_version(module.ToyStrategy)
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop('toy_strategy_cache_test', None)
+        assert old_version != new_version
+
+        cache = BacktestCache(os.path.join(tmp, 'cache.db'))
+        cache.put('old', 1, strategy='toy', version=old_version)
+        cache.put('new', 2, strategy='toy', version=new_version)
+        cache.put('other', 3, strategy='other', version=old_version)
+        assert cache.invalidate('toy', keep_version=new_version) == 1
+        assert cache.get('old') is None
+        assert cache.get('new') == 2 and cache.get('other') == 3
+
+
+if __name__ == '__main__':
+    test_keys_follow_content_not_identity()
+    test_results_survive_restart_so_sweeps_resume()
+    test_lru_eviction_keeps_recently_used()
+    test_source_change_invalidates_strategy_entries()
+    print("✅ All backtest cache tests passed!")
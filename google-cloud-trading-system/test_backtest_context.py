@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test Backtest Context
+Verifies the precomputed per-bar session, news and multi-timeframe context against per-bar recomputation
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.backtest_context import BacktestContext, atr, ema, rsi
+from core.session_manager import SessionManager
+from core.support_resistance import SupportResistanceEngine
+
+OHLC = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'}
+
+
+def _frames(days=14, seed=5, start_price=1.10):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2025-09-29', periods=days * 288, freq='5min', tz='UTC')
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 4e-4, len(index))))
+    m5 = pd.DataFrame({'open': np.roll(close, 1), 'high': close * (1 + 2e-4), 'low': close * (1 - 2e-4),
+                       'close': close}, index=index)
+    m5.iloc[0, 0] = close[0]
+    return {'M5': m5, 'M15': m5.resample('15min').agg(OHLC).dropna(),
+            'H1': m5.resample('1h').agg(OHLC).dropna(), 'H4': m5.resample('4h').agg(OHLC).dropna(),
+            'D1': m5.resample('1D').agg(OHLC).dropna()}
+
+
+def _news(index):
+    rng = np.random.default_rng(1)
+    events = {'USD': [], 'EUR': []}
+    for k in range(60):
+        when = index[0] + pd.Timedelta(minutes=int(rng.integers(0, len(index) * 5)))
+        currency = 'USD' if k % 2 else 'EUR'
+        events[currency].append({'time': when.strftime('%Y-%m-%d %H:%M:%S'), 'currency': currency,
+                                 'name': f'event {k}', 'impact': ['high', 'medium', 'low'][k % 3],
+                                 'sentiment': float(rng.uniform(-1, 1))})
+    return events
+
+
+def test_indicators_match_wilder_recursions():
+    """EMA/RSI/ATR equal their SMA-seeded recursive definitions"""
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, 200))
+    high, low = close + rng.uniform(0, 1, 200), close - rng.uniform(0, 1, 200)
+
+    expected = [np.nan] * 19 + [close[:20].mean()]
+    for x in close[20:]:
+        expected.append(expected[-1] + 2 / 21 * (x - expected[-1]))
+    assert np.allclose(ema(close, 20), expected, equal_nan=True)
+
+    change = np.diff(close)
+    gain, loss = np.clip(change[:14], 0, None).mean(), np.clip(-change[:14], 0, None).mean()
+    expected = [np.nan] * 14 + [100 * gain / (gain + loss)]
+    for c in change[14:]:
+        gain, loss = (gain * 13 + max(c, 0)) / 14, (loss * 13 + max(-c, 0)) / 14
+        expected.append(100 * gain / (gain + loss))
+    assert np.allclose(rsi(close), expected, equal_nan=True)
+
+    tr = [max(high[k] - low[k], abs(high[k] - close[k - 1]), abs(low[k] - close[k - 1])) for k in range(1, 200)]
+    expected = [np.nan] * 14 + [np.mean(tr[:14])]
+    for value in tr[14:]:
+        expected.append((expected[-1] * 13 + value) / 14)
+    assert np.allclose(atr(high, low, close), expected, equal_nan=True)
+
+
+def test_news_arrays_match_window_scan():
+    """Recent/upcoming windows, sentiment and caution equal a per-bar scan of every event"""
+    index = _frames(days=3)['M5'].index
+    news = _news(index)
+    ctx = BacktestContext(index, news=news)
+    events = [e for currency in news.values() for e in currency]
+    for i in range(0, len(index), 7):
+        now = index[i]
+        recent = [e for e in events if now - pd.Timedelta(hours=2) <= pd.Timestamp(e['time'], tz='UTC') <= now]
+        upcoming = [e for e in events if now < pd.Timestamp(e['time'], tz='UTC') <= now + pd.Timedelta(hours=2)]
+        weight = sum(1.0 if e['impact'] == 'high' else 0.5 if e['impact'] == 'medium' else 0 for e in recent)
+        total = sum((2 if e['impact'] == 'high' else 1) * e['sentiment'] for e in recent if e['impact'] != 'low')
+        context = ctx.news_context(i)
+        assert sorted(e['name'] for e in context['recent_news']) == sorted(e['name'] for e in recent)
+        assert sorted(e['name'] for e in context['upcoming_news']) == sorted(e['name'] for e in upcoming)
+        assert np.isclose(context['high_impact_count'], weight)
+        assert np.isclose(context['sentiment'], total / weight if weight else 0.0)
+        assert context['high_impact_upcoming'] == any(e['impact'] == 'high' for e in upcoming)
+        assert context['trading_caution'] == (context['high_impact_upcoming'] or weight > 1)
+
+
+def test_price_context_uses_only_closed_higher_timeframe_bars():
+    """Levels and trends at each bar equal a fresh analysis of the higher-timeframe bars closed by then"""
+    frames = _frames()
+    index = frames['M5'].index
+    psych = [1.0 + 0.01 * k for k in range(30)]
+    ctx = BacktestContext(index, psychological_levels=psych)
+    ctx.add_instrument('EUR_USD', frames)
+
+    for i in (400, 2000, 3333, len(index) - 1):
+        bar_close = index[i] + pd.Timedelta(minutes=5)
+        price = frames['M5']['close'].iloc[i]
+        context = ctx.price_context('EUR_USD', i, price)
+        supports, resistances = [], []
+        for timeframe, period in (('H1', '1h'), ('H4', '4h')):
+            closed = frames[timeframe][frames[timeframe].index + pd.Timedelta(period) <= bar_close]
+            assert len(closed) == ctx._instruments['EUR_USD']['timeframes'][timeframe]['bar'][i] + 1
+            if len(closed) < 30:
+                assert timeframe not in context['timeframes']
+                continue
+            assert np.isclose(context['timeframes'][timeframe]['momentum'], (rsi(closed['close'].to_numpy())[-1] - 50) / 50)
+            levels = SupportResistanceEngine().update('X', timeframe, closed)
+            last = closed['close'].iloc[-1]
+            supports += [p for p, t in levels.supports.levels() if t >= 2] + [p for p in psych if 0.9 * last < p < last]
+            resistances += [p for p, t in levels.resistances.levels() if t >= 2] + [p for p in psych if last < p < 1.1 * last]
+        assert 'D1' not in context['timeframes']  # fewer than 30 daily bars
+        assert context['nearest_support'] == max([p for p in supports if p < price], default=None)
+        assert context['nearest_resistance'] == min([p for p in resistances if p > price], default=None)
+
+
+def test_fourteen_days_of_seven_instruments_in_seconds():
+    """Building and reading the context for every bar of a 14-day, 7-instrument run is fast"""
+    instruments = ['EUR_USD', 'GBP_USD', 'USD_JPY', 'AUD_USD', 'USD_CAD', 'NZD_USD', 'XAU_USD']
+    frames = {inst: _frames(seed=k, start_price=[1.1, 1.3, 150.0, 0.65, 1.37, 0.6, 2650.0][k])
+              for k, inst in enumerate(instruments)}
+    index = frames['EUR_USD']['M5'].index
+
+    started = time.perf_counter()
+    ctx = BacktestContext(index, SessionManager(), _news(index))
+    for inst in instruments:
+        ctx.add_instrument(inst, frames[inst])
+    for i in range(len(ctx)):
+        ctx.at(i)
+        for inst in instruments:
+            ctx.price_context(inst, i, frames[inst]['M5']['close'].iat[i])
+    elapsed = time.perf_counter() - started
+    assert elapsed < 10, f"{elapsed:.1f}s"
+    assert ctx.at(len(ctx) - 1)['session_quality'] in (0, 20, 40, 50, 65, 80, 85, 100)
+
+
+if __name__ == '__main__':
+    test_indicators_match_wilder_recursions()
+    test_news_arrays_match_window_scan()
+    test_price_context_uses_only_closed_higher_timeframe_bars()
+    test_fourteen_days_of_seven_instruments_in_seconds()
+    print("✅ All backtest context tests passed!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test Batch Signals
+Verifies the whole-history vectorized signal pass against bar-by-bar generate_signals
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.core.strategy_base import batch_mismatches, generate_signals_batch, replay_signals
+from src.strategies.champion_75wr import UltraSelective75WRChampion
+
+
+def _history(n, seed=11, indicators=True):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2025-01-06', periods=n, freq='5min')
+    # trending stretches so confirmation runs and trend alignment both occur
+    drift = np.repeat(rng.choice([-3e-4, 3e-4], size=n // 60 + 1), 60)[:n]
+    close = 1.10 * np.exp(np.cumsum(drift + rng.normal(0, 4e-4, n)))
+    data = pd.DataFrame({'open': np.r_[close[0], close[:-1]], 'close': close,
+                         'high': close * (1 + rng.uniform(1e-4, 6e-4, n)),
+                         'low': close * (1 - rng.uniform(1e-4, 6e-4, n))}, index=index)
+    if indicators:
+        data['volume'] = rng.integers(50, 400, n).astype(float)
+        data['ema_20'] = data['close'].ewm(span=20, adjust=False).mean()
+        data['ema_50'] = data['close'].ewm(span=50, adjust=False).mean()
+        delta = data['close'].diff()
+        gain = delta.clip(lower=0).rolling(14).mean()
+        loss = (-delta.clip(upper=0)).rolling(14).mean()
+        data['rsi'] = 100 - 100 / (1 + gain / loss)
+        data['macd'] = data['close'].ewm(span=12, adjust=False).mean() - data['close'].ewm(span=26, adjust=False).mean()
+        data['macd_signal'] = data['macd'].ewm(span=9, adjust=False).mean()
+    return data
+
+
+def _champion():
+    strategy = UltraSelective75WRChampion()
+    strategy.confirmation_bars = 5  # four of five moves agreeing is reachable
+    strategy.min_volume_mult = 0.8
+    return strategy
+
+
+def test_batch_matches_bar_by_bar():
+    """Direction, stop, target and confidence agree on every bar"""
+    strategy = _champion()
+    data = _history(1200)
+    assert batch_mismatches(strategy, data, 'EUR_USD') == []
+    signals = strategy.generate_signals_batch(data)
+    assert (signals.signal == 1).any() and (signals.signal == -1).any()
+    assert strategy.daily_trades == 0 and strategy.total_trades == 0
+
+
+def test_batch_matches_without_indicator_columns():
+    """Missing ema/rsi/macd/volume columns take the same fallbacks as the bar path"""
+    strategy = _champion()
+    strategy.signal_strength_min = 0.35
+    data = _history(800, seed=4, indicators=False)
+    assert batch_mismatches(strategy, data, 'GBP_USD') == []
+    assert (strategy.generate_signals_batch(data).signal != 0).any()
+
+
+def test_adx_ignores_index_type():
+    """ADX is positional: a DatetimeIndex no longer misaligns it to zero"""
+    strategy = _champion()
+    data = _history(200)
+    adx = strategy.calculate_adx(data)
+    assert adx > 0
+    assert adx == strategy.calculate_adx(data.reset_index(drop=True))
+
+
+def test_strategies_without_batch_fall_back_and_year_runs_fast():
+    """Non-batch strategies replay bar by bar; a year of M5 runs in well under a second"""
+    class LastBarUp:
+        def generate_signals(self, data, pair):
+            if len(data) > 1 and data['close'].iloc[-1] > data['close'].iloc[-2]:
+                price = data['close'].iloc[-1]
+                return [{'signal': 'BUY', 'sl_price': price - 0.001, 'tp_price': price + 0.002, 'confidence': 0.5}]
+            return []
+
+    data = _history(300, indicators=False)
+    fallback = generate_signals_batch(LastBarUp(), data)
+    assert (fallback.signal == (data['close'].diff() > 0).astype(int).to_numpy()).all()
+    assert fallback.to_frame().index.equals(data.index)
+
+    year = _history(365 * 288, seed=2)
+    strategy = _champion()
+    strategy.generate_signals_batch(year.iloc[:1000])
+    started = time.perf_counter()
+    signals = strategy.generate_signals_batch(year)
+    elapsed = time.perf_counter() - started
+    assert elapsed < 0.5, f"{elapsed:.2f}s"
+    assert len(signals.signal) == len(year)
+
+
+if __name__ == '__main__':
+    test_batch_matches_bar_by_bar()
+    test_batch_matches_without_indicator_columns()
+    test_adx_ignores_index_type()
+    test_strategies_without_batch_fall_back_and_year_runs_fast()
+    print("✅ All batch signal tests passed!")
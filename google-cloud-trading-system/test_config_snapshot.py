@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test immutable, versioned config snapshots in YAMLManager
+Uses a temp directory - no real config files are touched
+"""
+
+import copy
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.core import yaml_manager as yaml_manager_module
+from src.core.yaml_manager import YAMLManager
+
+ACCOUNTS_YAML = """accounts:
+- id: 101-004-TEST-001
+  name: Gold
+  display_name: Gold Momentum
+  strategy: momentum_trading
+  active: true
+  instruments: [XAU_USD]
+strategies: {}
+global_settings: {}
+"""
+
+
+def _manager(tmp):
+    Path(tmp, 'accounts.yaml').write_text(ACCOUNTS_YAML)
+    Path(tmp, 'strategy_config.yaml').write_text('momentum_trading:\n  entry:\n    min_adx: 15\n')
+    mgr = YAMLManager(yaml_file=str(Path(tmp, 'accounts.yaml')))
+    mgr.strategy_config_path = Path(tmp, 'strategy_config.yaml')
+    return mgr
+
+
+def test_reads_share_one_frozen_snapshot_without_parsing():
+    with tempfile.TemporaryDirectory() as tmp:
+        mgr = _manager(tmp)
+        snapshot = mgr.get_snapshot()
+        assert snapshot.version == 1
+
+        original = yaml_manager_module.yaml.safe_load
+        yaml_manager_module.yaml.safe_load = lambda *a, **k: (_ for _ in ()).throw(AssertionError('parsed'))
+        try:
+            assert mgr.get_all_accounts() is mgr.get_all_accounts()
+            assert mgr.get_snapshot() is snapshot
+            assert mgr.read_strategy_config()['momentum_trading']['entry']['min_adx'] == 15
+        finally:
+            yaml_manager_module.yaml.safe_load = original
+
+        account = mgr.get_all_accounts()[0]
+        for mutate in (lambda: account.__setitem__('active', False),
+                       lambda: mgr.get_all_accounts().append({}),
+                       lambda: account['instruments'].append('EUR_USD')):
+            try:
+                mutate()
+                assert False, 'snapshot should be read-only'
+            except TypeError:
+                pass
+
+
+def test_read_config_is_a_mutable_copy():
+    with tempfile.TemporaryDirectory() as tmp:
+        mgr = _manager(tmp)
+        config = mgr.read_config()
+        config['accounts'][0]['active'] = False
+        config['accounts'].append({'id': 'x'})
+        assert type(config['accounts']) is list
+        assert mgr.get_all_accounts()[0]['active'] is True
+        assert type(copy.deepcopy(mgr.get_all_accounts())[0]) is dict
+
+
+def test_new_version_only_when_a_file_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        mgr = _manager(tmp)
+        first = mgr.get_snapshot()
+        assert mgr.refresh() is first
+
+        tmp_path = Path(tmp, 'strategy_config.tmp')
+        tmp_path.write_text('momentum_trading:\n  entry:\n    min_adx: 25\n')
+        os.replace(tmp_path, Path(tmp, 'strategy_config.yaml'))
+        second = mgr.refresh()
+        assert second.version == 2
+        assert second.strategy_section('momentum_trading')['entry']['min_adx'] == 25
+        assert second.accounts_config is first.accounts_config  # unchanged file not re-parsed
+
+        config = mgr.read_config()
+        config['accounts'][0]['active'] = False
+        assert mgr.write_config(config, backup=False)
+        assert mgr.get_snapshot().version == 3
+        assert mgr.get_all_accounts()[0]['active'] is False
+
+
+def test_reads_pick_up_changes_without_a_watcher():
+    with tempfile.TemporaryDirectory() as tmp:
+        mgr = _manager(tmp)
+        first = mgr.get_snapshot()
+        assert mgr._reloader is None
+
+        tmp_path = Path(tmp, 'strategy_config.tmp')
+        tmp_path.write_text('momentum_trading:\n  entry:\n    min_adx: 30\n')
+        os.replace(tmp_path, Path(tmp, 'strategy_config.yaml'))
+        assert mgr.get_snapshot() is first  # within the stat-check interval
+
+        mgr._last_stat_check -= yaml_manager_module.STAT_CHECK_INTERVAL
+        second = mgr.get_snapshot()
+        assert second.version == 2
+        assert second.strategy_section('momentum_trading')['entry']['min_adx'] == 30
+
+
+if __name__ == '__main__':
+    test_reads_share_one_frozen_snapshot_without_parsing()
+    test_read_config_is_a_mutable_copy()
+    test_new_version_only_when_a_file_changes()
+    test_reads_pick_up_changes_without_a_watcher()
+    print("✅ Config snapshot tests passed!")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the config file watcher (inotify and polling backends)
+Uses a temp directory - no real config files are touched
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.core.config_reloader import ConfigReloader
+
+
+def _watch(tmp, use_inotify):
+    path = Path(tmp) / 'strategy_config.yaml'
+    path.write_text('momentum_trading:\n  min_adx: 15\n')
+    reloader = ConfigReloader(debounce_seconds=0.05, poll_interval=0.05)
+    changes = []
+    got = threading.Event()
+
+    def on_change(info):
+        changes.append(info)
+        got.set()
+
+    reloader.register_callback(on_change)
+    reloader.start_watching([path], use_inotify=use_inotify)
+    return reloader, path, changes, got
+
+
+def _atomic_write(path, text):
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)
+
+
+def _check_backend(use_inotify):
+    with tempfile.TemporaryDirectory() as tmp:
+        reloader, path, changes, got = _watch(tmp, use_inotify)
+        try:
+            _atomic_write(path, 'momentum_trading:\n  min_adx: 25\n')
+            assert got.wait(3), 'change not detected'
+            time.sleep(0.3)
+            assert len(changes) == 1
+            assert changes[0]['config'] == {'momentum_trading': {'min_adx': 25}}
+            assert changes[0]['file'] == 'strategy_config.yaml'
+
+            # Unrelated files in the same directory are ignored
+            got.clear()
+            (Path(tmp) / 'other.yaml').write_text('a: 1\n')
+            assert not got.wait(0.3)
+        finally:
+            reloader.stop_watching()
+
+
+def test_inotify_backend_sees_atomic_rename():
+    if not sys.platform.startswith('linux'):
+        return
+    _check_backend(True)
+
+
+def test_polling_fallback_debounces():
+    _check_backend(False)
+
+
+def test_half_written_file_is_not_delivered():
+    with tempfile.TemporaryDirectory() as tmp:
+        reloader, path, changes, got = _watch(tmp, False)
+        try:
+            path.write_text('momentum_trading: [unterminated\n')
+            assert not got.wait(0.4)
+            path.write_text('momentum_trading:\n  min_adx: 30\n')
+            assert got.wait(3)
+            assert changes[-1]['config']['momentum_trading']['min_adx'] == 30
+        finally:
+            reloader.stop_watching()
+
+
+if __name__ == '__main__':
+    test_inotify_backend_sees_atomic_rename()
+    test_polling_fallback_debounces()
+    test_half_written_file_is_not_delivered()
+    print("✅ Config watcher tests passed!")
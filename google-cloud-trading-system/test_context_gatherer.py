@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test Context Gatherer
+Verifies concurrent, deadline-bounded context sources with last-value fallback and cross-request sharing
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.context_gatherer import ContextGatherer, ContextSource, account_ids
+
+
+class SlowSource:
+    """Answers after a delay (or raises), counting calls"""
+
+    def __init__(self, value, delay=0.0, error=None):
+        self.value = value
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.value
+
+
+def test_sources_run_concurrently():
+    """Four 0.2s sources take about 0.2s, not 0.8s"""
+    gatherer = ContextGatherer()
+    sources = {name: ContextSource(SlowSource(name, delay=0.2), deadline=1.0)
+               for name in ('market_data', 'positions', 'system_status', 'news_data')}
+    started = time.perf_counter()
+    context = gatherer.gather(sources)
+    elapsed = time.perf_counter() - started
+    assert context == {name: name for name in sources}
+    assert elapsed < 0.5, f"{elapsed:.2f}s"
+
+
+def test_missed_deadline_uses_last_value():
+    """A slow source answers with its fallback, then its last value, and refreshes in the background"""
+    gatherer = ContextGatherer()
+    news = SlowSource({'sentiment': 'bullish'})
+    fast = ContextSource(SlowSource('ok'), ttl=0)
+    gatherer.gather({'news': ContextSource(news, ttl=0), 'market': fast})
+
+    news.value, news.delay = {'sentiment': 'bearish'}, 0.3
+    started = time.perf_counter()
+    context = gatherer.gather({'news': ContextSource(news, ttl=0, deadline=0.05), 'market': fast})
+    assert time.perf_counter() - started < 0.2
+    assert context == {'news': {'sentiment': 'bullish'}, 'market': 'ok'}
+
+    time.sleep(0.4)  # the late fetch still lands
+    context = gatherer.gather({'news': ContextSource(news, ttl=60, deadline=0.05)})
+    assert context == {'news': {'sentiment': 'bearish'}}
+
+    cold = ContextSource(SlowSource('late', delay=0.3), deadline=0.05, fallback={'error': 'unavailable'})
+    assert gatherer.gather({'cold': cold}) == {'cold': {'error': 'unavailable'}}
+
+
+def test_simultaneous_requests_share_one_fetch():
+    """Ten requests for the same source during one fetch cost a single call"""
+    gatherer = ContextGatherer()
+    positions = SlowSource({'total': 3}, delay=0.1)
+    results = []
+
+    def ask():
+        results.append(gatherer.gather({'positions:001': ContextSource(positions, ttl=0)}))
+
+    threads = [threading.Thread(target=ask) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [{'positions:001': {'total': 3}}] * 10
+    assert positions.calls == 1
+
+    assert gatherer.gather({'positions:001': ContextSource(positions, ttl=60)}) == {'positions:001': {'total': 3}}
+    assert positions.calls == 1  # within the ttl the stored answer is served
+
+
+def test_failing_source_keeps_last_value_and_none_is_omitted():
+    """Errors degrade to the last good value; sources answering None leave no key"""
+    gatherer = ContextGatherer()
+    market = SlowSource({'count': 7})
+    gatherer.gather({'market': ContextSource(market, ttl=0)})
+    market.error = RuntimeError('feed down')
+    context = gatherer.gather({'market': ContextSource(market, ttl=0),
+                               'positions': ContextSource(SlowSource(None))})
+    assert context == {'market': {'count': 7}}
+    assert market.calls == 2
+
+
+def test_account_ids_accept_config_dicts():
+    """Accounts from accounts.yaml (dicts) and plain ids both become id strings for cache keys"""
+    accounts = [{'id': '101-004-30719775-008', 'strategy': 'gold_scalping'}, '101-004-30719775-007',
+                {'account_id': 11}, {'display_name': 'no id'}, None]
+    assert account_ids(accounts) == ['101-004-30719775-008', '101-004-30719775-007', '11']
+    assert account_ids(None) == []
+
+
+if __name__ == '__main__':
+    test_sources_run_concurrently()
+    test_missed_deadline_uses_last_value()
+    test_simultaneous_requests_share_one_fetch()
+    test_failing_source_keeps_last_value_and_none_is_omitted()
+    test_account_ids_accept_config_dicts()
+    print("✅ All context gatherer tests passed!")
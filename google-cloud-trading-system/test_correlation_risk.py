@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test Correlation Risk
+Verifies the incremental correlation matrix against pandas and the RiskManager exposure checks, offline from candles
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.correlation_risk import RollingCorrelation, currency_exposure
+from core.risk_manager import RiskLimits, RiskManager
+
+
+def _candles(n=400, seed=3):
+    """EUR and GBP share a USD factor, USD_JPY moves on its own"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2025-10-01', periods=n, freq='1min')
+    usd = rng.normal(0, 1e-4, n)
+    returns = {
+        'EUR_USD': usd + rng.normal(0, 3e-5, n),
+        'GBP_USD': usd + rng.normal(0, 3e-5, n),
+        'USD_JPY': rng.normal(0, 1e-4, n),
+    }
+    start = {'EUR_USD': 1.10, 'GBP_USD': 1.30, 'USD_JPY': 150.0}
+    return {inst: pd.DataFrame({'close': start[inst] * np.exp(np.cumsum(r))}, index=index)
+            for inst, r in returns.items()}
+
+
+def test_incremental_matrix_matches_pandas():
+    """Running-sum correlations over the window equal a full recompute"""
+    candles = _candles()
+    tracker = RollingCorrelation.from_candles(candles, window=120, min_periods=30)
+    closes = pd.DataFrame({inst: df['close'] for inst, df in candles.items()})
+    returns = np.log(closes / closes.shift(1)).fillna(0.0).iloc[-120:]
+    expected = returns.corr()
+    assert np.allclose(tracker.matrix().loc[expected.index, expected.columns], expected, atol=1e-9)
+    assert tracker.corr('EUR_USD', 'GBP_USD') > 0.8
+    assert abs(tracker.corr('EUR_USD', 'USD_JPY')) < 0.3
+
+
+def test_live_closes_group_into_bars():
+    """Closes from the same bar form one row, committed when the next bar starts"""
+    candles = _candles(n=60)
+    offline = RollingCorrelation.from_candles(candles, window=100, min_periods=10)
+    live = RollingCorrelation(window=100, min_periods=10, instruments=sorted(candles))
+    for ts in candles['EUR_USD'].index:
+        for inst in sorted(candles):
+            live.on_bar_close(inst, candles[inst].loc[ts, 'close'], ts.value + 5_000_000_000)
+    live.on_bar_close('EUR_USD', 1.0, candles['EUR_USD'].index[-1].value + 61_000_000_000)
+    assert live.bars == offline.bars
+    assert np.allclose(live.values, offline.values)
+
+
+def test_correlated_pairs_come_from_data():
+    """Co-movement replaces the static groups once warm; cold start still uses them"""
+    rm = RiskManager(RiskLimits(correlation_min_bars=30))
+    assert rm._count_correlated_pairs('USD_JPY', ['EUR_USD']) == 1      # static USD_PAIRS group
+    rm.load_candles(_candles())
+    rm.sync_positions([{'instrument': 'EUR_USD', 'currentUnits': '100000'}])
+    assert rm._count_correlated_pairs('USD_JPY', ['EUR_USD']) == 0
+    assert rm._count_correlated_pairs('GBP_USD', ['EUR_USD']) == 1
+    assert rm._count_correlated_pairs('GBP_USD', ['EUR_USD', 'USD_JPY']) == 1
+    assert rm.get_correlated_pairs('EUR_USD') == {'GBP_USD'}
+
+
+def test_exposure_lookup_blocks_stacking_not_hedging():
+    """A second long on a correlated pair exceeds the limit; the offsetting short does not"""
+    rm = RiskManager(RiskLimits(correlation_min_bars=30, max_correlated_exposure=15.0,
+                                max_currency_exposure=30.0))
+    rm.load_candles(_candles())
+    rm.sync_positions([{'instrument': 'EUR_USD', 'currentUnits': '100000'}])
+    balance = 10000
+
+    exceeds, reason = rm.would_exceed_correlated_risk('GBP_USD', 50000, balance)
+    assert exceeds and 'Correlated exposure' in reason
+    assert not rm.would_exceed_correlated_risk('GBP_USD', -50000, balance)[0]
+    assert not rm.would_exceed_correlated_risk('USD_JPY', 50000, balance)[0]
+
+    legs = currency_exposure(rm.positions, rm.correlations.last_close)
+    assert legs['EUR'] > 0 and legs['USD'] == -legs['EUR']
+    rm.limits.max_currency_exposure = 12.0
+    exceeds, reason = rm.would_exceed_correlated_risk('USD_JPY', -20000, balance)
+    assert exceeds and reason.startswith('USD exposure')
+
+
+if __name__ == '__main__':
+    test_incremental_matrix_matches_pandas()
+    test_live_closes_group_into_bars()
+    test_correlated_pairs_come_from_data()
+    test_exposure_lookup_blocks_stacking_not_hedging()
+    print("✅ All correlation risk tests passed!")
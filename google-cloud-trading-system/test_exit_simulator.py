@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test Exit Simulator
+Verifies intrabar stop/target resolution, same-bar tie rules, gaps and trailing stops
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.exit_simulator import ExitSimulator, NEAREST_TO_OPEN, TARGET_FIRST
+
+
+def test_intrabar_stop_and_target_use_high_low():
+    """A wick through the level exits even when the close is back inside"""
+    sim = ExitSimulator(['EUR_USD', 'GBP_USD'])
+    long_id = sim.open_position('EUR_USD', 'BUY', 1.1000, stop_loss=1.0950, take_profit=1.1100, bar_index=0)
+    short_id = sim.open_position('GBP_USD', 'SELL', 1.3000, stop_loss=1.3050, take_profit=1.2900, bar_index=0)
+
+    # same bar the positions opened on is never checked
+    assert sim.step([1.2, 1.4], [1.0, 1.2], bar_index=0) == []
+
+    # EUR wicks to the target, GBP wicks to its stop; both close inside the range
+    events = sim.step(high=[1.1105, 1.3060], low=[1.0990, 1.2990], open_=[1.1000, 1.3000], bar_index=1)
+    by_id = {e.position_id: e for e in events}
+    assert by_id[long_id].reason == 'take_profit' and by_id[long_id].exit_price == 1.1100
+    assert by_id[short_id].reason == 'stop_loss' and by_id[short_id].exit_price == 1.3050
+    assert by_id[short_id].price_move < 0
+    assert len(sim) == 0
+
+
+def test_same_bar_tie_rules_and_gaps():
+    """Both levels inside one bar resolve deterministically; gaps fill at the open"""
+    def run(rule, bar_open):
+        sim = ExitSimulator(['EUR_USD'], same_bar_rule=rule)
+        sim.open_position('EUR_USD', 'BUY', 1.1000, stop_loss=1.0990, take_profit=1.1030)
+        return sim.step([1.1040], [1.0980], [bar_open], bar_index=1)[0]
+
+    assert run('stop_first', 1.1000).reason == 'stop_loss'
+    assert run(TARGET_FIRST, 1.1000).reason == 'take_profit'
+    assert run(NEAREST_TO_OPEN, 1.0995).reason == 'stop_loss'
+    assert run(NEAREST_TO_OPEN, 1.1025).reason == 'take_profit'
+
+    gap = run('stop_first', 1.0985)
+    assert gap.reason == 'stop_loss' and gap.exit_price == 1.0985
+
+
+def test_trailing_stop_ratchets_after_each_bar():
+    """The trail follows the best high and is reported as a trailing exit"""
+    sim = ExitSimulator(['XAU_USD'])
+    sim.open_position('XAU_USD', 'BUY', 2000.0, stop_loss=1990.0, trailing_distance=5.0)
+    assert sim.step([2012.0], [2001.0], bar_index=1) == []   # stop moves to 2007
+    assert sim.step([2010.0], [2008.0], bar_index=2) == []
+    event = sim.step([2009.0], [2006.0], bar_index=3)[0]
+    assert event.reason == 'trailing_stop'
+    assert event.exit_price == 2007.0
+    assert event.max_favorable_excursion == 12.0
+
+
+def test_many_positions_in_one_step():
+    """Thousands of open positions resolve in a single vectorized step"""
+    insts = ['EUR_USD', 'GBP_USD', 'USD_JPY']
+    sim = ExitSimulator(insts, capacity=4)
+    rng = np.random.default_rng(0)
+    for k in range(3000):
+        sim.open_position(insts[k % 3], 'BUY', 1.0, stop_loss=1.0 - rng.uniform(0.001, 0.02),
+                          take_profit=1.01, tag=k)
+    events = sim.step(high=[1.005, 1.02, np.nan], low=[0.99, 0.999, np.nan], bar_index=1)
+    reasons = {e.instrument: set() for e in events}
+    for e in events:
+        reasons[e.instrument].add(e.reason)
+    assert reasons['GBP_USD'] == {'take_profit'}
+    assert reasons['EUR_USD'] == {'stop_loss'}
+    assert 'USD_JPY' not in reasons
+    assert len(sim) == 3000 - len(events)
+    remaining = sim.close_all([1.0, 1.0, 1.0], bar_index=2)
+    assert all(e.reason == 'end_of_data' for e in remaining)
+    assert len(sim) == 0
+
+
+def test_closed_slots_are_reused():
+    """Closed positions are swap-removed: storage tracks open trades, ids and tags stay with their trade"""
+    sim = ExitSimulator(['EUR_USD'], capacity=4)
+    closed = []
+    for bar in range(1, 2001):
+        # a long that stops out next bar, and every tenth bar a long that never exits
+        sim.open_position('EUR_USD', 'BUY', 1.0, stop_loss=0.99, bar_index=bar - 1, tag=('quick', bar))
+        if bar % 10 == 0:
+            sim.open_position('EUR_USD', 'BUY', 1.0, stop_loss=0.5, trailing_distance=0.1,
+                              bar_index=bar - 1, tag=('slow', bar))
+        closed.extend(sim.step(high=[1.0], low=[0.98], bar_index=bar))
+
+    assert len(closed) == 2000 and len(sim) == 200
+    assert sim._capacity <= 256  # 2200 positions opened, only the open ones are stored
+    assert [e.tag for e in closed] == [('quick', bar) for bar in range(1, 2001)]
+    assert [e.position_id for e in closed] == sorted(e.position_id for e in closed)
+    remaining = sim.close_all([1.2], bar_index=2001)
+    assert [e.tag for e in remaining] == [('slow', bar) for bar in range(10, 2001, 10)]
+    assert {e.exit_price for e in remaining} == {1.2} and len(sim) == 0
+    assert len({e.position_id for e in closed + remaining}) == 2200
+
+
+if __name__ == '__main__':
+    test_intrabar_stop_and_target_use_high_low()
+    test_same_bar_tie_rules_and_gaps()
+    test_trailing_stop_ratchets_after_each_bar()
+    test_many_positions_in_one_step()
+    test_closed_slots_are_reused()
+    print("✅ All exit simulator tests passed!")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test FTMO Equity Tracking
+Verifies tick-driven mark-to-market equity, drawdown buffers, headroom and day rollover
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.data_feed import MarketData
+from core import ftmo_risk_manager as ftmo_module
+from core.ftmo_risk_manager import FTMORiskManager, attach_ftmo_account
+
+
+def _tick(pair, bid, ask, time_ns=None):
+    return MarketData(pair=pair, bid=bid, ask=ask, time_ns=time_ns)
+
+
+def test_open_losses_count_against_daily_limit():
+    """A floating loss blocks new trades before anything is closed"""
+    rm = FTMORiskManager(initial_balance=100000)
+    rm.track_position('1', 'XAU_USD', 100, 2650.0)
+    rm.track_position('2', 'EUR_USD', -100000, 1.1000)
+
+    rm.on_tick(_tick('XAU_USD', 2620.0, 2620.5))     # long -3000 at the bid
+    rm.on_tick(_tick('EUR_USD', 1.1099, 1.1100))     # short -1000 at the ask
+    assert round(rm.account.current_equity, 2) == 96000.0
+    assert rm.account.current_balance == 100000
+    room = rm.headroom()
+    assert round(room.daily_loss_room, 2) == 1000.0 and round(room.total_loss_room, 2) == 6000.0
+    assert rm.can_trade()[0]
+
+    rm.on_tick(_tick('XAU_USD', 2600.0, 2600.5))
+    assert round(rm.headroom().room, 2) == -1000.0
+    ok, reason = rm.can_trade()
+    assert not ok and 'Daily drawdown' in reason
+
+
+def test_close_releases_open_pnl_and_moves_peak():
+    """Closing converts open P&L to balance; a new peak raises the total-loss floor"""
+    rm = FTMORiskManager(initial_balance=100000)
+    rm.track_position('1', 'EUR_USD', 100000, 1.1000)
+    rm.on_tick(_tick('EUR_USD', 1.1200, 1.1201))
+    assert round(rm.account.open_pnl, 2) == 2000.0
+    assert round(rm.account.daily_high_equity, 2) == 102000.0
+
+    rm.on_tick(_tick('EUR_USD', 1.1150, 1.1151))
+    assert round(rm.headroom().drawdown_from_high * 102000, 2) == 500.0
+    rm.record_trade_exit(1500.0, True, trade_id='1')
+    assert rm.positions == {} and rm.account.open_pnl == 0.0
+    assert rm.account.current_equity == rm.account.current_balance == 101500
+    assert round(rm.headroom().total_loss_room, 2) == round(101500 - 101500 * 0.9, 2)
+
+
+def test_usd_base_pairs_convert_to_dollars():
+    """USD_JPY P&L is converted out of yen"""
+    rm = FTMORiskManager(initial_balance=100000)
+    rm.track_position('1', 'USD_JPY', 100000, 150.00)
+    rm.on_tick(_tick('USD_JPY', 151.50, 151.52))
+    assert round(rm.account.open_pnl, 2) == round(100000 * 1.5 / 151.5, 2)
+
+
+def test_crosses_convert_quote_currency_to_dollars():
+    """EUR_GBP P&L is converted with the GBP_USD rate, and waits for one"""
+    rm = FTMORiskManager(initial_balance=100000)
+    rm.track_position('1', 'EUR_GBP', 100000, 0.8500)
+    rm.on_tick(_tick('EUR_GBP', 0.8600, 0.8601))
+    assert rm.account.open_pnl == 0.0                 # no GBP rate yet: not marked in pounds
+    rm.on_tick(_tick('GBP_USD', 1.2999, 1.3001))
+    rm.on_tick(_tick('EUR_GBP', 0.8600, 0.8601))
+    assert round(rm.account.open_pnl, 2) == 1300.0
+    rm.on_tick(_tick('USD_JPY', 149.99, 150.01))
+    rm.track_position('2', 'GBP_JPY', -10000, 190.00, price=191.50)
+    assert round(rm.positions['2']['pnl'], 2) == -100.0
+
+
+def test_exit_only_releases_the_named_position():
+    """Without a trade_id no live position is guessed at and released"""
+    rm = FTMORiskManager(initial_balance=100000)
+    rm.track_position('1', 'EUR_USD', 100000, 1.1000)
+    rm.track_position('2', 'XAU_USD', 10, 2650.0)
+    rm.on_tick(_tick('EUR_USD', 1.1100, 1.1101))
+    rm.on_tick(_tick('XAU_USD', 2640.0, 2640.5))
+    rm.record_trade_exit(250.0, True)                 # some untracked trade
+    assert sorted(rm.positions) == ['1', '2']
+    assert round(rm.account.current_equity, 2) == round(100000 + 250.0 + 1000.0 - 100.0, 2)
+    rm.record_trade_exit(1000.0, True, trade_id='1')
+    assert list(rm.positions) == ['2']
+    assert round(rm.account.current_equity, 2) == round(101250.0 - 100.0, 2)
+
+
+class _Account:
+    def __init__(self, balance):
+        self.balance = balance
+
+
+class _Client:
+    def __init__(self, balance, trades):
+        self.balance, self.trades = balance, trades
+
+    def get_account_info(self):
+        return _Account(self.balance)
+
+    def get_open_trades(self):
+        return self.trades
+
+
+class _Feed:
+    def __init__(self):
+        self.data_callbacks, self.instruments = [], []
+
+    def add_data_callback(self, callback):
+        self.data_callbacks.append(callback)
+
+    def add_instruments(self, instruments):
+        self.instruments.extend(instruments)
+
+
+def test_live_attach_mirrors_broker_trades_and_balance():
+    """Startup attaches to the FTMO account's feed; closed trades come back through the balance"""
+    client = _Client(100000.0, [{'id': 7, 'instrument': 'EUR_GBP', 'currentUnits': '100000', 'price': '0.8500'}])
+    feeds = type('MultiFeed', (), {'data_feeds': {'006': _Feed(), '011': _Feed()}})()
+    rm = FTMORiskManager(initial_balance=100000)
+    originals = ftmo_module.get_ftmo_risk_manager, os.environ.get('FTMO_ACCOUNT_ID')
+    ftmo_module.get_ftmo_risk_manager = lambda *a, **k: rm
+    import core.oanda_client as oanda_module
+    get_account_client = oanda_module.get_account_client
+    oanda_module.get_account_client = lambda account_id=None, **k: client
+    try:
+        os.environ.pop('FTMO_ACCOUNT_ID', None)
+        assert attach_ftmo_account(feeds) is None
+        os.environ['FTMO_ACCOUNT_ID'] = '011'
+        assert attach_ftmo_account(feeds) is rm
+    finally:
+        ftmo_module.get_ftmo_risk_manager = originals[0]
+        oanda_module.get_account_client = get_account_client
+        os.environ.pop('FTMO_ACCOUNT_ID', None)
+    feed = feeds.data_feeds['011']
+    assert feed.data_callbacks == [rm.on_prices] and feeds.data_feeds['006'].data_callbacks == []
+    assert feed.instruments == ['GBP_USD'] and list(rm.positions) == ['7']
+
+    client.trades.append({'id': 8, 'instrument': 'XAU_USD', 'currentUnits': '10', 'price': '2650.0'})
+    rm.sync_account()
+    rm.on_tick(_tick('GBP_USD', 1.2999, 1.3001))
+    rm.on_tick(_tick('EUR_GBP', 0.8600, 0.8601))
+    rm.on_tick(_tick('XAU_USD', 2640.0, 2640.5))
+
+    # The broker closed trade 7: its P&L is in the balance once, trade 8 keeps its open P&L
+    client.balance, client.trades = 101300.0, client.trades[1:]
+    rm.record_trade_exit(1300.0, True)
+    assert list(rm.positions) == ['8'] and rm.account.current_balance == 101300.0
+    assert round(rm.account.current_equity, 2) == 101200.0
+    assert rm.account.peak_balance == 101300.0 and rm.account.wins == 1
+
+
+def test_new_day_rebases_daily_limit_and_sizing_respects_headroom():
+    """Midnight resets the daily start; position size never risks more than the headroom"""
+    rm = FTMORiskManager(initial_balance=100000)
+    rm.track_position('1', 'XAU_USD', 100, 2650.0)
+    rm.on_tick(_tick('XAU_USD', 2603.0, 2603.5))       # -4700 floating
+    assert rm.calculate_position_size(2650.0, 2640.0) == 30   # $300 of room left, not the usual $500
+    rm.record_trade_exit(-4700.0, False, trade_id='1')
+
+    tomorrow = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+    rm.on_tick(_tick('EUR_USD', 1.1, 1.1001, int((tomorrow.timestamp() + 60) * 1e9)))
+    assert rm.account.daily_start_balance == 95300
+    assert round(rm.headroom().daily_loss_room, 2) == round(95300 * 0.05, 2)
+    assert rm.calculate_position_size(2650.0, 2640.0) == int(95300 * 0.005 / 10)
+
+
+if __name__ == '__main__':
+    test_open_losses_count_against_daily_limit()
+    test_close_releases_open_pnl_and_moves_peak()
+    test_usd_base_pairs_convert_to_dollars()
+    test_crosses_convert_quote_currency_to_dollars()
+    test_exit_only_releases_the_named_position()
+    test_live_attach_mirrors_broker_trades_and_balance()
+    test_new_day_rebases_daily_limit_and_sizing_respects_headroom()
+    print("✅ All FTMO equity tracking tests passed!")
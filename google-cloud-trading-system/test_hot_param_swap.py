@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test in-place strategy parameter swaps
+Runs offline - history top-ups use a stub fetcher instead of OANDA
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.core.hot_params import HotParameterSwapMixin, flatten_strategy_params, merge_older_history
+
+
+class _Strategy:
+    HOT_SWAP_PARAMS = frozenset({'min_adx', 'min_signal_strength', 'momentum_period'})
+
+    def __init__(self):
+        self.instruments = ['XAU_USD']
+        self.min_adx = 15.0
+        self.min_signal_strength = 0.35
+        self.momentum_period = 40
+        self.max_trades_per_day = 15
+        self.stop_loss_pct = 0.004
+        self.price_history = {'XAU_USD': [float(i) for i in range(60)]}
+        self.last_trade_time = datetime(2025, 10, 1, 12, 0)
+
+
+class _Scanner(HotParameterSwapMixin):
+    def __init__(self, strategy):
+        self.strategies = {'Gold Momentum': strategy}
+        self.accounts = {'Gold Momentum': '011'}
+        self.fetches = []
+        self.init_hot_swap({'momentum_trading': _Strategy}, {'Gold Momentum': 'momentum_trading'})
+
+    def _fetch_candles(self, instrument, granularity, count):
+        self.fetches.append((instrument, count))
+        return [_bar(i) for i in range(60 - count, 60)]
+
+
+def _bar(i):
+    return {'timestamp': f'2025-10-01T{i % 24:02d}:00:00.000000000Z', 'open': float(i), 'high': i + 0.5,
+            'low': i - 0.5, 'close': float(i), 'volume': 10}
+
+
+ACCOUNTS = [{'id': '011', 'display_name': 'Gold Momentum', 'strategy': 'momentum_trading', 'active': True}]
+
+
+def test_flatten_drops_structural_keys():
+    flat = flatten_strategy_params({'enabled': True, 'account': '011', 'entry': {'min_adx': 25},
+                                    'risk': {'stop_loss_pct': 0.005}, 'instruments': ['XAU_USD']})
+    assert flat == {'min_adx': 25, 'stop_loss_pct': 0.005}
+
+
+def test_threshold_change_keeps_warm_state_without_network():
+    strategy = _Strategy()
+    history = strategy.price_history['XAU_USD']
+    scanner = _Scanner(strategy)
+    summary = scanner.hot_swap_parameters({'momentum_trading': {'entry': {'min_adx': 25}}}, ACCOUNTS)
+    assert scanner.strategies['Gold Momentum'] is strategy
+    assert strategy.min_adx == 25.0 and isinstance(strategy.min_adx, float)
+    assert strategy.price_history['XAU_USD'] is history
+    assert strategy.last_trade_time == datetime(2025, 10, 1, 12, 0)
+    assert summary['changed'] == {'Gold Momentum': {'min_adx': {'old': 15.0, 'new': 25.0}}}
+    assert scanner.fetches == []
+
+
+def test_longer_lookback_tops_up_older_history_only():
+    strategy = _Strategy()
+    scanner = _Scanner(strategy)
+    summary = scanner.hot_swap_parameters({'momentum_trading': {'momentum_period': 100}}, ACCOUNTS)
+    assert scanner.fetches == [('XAU_USD', 100)]
+    assert strategy.price_history['XAU_USD'] == [float(i) for i in range(-40, 60)]
+    assert summary['history_topped_up'] == ['Gold Momentum:XAU_USD']
+    assert merge_older_history([3.0, 4.0], [_bar(i) for i in range(1, 5)]) == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_top_up_keeps_candle_elements_and_history_cap():
+    strategy = _Strategy()
+    strategy.max_history = 80
+    live = {'timestamp': datetime(2025, 10, 2), 'close': 59.0, 'high': 59.5, 'low': 58.5, 'volume': 1000}
+    strategy.price_history['XAU_USD'] = [dict(live, close=float(i)) for i in range(60)]
+    scanner = _Scanner(strategy)
+    summary = scanner.hot_swap_parameters({'momentum_trading': {'momentum_period': 100}}, ACCOUNTS)
+    history = strategy.price_history['XAU_USD']
+    assert scanner.fetches == [('XAU_USD', 80)]
+    assert len(history) == 80 and [bar['close'] for bar in history] == [float(i) for i in range(-20, 60)]
+    assert all(set(bar) == set(live) and isinstance(bar['timestamp'], datetime) for bar in history)
+    assert summary['history_topped_up'] == ['Gold Momentum:XAU_USD']
+
+    full = _Strategy()
+    full.max_history = 60
+    scanner = _Scanner(full)
+    summary = scanner.hot_swap_parameters({'momentum_trading': {'momentum_period': 100}}, ACCOUNTS)
+    assert scanner.fetches == [] and summary['history_topped_up'] == []
+    assert full.momentum_period == 100 and len(full.price_history['XAU_USD']) == 60
+
+
+def test_parameters_outside_the_whitelist_are_refused():
+    strategy = _Strategy()
+    scanner = _Scanner(strategy)
+    config = {'momentum_trading': {'max_trades_per_day': 999, 'risk': {'stop_loss_pct': 0.005},
+                                   'entry': {'min_signal_strength': 0.5}}}
+    summary = scanner.hot_swap_parameters(config, ACCOUNTS)
+    assert strategy.max_trades_per_day == 15 and strategy.stop_loss_pct == 0.004
+    assert strategy.min_signal_strength == 0.5
+    assert summary['changed'] == {'Gold Momentum': {'min_signal_strength': {'old': 0.35, 'new': 0.5}}}
+    assert summary['refused'] == {'Gold Momentum': {'max_trades_per_day': {'current': 15, 'requested': 999},
+                                                    'stop_loss_pct': {'current': 0.004, 'requested': 0.005}}}
+
+    undeclared = _Strategy()
+    undeclared.HOT_SWAP_PARAMS = frozenset()
+    summary = _Scanner(undeclared).hot_swap_parameters({'momentum_trading': {'min_adx': 25}}, ACCOUNTS)
+    assert undeclared.min_adx == 15.0 and summary['changed'] == {}
+
+
+def test_restart_fails_when_no_scanner_can_hot_swap():
+    from src.core.graceful_restart import GracefulRestartManager
+    manager = GracefulRestartManager.__new__(GracefulRestartManager)
+    manager._live_scanners = lambda: [object()]
+    result = manager.restart_scanner()
+    assert result['success'] is False and result['skipped'] == ['object']
+
+    scanner = _Scanner(_Strategy())
+    manager._live_scanners = lambda: [scanner, object()]
+    scanner.hot_swap_parameters = lambda: {'changed': {}}
+    result = manager.restart_scanner()
+    assert result['success'] is True and result['hot_swaps'] == [{'changed': {}}]
+
+
+def test_deactivated_account_is_dropped():
+    scanner = _Scanner(_Strategy())
+    summary = scanner.hot_swap_parameters({}, [dict(ACCOUNTS[0], active=False)])
+    assert summary['removed'] == ['Gold Momentum']
+    assert scanner.strategies == {} and scanner.accounts == {}
+
+
+if __name__ == '__main__':
+    test_flatten_drops_structural_keys()
+    test_threshold_change_keeps_warm_state_without_network()
+    test_longer_lookback_tops_up_older_history_only()
+    test_top_up_keeps_candle_elements_and_history_cap()
+    test_parameters_outside_the_whitelist_are_refused()
+    test_restart_fails_when_no_scanner_can_hot_swap()
+    test_deactivated_account_is_dropped()
+    print("✅ Hot parameter swap tests passed!")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test Ledger Monte Carlo
+Verifies resampling methods, drawdown/ruin statistics and speed on a synthetic ledger
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.ledger_monte_carlo import TradeLedger, resample_indices, run_ledger_monte_carlo
+
+
+def _synthetic_ledger(n_trades=200, seed=7):
+    rng = np.random.default_rng(seed)
+    balance = 10000.0
+    trades = []
+    for i in range(n_trades):
+        r = 0.03 if rng.random() < 0.55 else -0.02
+        pnl = balance * r
+        balance += pnl
+        trades.append({'pnl': pnl, 'timestamp': i, 'instrument': 'EUR_USD'})
+    return TradeLedger.from_trades(trades, 10000.0), balance
+
+
+def test_ledger_returns_reconstruct_backtest_equity():
+    """Compounding the ledger returns reproduces the backtest's final balance"""
+    ledger, final_balance = _synthetic_ledger()
+    assert np.isclose(10000.0 * np.prod(1 + ledger.returns), final_balance)
+
+
+def test_ledger_is_put_in_exit_order():
+    """Trades assembled per instrument are compounded in the order they closed"""
+    eur = [{'pnl': 100.0, 'timestamp': 1, 'exit_time': 2, 'instrument': 'EUR_USD'},
+           {'pnl': -50.0, 'timestamp': 5, 'exit_time': 9, 'instrument': 'EUR_USD'}]
+    gbp = [{'pnl': 200.0, 'timestamp': 3, 'exit_time': 4, 'instrument': 'GBP_USD'}]
+    ledger = TradeLedger.from_trades(eur + gbp, 1000.0)
+    assert ledger.instruments == ['EUR_USD', 'GBP_USD', 'EUR_USD']
+    assert np.allclose(ledger.pnl, [100.0, 200.0, -50.0])
+    assert np.allclose(ledger.returns, [100 / 1000, 200 / 1100, -50 / 1300])
+    # without exit times the entry timestamp orders them
+    entries = TradeLedger.from_trades([{k: v for k, v in t.items() if k != 'exit_time'} for t in eur + gbp], 1000.0)
+    assert entries.timestamps == [1, 3, 5]
+
+
+def test_shuffle_keeps_final_return_and_seed_is_deterministic():
+    """Reordering trades changes the path but not where it ends"""
+    ledger, final_balance = _synthetic_ledger()
+    paths = run_ledger_monte_carlo(ledger, n_paths=500, method='shuffle', seed=1)
+    expected = (final_balance / 10000.0 - 1) * 100
+    assert np.allclose(paths.final_returns, expected)
+    assert paths.max_drawdowns.std() > 0
+
+    a = run_ledger_monte_carlo(ledger, n_paths=300, method='block_bootstrap', seed=42)
+    b = run_ledger_monte_carlo(ledger, n_paths=300, method='block_bootstrap', seed=42)
+    assert np.array_equal(a.final_returns, b.final_returns)
+
+    idx = resample_indices(10, 4, 10, 'block_bootstrap', np.random.default_rng(0), block_size=3)
+    assert idx.shape == (4, 10)
+    assert all((np.diff(row[:3]) % 10 == 1).all() for row in idx)
+
+
+def test_drawdown_ruin_and_streaks():
+    """All-loss ledger ruins every path at a known trade"""
+    trades, balance = [], 1000.0
+    for _ in range(20):
+        pnl = -balance * 0.1
+        balance += pnl
+        trades.append({'pnl': pnl})
+    ledger = TradeLedger.from_trades(trades, 1000.0)
+    stats = run_ledger_monte_carlo(ledger, n_paths=50, seed=0, ruin_threshold=0.5).summary()
+    assert stats['probability_of_ruin'] == 100.0
+    # 0.9**7 = 0.478 is the first equity below half
+    assert stats['median_trades_to_ruin'] == 7
+    assert stats['max_consecutive_losses'] == 20
+    assert stats['max_consecutive_wins'] == 0
+    assert np.isclose(stats['mean_max_drawdown'], (1 - 0.9 ** 20) * 100)
+
+
+def test_ten_thousand_paths_are_fast():
+    """10k bootstrap paths over a 200-trade ledger stay well under a few seconds"""
+    ledger, _ = _synthetic_ledger()
+    start = time.perf_counter()
+    paths = run_ledger_monte_carlo(ledger, n_paths=10000, method='bootstrap', seed=3)
+    elapsed = time.perf_counter() - start
+    assert len(paths.final_returns) == 10000
+    assert elapsed < 5.0, elapsed
+
+
+if __name__ == '__main__':
+    test_ledger_returns_reconstruct_backtest_equity()
+    test_ledger_is_put_in_exit_order()
+    test_shuffle_keeps_final_return_and_seed_is_deterministic()
+    test_drawdown_ruin_and_streaks()
+    test_ten_thousand_paths_are_fast()
+    print("✅ All ledger Monte Carlo tests passed!")
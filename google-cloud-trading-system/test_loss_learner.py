@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test Loss Learner
+Verifies the append-only event log, windowed counters, restart replay and legacy migration
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.loss_learner import DAY_SECONDS, LossLearner, WindowedCounter
+
+
+def _loss(learner, instrument='EUR_USD', regime='TRENDING', days_ago=0.0, adx=30.0, momentum=0.01):
+    learner.record_loss(instrument, regime, adx, momentum, 1.0, -10.0, {},
+                        timestamp=time.time() - days_ago * DAY_SECONDS)
+
+
+def test_windowed_counter_expires_old_buckets():
+    """Counts cover only the trailing window and drop keys that age out"""
+    counter = WindowedCounter((7, 14), bucket_seconds=60)
+    now = time.time()
+    for days_ago in (10, 6, 1, 1):
+        counter.add('EUR_USD', now - days_ago * DAY_SECONDS)
+    counter.add('XAU_USD', now - 13 * DAY_SECONDS)
+    assert counter.count('EUR_USD', 7, now) == 3
+    assert counter.count('EUR_USD', 14, now) == 4
+    assert counter.counts(7, now) == {'EUR_USD': 3}
+    assert counter.count('EUR_USD', 7, now + 2 * DAY_SECONDS) == 2
+    assert counter.counts(14, now + 2 * DAY_SECONDS) == {'EUR_USD': 4}
+
+
+def test_risk_checks_follow_the_windows():
+    """Instrument/regime cuts and the avoidance list use 7- and 14-day counts"""
+    with tempfile.TemporaryDirectory() as tmp:
+        learner = LossLearner('test', data_dir=tmp)
+        for days_ago in (10, 9, 2, 1):
+            _loss(learner, 'XAU_USD', 'CHOPPY', days_ago)
+        _loss(learner, 'EUR_USD', 'CHOPPY', 0.5)
+        for _ in range(4):
+            learner.record_win('GBP_USD', 25.0)
+
+        assert learner._get_instrument_loss_count('XAU_USD') == 2
+        assert learner._get_regime_loss_count('CHOPPY') == 3
+        assert learner.get_risk_adjustment('EUR_USD', 'TRENDING') == 1.0
+        _loss(learner, 'XAU_USD', 'CHOPPY', 0.1)
+        assert learner.get_risk_adjustment('XAU_USD', 'RANGING') == 0.75
+        assert learner.get_avoidance_list() == [
+            {'type': 'INSTRUMENT', 'value': 'XAU_USD', 'reason': '5 losses in 14 days', 'severity': 'HIGH'},
+            {'type': 'REGIME', 'value': 'CHOPPY', 'reason': '6 losses in 14 days', 'severity': 'MEDIUM'},
+        ]
+        assert learner.is_failure_pattern({'instrument': 'XAU_USD', 'regime': 'CHOPPY',
+                                            'adx': 31.0, 'momentum': 0.011})
+        assert not learner.is_failure_pattern({'instrument': 'EUR_USD', 'regime': 'TRENDING',
+                                                'adx': 60.0, 'momentum': -0.05})
+
+
+def test_restart_replays_log_and_compacts():
+    """Wins and losses survive a restart; an oversized log shrinks to a snapshot plus live losses"""
+    with tempfile.TemporaryDirectory() as tmp:
+        learner = LossLearner('test', data_dir=tmp)
+        for i in range(60):
+            _loss(learner, 'EUR_USD', 'RANGING', days_ago=20.1 - i * 0.2)  # last 29 inside 14 days
+        learner.record_win('EUR_USD', 5.0)
+        _loss(learner, 'EUR_USD', 'RANGING')
+        before = {k: v for k, v in learner.get_performance_summary().items() if k != 'historical_losses_tracked'}
+
+        with open(learner.events_file) as f:
+            assert sum(1 for _ in f) == 62  # appended, never rewritten
+
+        defaults = LossLearner.COMPACT_EVENTS, LossLearner.MAX_LOSSES
+        LossLearner.COMPACT_EVENTS, LossLearner.MAX_LOSSES = 50, 10
+        try:
+            restarted = LossLearner('test', data_dir=tmp)
+        finally:
+            LossLearner.COMPACT_EVENTS, LossLearner.MAX_LOSSES = defaults
+        assert restarted.recent_performance['consecutive_losses'] == 1
+        assert restarted._get_instrument_loss_count('EUR_USD', days=14) == 30
+
+        with open(restarted.events_file) as f:
+            events = [json.loads(line) for line in f]
+        assert events[0]['type'] == 'SNAPSHOT' and len(events) == 1 + 30
+
+        again = LossLearner('test', data_dir=tmp)
+        summary = again.get_performance_summary()
+        assert summary.pop('historical_losses_tracked') == 30
+        assert summary == before
+        assert again._get_instrument_loss_count('EUR_USD', days=14) == 30
+
+
+def test_running_learner_compacts_when_appending():
+    """A long-running learner rewrites its log once it outgrows COMPACT_EVENTS, keeping its state"""
+    with tempfile.TemporaryDirectory() as tmp:
+        defaults = LossLearner.COMPACT_EVENTS, LossLearner.MAX_LOSSES
+        LossLearner.COMPACT_EVENTS, LossLearner.MAX_LOSSES = 50, 10
+        try:
+            learner = LossLearner('test', data_dir=tmp)
+            for i in range(60):
+                _loss(learner, 'EUR_USD', 'RANGING', days_ago=20.1 - i * 0.2)
+            learner.record_win('EUR_USD', 5.0)
+            summary = learner.get_performance_summary()
+        finally:
+            LossLearner.COMPACT_EVENTS, LossLearner.MAX_LOSSES = defaults
+
+        with open(learner.events_file) as f:
+            events = [json.loads(line) for line in f]
+        assert events[0]['type'] == 'SNAPSHOT' and len(events) < 50
+        assert summary['total_losses'] == 60 and summary['total_wins'] == 1
+
+        restarted = LossLearner('test', data_dir=tmp)
+        assert restarted.get_performance_summary()['total_losses'] == 60
+        assert restarted._get_instrument_loss_count('EUR_USD', days=14) == 29
+
+
+def test_legacy_json_history_is_migrated():
+    """An old *_losses.json list is converted to epoch-stamped events once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = [{'timestamp': (datetime.now() - timedelta(days=d)).isoformat(), 'instrument': 'GBP_USD',
+                   'regime': 'TRENDING', 'adx': 25.0, 'momentum': 0.002, 'volume': 1.0, 'pnl': -5.0,
+                   'conditions': {}} for d in (20, 3, 2)]
+        with open(os.path.join(tmp, 'test_losses.json'), 'w') as f:
+            json.dump(legacy, f)
+
+        learner = LossLearner('test', data_dir=tmp)
+        assert len(learner.loss_history) == 3
+        assert learner._get_instrument_loss_count('GBP_USD') == 2
+        assert isinstance(learner.loss_history[-1]['ts'], float)
+        assert os.path.exists(learner.events_file)
+
+
+if __name__ == '__main__':
+    test_windowed_counter_expires_old_buckets()
+    test_risk_checks_follow_the_windows()
+    test_restart_replays_log_and_compacts()
+    test_running_learner_compacts_when_appending()
+    test_legacy_json_history_is_migrated()
+    print("✅ All loss learner tests passed!")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test compact MarketData ticks and TickBatch
+Runs offline - no OANDA credentials required
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.core.data_feed import MarketData, TickBatch, market_data_to_dict
+
+
+def test_positional_constructor_compat():
+    """Old dataclass positional order still works and timestamp stays a string"""
+    md = MarketData('EUR_USD', 1.1000, 1.1002, '2025-09-15T14:14:27.714891445Z',
+                    True, 'OANDA', 0.0002, 0)
+    assert md.pair == 'EUR_USD'
+    assert md.instrument == 'EUR_USD'
+    assert md.timestamp == '2025-09-15T14:14:27.714891445Z'
+    assert md.time_ns == 1757945667714891445
+    assert md.regime == 'unknown'
+    assert not hasattr(md, '__dict__')
+
+
+def test_instrument_alias_and_default_spread():
+    md = MarketData(instrument='XAU_USD', bid=2650.0, ask=2650.5, timestamp='2025-09-15T14:14:27Z')
+    assert md.pair == 'XAU_USD'
+    assert abs(md.spread - 0.5) < 1e-9
+
+
+def test_time_ns_formats_lazily():
+    md = MarketData('GBP_USD', 1.25, 1.2502, time_ns=1757945667714891445)
+    assert md.timestamp == '2025-09-15T14:14:27.714891+00:00'
+    md.timestamp = '2025-09-15T14:14:28Z'
+    assert md.time_ns == 1757945668000000000
+
+
+def test_move_to_reprices_a_tick_in_place():
+    """Bulk replays reuse one tick per instrument; the new time replaces the old string"""
+    md = MarketData('EUR_USD', 1.1000, 1.1002, '2025-09-15T14:14:27Z', is_live=False)
+    md.timestamp  # cache the formatted string
+    md.move_to(1.1010, 1.1011, 1757945700000000000)
+    assert (md.bid, md.ask) == (1.1010, 1.1011) and abs(md.spread - 0.0001) < 1e-12
+    assert md.timestamp == '2025-09-15T14:15:00+00:00'
+    md.move_to(1.1020, 1.1021, 1757946000000000000, '2025-09-15T14:20:00.000000000Z')
+    assert md.timestamp == '2025-09-15T14:20:00.000000000Z' and md.is_live is False
+
+
+def test_tick_batch_from_candles():
+    candles = [
+        {'time': '2025-09-15T14:14:00.000000000Z', 'complete': True,
+         'bid': {'c': '1.1000'}, 'ask': {'c': '1.1002'}},
+        {'time': '2025-09-15T14:15:00.000000000Z', 'complete': True,
+         'mid': {'c': '1.1001'}},
+        {'time': '2025-09-15T14:16:00.000000000Z', 'complete': False,
+         'mid': {'c': '1.1003'}},
+    ]
+    batch = TickBatch.from_candles('EUR_USD', candles)
+    assert len(batch) == 2
+    assert batch.times[1] - batch.times[0] == 60 * 1_000_000_000
+    assert batch[-1].bid == batch[-1].ask == 1.1001
+    assert [t.time_ns for t in batch] == list(batch.times)
+
+
+def test_tick_batch_grows():
+    batch = TickBatch('EUR_USD', capacity=2)
+    for i in range(10):
+        batch.append(i, 1.0 + i, 1.1 + i)
+    assert len(batch) == 10
+    assert batch.bids[-1] == 10.0
+    assert TickBatch.from_ticks(batch.to_market_data()).times.tolist() == list(range(10))
+
+
+def test_scanner_backfill_reads_bid_ask_candles():
+    """Startup backfill parses each instrument's candles once (get_candles defaults to bid/ask)"""
+    from types import SimpleNamespace
+    from src.core.simple_timer_scanner import SimpleTimerScanner
+
+    candles = [{'time': f'2025-09-15T14:{m:02d}:00.000000000Z', 'complete': m < 3,
+                'bid': {'c': f'{1.1000 + m * 0.001:.4f}'}, 'ask': {'c': f'{1.1002 + m * 0.001:.4f}'}}
+               for m in range(4)]
+    fetched = []
+
+    def get_candles(instrument, count, granularity):
+        fetched.append(instrument)
+        return {'candles': candles}
+
+    scanner = SimpleTimerScanner.__new__(SimpleTimerScanner)  # no accounts or OANDA needed
+    scanner.oanda = SimpleNamespace(get_candles=get_candles)
+    scanner.strategies = {'a': SimpleNamespace(instruments=['EUR_USD'], price_history={'EUR_USD': [1.0]}),
+                          'b': SimpleNamespace(instruments=['EUR_USD'])}
+    scanner._backfill_all_strategies()
+
+    assert fetched == ['EUR_USD']
+    assert scanner.strategies['a'].price_history['EUR_USD'] == [1.0, 1.1001, 1.1011, 1.1021]
+    assert scanner.strategies['b'].price_history['EUR_USD'] == [1.1001, 1.1011, 1.1021]
+
+
+def test_market_data_to_dict_is_json_ready():
+    """Slotted ticks serialize through to_dict with the old dataclass fields"""
+    market = {'EUR_USD': MarketData('EUR_USD', 1.1000, 1.1002, '2025-09-15T14:14:27Z')}
+    payload = json.loads(json.dumps(market_data_to_dict(market)))
+    assert payload['EUR_USD']['bid'] == 1.1
+    assert payload['EUR_USD']['timestamp'] == '2025-09-15T14:14:27Z'
+    assert market_data_to_dict({'XAU_USD': {'bid': 1}}) == {'XAU_USD': {'bid': 1}}
+
+
+def test_dashboard_system_status_round_trips_json():
+    """get_system_status() with live MarketData survives json.dumps (what jsonify and socketio emit do)"""
+    from src.core.session_manager import SessionManager
+    from src.dashboard.advanced_dashboard import AdvancedDashboardManager
+
+    class Feed:
+        def get_latest_data(self, account_id):
+            return {'EUR_USD': MarketData('EUR_USD', 1.1000, 1.1002, '2025-09-15T14:14:27Z')}
+
+    class Accounts:
+        def get_account_status(self, account_id):
+            return {'balance': 100000.0}
+
+    class Orders:
+        def get_trading_metrics(self, account_id):
+            return {'total_trades': 4, 'winning_trades': 3}
+
+    manager = AdvancedDashboardManager.__new__(AdvancedDashboardManager)
+    manager._cache, manager._ttl = {}, {}
+    manager._initialized, manager.use_live_data = True, True
+    manager.last_update = datetime.now()
+    manager._data_feed, manager._account_manager, manager._order_manager = Feed(), Accounts(), Orders()
+    manager._session_manager = SessionManager()
+    manager._active_accounts = ['001']
+    manager._trading_systems = {'001': {'strategy_name': 'momentum'}}
+
+    status = json.loads(json.dumps(manager.get_system_status()))
+    assert status['system_status'] == 'online'
+    assert status['market_data']['001']['EUR_USD']['ask'] == 1.1002
+    assert isinstance(status['session_context']['active_sessions'], list)
+
+
+if __name__ == '__main__':
+    test_positional_constructor_compat()
+    test_instrument_alias_and_default_spread()
+    test_time_ns_formats_lazily()
+    test_move_to_reprices_a_tick_in_place()
+    test_tick_batch_from_candles()
+    test_tick_batch_grows()
+    test_scanner_backfill_reads_bid_ask_candles()
+    test_market_data_to_dict_is_json_ready()
+    test_dashboard_system_status_round_trips_json()
+    print("✅ MarketData tick tests passed!")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test OANDA Client Registry
+Verifies long-lived per-account clients sharing one pool, rate limiter, price cache and upstream reads
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.oanda_client import OandaClient, get_account_client
+
+
+class RecordingSession:
+    """Answers OANDA endpoints from canned bodies and records every request"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, json=None, timeout=None):
+        with self._lock:
+            self.requests.append((method, url, time.monotonic()))
+        time.sleep(self.delay)
+        return RecordingResponse(self._body(url))
+
+    def _body(self, url):
+        if '/pricing' in url:
+            stamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000000000Z')
+            return {'prices': [{'instrument': 'EUR_USD', 'bids': [{'price': '1.1000'}],
+                                'asks': [{'price': '1.1002'}], 'time': stamp}]}
+        if url.endswith('/trades?state=OPEN'):
+            return {'trades': [{'id': '1', 'instrument': 'EUR_USD', 'currentUnits': '1000'}]}
+        if url.endswith('/close'):
+            return {'orderFillTransaction': {'id': '2'}}
+        account_id = url.rsplit('/', 1)[-1]
+        return {'account': {'id': account_id, 'currency': 'USD', 'balance': '100000'}}
+
+    def count(self, fragment):
+        return sum(1 for _, url, _ in self.requests if fragment in url)
+
+
+class RecordingResponse:
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+def _record(client, delay=0.0):
+    client.transport.session = RecordingSession(delay)
+    return client.transport.session
+
+
+def test_registry_hands_out_long_lived_shared_clients():
+    """Same account -> same client; accounts on one login share pool, limiter and prices"""
+    first = get_account_client('001-A', api_key='key-registry', environment='practice')
+    assert get_account_client('001-A', api_key='key-registry', environment='practice') is first
+    other = get_account_client('001-B', api_key='key-registry', environment='practice')
+    assert other is not first
+    assert other.transport is first.transport
+    assert other.current_prices is first.current_prices
+    assert get_account_client('001-A', api_key='key-other', environment='practice').transport is not first.transport
+    assert OandaClient('key-registry', '001-A', 'practice').transport is not first.transport
+
+
+def test_concurrent_pollers_share_one_upstream_read():
+    """Ten daemons polling the same account cost one call per endpoint"""
+    session = _record(get_account_client('002-A', api_key='key-pollers'), delay=0.05)
+    results = []
+
+    def poll():
+        client = get_account_client('002-A', api_key='key-pollers')
+        results.append((client.get_account_info().balance, len(client.get_open_trades())))
+
+    threads = [threading.Thread(target=poll) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [(100000.0, 1)] * 10
+    assert session.count('/trades?state=OPEN') == 1
+    assert len(session.requests) == 2
+
+
+def test_prices_fetched_for_one_account_serve_another():
+    """A fresh quote from one account's client is a cache hit for the next account"""
+    session = _record(get_account_client('003-A', api_key='key-prices'))
+    get_account_client('003-A', api_key='key-prices').get_current_prices(['EUR_USD'], force_refresh=True)
+    prices = get_account_client('003-B', api_key='key-prices').get_current_prices(['EUR_USD'])
+    assert prices['EUR_USD'].bid == 1.1
+    assert session.count('/pricing') == 1
+
+
+def test_account_reads_are_never_stale_and_writes_detach_inflight_reads():
+    """Back-to-back reads go upstream; a read started before a write is not joined after it"""
+    client = get_account_client('004-A', api_key='key-writes')
+    session = _record(client)
+    client.transport.min_request_interval = 0.0
+    client.get_open_trades()
+    client.get_open_trades()
+    assert session.count('004-A/trades?state=OPEN') == 2
+
+    session.delay = 0.1
+    reader = threading.Thread(target=client.get_open_trades)
+    reader.start()
+    time.sleep(0.03)
+    session.delay = 0.0
+    client.close_trade('1')
+    client.get_open_trades()  # must not wait for the pre-write read
+    reader.join()
+    trades = [t for method, url, t in session.requests if url.endswith('004-A/trades?state=OPEN')]
+    assert len(trades) == 4
+
+
+def test_rate_limit_spaces_each_account_without_serializing_accounts():
+    """One account's requests keep their spacing; another account does not queue behind them"""
+    first = get_account_client('005-A', api_key='key-limits')
+    session = _record(first)
+    first.transport.min_request_interval = 0.1
+    second = get_account_client('005-B', api_key='key-limits')
+    started = time.monotonic()
+    threads = [threading.Thread(target=call) for call in (first.get_account_info, first.get_open_trades,
+                                                          second.get_account_info)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+    stamps = {account: [t - started for _, url, t in session.requests if f'/{account}' in url]
+              for account in ('005-A', '005-B')}
+    assert len(stamps['005-A']) == 2 and stamps['005-A'][1] - stamps['005-A'][0] >= 0.095
+    assert stamps['005-B'][0] < 0.05
+
+
+if __name__ == '__main__':
+    test_registry_hands_out_long_lived_shared_clients()
+    test_concurrent_pollers_share_one_upstream_read()
+    test_prices_fetched_for_one_account_serve_another()
+    test_account_reads_are_never_stale_and_writes_detach_inflight_reads()
+    test_rate_limit_spaces_each_account_without_serializing_accounts()
+    print("✅ All OANDA client registry tests passed!")
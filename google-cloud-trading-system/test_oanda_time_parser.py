@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test OANDA timestamp parsing
+Checks the fast ns parser against datetime for OANDA's RFC3339 format
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.core.oanda_client import OandaClient, parse_oanda_time_ns, parse_oanda_times_ns
+
+SAMPLES = [
+    '2025-09-15T14:14:27.714891445Z',
+    '2024-02-29T23:59:59.999999999Z',
+    '2000-01-01T00:00:00.000000000Z',
+    '1999-12-31T12:30:00.000000001Z',
+]
+
+
+def _expected_ns(ts: str) -> int:
+    dt = datetime.strptime(ts[:19], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+    return int(dt.timestamp()) * 1_000_000_000 + int(ts[20:29])
+
+
+def test_fast_path_matches_datetime():
+    for ts in SAMPLES:
+        assert parse_oanda_time_ns(ts) == _expected_ns(ts)
+
+
+def test_vectorized_matches_scalar():
+    assert parse_oanda_times_ns(SAMPLES).tolist() == [parse_oanda_time_ns(t) for t in SAMPLES]
+    mixed = SAMPLES + ['2025-09-15T14:14:27Z']
+    assert parse_oanda_times_ns(mixed)[-1] == 1757945667 * 1_000_000_000
+
+
+def test_fallback_formats():
+    assert parse_oanda_time_ns('2025-09-15T14:14:27.5Z') == 1757945667_500_000_000
+    assert parse_oanda_time_ns('2025-09-15T15:14:27+01:00') == 1757945667_000_000_000
+    assert parse_oanda_time_ns('1757945667.714891445') == 1757945667_714_891_445
+
+
+def test_parse_oanda_time_returns_aware_datetime():
+    dt = OandaClient._parse_oanda_time(SAMPLES[0])
+    assert dt == datetime(2025, 9, 15, 14, 14, 27, 714891, tzinfo=timezone.utc)
+
+
+if __name__ == '__main__':
+    test_fast_path_matches_datetime()
+    test_vectorized_matches_scalar()
+    test_fallback_formats()
+    test_parse_oanda_time_returns_aware_datetime()
+    print("✅ OANDA time parser tests passed!")
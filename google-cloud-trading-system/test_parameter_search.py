@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test Parameter Search
+Verifies adaptive searches match the grid at a fraction of the evaluations, deterministically
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.parameter_search import GridSearch, Hyperband, SearchSpace, SuccessiveHalving, TPESearch, get_search
+
+RANGES = {'stop_loss_atr': (1.0, 4.0), 'take_profit_atr': (2.0, 10.0)}
+
+
+def _sharpe_surface(params, budget):
+    """Smooth, correlated 'Sharpe' ridge; short budgets see it through extra noise"""
+    sl, tp = params['stop_loss_atr'], params['take_profit_atr']
+    ridge = 1.5 - 0.6 * (sl - 2.68) ** 2 - 0.08 * (tp - 2.2 * sl) ** 2
+    noise = np.sin(37 * sl + 11 * tp) * 0.05 * (1.0 - budget)
+    return ridge + noise
+
+
+def test_space_grid_and_decode():
+    """Grid enumerates every choice; ints stay ints; numeric grids are ordinal"""
+    space = SearchSpace({'period': (10, 30), 'mode': ['fast', 'slow'], 'adx': [10, 20, 30]})
+    grid = space.grid(points=3)
+    assert len(grid) == 3 * 2 * 3
+    assert {g['period'] for g in grid} == {10, 20, 30}
+    assert space.is_categorical('mode') and not space.is_categorical('adx')
+    assert space.decode(np.array([1.0, 0.0, 0.99])) == {'period': 30, 'mode': 'fast', 'adx': 30}
+
+
+def test_tpe_matches_grid_with_a_tenth_of_evaluations():
+    """TPE with <=10% of the grid's backtests gets within 0.01 Sharpe and beats an equal-cost grid"""
+    space = SearchSpace(RANGES)
+    grid = GridSearch(points=18).run(space, _sharpe_surface)
+    small_grid = GridSearch(points=6).run(space, _sharpe_surface)
+    assert grid.evaluations == 324
+
+    scores = []
+    for seed in range(5):
+        tpe = TPESearch(n_trials=32).run(space, _sharpe_surface, seed=seed)
+        assert tpe.evaluations <= grid.evaluations // 10
+        scores.append(tpe.best_score)
+    assert np.mean(scores) >= grid.best_score - 0.01
+    assert min(scores) > small_grid.best_score
+
+
+def test_same_seed_same_result():
+    """Every stochastic search is reproducible under a fixed seed"""
+    space = SearchSpace(RANGES)
+    for method in ('random', 'tpe', 'successive_halving', 'hyperband'):
+        a = get_search(method).run(space, _sharpe_surface, seed=7)
+        b = get_search(method).run(space, _sharpe_surface, seed=7)
+        assert a.best_params == b.best_params and a.best_score == b.best_score
+        assert [h['params'] for h in a.history] == [h['params'] for h in b.history]
+
+
+def test_budgeted_searches_spend_less_than_grid():
+    """Successive halving / Hyperband screen on short data and only promote survivors"""
+    space = SearchSpace(RANGES)
+    grid = GridSearch(points=18).run(space, _sharpe_surface)
+    halving = SuccessiveHalving(n_candidates=81, eta=3).run(space, _sharpe_surface, seed=1)
+    hyperband = Hyperband().run(space, _sharpe_surface, seed=1)
+
+    for result in (halving, hyperband):
+        assert result.budget_used < grid.budget_used / 10
+        assert all(h['budget'] >= 1.0 for h in result.top(3))
+        assert result.best_score > grid.best_score - 0.2
+
+
+if __name__ == '__main__':
+    test_space_grid_and_decode()
+    test_tpe_matches_grid_with_a_tenth_of_evaluations()
+    test_same_seed_same_result()
+    test_budgeted_searches_spend_less_than_grid()
+    print("✅ All parameter search tests passed!")
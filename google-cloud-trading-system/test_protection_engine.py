@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test Profit Protection Engine
+Replays recorded tick files through the engine - no OANDA credentials required
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.profit_protector import ProfitProtector
+from core import protection_engine as protection_engine_module
+from core.data_feed import MarketData
+from core.protection_engine import ProtectionEngine, load_tick_file, protect_accounts
+
+
+class RecordingClient:
+    """Captures stop modifications instead of sending them"""
+
+    def __init__(self, fail_first: int = 0):
+        self.calls = []
+        self.fail_first = fail_first
+
+    def update_trade_protective_orders(self, trade_id, stop_loss=None, take_profit=None):
+        if self.fail_first:
+            self.fail_first -= 1
+            raise ConnectionError("503 from OANDA")
+        self.calls.append((trade_id, stop_loss))
+        return {}
+
+
+def _protector():
+    return ProfitProtector({'breakeven_at': 0.005, 'trail_at': 0.015, 'trail_distance': 0.008})
+
+
+def _write_stream(path, rows):
+    """OANDA pricing-stream style recording, with heartbeats mixed in"""
+    with open(path, 'w') as f:
+        for second, instrument, bid, ask in rows:
+            f.write(json.dumps({'type': 'HEARTBEAT', 'time': f'2025-10-20T10:00:{second:02d}.000000000Z'}) + '\n')
+            f.write(json.dumps({'type': 'PRICE', 'instrument': instrument,
+                                'time': f'2025-10-20T10:00:{second:02d}.000000000Z',
+                                'bids': [{'price': str(bid)}], 'asks': [{'price': str(ask)}]}) + '\n')
+
+
+def test_breakeven_then_trailing_from_recorded_stream():
+    """Long trade: breakeven at +0.5%, then trails 0.8% under the peak; other pairs ignored"""
+    client = RecordingClient()
+    engine = ProtectionEngine(client=client, protector=_protector(), min_update_seconds=0)
+    engine.track('42', 'EUR_USD', 'BUY', entry_price=1.1000, stop_loss=1.0912, units=10000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ticks.jsonl')
+        _write_stream(path, [
+            (0, 'EUR_USD', 1.1010, 1.1011),
+            (1, 'GBP_USD', 1.5000, 1.5001),   # no EUR move here
+            (2, 'EUR_USD', 1.1060, 1.1061),   # +0.55% -> breakeven
+            (3, 'EUR_USD', 1.1200, 1.1201),   # +1.8%  -> trail to 1.11104
+            (4, 'EUR_USD', 1.12005, 1.12015), # trail moves 0.5 pip -> not worth a call
+            (5, 'EUR_USD', 1.1150, 1.1151),   # pullback never loosens the stop
+        ])
+        updates = engine.replay(load_tick_file(path))
+
+    assert client.calls == [('42', 1.1), ('42', 1.11104)]
+    assert [u.new_stop for u in updates] == [1.1, 1.11104]
+    assert all(u.pushed for u in updates)
+    assert engine.positions['42']['stop_loss'] == 1.11104
+    assert engine.positions['42']['peak_price'] == 1.12005
+
+
+def test_sync_short_trade_marks_at_ask_and_keeps_peak():
+    """Trades come from OANDA dicts; shorts use the ask; re-sync keeps the in-memory peak"""
+    engine = ProtectionEngine(client=None, protector=_protector(), min_update_seconds=0)
+    trade = {'id': '7', 'instrument': 'XAU_USD', 'price': '2650.00', 'currentUnits': '-10',
+             'stopLossOrder': {'price': '2670.00'}}
+    engine.sync_trades([trade, {'id': '8', 'instrument': 'EUR_USD', 'price': '1.1', 'currentUnits': '1'}])
+    assert list(engine.positions) == ['7']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ticks.csv')
+        with open(path, 'w') as f:
+            f.write("time,instrument,bid,ask\n")
+            f.write("2025-10-20T10:00:00Z,XAU_USD,2609.00,2609.50\n")   # ask -1.53%: breakeven...
+            f.write("2025-10-20T10:00:01Z,XAU_USD,2609.00,2609.50\n")   # ...then trail above the low
+        updates = engine.replay(load_tick_file(path))
+
+    assert not any(u.pushed for u in updates)  # dry run: decided, not sent
+    assert [u.new_stop for u in updates] == [2650.0, round(2609.50 * 1.008, 2)]
+    engine.sync_trades([dict(trade, stopLossOrder={'price': str(updates[-1].new_stop)})])
+    assert engine.positions['7']['peak_price'] == 2609.50
+    assert engine.positions['7']['stop_loss'] == updates[-1].new_stop
+
+
+def test_failed_push_is_retried_after_the_interval():
+    """A rejected modification is retried on a later tick, not on every tick"""
+    client = RecordingClient(fail_first=1)
+    engine = ProtectionEngine(client=client, protector=_protector(), min_update_seconds=5)
+    engine.track('1', 'EUR_USD', 'BUY', entry_price=1.1000, stop_loss=1.0900)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ticks.jsonl')
+        _write_stream(path, [(s, 'EUR_USD', 1.1060, 1.1061) for s in (10, 11, 12, 16)])
+        updates = engine.replay(load_tick_file(path))
+
+    assert [u.error is not None for u in updates] == [True, False]
+    assert client.calls == [('1', 1.1)]
+
+
+class BlockingClient(RecordingClient):
+    """Holds every modification until released, like a slow OANDA request"""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def update_trade_protective_orders(self, trade_id, stop_loss=None, take_profit=None):
+        self.entered.set()
+        self.release.wait(5)
+        return super().update_trade_protective_orders(trade_id, stop_loss)
+
+
+def test_feed_callback_never_waits_on_the_broker():
+    """Decisions return at once; stops queued behind a slow call collapse to the latest one"""
+    client = BlockingClient()
+    engine = ProtectionEngine(client=client, protector=_protector(), min_update_seconds=0)
+    engine._last_sync = time.time()  # no trade refresh in this test
+    engine.track('42', 'EUR_USD', 'BUY', entry_price=1.1000, stop_loss=1.0912, units=10000)
+
+    def tick(bid):
+        engine.on_prices({'EUR_USD': MarketData(pair='EUR_USD', bid=bid, ask=bid + 0.0001,
+                                                timestamp='2025-10-20T10:00:00Z')})
+
+    started = time.monotonic()
+    tick(1.1060)
+    assert client.entered.wait(5)  # breakeven push is now stuck in the broker call
+    for bid in (1.1200, 1.1300, 1.1400):
+        tick(bid)
+    assert time.monotonic() - started < 1.0
+    assert client.calls == []
+    assert engine.positions['42']['stop_loss'] == 1.13088  # decided, waiting for the broker
+
+    client.release.set()
+    engine.flush()
+    # the breakeven call was already in flight; the three trails behind it went out as one
+    assert client.calls == [('42', 1.1), ('42', 1.13088)]
+    assert [u.error for u in engine.updates] == [None, 'superseded', 'superseded', None]
+
+
+class _Feed:
+    """LiveDataFeed stand-in that records its callbacks"""
+
+    def __init__(self):
+        self.data_callbacks = []
+
+    def add_data_callback(self, callback):
+        self.data_callbacks.append(callback)
+
+
+class _MultiFeed:
+    def __init__(self, account_ids):
+        self.data_feeds = {account_id: _Feed() for account_id in account_ids}
+
+
+def test_startup_attaches_one_engine_per_account_feed():
+    """Each account feed drives its own engine once; nothing attaches while trading is disabled"""
+    engines = {account_id: ProtectionEngine(protector=_protector()) for account_id in ('006', '011')}
+    original = protection_engine_module.get_protection_engine
+    protection_engine_module.get_protection_engine = lambda account_id=None: engines[account_id]
+    try:
+        feed = _MultiFeed(['006', '011'])
+        os.environ['TRADING_DISABLED'] = 'true'
+        assert protect_accounts(feed) == {}
+        os.environ['TRADING_DISABLED'] = 'false'
+        assert protect_accounts(feed) == engines
+        protect_accounts(feed)
+    finally:
+        protection_engine_module.get_protection_engine = original
+        os.environ.pop('TRADING_DISABLED', None)
+    for account_id, account_feed in feed.data_feeds.items():
+        assert account_feed.data_callbacks == [engines[account_id].on_prices]
+
+
+if __name__ == '__main__':
+    test_breakeven_then_trailing_from_recorded_stream()
+    test_sync_short_trade_marks_at_ask_and_keeps_peak()
+    test_failed_push_is_retried_after_the_interval()
+    test_feed_callback_never_waits_on_the_broker()
+    test_startup_attaches_one_engine_per_account_feed()
+    print("✅ All protection engine tests passed!")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test batch quality scoring
+Checks the vectorized batch path against per-signal score_trade_quality
+"""
+
+import os
+import sys
+import random
+from datetime import datetime
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.core.quality_scoring import get_quality_scoring, market_indicators
+
+
+def _random_signal(rng: random.Random):
+    instrument = rng.choice(['EUR_USD', 'GBP_USD', 'XAU_USD', 'USD_CAD'])
+    side = rng.choice(['BUY', 'SELL'])
+    market_data = {
+        'adx': rng.uniform(0, 60),
+        'momentum': rng.uniform(-1, 1),
+        'volume': rng.uniform(0, 2.5),
+    }
+    price = rng.uniform(1.0, 2.0)
+    context = {
+        'timestamp': datetime(2025, 10, 14, rng.randint(0, 23), 30),
+        'risk_reward': rng.uniform(0.5, 4.0),
+    }
+    if rng.random() < 0.5:
+        context['pattern'] = {'strength': rng.random()}
+    if rng.random() < 0.5:
+        context['news'] = {'sentiment': rng.uniform(-1, 1), 'impact': rng.choice(['low', 'medium', 'high'])}
+    if rng.random() < 0.5:
+        context['timeframes'] = {tf: {'trend': rng.choice(['bullish', 'bearish', 'neutral'])}
+                                 for tf in ('M15', 'H1', 'H4')}
+    if rng.random() < 0.7:
+        context.update(current_price=price, nearest_support=price * 0.995, nearest_resistance=price * 1.004)
+    return instrument, side, market_data, context
+
+
+def test_batch_matches_scalar():
+    scorer = get_quality_scoring()
+    rng = random.Random(7)
+    signals = [_random_signal(rng) for _ in range(200)]
+
+    batch = scorer.score_signals_batch(signals)
+    assert len(batch) == len(signals)
+
+    for i, (instrument, side, market_data, context) in enumerate(signals):
+        single = scorer.score_trade_quality(instrument, side, market_data, context)
+        assert batch.total_scores[i] == single.total_score
+        assert batch.recommendations[i] == single.recommendation
+        assert abs(batch.confidence[i] - single.confidence) < 1e-9
+        assert abs(batch.expected_win_rate[i] - single.expected_win_rate) < 1e-9
+        materialised = batch.to_quality_score(i)
+        for factor, score in single.factors.items():
+            assert abs(materialised.factors[factor] - score) < 1e-9
+        assert materialised.explanation == single.explanation
+
+
+def test_passing_indices():
+    scorer = get_quality_scoring()
+    rng = random.Random(11)
+    batch = scorer.score_signals_batch([_random_signal(rng) for _ in range(50)])
+    passing = batch.passing(60)
+    assert all(batch.total_scores[i] >= 60 for i in passing)
+
+
+def test_market_indicators_match_strategy_adx():
+    """Close-only histories give the momentum strategy's ADX; candles add relative volume"""
+    import pandas as pd
+    rng = random.Random(3)
+    closes = [2650.0]
+    for _ in range(59):
+        closes.append(closes[-1] + rng.uniform(-2, 2.5))
+
+    series = pd.Series(closes)
+    tr = series.diff().abs()
+    dm_plus = series.diff().clip(lower=0)
+    dm_minus = (-series.diff()).clip(lower=0)
+    di_plus = 100 * dm_plus.rolling(14).mean() / tr.rolling(14).mean()
+    di_minus = 100 * dm_minus.rolling(14).mean() / tr.rolling(14).mean()
+    expected_adx = (100 * (di_plus - di_minus).abs() / (di_plus + di_minus)).rolling(14).mean().iloc[-1]
+
+    indicators = market_indicators(closes)
+    assert abs(indicators['adx'] - expected_adx) < 1e-9
+    assert abs(indicators['momentum'] - (closes[-1] - closes[-20]) / closes[-20]) < 1e-12
+    assert indicators['volume'] == 1.0
+
+    candles = [{'close': c, 'high': c + 1, 'low': c - 1, 'volume': 100} for c in closes]
+    candles[-1]['volume'] = 300
+    assert abs(market_indicators(candles)['volume'] - 300 / 110) < 1e-9
+    assert market_indicators([])['adx'] == 0.0
+
+
+def test_candle_scanner_scores_signals_in_one_batch():
+    """The scanner's scoring step matches score_trade_quality on the strategy's real indicators"""
+    sys.path.insert(0, os.path.dirname(__file__))
+    from types import SimpleNamespace
+    from src.core.candle_based_scanner import CandleBasedScanner
+    from src.core.data_feed import MarketData
+    from src.core.order_manager import OrderSide, TradeSignal
+
+    scanner = CandleBasedScanner.__new__(CandleBasedScanner)
+    scanner.quality_scorer = get_quality_scoring()
+    signals = [TradeSignal('EUR_USD', OrderSide.BUY, 1000, stop_loss=1.0980, take_profit=1.1040),
+               TradeSignal('XAU_USD', OrderSide.SELL, 10, stop_loss=2660.0, take_profit=2620.0)]
+    market = {'EUR_USD': MarketData('EUR_USD', 1.0999, 1.1001), 'XAU_USD': MarketData('XAU_USD', 2649.5, 2650.5)}
+    gold = [2700.0 - i * 1.5 + (i % 3) for i in range(40)]
+    strategy = SimpleNamespace(price_history={'EUR_USD': [1.10 + i * 0.0001 for i in range(40)], 'XAU_USD': gold})
+
+    batch = scanner._score_signals(signals, market, strategy)
+    assert len(batch) == 2
+    assert abs(batch.inputs['risk_reward'][0] - 2.0) < 1e-9
+    assert batch.inputs['adx'][0] > 25 and batch.inputs['momentum'][1] < 0
+    single = scanner.quality_scorer.score_trade_quality('XAU_USD', 'SELL', market_indicators(gold),
+                                                        {'current_price': 2650.0, 'risk_reward': 3.0})
+    assert batch.total_scores[1] == single.total_score
+
+
+if __name__ == '__main__':
+    test_batch_matches_scalar()
+    test_passing_indices()
+    test_market_indicators_match_strategy_adx()
+    test_candle_scanner_scores_signals_in_one_batch()
+    print("✅ Batch quality scoring tests passed!")
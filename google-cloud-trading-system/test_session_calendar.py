@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test Session Calendar
+Verifies the hour-of-week session lookup, DST transitions and whole-index tagging
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.session_manager import MarketSession, SessionManager, hour_of_week
+
+
+def _utc(*args):
+    return pytz.UTC.localize(datetime(*args))
+
+
+def test_lookup_matches_session_hours():
+    """Quality and sessions come straight from the hour-of-week table"""
+    sm = SessionManager()
+    wednesday = datetime(2025, 10, 15, 14, 20)
+    assert hour_of_week(wednesday) == 2 * 24 + 14
+    assert sm.get_session_quality(wednesday) == (
+        100, {MarketSession.LONDON, MarketSession.NEWYORK, MarketSession.OVERLAP_LONDON_NY})
+    assert sm.get_session_quality(datetime(2025, 10, 18, 12)) == (0, {MarketSession.WEEKEND})
+    assert sm.get_session_quality(datetime(2025, 9, 30, 21, 30)) == (20, {MarketSession.OFF_HOURS})
+    assert sm.get_session_quality(datetime(2025, 10, 13, 23)) == (40, {MarketSession.SYDNEY})
+    assert sm.is_prime_trading_time(_utc(2025, 10, 15, 14, 59))
+    assert sm.get_current_sessions() == sm.get_current_sessions(datetime.now(pytz.UTC))
+
+
+def test_march_transitions_move_sessions_in_utc():
+    """New York moves an hour earlier on 9 March, London on 30 March"""
+    sm = SessionManager()
+    # 12:30 UTC: before 9 March New York is still closed (08:00 EST = 13:00 UTC)
+    assert MarketSession.NEWYORK not in sm.get_current_sessions(_utc(2025, 3, 5, 12, 30))
+    assert sm.is_prime_trading_time(_utc(2025, 3, 12, 12, 30))
+    # 15:30 UTC: London (16:00 GMT close) is open until 30 March, shut after it (16:00 BST = 15:00 UTC)
+    assert sm.is_prime_trading_time(_utc(2025, 3, 26, 15, 30))
+    assert sm.get_current_sessions(_utc(2025, 4, 2, 15, 30)) == {MarketSession.NEWYORK}
+    # 07:30 UTC: London's 08:00 open is 07:00 UTC in BST, overlapping Tokyo
+    assert MarketSession.LONDON not in sm.get_current_sessions(_utc(2025, 3, 26, 7, 30))
+    assert sm.get_current_sessions(_utc(2025, 4, 2, 7, 30)) == {
+        MarketSession.TOKYO, MarketSession.LONDON, MarketSession.OVERLAP_TOKYO_LONDON}
+
+
+def test_october_transitions_move_sessions_in_utc():
+    """Sydney moves earlier on 5 October, London later on 26 October, New York on 2 November"""
+    sm = SessionManager()
+    assert MarketSession.LONDON in sm.get_current_sessions(_utc(2025, 10, 22, 7, 30))
+    assert MarketSession.LONDON not in sm.get_current_sessions(_utc(2025, 10, 29, 7, 30))
+    # Between the UK and US changes the overlap is 12:00-16:00 UTC, then 13:00-16:00
+    assert sm.is_prime_trading_time(_utc(2025, 10, 29, 12, 30))
+    assert not sm.is_prime_trading_time(_utc(2025, 11, 5, 12, 30))
+    assert sm.is_prime_trading_time(_utc(2025, 11, 5, 15, 30))
+    # 21:30 UTC is 08:30 in Sydney once AEDT starts
+    assert sm.get_current_sessions(_utc(2025, 9, 30, 21, 30)) == {MarketSession.OFF_HOURS}
+    assert sm.get_current_sessions(_utc(2025, 10, 14, 21, 30)) == {MarketSession.SYDNEY}
+
+
+def test_local_times_follow_dst():
+    """08:30 in New York is in the New York session on either side of each change"""
+    sm = SessionManager()
+    new_york = pytz.timezone('America/New_York')
+    for day in (datetime(2025, 3, 7), datetime(2025, 3, 11), datetime(2025, 10, 31), datetime(2025, 11, 4)):
+        local = new_york.localize(day.replace(hour=8, minute=30))
+        assert MarketSession.NEWYORK in sm.get_current_sessions(local), day
+    london = pytz.timezone('Europe/London')
+    assert sm.get_current_sessions(london.localize(datetime(2025, 3, 28, 9, 0))) == {MarketSession.LONDON}
+    assert MarketSession.LONDON in sm.get_current_sessions(london.localize(datetime(2025, 3, 31, 9, 0)))
+
+
+def test_session_windows_are_local_time():
+    """Start/end and next-start follow the centre's clock, overlaps shrink and grow with DST"""
+    sm = SessionManager()
+    assert sm.get_session_start_end(MarketSession.OVERLAP_LONDON_NY, datetime(2025, 3, 12, 10)) == (
+        _utc(2025, 3, 12, 12), _utc(2025, 3, 12, 16))
+    assert sm.get_session_start_end(MarketSession.OVERLAP_LONDON_NY, datetime(2025, 4, 2, 10)) == (
+        _utc(2025, 4, 2, 12), _utc(2025, 4, 2, 15))
+    assert sm.get_session_start_end(MarketSession.SYDNEY, datetime(2025, 10, 14, 23)) == (
+        _utc(2025, 10, 14, 21), _utc(2025, 10, 15, 6))
+    assert sm.get_next_session_time(MarketSession.LONDON, datetime(2025, 3, 28, 10)) == _utc(2025, 3, 31, 7)
+    assert sm.get_next_session_time(MarketSession.NEWYORK, datetime(2025, 10, 31, 20)) == _utc(2025, 11, 3, 13)
+
+
+def test_tag_sessions_matches_scalar_lookup():
+    """Whole-index tags across every DST change equal the per-timestamp answers"""
+    sm = SessionManager()
+    for index in (pd.date_range('2025-03-01', '2025-11-08', freq='37min', tz='Europe/London'),
+                  pd.date_range('2025-10-20', periods=4000, freq='5min')):
+        tags = sm.tag_sessions(index)
+        expected = [sm.get_session_quality(ts) for ts in index]
+        assert tags['quality'].tolist() == [quality for quality, _ in expected]
+        assert tags['sessions'].tolist() == [sessions for _, sessions in expected]
+        assert tags['OVERLAP_LONDON_NY'].tolist() == [MarketSession.OVERLAP_LONDON_NY in s for _, s in expected]
+        assert tags.index.equals(index)
+    assert len(sm._regimes) <= 6  # one table per DST regime, not per week
+
+
+def test_calendar_rebuilds_after_schedule_change():
+    """Edited session hours or scores take effect after rebuild_calendar()"""
+    sm = SessionManager()
+    sm.session_times[MarketSession.LONDON] = (7, 16)
+    sm.session_quality_scores[MarketSession.LONDON] = 90
+    sm.rebuild_calendar()
+    assert sm.get_session_quality(datetime(2025, 10, 14, 6, 30)) == (
+        90, {MarketSession.TOKYO, MarketSession.LONDON, MarketSession.OVERLAP_TOKYO_LONDON})
+
+
+if __name__ == '__main__':
+    test_lookup_matches_session_hours()
+    test_march_transitions_move_sessions_in_utc()
+    test_october_transitions_move_sessions_in_utc()
+    test_local_times_follow_dst()
+    test_session_windows_are_local_time()
+    test_tag_sessions_matches_scalar_lookup()
+    test_calendar_rebuilds_after_schedule_change()
+    print("✅ All session calendar tests passed!")
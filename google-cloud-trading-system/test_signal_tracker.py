@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test Signal Tracker
+Verifies bounded retention, index maintenance and indexed dashboard queries
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.signal_tracker import SignalStatus, SignalTracker
+
+
+def _fresh_tracker(max_signals=100):
+    SignalTracker._instance = None
+    tracker = SignalTracker()
+    tracker.max_signals = max_signals
+    return tracker
+
+
+def _add(tracker, instrument='EUR_USD', strategy='momentum', side='BUY'):
+    return tracker.add_signal(instrument, side, strategy, 1.1000, 1.0950, 1.1100)
+
+
+def test_count_bound_evicts_oldest_and_cleans_indexes():
+    """Past max_signals the oldest signals go, along with their index entries"""
+    tracker = _fresh_tracker(max_signals=5)
+    ids = [_add(tracker, instrument='XAU_USD' if i < 3 else 'EUR_USD') for i in range(8)]
+    assert list(tracker.signals) == ids[3:]
+    assert 'XAU_USD' not in tracker._by_instrument
+    assert list(tracker._by_instrument['EUR_USD']) == ids[3:]
+    assert len(tracker._by_status[SignalStatus.PENDING]) == 5
+
+
+def test_age_bound_keeps_open_trades():
+    """Signals past the retention window are dropped, except an open trade at the front"""
+    tracker = _fresh_tracker()
+    old_active, old_pending, fresh = _add(tracker), _add(tracker), _add(tracker)
+    for signal_id in (old_active, old_pending):
+        tracker.signals[signal_id].generated_at -= timedelta(hours=tracker.retention_hours + 1)
+    tracker.update_signal_status(old_active, SignalStatus.ACTIVE)
+
+    _add(tracker)
+    assert old_active in tracker.signals and old_pending in tracker.signals
+
+    tracker.update_signal_status(old_active, SignalStatus.FILLED)
+    _add(tracker)
+    assert old_active not in tracker.signals and old_pending not in tracker.signals
+    assert fresh in tracker.signals
+
+
+def test_indexed_queries_newest_first():
+    """Instrument/strategy/status filters combine and return newest first"""
+    tracker = _fresh_tracker()
+    a = _add(tracker, 'XAU_USD', 'gold_scalper')
+    b = _add(tracker, 'EUR_USD', 'momentum')
+    c = _add(tracker, 'XAU_USD', 'momentum')
+    d = _add(tracker, 'XAU_USD', 'gold_scalper')
+    tracker.update_signal_status(a, SignalStatus.ACTIVE)
+
+    assert [s.signal_id for s in tracker.get_all_signals(instrument='XAU_USD')] == [d, c, a]
+    assert [s.signal_id for s in tracker.get_all_signals(instrument='XAU_USD', limit=2)] == [d, c]
+    assert [s.signal_id for s in tracker.get_pending_signals('XAU_USD', 'gold_scalper')] == [d]
+    assert [s.signal_id for s in tracker.get_active_signals(strategy='gold_scalper')] == [a]
+    assert [s.signal_id for s in tracker.get_all_signals(status=SignalStatus.PENDING)] == [d, c, b]
+    assert tracker.get_all_signals(instrument='GBP_USD') == []
+    assert [s.signal_id for s in tracker.get_all_signals()] == [d, c, b, a]
+
+
+def test_expiry_and_statistics_use_status_index():
+    """Only stale pending signals expire; counts follow status changes"""
+    tracker = _fresh_tracker()
+    stale, fresh, trade = _add(tracker), _add(tracker), _add(tracker)
+    tracker.signals[stale].generated_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    tracker.update_signal_status(trade, SignalStatus.ACTIVE)
+    tracker.update_signal_status(trade, SignalStatus.FILLED,
+                                 closed_at=tracker.signals[trade].executed_at + timedelta(minutes=30))
+
+    tracker.expire_old_pending_signals()
+    assert tracker.get_signal(stale).status == SignalStatus.EXPIRED
+    assert tracker.get_signal(fresh).status == SignalStatus.PENDING
+
+    stats = tracker.get_statistics()
+    assert (stats['total_signals'], stats['pending'], stats['active'], stats['filled']) == (3, 1, 0, 1)
+    assert stats['win_rate'] == 100.0
+    assert stats['avg_hold_time_minutes'] == 30.0
+
+
+if __name__ == '__main__':
+    test_count_bound_evicts_oldest_and_cleans_indexes()
+    test_age_bound_keeps_open_trades()
+    test_indexed_queries_newest_first()
+    test_expiry_and_statistics_use_status_index()
+    print("✅ All signal tracker tests passed!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test lazy service registry and startup profile
+Runs offline - no Flask or OANDA credentials required
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.core.startup_profile import (ServiceRegistry, StartupProfile, format_import_tree,
+                                      import_time_tree, lazy_callable, lazy_import, parse_import_times)
+
+
+def test_service_built_once_under_concurrency():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    store = {}
+    registry = ServiceRegistry(store=store)
+    registry.register('dashboard_manager', factory)
+    assert registry.status()['dashboard_manager']['state'] == ServiceRegistry.PENDING
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('dashboard_manager')))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(set(map(id, results))) == 1
+    assert store['dashboard_manager'] is results[0]
+    assert registry.is_ready('dashboard_manager')
+
+
+def test_failed_service_releases_waiters():
+    profile = StartupProfile()
+    registry = ServiceRegistry(profile=profile)
+    registry.register('scanner', lambda: 1 / 0)
+    threading.Thread(target=registry.get, args=('scanner',), daemon=True).start()
+    assert registry.wait('scanner', timeout=2) is False
+    assert registry.status()['scanner']['state'] == ServiceRegistry.FAILED
+    assert registry.get('scanner') is None
+    assert profile.report()['phases'][0]['name'] == 'service:scanner'
+
+
+def test_lazy_import_defers_module_body():
+    mod = lazy_import('json.tool')
+    assert 'json.tool' in sys.modules
+    assert callable(mod.main)
+    dumps = lazy_callable('json', 'dumps')
+    assert dumps({'a': 1}) == '{"a": 1}'
+
+
+def test_parse_import_times_tree():
+    text = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |     child_a",
+        "import time:        50 |         50 |     child_b",
+        "import time:       200 |        350 |   parent",
+        "import time:        10 |         10 |   other",
+    ])
+    roots = parse_import_times(text)
+    assert [r['module'] for r in roots] == ['parent', 'other']
+    assert [c['module'] for c in roots[0]['children']] == ['child_a', 'child_b']
+    assert roots[0]['cumulative_us'] == 350
+
+
+def test_import_profiling_child_starts_nothing():
+    """The -X importtime child sees the profiling and trading-disabled flags"""
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, 'probe_main.py'), 'w') as f:
+            f.write("import os, sys\n"
+                    "if os.getenv('IMPORT_PROFILING') != 'true' or os.getenv('TRADING_DISABLED') != 'true':\n"
+                    "    sys.exit(3)\n")
+        result = import_time_tree('probe_main', cwd=root, top=1000)
+    assert result['returncode'] == 0
+    assert any(entry['module'] == 'probe_main' for entry in result['slowest'])
+
+
+def test_import_tree_is_printed_slowest_first_and_indented():
+    tree = [{'module': 'light', 'self_ms': 1.0, 'cumulative_ms': 1.0, 'children': []},
+            {'module': 'flask', 'self_ms': 2.0, 'cumulative_ms': 40.0, 'children': [
+                {'module': 'werkzeug', 'self_ms': 30.0, 'cumulative_ms': 30.0, 'children': []}]}]
+    lines = format_import_tree(tree)
+    assert [line.split()[-1] for line in lines] == ['flask', 'werkzeug', 'light']
+    assert lines[0].endswith('ms  flask') and lines[1].endswith('ms    werkzeug')
+
+
+if __name__ == '__main__':
+    test_service_built_once_under_concurrency()
+    test_failed_service_releases_waiters()
+    test_lazy_import_defers_module_body()
+    test_parse_import_times_tree()
+    test_import_profiling_child_starts_nothing()
+    test_import_tree_is_printed_slowest_first_and_indented()
+    print("✅ Startup profile tests passed!")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test support/resistance engine
+Vectorized swings vs the old loop, and incremental updates vs full rebuild
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.core.support_resistance import SupportResistanceEngine, swing_mask
+from src.core.market_regime import MarketRegimeDetector
+
+
+def _random_bars(n: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.0005, n))
+    high = close + rng.uniform(0, 0.0008, n)
+    low = close - rng.uniform(0, 0.0008, n)
+    index = pd.date_range('2025-10-01', periods=n, freq='15min')
+    return pd.DataFrame({'open': close, 'high': high, 'low': low, 'close': close}, index=index)
+
+
+def test_swing_mask_matches_loop():
+    lows = _random_bars(300)['low'].to_numpy()
+    expected = [i for i in range(5, len(lows) - 5)
+                if lows[i] <= lows[i - 1] and lows[i] <= lows[i - 2]
+                and lows[i] <= lows[i + 1] and lows[i] <= lows[i + 2]]
+    assert np.flatnonzero(swing_mask(lows, 2, 'low', edge=5)).tolist() == expected
+
+
+def test_incremental_matches_rebuild():
+    df = _random_bars(400)
+    incremental = SupportResistanceEngine()
+    for end in range(50, len(df) + 1):
+        state = incremental.update('EUR_USD', 'M15', df.iloc[:end])
+    rebuilt = SupportResistanceEngine().update('EUR_USD', 'M15', df)
+    assert state.supports.levels() == rebuilt.supports.levels()
+    assert state.resistances.levels() == rebuilt.resistances.levels()
+
+
+def test_lookback_evicts_old_swings():
+    df = _random_bars(400)
+    incremental = SupportResistanceEngine(lookback=120)
+    for end in range(150, len(df) + 1):
+        state = incremental.update('EUR_USD', 'M15', df.iloc[:end])
+    # Level anchors are path dependent, but touches must cover exactly the window's swings
+    lows = df['low'].to_numpy()
+    in_window = np.flatnonzero(swing_mask(lows, 2, 'low', edge=5))
+    in_window = in_window[in_window >= len(df) - 120]
+    assert sorted(state.support_swings) == in_window.tolist()
+    assert sum(t for _, t in state.supports.levels()) == len(in_window)
+
+
+def test_changed_history_triggers_rebuild():
+    df = _random_bars(200)
+    engine = SupportResistanceEngine()
+    engine.update('EUR_USD', 'M15', df)
+    other = _random_bars(200, seed=9)
+    state = engine.update('EUR_USD', 'M15', other)
+    assert state.supports.levels() == SupportResistanceEngine().update('X', 'M15', other).supports.levels()
+
+
+def test_rolling_window_updates_incrementally():
+    """count=100 windows roll by one bar per call without rebuilding; swings match a rebuild"""
+    df = _random_bars(400)
+    engine = SupportResistanceEngine()
+    first = engine.update('EUR_USD', 'M15', df.iloc[0:100])
+    for start in range(1, 301):
+        window = df.iloc[start:start + 100]
+        state = engine.update('EUR_USD', 'M15', window)
+        assert state is first
+        rebuilt = SupportResistanceEngine().update('X', 'M15', window)
+        assert sorted(state.support_swings) == [start + i for i in sorted(rebuilt.support_swings)]
+        assert sorted(state.resistance_swings) == [start + i for i in sorted(rebuilt.resistance_swings)]
+        assert sum(t for _, t in state.supports.levels()) == len(rebuilt.support_swings)
+    assert len(state.lows) == 100
+
+
+def test_regime_rolling_levels_reuse_engine():
+    """MarketRegimeDetector's per-instrument levels equal _find_key_levels on every rolled window"""
+    prices = _random_bars(400)['close'].tolist()
+    detector = MarketRegimeDetector()
+    for start in range(0, 300, 7):
+        window = prices[start:start + 100]
+        assert detector._get_key_levels('EUR_USD', window) == detector._find_key_levels(window)
+    state = detector.level_engine.get('EUR_USD', 'close')
+    assert state.base == 294  # numbering carried across every roll, never rebuilt
+    other = _random_bars(120, seed=8)['close'].tolist()
+    assert detector._get_key_levels('EUR_USD', other) == detector._find_key_levels(other)
+
+
+def test_regime_key_levels_match_old_loop():
+    prices = _random_bars(300)['close'].tolist()
+    highs, lows = [], []
+    for i in range(5, len(prices) - 5):
+        if prices[i] == max(prices[i - 5:i + 6]):
+            highs.append(prices[i])
+        if prices[i] == min(prices[i - 5:i + 6]):
+            lows.append(prices[i])
+
+    def old_cluster(levels, tolerance=0.003):
+        sorted_levels = sorted(levels)
+        clusters, current = [], [sorted_levels[0]]
+        for level in sorted_levels[1:]:
+            mean = np.mean(current)
+            if abs(level - mean) / mean < tolerance:
+                current.append(level)
+            else:
+                clusters.append(np.mean(current))
+                current = [level]
+        clusters.append(np.mean(current))
+        return clusters
+
+    levels = MarketRegimeDetector()._find_key_levels(prices)
+    assert np.allclose(levels['resistance'], old_cluster(highs)[:3])
+    assert np.allclose(levels['support'], old_cluster(lows)[:3])
+
+
+def test_analyzer_clusters_at_its_level_tolerance():
+    """PriceContextAnalyzer.level_tolerance reaches the engine, also when changed later"""
+    from src.core.price_context_analyzer import PriceContextAnalyzer  # needs TA-Lib
+    df = _random_bars(300)
+    analyzer = PriceContextAnalyzer()
+    assert analyzer.level_engine.tolerance == analyzer.level_tolerance
+
+    def swing_levels():
+        return analyzer._level_series('EUR_USD', 'M15', df).supports.levels()
+
+    default = swing_levels()
+    analyzer.level_tolerance = 0.01
+    wide = swing_levels()
+    assert analyzer.level_engine.tolerance == 0.01
+    assert wide == SupportResistanceEngine(tolerance=0.01).update('X', 'M15', df).supports.levels()
+    assert len(wide) < len(default)
+    assert sum(t for _, t in wide) == sum(t for _, t in default)  # same swings, fewer clusters
+
+
+if __name__ == '__main__':
+    test_swing_mask_matches_loop()
+    test_incremental_matches_rebuild()
+    test_lookback_evicts_old_swings()
+    test_changed_history_triggers_rebuild()
+    test_rolling_window_updates_incrementally()
+    test_regime_rolling_levels_reuse_engine()
+    test_regime_key_levels_match_old_loop()
+    test_analyzer_clusters_at_its_level_tolerance()
+    print("✅ Support/resistance engine tests passed!")
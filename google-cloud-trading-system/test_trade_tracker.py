@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test Trade Tracker
+Verifies per-thread WAL connections, batched writes, parameterized metrics and index use
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.trade_tracker import METRICS_BY_ACCOUNT_SQL, METRICS_SQL, TradeEntry, TradeStatus, TradeTracker
+
+
+def _tracker(tmp):
+    cwd = os.getcwd()
+    os.chdir(tmp)  # setup_logging writes logs/ into the working directory
+    try:
+        return TradeTracker(os.path.join(tmp, 'trading_system.db'))
+    finally:
+        os.chdir(cwd)
+
+
+def _trade(i, days_ago, account='PRIMARY', status=TradeStatus.FILLED, pnl=10.0):
+    return TradeEntry(
+        trade_id=f't{i}', timestamp=datetime.now() - timedelta(days=days_ago), account=account,
+        instrument='EUR_USD', side='BUY', order_type='MARKET', units=1000, entry_price=1.1,
+        stop_loss=1.09, take_profit=1.12, strategy='momentum', confidence=0.8, session='london',
+        status=status, profit_loss=pnl, pips_profit=pnl / 10, duration_minutes=30)
+
+
+def test_connection_is_reused_per_thread():
+    """One WAL connection per thread, kept across calls"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = _tracker(tmp)
+        first = tracker._connection()
+        tracker.log_trade(_trade(1, 0))
+        tracker.get_active_trades()
+        assert tracker._connection() is first
+        assert first.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(tracker._connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not first
+        tracker.close()
+
+
+def test_batch_commits_once_and_rolls_back_on_error():
+    """Writes inside batch() land together; an exception discards them"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = _tracker(tmp)
+        with tracker.batch():
+            tracker.log_trade(_trade(1, 0))
+            tracker.log_trades([_trade(2, 0), _trade(3, 0)])
+            assert tracker.update_trade_status('t1', TradeStatus.CANCELLED, exit_price=1.1)
+        try:
+            with tracker.batch():
+                tracker.log_trade(_trade(4, 0))
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        assert not tracker.log_trade(_trade(2, 0))  # duplicate id: rolled back, connection still usable
+        assert sorted(t['trade_id'] for t in tracker.get_active_trades()) == ['t2', 't3']
+
+
+def test_metrics_are_parameterized_and_windowed():
+    """Account names are bound, not formatted; only filled trades inside the window count"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = _tracker(tmp)
+        tracker.log_trades([
+            _trade(1, 1, pnl=20.0), _trade(2, 2, pnl=-5.0), _trade(3, 40, pnl=100.0),
+            _trade(4, 1, status=TradeStatus.PENDING, pnl=7.0),
+            _trade(5, 1, account="O'Brien", pnl=3.0),
+        ])
+        metrics = tracker.get_performance_metrics(account='PRIMARY', days=30)
+        assert (metrics['total_trades'], metrics['winning_trades'], metrics['total_profit_loss']) == (2, 1, 15.0)
+        assert tracker.get_performance_metrics(account="O'Brien")['total_trades'] == 1
+        assert tracker.get_performance_metrics(days=60)['total_trades'] == 4
+
+
+def test_year_of_trades_uses_indexes():
+    """Dashboard queries hit the indexes and stay fast on a year of history"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = _tracker(tmp)
+        accounts = ['PRIMARY', 'GOLD', 'ALPHA']
+        trades = [_trade(i, i / 100, account=accounts[i % 3], pnl=(i % 7) - 3.0,
+                         status=TradeStatus.FILLED if i > 20 else TradeStatus.PENDING)
+                  for i in range(36500)]
+        with tracker.batch():
+            tracker.log_trades(trades)
+
+        conn = tracker._connection()
+        cutoff = (datetime.now() - timedelta(days=30)).isoformat()
+        for sql, args in ((METRICS_SQL, (cutoff,)), (METRICS_BY_ACCOUNT_SQL, (cutoff, 'GOLD'))):
+            plan = ' '.join(row[-1] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, args))
+            assert 'USING INDEX' in plan or 'USING COVERING INDEX' in plan, plan
+
+        started = time.perf_counter()
+        for _ in range(10):
+            metrics = tracker.get_performance_metrics()
+            tracker.get_performance_metrics(account='GOLD')
+            recent = tracker.get_trade_history(20)
+        elapsed_ms = (time.perf_counter() - started) / 10 * 1000
+        assert metrics['total_trades'] == 3000 - 21
+        assert [t['trade_id'] for t in recent[:2]] == ['t0', 't1']
+        assert elapsed_ms < 50, f"{elapsed_ms:.1f}ms per metrics refresh"
+
+
+if __name__ == '__main__':
+    test_connection_is_reused_per_thread()
+    test_batch_commits_once_and_rolls_back_on_error()
+    test_metrics_are_parameterized_and_windowed()
+    test_year_of_trades_uses_indexes()
+    print("✅ All trade tracker tests passed!")
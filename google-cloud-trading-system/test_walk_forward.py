@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Walk-Forward Runner
+Verifies fold construction, out-of-sample stitching and parallel/serial agreement
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.walk_forward import WalkForwardRunner, bars_per_day, make_folds, parameter_stability
+from universal_optimizer import UniversalOptimizer
+
+
+def _prepare(n=1200, seed=5):
+    """Synthetic 'precomputed indicator': per-bar return of a trend that flips halfway"""
+    rng = np.random.default_rng(seed)
+    drift = np.where(np.arange(n) < n // 2, 0.001, -0.001)
+    return drift + rng.normal(0, 0.0005, n)
+
+
+def _evaluate(params, returns, start, end):
+    """Trade one bar at a time in the configured direction, only inside [start, end)"""
+    pnl = params['direction'] * returns[start:end] * params['size']
+    return {'score': float(pnl.sum()), 'trades': [{'pnl': float(p)} for p in pnl]}
+
+
+CANDIDATES = [{'direction': d, 'size': s} for d in (-1, 1) for s in (1, 2)]
+
+
+def test_make_folds_rolling_and_anchored():
+    """Rolling windows slide, anchored windows grow; test windows tile without overlap"""
+    rolling = make_folds(100, train_bars=40, test_bars=20, start=10)
+    assert [(f.train_start, f.train_end, f.test_start, f.test_end) for f in rolling] == [
+        (10, 50, 50, 70), (30, 70, 70, 90)]
+    anchored = make_folds(100, train_bars=40, test_bars=20, start=10, anchored=True)
+    assert [f.train_start for f in anchored] == [10, 10]
+    assert [f.train_end for f in anchored] == [50, 70]
+    assert make_folds(50, 40, 20) == []
+
+
+def test_walk_forward_picks_per_fold_and_stitches_oos():
+    """Each fold fits its own window; OOS equity only contains test-window trades"""
+    returns = _prepare()
+    folds = make_folds(len(returns), train_bars=200, test_bars=100)
+    result = WalkForwardRunner(_evaluate, CANDIDATES, n_workers=1, initial_balance=1.0).run(returns, folds)
+
+    first, last = result.folds[0], result.folds[-1]
+    assert first.best_params == {'direction': 1, 'size': 2}
+    assert last.best_params == {'direction': -1, 'size': 2}
+    assert result.oos_trades == sum(f.test_end - f.test_start for f in folds)
+    assert np.isclose(result.oos_equity[-1], 1.0 + result.oos_pnl)
+    stability = result.parameter_stability
+    assert stability['size']['std'] == 0.0
+    assert stability['direction']['changes'] >= 1
+
+
+def test_parallel_matches_serial():
+    """Forked fold workers give the same result as the serial path"""
+    returns = _prepare()
+    folds = make_folds(len(returns), train_bars=200, test_bars=100)
+    serial = WalkForwardRunner(_evaluate, CANDIDATES, n_workers=1).run(returns, folds)
+    parallel = WalkForwardRunner(_evaluate, CANDIDATES, n_workers=3).run(returns, folds)
+    assert [r.best_params for r in serial.folds] == [r.best_params for r in parallel.folds]
+    assert np.allclose(serial.oos_equity, parallel.oos_equity)
+
+
+def test_parameter_stability_categorical():
+    """Non-numeric parameters report their most common value"""
+    stability = parameter_stability([{'mode': 'a'}, {'mode': 'b'}, {'mode': 'a'}])
+    assert stability['mode']['mode'] == 'a'
+    assert np.isclose(stability['mode']['mode_share'], 2 / 3)
+    assert stability['mode']['changes'] == 2
+
+
+def test_failed_out_of_sample_run_is_recorded():
+    """An OOS error marks its fold failed instead of aborting the walk-forward"""
+    returns = _prepare()
+    folds = make_folds(len(returns), train_bars=200, test_bars=100)
+    broken = folds[1]
+
+    def evaluate(params, data, start, end):
+        if (start, end) == (broken.test_start, broken.test_end):
+            raise ValueError('no candles')
+        return _evaluate(params, data, start, end)
+
+    result = WalkForwardRunner(evaluate, CANDIDATES, n_workers=1).run(returns, folds)
+    failed = result.folds[1]
+    assert failed.error == 'out-of-sample: no candles' and failed.out_of_sample == {}
+    assert all(r.error is None for i, r in enumerate(result.folds) if i != 1)
+    assert result.oos_trades == sum(f.test_end - f.test_start for f in folds) - 100
+    assert result.summary()['folds'][1]['error'] == failed.error
+
+
+def test_bars_per_day_from_candle_spacing():
+    """M5 and H1 OANDA timestamps give 288 and 24 bars a day"""
+    m5 = [f'2025-10-01T10:{m:02d}:00.000000000Z' for m in range(0, 60, 5)]
+    h1 = [f'2025-10-01T{h:02d}:00:00.000000000Z' for h in range(10)]
+    assert bars_per_day(m5) == 288
+    assert bars_per_day(h1) == 24
+
+
+class _BuyOnce:
+    """Buys on its sixth bar, with stops too wide to be hit in the test"""
+
+    def __init__(self):
+        self.bars = 0
+
+    def analyze_market(self, market_data):
+        self.bars += 1
+        if self.bars != 6:
+            return []
+        return [SimpleNamespace(instrument='EUR_USD', side=SimpleNamespace(value='BUY'),
+                                stop_loss=1.0, take_profit=2.0)]
+
+
+def test_trade_open_at_fold_boundary_is_closed_at_the_last_bar():
+    """A trade entered inside the window but still open at its end counts, marked at the last bar"""
+    candles = [{'time': f'2025-10-01T10:{m:02d}:00.000000000Z',
+                'bid': {'c': f'{1.1 + m * 0.001:.3f}'}, 'ask': {'c': f'{1.1001 + m * 0.001:.4f}'}}
+               for m in range(20)]
+    optimizer = UniversalOptimizer.__new__(UniversalOptimizer)  # no OANDA client needed
+    optimizer.strategy_class = _BuyOnce
+    optimizer.instruments = ['EUR_USD']
+    result = optimizer._run_backtest({}, {'EUR_USD': candles}, window=(5, 10))
+
+    assert result['total_trades'] == 1
+    trade = result['trades'][0]
+    assert trade['entry_time'] == candles[5]['time'] and trade['entry_price'] == 1.105
+    assert trade['exit_time'] == candles[9]['time'] and trade['exit_price'] == 1.109
+    assert trade['result'] == 'win' and np.isclose(result['total_pnl'], 0.004)
+
+
+if __name__ == '__main__':
+    test_make_folds_rolling_and_anchored()
+    test_walk_forward_picks_per_fold_and_stitches_oos()
+    test_parallel_matches_serial()
+    test_parameter_stability_categorical()
+    test_failed_out_of_sample_run_is_recorded()
+    test_bars_per_day_from_candle_spacing()
+    test_trade_open_at_fold_boundary_is_closed_at_the_last_bar()
+    print("✅ All walk-forward tests passed!")
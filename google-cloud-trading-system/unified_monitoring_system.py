@@ -26,7 +26,7 @@ from dataclasses import dataclass
 sys.path.append('/Users/mac/quant_system_clean/google-cloud-trading-system')
 
 from src.core.yaml_manager import get_yaml_manager
-from src.core.oanda_client import OandaClient
+from src.core.oanda_client import get_account_client
 from src.core.data_feed import get_data_feed
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -113,7 +113,7 @@ class UnifiedMonitoringSystem:
     def get_account_status(self, account_id: str) -> Optional[AccountStatus]:
         """Get status for a specific account"""
         try:
-            client = OandaClient(account_id=account_id)
+            client = get_account_client(account_id)
             account_info = client.get_account_info()
             open_trades = client.get_open_trades()
             
@@ -8,7 +8,7 @@ import os
 import sys
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 import itertools
 import json
 import yaml
@@ -18,6 +18,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.core.oanda_client import OandaClient
 from src.core.data_feed import MarketData
+from src.core.walk_forward import WalkForwardRunner, bars_per_day, make_folds
+from src.core.parameter_search import SearchSpace, get_search
+from src.core.backtest_cache import BacktestCache, code_version, data_fingerprint, get_backtest_cache, make_key
+
+# Bars replayed before a walk-forward window (strategies keep 200 bars of history)
+WARMUP_BARS = 200
 
 
 def load_credentials_from_yaml():
@@ -56,13 +62,22 @@ logger = logging.getLogger(__name__)
 class UniversalOptimizer:
     """Monte Carlo optimizer that works with any strategy class"""
     
-    def __init__(self, strategy_class, strategy_name: str, instruments: List[str]):
+    def __init__(self, strategy_class, strategy_name: str, instruments: List[str],
+                 cache: Optional[BacktestCache] = None, use_cache: bool = True):
         # Load credentials from app.yaml if needed
         load_credentials_from_yaml()
         
         self.strategy_class = strategy_class
         self.strategy_name = strategy_name
         self.instruments = instruments
+        
+        # Results are memoized per (strategy + backtester source, params, data window);
+        # entries from older versions of this strategy's code are dropped up front
+        self.cache = (cache or get_backtest_cache()) if use_cache else None
+        self.code_version = code_version(strategy_class, type(self))
+        self.cache_namespace = f"{strategy_class.__module__}.{strategy_class.__qualname__}:universal"
+        if self.cache is not None:
+            self.cache.invalidate(self.cache_namespace, keep_version=self.code_version)
         self.oanda_client = OandaClient(
             api_key=os.getenv('OANDA_API_KEY'),
             account_id=os.getenv('OANDA_ACCOUNT_ID'),
@@ -112,12 +127,59 @@ class UniversalOptimizer:
         logger.info(f"🎲 Generated {len(combinations)} parameter combinations")
         return combinations
     
+    def _index_candles(self, historical_data: Dict[str, List[Dict]]) -> Tuple[List[str], Dict[str, Dict[str, Dict]]]:
+        """Sorted timestamps and per-instrument time -> candle maps, built once per dataset"""
+        cached = getattr(self, '_candle_index', None)
+        if cached is not None and cached[0] is historical_data:
+            return cached[1], cached[2]
+        
+        by_time = {inst: {c['time']: c for c in candles} for inst, candles in historical_data.items()}
+        timestamps = sorted({t for candles in by_time.values() for t in candles})
+        self._candle_index = (historical_data, timestamps, by_time)
+        return timestamps, by_time
+    
+    def _data_fingerprint(self, historical_data: Dict[str, List[Dict]]) -> str:
+        """Content hash of the dataset, computed once per dataset"""
+        cached = getattr(self, '_fingerprint', None)
+        if cached is not None and cached[0] is historical_data:
+            return cached[1]
+        fingerprint = data_fingerprint(historical_data)
+        self._fingerprint = (historical_data, fingerprint)
+        return fingerprint
+    
     def backtest_with_params(
         self,
         params: Dict[str, Any],
-        historical_data: Dict[str, List[Dict]]
+        historical_data: Dict[str, List[Dict]],
+        window: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run backtest with specific parameter set (memoized in the backtest cache)
+        
+        Args:
+            params: Strategy attributes to override
+            historical_data: Candles per instrument
+            window: Only open trades in timestamps [start, end) of the sorted
+                timeline; the WARMUP_BARS before start are replayed for history,
+                and trades still open at end are closed at their last price
+        """
+        if self.cache is None:
+            return self._run_backtest(params, historical_data, window)
+        
+        key = make_key(self.code_version, params, self._data_fingerprint(historical_data),
+                       instruments=self.instruments, window=window, warmup=WARMUP_BARS)
+        return self.cache.get_or_compute(
+            key, lambda: self._run_backtest(params, historical_data, window),
+            strategy=self.cache_namespace, version=self.code_version
+        )
+    
+    def _run_backtest(
+        self,
+        params: Dict[str, Any],
+        historical_data: Dict[str, List[Dict]],
+        window: Optional[Tuple[int, int]] = None
     ) -> Dict[str, Any]:
-        """Run backtest with specific parameter set"""
+        """Uncached backtest behind backtest_with_params()"""
         
         # Create strategy instance with custom parameters
         strategy = self.strategy_class()
@@ -136,20 +198,22 @@ class UniversalOptimizer:
         strategy.price_history = {inst: [] for inst in self.instruments}
         
         # Collect all timestamps across instruments
-        all_timestamps = set()
-        for instrument, candles in historical_data.items():
-            for candle in candles:
-                all_timestamps.add(candle['time'])
-        
-        sorted_timestamps = sorted(all_timestamps)
+        sorted_timestamps, candles_by_time = self._index_candles(historical_data)
+        trade_from = 0
+        if window is not None:
+            trade_from, trade_to = window
+            replay_from = max(0, trade_from - WARMUP_BARS)
+            sorted_timestamps = sorted_timestamps[replay_from:trade_to]
+            trade_from -= replay_from
         
         # Results tracking
         trades = []
         open_positions = {}
+        last_seen = {}  # pair -> (timestamp, bid) of its latest candle
         total_signals_seen = 0
         
         # Process each timestamp
-        for timestamp in sorted_timestamps:
+        for bar, timestamp in enumerate(sorted_timestamps):
             # Build market data for this timestamp
             market_data_dict = {}
             
@@ -158,11 +222,7 @@ class UniversalOptimizer:
                     continue
                     
                 # Find candle for this timestamp
-                candle = None
-                for c in historical_data[instrument]:
-                    if c['time'] == timestamp:
-                        candle = c
-                        break
+                candle = candles_by_time[instrument].get(timestamp)
                 
                 if candle:
                     # Extract close price from OANDA format
@@ -193,7 +253,13 @@ class UniversalOptimizer:
                     )
             
             # Generate signals
-            if market_data_dict:
+            if market_data_dict and bar < trade_from:
+                # Warm-up bars only build strategy state
+                try:
+                    strategy.analyze_market(market_data_dict)
+                except Exception as e:
+                    logger.debug(f"Warm-up error: {str(e)}")
+            elif market_data_dict:
                 try:
                     signals = strategy.analyze_market(market_data_dict)
                     
@@ -228,6 +294,7 @@ class UniversalOptimizer:
             for pair, position in list(open_positions.items()):
                 if pair in market_data_dict:
                     current_price = market_data_dict[pair].bid
+                    last_seen[pair] = (timestamp, current_price)
                     
                     # Check if stop loss or take profit hit
                     if position['direction'] == 'BUY':
@@ -291,6 +358,22 @@ class UniversalOptimizer:
             for pair in closed_positions:
                 del open_positions[pair]
         
+        # Positions still open at the end of the window are closed at their last
+        # price instead of dropped, so slow-exit parameter sets are scored fairly
+        for pair, position in open_positions.items():
+            exit_time, exit_price = last_seen.get(pair, (position['entry_time'], position['entry_price']))
+            direction = 1 if position['direction'] == 'BUY' else -1
+            pnl = direction * (exit_price - position['entry_price'])
+            trades.append({
+                'pair': pair,
+                'entry_price': position['entry_price'],
+                'exit_price': exit_price,
+                'pnl': pnl,
+                'result': 'win' if pnl > 0 else 'loss',
+                'entry_time': position['entry_time'],
+                'exit_time': exit_time
+            })
+        
         # Restore original settings
         if original_time_filter is not None:
             strategy.min_time_between_trades_minutes = original_time_filter
@@ -341,9 +424,23 @@ class UniversalOptimizer:
         self,
         param_ranges: Dict[str, List],
         days: int = 7,
-        top_n: int = 5
+        top_n: int = 5,
+        search: Optional[str] = None,
+        seed: Optional[int] = None,
+        **search_kwargs
     ) -> List[Dict]:
-        """Run Monte Carlo optimization"""
+        """
+        Run Monte Carlo optimization
+        
+        Args:
+            param_ranges: Values per parameter (lists), or (low, high) ranges for adaptive searches
+            days: History to download
+            top_n: Parameter sets to return
+            search: None for the full grid, or a parameter_search method
+                ('tpe', 'hyperband', 'successive_halving', 'random')
+            seed: Seed for the adaptive searches (same seed, same result)
+            **search_kwargs: Passed to the search (e.g. n_trials)
+        """
         
         logger.info(f"\n{'='*70}")
         logger.info(f"🎯 OPTIMIZING STRATEGY: {self.strategy_name}")
@@ -356,23 +453,16 @@ class UniversalOptimizer:
             logger.error("❌ No historical data available!")
             return []
         
-        # Step 2: Generate parameter combinations
-        param_combinations = self.create_param_combinations(param_ranges)
-        
-        # Step 3: Run Monte Carlo simulation
-        logger.info(f"\n🔬 Running {len(param_combinations)} simulations...")
-        results = []
+        # Step 2-3: Backtest the full grid, or let an adaptive search pick the sets
+        if search is not None:
+            results = self._adaptive_search(param_ranges, historical_data, search, seed, **search_kwargs)
+        else:
+            results = self._grid_search(param_ranges, historical_data)
         
-        for i, params in enumerate(param_combinations, 1):
-            if i % 10 == 0:
-                logger.info(f"  Progress: {i}/{len(param_combinations)} ({i/len(param_combinations)*100:.1f}%)")
-            
-            try:
-                result = self.backtest_with_params(params, historical_data)
-                results.append(result)
-            except Exception as e:
-                logger.debug(f"  Simulation {i} failed: {str(e)}")
-                continue
+        if self.cache is not None:
+            stats = self.cache.stats()
+            logger.info(f"💾 Backtest cache: {stats['hits']} hits / {stats['misses']} misses, "
+                        f"{stats['entries']} stored results")
         
         # Step 4: Rank results
         results.sort(key=lambda x: x['score'], reverse=True)
@@ -392,6 +482,110 @@ class UniversalOptimizer:
             logger.info(f"Avg Loss: {result['avg_loss']:.5f}")
         
         return results[:top_n]
+    
+    def _grid_search(self, param_ranges: Dict[str, List],
+                     historical_data: Dict[str, List[Dict]]) -> List[Dict]:
+        """Backtest every parameter combination"""
+        param_combinations = self.create_param_combinations(param_ranges)
+        
+        logger.info(f"\n🔬 Running {len(param_combinations)} simulations...")
+        results = []
+        
+        for i, params in enumerate(param_combinations, 1):
+            if i % 10 == 0:
+                logger.info(f"  Progress: {i}/{len(param_combinations)} ({i/len(param_combinations)*100:.1f}%)")
+            
+            try:
+                result = self.backtest_with_params(params, historical_data)
+                results.append(result)
+            except Exception as e:
+                logger.debug(f"  Simulation {i} failed: {str(e)}")
+                continue
+        
+        return results
+    
+    def _adaptive_search(self, param_ranges: Dict[str, Any], historical_data: Dict[str, List[Dict]],
+                         method: str, seed: Optional[int] = None, **search_kwargs) -> List[Dict]:
+        """
+        Search the same objective as the grid with a parameter_search method
+        
+        Fractional budgets backtest only the most recent share of the timeline,
+        so Hyperband/successive halving discard weak sets on short windows.
+        Full-data results are kept so the ranking below sees the usual dicts.
+        """
+        timestamps, _ = self._index_candles(historical_data)
+        n_bars = len(timestamps)
+        full_results: Dict[str, Dict[str, Any]] = {}
+        
+        def objective(params: Dict[str, Any], budget: float) -> float:
+            if budget >= 1.0:
+                result = self.backtest_with_params(params, historical_data)
+                full_results[json.dumps(params, sort_keys=True, default=str)] = result
+            else:
+                window = (n_bars - max(1, int(round(n_bars * budget))), n_bars)
+                result = self.backtest_with_params(params, historical_data, window=window)
+            return result['score']
+        
+        outcome = get_search(method, **search_kwargs).run(SearchSpace(param_ranges), objective, seed=seed)
+        grid_size = 1
+        for values in param_ranges.values():
+            grid_size *= len(values) if isinstance(values, list) else 1
+        logger.info(f"🔍 {method}: {outcome.evaluations} backtests ({outcome.budget_used:.1f} full-data "
+                    f"equivalents) vs {grid_size} for the full grid")
+        return list(full_results.values())
+    
+    def walk_forward(
+        self,
+        param_ranges: Dict[str, List],
+        days: int = 28,
+        train_days: int = 7,
+        test_days: int = 2,
+        anchored: bool = False,
+        n_workers: Optional[int] = None,
+        historical_data: Optional[Dict[str, List[Dict]]] = None
+    ):
+        """
+        Walk-forward optimization: grid search on each training window,
+        score the winner on the following unseen window
+        
+        Args:
+            param_ranges: Grid searched in every fold
+            days: History to download when historical_data is None
+            train_days: In-sample window per fold
+            test_days: Out-of-sample window per fold
+            anchored: Grow the training window from the start instead of rolling it
+            n_workers: Worker processes (default: CPUs - 1)
+            historical_data: Candles per instrument (downloaded if None)
+            
+        Returns:
+            WalkForwardResult with stitched out-of-sample trades and parameter stability
+        """
+        logger.info(f"\n{'='*70}")
+        logger.info(f"🚶 WALK-FORWARD: {self.strategy_name}")
+        logger.info(f"{'='*70}\n")
+        
+        historical_data = historical_data or self.download_historical_data(days)
+        if not historical_data:
+            logger.error("❌ No historical data available!")
+            return None
+        
+        # Timeline index is built once here and inherited by the fold workers
+        timestamps, _ = self._index_candles(historical_data)
+        # Bars per day from the candle spacing, whatever granularity was downloaded
+        day = bars_per_day(timestamps)
+        folds = make_folds(len(timestamps), train_days * day, test_days * day,
+                           anchored=anchored, start=min(WARMUP_BARS, len(timestamps)))
+        if not folds:
+            logger.error("❌ History too short for the requested train/test windows")
+            return None
+        
+        runner = WalkForwardRunner(self._fold_backtest, self.create_param_combinations(param_ranges),
+                                   score_key='score', n_workers=n_workers)
+        return runner.run(historical_data, folds)
+    
+    def _fold_backtest(self, params: Dict[str, Any], historical_data: Dict[str, List[Dict]],
+                       start: int, end: int) -> Dict[str, Any]:
+        return self.backtest_with_params(params, historical_data, window=(start, end))
 
 
 def main():